@@ -170,6 +170,10 @@ export const videosApi = {
     if (options?.sortOrder) params.sort_order = options.sortOrder;
     if (options?.limit) params.limit = options.limit;
     if (options?.offset) params.offset = options.offset;
+    if (options?.cursor) params.cursor = options.cursor;
+    if (options?.count) params.count = options.count;
+    if (options?.profile) params.profile = options.profile;
+    if (options?.fields?.length) params.fields = options.fields.join(',');
     if (options?.dateStart) params.date_start = options.dateStart;
     if (options?.dateEnd) params.date_end = options.dateEnd;
 
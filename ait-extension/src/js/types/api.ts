@@ -8,7 +8,7 @@ export interface IngestOptions {
   force_reprocess?: boolean;
 }
 
-export type SearchType = 'semantic' | 'fulltext' | 'hybrid' | 'transcripts' | 'similar' | 'recent';
+export type SearchType = 'semantic' | 'fulltext' | 'hybrid' | 'transcripts' | 'fused' | 'similar' | 'recent';
 
 export type SortField = "processed_at" | "file_name" | "duration_seconds" | "created_at";
 export type SortOrder = "ascending" | "descending";
@@ -193,6 +193,9 @@ export interface SearchResults {
   total: number; 
   query?: string; 
   search_type?: SearchType; 
+  count_type?: 'exact' | 'estimated' | 'planned' | null;
+  next_cursor?: string | null;
+  has_more?: boolean;
 }
 
 export interface ApiResponse<T = any> {
@@ -237,11 +240,17 @@ export interface PipelineStep {
   enabled_by_default?: boolean;
 }
 
+export type FieldProfile = 'grid' | 'detail' | 'export';
+
 export interface ListVideoOptions {
   sortBy?: SortField;
   sortOrder?: SortOrder;
   limit?: number;
   offset?: number;
+  cursor?: string;
+  count?: 'exact' | 'estimated' | 'planned' | 'none';
+  profile?: FieldProfile;
+  fields?: string[];
   dateStart?: string; 
   dateEnd?: string;   
 }
@@ -0,0 +1,844 @@
+#!/usr/bin/env python3
+"""
+Async API server for AI Ingesting Tool.
+
+ASGI counterpart to api_server_new.py serving the same HTTP routes and
+Socket.IO events. Per-clip reads (details, thumbnails, transcripts, analysis)
+go straight to Supabase over a pooled async HTTP client, share the threaded
+server's single-flight lookup cache, and run concurrently, so one slow query
+or thumbnail download no longer holds a server thread. Search, listing and stats still use the synchronous
+VideoSearcher and run on worker threads; ingest keeps running on its own
+background thread and its progress events are forwarded to the event loop.
+
+Run with:
+    python api_server_async.py [--host 127.0.0.1] [--port 8000]
+"""
+
+import os
+import json
+import re
+import time
+import asyncio
+import argparse
+import datetime
+import mimetypes
+from typing import Any, Dict, List, Optional
+
+import structlog
+import socketio
+import uvicorn
+from quart import Quart, request, jsonify, Response, g
+from quart_cors import cors
+
+# Shared ingest state and helpers live in the threaded server
+import api_server_new as legacy
+
+from video_ingest_tool.auth import AuthManager, auth_state
+from video_ingest_tool.search import VideoSearcher, format_search_results
+from video_ingest_tool.supabase_async import AsyncSupabaseClient, split_storage_url
+from video_ingest_tool import telemetry
+
+logger = structlog.get_logger(__name__)
+
+AUTH_ERROR_MARKERS = ("Authentication required", "Invalid Refresh Token", "Failed to create authenticated client")
+
+# Quart app; origins are reflected so credentialed requests from the panel work
+app = Quart(__name__)
+app = cors(app, allow_origin=re.compile(r".*"), allow_credentials=True)
+
+sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+asgi_app = socketio.ASGIApp(sio, other_asgi_app=app)
+
+# Set on startup
+supabase: Optional[AsyncSupabaseClient] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _is_auth_error(error_msg: str) -> bool:
+    return any(marker in error_msg for marker in AUTH_ERROR_MARKERS)
+
+
+def _emit_from_thread(event: str, payload: Dict[str, Any]) -> None:
+    """Progress emitter used by the ingest thread to reach async clients."""
+    if _loop is not None and not _loop.is_closed():
+        asyncio.run_coroutine_threadsafe(sio.emit(event, payload), _loop)
+
+
+async def _get_session(log_to_console: bool = True) -> Optional[Dict[str, Any]]:
+    """Return the current session from the in-memory auth state, or None if not authenticated."""
+    session = auth_state.session
+    if not session and log_to_console:
+        logger.warning("Not authenticated")
+    return session
+
+
+def _cache_headers(clip_id: str, last_updated: Any) -> Dict[str, str]:
+    """Build Last-Modified/ETag/Cache-Control headers matching the threaded server."""
+    if not last_updated:
+        return {}
+    if isinstance(last_updated, str):
+        try:
+            last_updated_dt = datetime.datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
+        except ValueError:
+            last_updated_dt = datetime.datetime.now(datetime.timezone.utc)
+    elif isinstance(last_updated, datetime.datetime):
+        last_updated_dt = last_updated
+    else:
+        last_updated_dt = datetime.datetime.now(datetime.timezone.utc)
+
+    return {
+        'Last-Modified': last_updated_dt.strftime('%a, %d %b %Y %H:%M:%S GMT'),
+        'Cache-Control': 'private, max-age=86400',
+        'ETag': f'"{clip_id}-{int(last_updated_dt.timestamp())}"',
+    }
+
+
+async def fetch_clip_bundles(clip_ids: List[str], access_token: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch clips with their transcript and analysis in a single embedded query.
+
+    Args:
+        clip_ids: Clip IDs to load
+        access_token: User access token
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Clip ID -> {"clip", "transcript", "analysis"}; missing clips are absent
+    """
+    rows = await supabase.select('clips', access_token, columns=legacy.CLIP_BUNDLE_SELECT, filters={'id': clip_ids})
+    return {row['id']: legacy.bundle_from_embedded_row(row) for row in rows}
+
+
+async def fetch_clip_bundle(clip_id: str, access_token: str) -> Optional[Dict[str, Any]]:
+    """Fetch one clip bundle, coalesced with identical concurrent lookups."""
+    async def load():
+        return (await fetch_clip_bundles([clip_id], access_token)).get(clip_id)
+    return await legacy.lookup_cache.aget_or_load(('clip', clip_id), load)
+
+
+async def fetch_clip_row(table: str, clip_id: str, access_token: str) -> Optional[Dict[str, Any]]:
+    """Fetch the first row of `table` for a clip, coalesced like fetch_clip_bundle."""
+    key = ('transcript' if table == 'transcripts' else 'analysis', clip_id)
+    return await legacy.lookup_cache.aget_or_load(
+        key, lambda: supabase.select_one(table, access_token, filters={'clip_id': clip_id})
+    )
+
+
+@app.before_serving
+async def startup():
+    """Create the pooled client and hook ingest progress into this loop."""
+    global supabase, _loop
+    _loop = asyncio.get_running_loop()
+    supabase = AsyncSupabaseClient()
+    auth_state.start()
+    legacy.progress_emitter = _emit_from_thread
+    logger.info("Async API server started")
+
+
+@app.after_serving
+async def shutdown():
+    """Release pooled connections."""
+    legacy.progress_emitter = legacy.socketio.emit
+    auth_state.stop()
+    if supabase is not None:
+        await supabase.aclose()
+
+
+@app.before_request
+async def start_request_timer():
+    """Start timing the request for the latency histogram."""
+    g.request_started = time.perf_counter()
+    telemetry.HTTP_REQUESTS_IN_FLIGHT.inc()
+
+
+@app.after_request
+async def record_request_latency(response):
+    """Record request latency under the route template; streamed bodies are timed to the first byte."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        telemetry.HTTP_REQUESTS_IN_FLIGHT.dec()
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        telemetry.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route=route,
+                                               method=request.method, status=str(response.status_code))
+    return response
+
+
+# API Routes
+@app.route('/metrics', methods=['GET'])
+async def metrics_endpoint():
+    """Prometheus scrape endpoint (shares the threaded server's registry and ingest metrics)."""
+    return Response(telemetry.render(), content_type=telemetry.CONTENT_TYPE)
+
+
+@app.route('/api/health', methods=['GET'])
+async def health_check():
+    """Health check endpoint."""
+    return jsonify({
+        "status": "ok",
+        "timestamp": time.time(),
+        "backend_available": legacy.BACKEND_AVAILABLE
+    })
+
+
+# Auth endpoints
+@app.route('/api/auth/status', methods=['GET'])
+async def auth_status():
+    """Get authentication status."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"authenticated": False, "error": "Backend not available"}), 500
+
+    try:
+        session = auth_state.session
+        if not session:
+            return jsonify({"authenticated": False})
+
+        profile = await asyncio.to_thread(AuthManager().get_user_profile)
+        return jsonify({
+            "authenticated": True,
+            "user": {
+                "id": session.get('user_id'),
+                "email": session.get('email'),
+                "display_name": profile.get('display_name') if profile else None,
+                "profile_type": profile.get('profile_type') if profile else None
+            }
+        })
+    except Exception as e:
+        logger.error(f"Auth status check failed: {str(e)}")
+        return jsonify({"authenticated": False, "error": str(e)}), 500
+
+
+@app.route('/api/auth/login', methods=['POST'])
+async def auth_login():
+    """Login endpoint."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    try:
+        data = await request.get_json()
+        email = data.get('email')
+        password = data.get('password')
+
+        if not email or not password:
+            return jsonify({"error": "Email and password required"}), 400
+
+        auth_manager = AuthManager()
+        success = await asyncio.to_thread(auth_manager.login, email, password)
+        legacy.lookup_cache.invalidate()
+        if not success:
+            return jsonify({"error": "Login failed"}), 401
+
+        profile = await asyncio.to_thread(auth_manager.get_user_profile)
+        return jsonify({
+            "success": True,
+            "user": {
+                "email": email,
+                "display_name": profile.get('display_name') if profile else None,
+                "profile_type": profile.get('profile_type') if profile else None
+            }
+        })
+    except Exception as e:
+        logger.error(f"Login failed: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/auth/signup', methods=['POST'])
+async def auth_signup():
+    """Signup endpoint."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    try:
+        data = await request.get_json()
+        email = data.get('email')
+        password = data.get('password')
+
+        if not email or not password:
+            return jsonify({"error": "Email and password required"}), 400
+
+        if await asyncio.to_thread(AuthManager().signup, email, password):
+            return jsonify({"success": True, "message": "Account created successfully"})
+        return jsonify({"error": "Signup failed"}), 400
+    except Exception as e:
+        logger.error(f"Signup failed: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/auth/logout', methods=['POST'])
+async def auth_logout():
+    """Logout endpoint."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    try:
+        success = await asyncio.to_thread(AuthManager().logout)
+        legacy.lookup_cache.invalidate()
+        return jsonify({"success": success})
+    except Exception as e:
+        logger.error(f"Logout failed: {str(e)}")
+        return jsonify({"error": "Logout failed"}), 500
+
+
+# Ingest endpoints
+@app.route('/api/ingest', methods=['POST'])
+async def start_ingest():
+    """Start video ingest process."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({
+            "error": "Backend not available. Please ensure video_ingest_tool is properly installed."
+        }), 500
+
+    if legacy.is_ingest_running():
+        return jsonify({
+            "error": "Ingest job already running",
+            "current_status": legacy.ingest_progress["status"]
+        }), 400
+
+    try:
+        data = await request.get_json()
+        if data is None:
+            return jsonify({"error": "Invalid request: Could not parse JSON body. Ensure Content-Type is application/json."}), 400
+        directory = data.get('directory')
+    except Exception as e:
+        logger.error("Error parsing request JSON for ingest", exc_info=True, error=str(e))
+        return jsonify({"error": "Invalid request: Failed to parse JSON body.", "details": str(e)}), 400
+
+    if not directory or not os.path.exists(directory):
+        return jsonify({"error": f"Directory not found or not accessible: {directory}"}), 400
+
+    try:
+        legacy.start_ingest_job(directory, data)
+        return jsonify({"status": "started", "directory": directory})
+    except Exception as e:
+        logger.error("Error starting ingest thread", exc_info=True, error=str(e))
+        legacy.ingest_progress["status"] = "idle"
+        return jsonify({"error": "Failed to start ingest job", "details": str(e)}), 500
+
+
+@app.route('/api/ingest/progress', methods=['GET'])
+async def get_ingest_progress():
+    """Get current ingest job progress."""
+    return jsonify(legacy.ingest_progress)
+
+
+@app.route('/api/ingest/profiling', methods=['GET', 'POST'])
+async def ingest_profiling_endpoint():
+    """Get or set the profiling mode for subsequent ingest runs."""
+    if request.method == 'GET':
+        return jsonify(legacy.ingest_profiling)
+    settings, error = legacy.configure_ingest_profiling(await request.get_json(silent=True))
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify(settings)
+
+
+@app.route('/api/ingest/results', methods=['GET'])
+async def get_ingest_results():
+    """Get results from the most recent ingest job (index entries; see the Flask route)."""
+    results = legacy.ingest_progress.get("results") or []
+    return jsonify({"results": results, "count": len(results)})
+
+
+@app.route('/api/runs', methods=['GET'])
+async def list_runs():
+    """Recent ingest runs recorded in the local run catalog, with per-status counts."""
+    catalog = legacy.get_run_catalog()
+    if catalog is None:
+        return jsonify({"error": "Run catalog not available"}), 503
+    runs = await asyncio.to_thread(catalog.runs, limit=request.args.get('limit', 20, type=int))
+    return jsonify({"runs": runs})
+
+
+@app.route('/api/runs/results', methods=['GET'])
+async def list_run_results():
+    """Results of ingest runs from the local run catalog (see api_server_new.query_run_catalog)."""
+    body, error, status_code = await asyncio.to_thread(legacy.query_run_catalog, request.args)
+    if error:
+        return jsonify({"error": error}), status_code
+    return Response(body, status=status_code, content_type="application/json")
+
+
+# Search endpoints
+@app.route('/api/search', methods=['GET'])
+async def search_videos():
+    """HTTP API endpoint for searching processed videos."""
+    query = request.args.get('query', '')
+    search_type = request.args.get('type', 'hybrid')
+    limit = request.args.get('limit', 20, type=int)
+    profile = request.args.get('profile', legacy.DEFAULT_LIST_PROFILE)
+
+    _, results_or_error, status_code = await asyncio.to_thread(legacy.perform_search, query, search_type, limit, profile)
+    return jsonify(results_or_error), status_code
+
+
+@app.route('/api/clips', methods=['GET'])
+async def list_videos_endpoint():
+    """HTTP API endpoint for listing videos (keyset pagination, see api_server_new.list_videos_endpoint)."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 503
+
+    if not await _get_session(log_to_console=False):
+        return jsonify({"error": "Authentication required"}), 401
+
+    try:
+        page = await asyncio.to_thread(VideoSearcher().list_videos_page, **legacy.parse_list_args(request.args))
+        return jsonify(legacy.format_list_page(page)), 200
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error("List videos validation error", error=error_msg)
+        return jsonify({"error": error_msg}), 401 if _is_auth_error(error_msg) else 400
+    except Exception as e:
+        logger.error("List videos failed", error=str(e))
+        return jsonify({"error": f"Failed to list videos: {str(e)}"}), 500
+
+
+@app.route('/api/similar', methods=['GET'])
+async def search_similar_videos():
+    """Find videos similar to a given clip."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available for similar search"}), 500
+
+    clip_id = request.args.get('clip_id')
+    limit = request.args.get('limit', 5, type=int)
+    profile = request.args.get('profile', legacy.DEFAULT_LIST_PROFILE)
+
+    if not clip_id:
+        return jsonify({"error": "Clip ID required"}), 400
+
+    if not await _get_session():
+        return jsonify({"error": "Authentication required for similar search"}), 401
+
+    try:
+        results = await asyncio.to_thread(
+            VideoSearcher().find_similar, clip_id=clip_id, match_count=limit, profile=profile
+        )
+        formatted_results = format_search_results(results, "similar")
+        return jsonify({
+            "results": formatted_results,
+            "total": len(formatted_results),
+            "source_clip_id": clip_id
+        })
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"Similar search ValueError for clip {clip_id}: {error_msg}")
+        if _is_auth_error(error_msg):
+            return jsonify({"error": error_msg}), 401
+        if "Clip not found" in error_msg:
+            return jsonify({"error": error_msg}), 404
+        return jsonify({"error": error_msg}), 400
+    except Exception as e:
+        logger.error(f"Similar search failed: {str(e)}")
+        return jsonify({"error": f"Similar search failed: {str(e)}"}), 500
+
+
+@app.route('/api/database/status', methods=['GET'])
+async def database_status():
+    """Get database connection status."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({
+            "connection": "unavailable",
+            "message": "Backend not available"
+        }), 500
+
+    try:
+        from video_ingest_tool.supabase_config import get_database_status
+        return jsonify(await asyncio.to_thread(get_database_status))
+    except Exception as e:
+        logger.error(f"Failed to get database status: {str(e)}")
+        return jsonify({"connection": "error", "message": str(e)}), 500
+
+
+@app.route('/api/clips/<clip_id>', methods=['GET'])
+async def get_clip_details(clip_id):
+    """Get detailed information about a specific clip."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    session = await _get_session()
+    if not session:
+        return jsonify({"error": "Authentication required"}), 401
+
+    try:
+        bundle = await fetch_clip_bundle(clip_id, session['access_token'])
+        if bundle is None:
+            return jsonify({"error": "Clip not found"}), 404
+        return jsonify(bundle)
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"Get clip details ValueError for {clip_id}: {error_msg}")
+        return jsonify({"error": error_msg}), 401 if _is_auth_error(error_msg) else 400
+    except Exception as e:
+        logger.error(f"Failed to get clip details: {str(e)}")
+        return jsonify({"error": f"Failed to get clip details: {str(e)}"}), 500
+
+
+@app.route('/api/clips/batch', methods=['POST'])
+async def get_clip_details_batch():
+    """Get details for several clips in one round trip (see api_server_new.get_clip_details_batch)."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    data = await request.get_json(silent=True) or {}
+    clip_ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(clip_ids, list) or not clip_ids:
+        return jsonify({"error": "Request body must include a non-empty 'ids' list"}), 400
+    if not all(isinstance(clip_id, str) for clip_id in clip_ids):
+        return jsonify({"error": "'ids' must be a list of clip ID strings"}), 400
+    if len(clip_ids) > legacy.MAX_BATCH_CLIPS:
+        return jsonify({"error": f"At most {legacy.MAX_BATCH_CLIPS} clip IDs per request"}), 400
+
+    session = await _get_session()
+    if not session:
+        return jsonify({"error": "Authentication required"}), 401
+
+    try:
+        bundles = {}
+        to_fetch = []
+        for clip_id in dict.fromkeys(clip_ids):
+            found, bundle = legacy.lookup_cache.peek(('clip', clip_id))
+            if found:
+                bundles[clip_id] = bundle
+            else:
+                to_fetch.append(clip_id)
+
+        if to_fetch:
+            fetched = await fetch_clip_bundles(to_fetch, session['access_token'])
+            for clip_id in to_fetch:
+                legacy.lookup_cache.put(('clip', clip_id), fetched.get(clip_id))
+                bundles[clip_id] = fetched.get(clip_id)
+
+        return jsonify({
+            "results": [bundles[clip_id] for clip_id in clip_ids if bundles.get(clip_id)],
+            "missing": [clip_id for clip_id in clip_ids if not bundles.get(clip_id)]
+        })
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"Batch clip details ValueError: {error_msg}")
+        return jsonify({"error": error_msg}), 401 if _is_auth_error(error_msg) else 400
+    except Exception as e:
+        logger.error(f"Failed to get batch clip details: {str(e)}")
+        return jsonify({"error": f"Failed to get clip details: {str(e)}"}), 500
+
+
+@app.route('/api/stats', methods=['GET'])
+async def get_catalog_stats():
+    """Get statistics about the video catalog."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    if not await _get_session():
+        return jsonify({"error": "Authentication required"}), 401
+
+    try:
+        return jsonify(await asyncio.to_thread(VideoSearcher().get_user_stats))
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"Get catalog stats ValueError: {error_msg}")
+        return jsonify({"error": error_msg}), 401 if _is_auth_error(error_msg) else 400
+    except Exception as e:
+        logger.error(f"Error getting catalog stats: {str(e)}")
+        return jsonify({"error": f"Failed to get catalog stats: {str(e)}"}), 500
+
+
+@app.route('/api/pipeline/steps', methods=['GET'])
+async def get_pipeline_steps():
+    """Get available pipeline steps."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    try:
+        steps = legacy.get_available_pipeline_steps()
+        formatted_steps = [{
+            "id": step_info['name'],
+            "name": step_info['name'],
+            "description": step_info.get('description', ''),
+            "enabled_by_default": step_info.get('enabled', True)
+        } for step_info in steps]
+        return jsonify({"steps": formatted_steps})
+    except Exception as e:
+        logger.error(f"Failed to get pipeline steps: {str(e)}")
+        return jsonify({"error": f"Failed to get pipeline steps: {str(e)}"}), 500
+
+
+@app.route('/api/thumbnail/<clip_id>', methods=['GET'])
+async def get_thumbnail(clip_id):
+    """
+    Proxy a clip thumbnail from Supabase storage.
+
+    The object is streamed through to the client chunk by chunk rather than
+    buffered, so concurrent thumbnail requests from a grid don't pile up in memory.
+
+    Args:
+        clip_id: ID of the clip to get the thumbnail for
+
+    Returns:
+        Image response or error message
+    """
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 503
+
+    session = await _get_session(log_to_console=False)
+    if not session:
+        return jsonify({"error": "Authentication required"}), 401
+    access_token = session['access_token']
+
+    try:
+        clip = await legacy.lookup_cache.aget_or_load(
+            ('thumbnail_row', clip_id),
+            lambda: supabase.select_one(
+                'clips', access_token, columns='id,thumbnail_url,updated_at', filters={'id': clip_id}
+            )
+        )
+        if not clip:
+            return jsonify({"error": "Clip not found"}), 404
+
+        thumbnail_url = clip.get('thumbnail_url')
+        if not thumbnail_url:
+            return jsonify({"error": "Thumbnail not found for clip"}), 404
+
+        try:
+            bucket, path = split_storage_url(thumbnail_url)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 500
+
+        try:
+            upstream = await supabase.open_object(bucket, path, access_token)
+        except FileNotFoundError:
+            return jsonify({"error": "Thumbnail not found for clip"}), 404
+
+        async def body():
+            try:
+                async for chunk in upstream.aiter_bytes():
+                    yield chunk
+            finally:
+                await upstream.aclose()
+
+        content_type = mimetypes.guess_type(path)[0] or 'image/jpeg'
+        headers = _cache_headers(clip_id, clip.get('updated_at'))
+        return Response(body(), mimetype=content_type, headers=headers)
+
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"Get thumbnail ValueError for {clip_id}: {error_msg}")
+        return jsonify({"error": error_msg}), 401 if _is_auth_error(error_msg) else 400
+    except Exception as e:
+        logger.error(f"Failed to get thumbnail: {str(e)}")
+        return jsonify({"error": f"Failed to get thumbnail: {str(e)}"}), 500
+
+
+@app.route('/api/transcript/<clip_id>', methods=['GET'])
+async def get_transcript(clip_id):
+    """Get transcript for a specific clip."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    session = await _get_session()
+    if not session:
+        return jsonify({"error": "Authentication required"}), 401
+
+    try:
+        transcript = await fetch_clip_row('transcripts', clip_id, session['access_token'])
+        if not transcript:
+            return jsonify({"message": "No transcript found for this clip"}), 404
+        return jsonify({"transcript": transcript})
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"Get transcript ValueError for {clip_id}: {error_msg}")
+        return jsonify({"error": error_msg}), 401 if _is_auth_error(error_msg) else 400
+    except Exception as e:
+        logger.error(f"Failed to get transcript: {str(e)}")
+        return jsonify({"error": f"Failed to get transcript: {str(e)}"}), 500
+
+
+@app.route('/api/analysis/<clip_id>', methods=['GET'])
+async def get_analysis(clip_id):
+    """Get analysis for a specific clip."""
+    if not legacy.BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+
+    session = await _get_session()
+    if not session:
+        return jsonify({"error": "Authentication required"}), 401
+
+    try:
+        analysis = await fetch_clip_row('analyses', clip_id, session['access_token'])
+        if not analysis:
+            return jsonify({"message": "No analysis found for this clip"}), 404
+        return jsonify({"analysis": analysis})
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"Get analysis ValueError for {clip_id}: {error_msg}")
+        return jsonify({"error": error_msg}), 401 if _is_auth_error(error_msg) else 400
+    except Exception as e:
+        logger.error(f"Failed to get analysis: {str(e)}")
+        return jsonify({"error": f"Failed to get analysis: {str(e)}"}), 500
+
+
+# WebSocket event handlers
+async def emit_response(sid: str, request_id: Optional[str], result: Any = None, error: Optional[str] = None):
+    """Send a request/response style reply to the requesting socket."""
+    if not request_id:
+        if error:
+            logger.warning(f"Emitting error without request_id: {error}")
+        return
+    payload: Dict[str, Any] = {"requestId": request_id}
+    if error is not None:
+        payload["error"] = error
+    else:
+        payload["result"] = result
+    await sio.emit('response', payload, to=sid)
+
+
+@sio.event
+async def connect(sid, environ):
+    """Handle client connection to WebSocket."""
+    logger.info("Client connected to WebSocket", sid=sid)
+
+
+@sio.event
+async def disconnect(sid, *args):
+    """Handle client disconnection from WebSocket."""
+    logger.info("Client disconnected from WebSocket", sid=sid)
+
+
+@sio.on('search_request')
+async def handle_search_request(sid, data):
+    """Handle search requests through WebSocket."""
+    request_id = data.get('requestId')
+    try:
+        success, results_or_error, _ = await asyncio.to_thread(
+            legacy.perform_search,
+            data.get('query', ''),
+            data.get('searchType', 'hybrid'),
+            data.get('limit', 20),
+            data.get('profile', legacy.DEFAULT_LIST_PROFILE)
+        )
+        if success:
+            await emit_response(sid, request_id, result=results_or_error)
+        else:
+            await emit_response(sid, request_id, error=results_or_error.get("error", "Search failed"))
+    except Exception as e:
+        logger.error("Error handling WebSocket search request", error=str(e))
+        await emit_response(sid, request_id, error=f"Request failed: {str(e)}")
+
+
+@sio.on('start_ingest')
+async def handle_start_ingest(sid, data):
+    """Handle ingest start requests through WebSocket."""
+    request_id = data.get('requestId')
+    directory = data.get('directory')
+
+    if not directory or not os.path.exists(directory):
+        await emit_response(sid, request_id, error=f"Directory not found: {directory}")
+        return
+    if legacy.is_ingest_running():
+        await emit_response(sid, request_id, error="Ingest job already running")
+        return
+
+    try:
+        legacy.start_ingest_job(directory, data.get('options', {}))
+        await emit_response(sid, request_id, result={"status": "started", "directory": directory})
+    except Exception as e:
+        logger.error("Error starting ingest thread (WebSocket)", exc_info=True, error=str(e))
+        legacy.ingest_progress["status"] = "idle"
+        await emit_response(sid, request_id, error=f"Failed to start ingest job: {str(e)}")
+
+
+@sio.on('get_ingest_progress')
+async def handle_get_ingest_progress(sid, data):
+    """Handle ingest progress requests through WebSocket."""
+    await emit_response(sid, data.get('requestId'), result=legacy.ingest_progress)
+
+
+@sio.on('get_video_details')
+async def handle_get_video_details(sid, data):
+    """Handle video details requests through WebSocket."""
+    request_id = data.get('requestId')
+    clip_id = data.get('clipId')
+    if not clip_id:
+        await emit_response(sid, request_id, error="Clip ID required")
+        return
+
+    if not legacy.BACKEND_AVAILABLE:
+        await emit_response(sid, request_id, error="Backend not available")
+        return
+
+    session = await _get_session(log_to_console=False)
+    if not session:
+        await emit_response(sid, request_id, error="Authentication required")
+        return
+    access_token = session['access_token']
+
+    try:
+        clip_rows, transcript, analysis = await asyncio.gather(
+            supabase.rpc('get_clip_details', {'clip_id_param': clip_id}, access_token),
+            supabase.select_one('transcripts', access_token, filters={'clip_id': clip_id}),
+            supabase.select_one('analyses', access_token, filters={'clip_id': clip_id}),
+        )
+        if not clip_rows:
+            await emit_response(sid, request_id, error="Clip not found")
+            return
+        await emit_response(sid, request_id, result={
+            "clip": clip_rows[0], "transcript": transcript, "analysis": analysis
+        })
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"WS get_video_details ValueError for clip {clip_id}: {error_msg}")
+        prefix = "Authentication error" if _is_auth_error(error_msg) else "Request failed"
+        await emit_response(sid, request_id, error=f"{prefix}: {error_msg}")
+    except Exception as e:
+        logger.error(f"Error handling WebSocket get video details for clip {clip_id}: {str(e)}", exc_info=True)
+        await emit_response(sid, request_id, error=f"Unexpected error: {str(e)}")
+
+
+@sio.on('get_similar_videos')
+async def handle_get_similar_videos(sid, data):
+    """Handle similar videos requests through WebSocket."""
+    request_id = data.get('requestId')
+    clip_id = data.get('clipId')
+    limit = data.get('limit', 5)
+    if not clip_id:
+        await emit_response(sid, request_id, error="Clip ID required")
+        return
+
+    if not legacy.BACKEND_AVAILABLE:
+        await emit_response(sid, request_id, error="Backend not available")
+        return
+
+    if not await _get_session(log_to_console=False):
+        await emit_response(sid, request_id, error="Authentication required")
+        return
+
+    try:
+        results = await asyncio.to_thread(
+            VideoSearcher().find_similar, clip_id=clip_id, match_count=limit,
+            profile=data.get('profile', legacy.DEFAULT_LIST_PROFILE)
+        )
+        formatted_results = format_search_results(results, "similar")
+        await emit_response(sid, request_id, result={
+            "results": formatted_results, "total": len(formatted_results), "source_clip_id": clip_id
+        })
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"WS get_similar_videos ValueError for clip {clip_id}: {error_msg}")
+        if _is_auth_error(error_msg):
+            await emit_response(sid, request_id, error=f"Authentication error: {error_msg}")
+        elif "Clip not found" in error_msg:
+            await emit_response(sid, request_id, error=error_msg)
+        else:
+            await emit_response(sid, request_id, error=f"Request failed: {error_msg}")
+    except Exception as e:
+        logger.error(f"Error handling WebSocket get similar videos for clip {clip_id}: {str(e)}", exc_info=True)
+        await emit_response(sid, request_id, error=f"Unexpected error: {str(e)}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the async AI Ingesting Tool API server")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on")
+    parser.add_argument('--log-level', default='info', help="Uvicorn log level")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    print(f"Starting async API server on {args.host}:{args.port}")
+    uvicorn.run(asgi_app, host=args.host, port=args.port, log_level=args.log_level)
@@ -10,9 +10,10 @@ import json
 import time
 import logging
 import structlog
+from threading import Thread
 from typing import Dict, Any, List, Optional, Union, Tuple
 
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, g
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 
@@ -29,15 +30,21 @@ from video_ingest_tool.cli import auth_signup as cli_auth_signup
 from video_ingest_tool.cli import auth_status as cli_auth_status
 
 # Import additional components as needed
-from video_ingest_tool.auth import AuthManager
+from video_ingest_tool.auth import AuthManager, auth_state
 from video_ingest_tool.search import VideoSearcher, format_search_results
+from video_ingest_tool.field_profiles import clip_select, validate_profile
 from video_ingest_tool.processor import get_available_pipeline_steps, process_video_file, get_default_pipeline_config
 from video_ingest_tool.discovery import scan_directory
 from video_ingest_tool.config import setup_logging
-from video_ingest_tool.output import save_to_json, save_run_outputs
+from video_ingest_tool.output import RunOutputWriter, copy_run_log, iter_run_index, save_to_json
+from video_ingest_tool.run_catalog import docs_to_json, get_run_catalog
+from video_ingest_tool.serialization import dumps, loads
+from video_ingest_tool.pipeline import PROFILE_MODES, RunMetrics, StepProfiler
 from video_ingest_tool.utils import calculate_checksum
 from video_ingest_tool.video_processor import DEFAULT_COMPRESSION_CONFIG
 from video_ingest_tool.search_config import get_search_params
+from video_ingest_tool.single_flight import SingleFlightCache
+from video_ingest_tool import telemetry
 
 # Setup logging
 logger = structlog.get_logger(__name__)
@@ -50,51 +57,26 @@ socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
 # Global variables for ingest job tracking
 current_ingest_job = None
 ingest_progress = {"status": "idle", "progress": 0, "total": 0, "current_file": "", "results": [], "processed_files": []}
+# Profiling applied to the next ingest runs (toggled through /api/ingest/profiling)
+ingest_profiling = {"mode": None, "steps": []}
 BACKEND_AVAILABLE = True
+INGEST_ACTIVE_STATUSES = ("starting", "scanning", "processing")
+MAX_BATCH_CLIPS = 100
 
-# Helper functions
-def get_json_files():
-    """Get processed video files from JSON output directories.
-    
-    Returns:
-        List of video metadata dictionaries from JSON files
-    """
-    try:
-        # Look for recent JSON files in output directory
-        output_dir = os.path.join(os.getcwd(), "output", "runs")
-        if not os.path.exists(output_dir):
-            return []
-            
-        # Find the most recent run directory
-        run_dirs = [d for d in os.listdir(output_dir) if d.startswith("run_")]
-        if not run_dirs:
-            return []
-            
-        latest_run = sorted(run_dirs)[-1]
-        json_dir = os.path.join(output_dir, latest_run, "json")
-        
-        if not os.path.exists(json_dir):
-            return []
-            
-        # Read all JSON files in the directory
-        results = []
-        for filename in os.listdir(json_dir):
-            if filename.endswith(".json"):
-                try:
-                    with open(os.path.join(json_dir, filename), 'r') as f:
-                        data = json.load(f)
-                        # Add ID if not present
-                        if 'id' not in data:
-                            data['id'] = filename.replace('.json', '')
-                        results.append(data)
-                except Exception as e:
-                    logger.error(f"Error reading JSON file {filename}: {str(e)}")
-        
-        return results
-    except Exception as e:
-        logger.error(f"Error getting JSON files: {str(e)}")
-        return []
+# Coalesces identical per-clip lookups across concurrent requests and keeps
+# results for a few seconds; cleared whenever ingest writes new data.
+lookup_cache = SingleFlightCache(ttl=float(os.getenv("API_LOOKUP_CACHE_TTL", "10")))
+telemetry.register_cache("lookup", lookup_cache)
+# Thumbnail bytes are only coalesced across concurrent requests, never kept
+# (max_entries=0), so images don't pile up in memory; browsers cache them instead
+thumbnail_downloads = SingleFlightCache(ttl=0, max_entries=0)
+telemetry.register_cache("thumbnail_download", thumbnail_downloads)
 
+# Broadcast hook for ingest progress; the async server swaps in an emitter
+# that hands events from the ingest thread to its own event loop.
+progress_emitter = socketio.emit
+
+# Helper functions
 def check_and_refresh_auth(log_to_console=True) -> bool:
     """Check authentication status and refresh token if needed."""
     try:
@@ -109,13 +91,174 @@ def check_and_refresh_auth(log_to_console=True) -> bool:
         logger.error(f"Auth check failed: {str(e)}")
         return False
 
-def perform_search(query='', search_type='hybrid', limit=20) -> Tuple[bool, Dict[str, Any], int]:
+def normalize_thumbnail_urls(clip: Dict[str, Any]) -> Dict[str, Any]:
+    """Ensure clip['all_thumbnail_urls'] is a list, parsing JSON strings."""
+    urls = clip.get('all_thumbnail_urls')
+    if isinstance(urls, str):
+        try:
+            clip['all_thumbnail_urls'] = json.loads(urls)
+        except ValueError:
+            clip['all_thumbnail_urls'] = []
+    elif not urls:
+        clip['all_thumbnail_urls'] = []
+    return clip
+
+# Select used to fetch a clip with its transcript and analysis in one query
+CLIP_BUNDLE_SELECT = f"{clip_select('detail')}, transcripts(*), analysis(*)"
+
+# Field profile used by list/search views unless the request asks for another
+DEFAULT_LIST_PROFILE = 'grid'
+
+def bundle_from_embedded_row(clip: Dict[str, Any]) -> Dict[str, Any]:
+    """Split a clips row fetched with CLIP_BUNDLE_SELECT into the clip details response shape."""
+    def first(related):
+        # Embedded one-to-many relations come back as lists (or an object for one-to-one)
+        if isinstance(related, list):
+            return related[0] if related else None
+        return related or None
+    
+    transcript = first(clip.pop('transcripts', None))
+    analysis = first(clip.pop('analysis', None))
+    return {
+        "clip": normalize_thumbnail_urls(clip),
+        "transcript": transcript,
+        "analysis": analysis
+    }
+
+def load_clip_bundle(clip_id: str) -> Optional[Dict[str, Any]]:
+    """Load a clip with its transcript and analysis; None if the clip doesn't exist."""
+    return load_clip_bundles([clip_id]).get(clip_id)
+
+def load_clip_bundles(clip_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Load clips with their transcript and analysis rows in a single query.
+    
+    Uses PostgREST resource embedding over the clip_id foreign keys, so N clips
+    cost one round trip instead of 3N.
+    
+    Args:
+        clip_ids: Clip IDs to load
+        
+    Returns:
+        Dict mapping clip ID to {"clip", "transcript", "analysis"}; missing clips are absent
+    """
+    client = AuthManager().get_authenticated_client()
+    if not client:
+        raise ValueError("Authentication required")
+    
+    result = client.table('clips').select(CLIP_BUNDLE_SELECT).in_('id', clip_ids).execute()
+    
+    return {clip['id']: bundle_from_embedded_row(clip) for clip in result.data or []}
+
+def load_clip_row(table: str, clip_id: str) -> Optional[Dict[str, Any]]:
+    """Load the first row of `table` belonging to a clip."""
+    client = AuthManager().get_authenticated_client()
+    if not client:
+        raise ValueError("Authentication required")
+    
+    result = client.table(table).select('*').eq('clip_id', clip_id).limit(1).execute()
+    return result.data[0] if result.data else None
+
+def load_thumbnail(clip_id: str) -> Dict[str, Any]:
+    """
+    Locate a clip's thumbnail in storage (small enough for lookup_cache).
+    
+    Returns:
+        Dict with bucket/path/content_type/updated_at, or error/status when the
+        clip or its thumbnail does not exist
+    """
+    import mimetypes
+    
+    client = AuthManager().get_authenticated_client()
+    if not client:
+        raise ValueError("Authentication required")
+    
+    clip_result = client.table('clips').select('id, thumbnail_url, updated_at').eq('id', clip_id).execute()
+    if not clip_result.data or not clip_result.data[0]:
+        return {"error": "Clip not found", "status": 404}
+    
+    clip = clip_result.data[0]
+    thumbnail_url = clip.get('thumbnail_url')
+    if not thumbnail_url:
+        return {"error": "Thumbnail not found for clip", "status": 404}
+    
+    # URL format: https://{project}.supabase.co/storage/v1/object/public/{bucket}/{path}
+    parts = thumbnail_url.rstrip('?').split('/storage/v1/object/public/')
+    if len(parts) != 2:
+        return {"error": "Invalid thumbnail URL format", "status": 500}
+    
+    bucket, *path_parts = parts[1].split('/', 1)
+    path = path_parts[0] if path_parts else ""
+    
+    return {
+        "bucket": bucket,
+        "path": path,
+        "content_type": mimetypes.guess_type(path)[0] or 'image/jpeg',
+        "updated_at": clip.get('updated_at')
+    }
+
+def download_thumbnail(thumbnail: Dict[str, Any]) -> bytes:
+    """Download a thumbnail located by load_thumbnail, sharing concurrent downloads of the same object."""
+    def download() -> bytes:
+        client = AuthManager().get_authenticated_client()
+        if not client:
+            raise ValueError("Authentication required")
+        return client.storage.from_(thumbnail["bucket"]).download(thumbnail["path"])
+    
+    return thumbnail_downloads.get_or_load((thumbnail["bucket"], thumbnail["path"]), download)
+
+def parse_list_args(args) -> Dict[str, Any]:
+    """
+    Translate /api/clips query parameters into VideoSearcher.list_videos_page kwargs.
+    
+    Args:
+        args: Request query parameters (Flask or Quart MultiDict)
+        
+    Returns:
+        Keyword arguments for list_videos_page
+    """
+    filters = {}
+    if args.get('date_start'):
+        filters['date_start'] = args.get('date_start') # ISO format string
+    if args.get('date_end'):
+        filters['date_end'] = args.get('date_end')     # ISO format string
+    
+    cursor = args.get('cursor') or None
+    profile = validate_profile(args.get('profile', DEFAULT_LIST_PROFILE))
+    # Counting costs a query, so by default only the first page pays for it
+    count = args.get('count', 'none' if cursor else 'estimated')
+    fields = args.get('fields')
+    
+    return {
+        "sort_by": args.get('sort_by', 'processed_at'),
+        "sort_order": args.get('sort_order', 'descending'),
+        "limit": min(max(args.get('limit', 20, type=int), 1), 1000),
+        "offset": args.get('offset', 0, type=int),
+        "filters": filters,
+        "cursor": cursor,
+        "count": None if count == 'none' else count,
+        "columns": [f.strip() for f in fields.split(',') if f.strip()] if fields else None,
+        "profile": profile
+    }
+
+def format_list_page(page: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a list_videos_page result for the /api/clips response (total is null when not counted)."""
+    return {
+        "results": page["results"],
+        "total": page["total"],
+        "count_type": page["count_type"],
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"]
+    }
+
+def perform_search(query='', search_type='hybrid', limit=20, profile=DEFAULT_LIST_PROFILE) -> Tuple[bool, Dict[str, Any], int]:
     """Shared search implementation for both HTTP API and WebSocket.
     
     Args:
         query: Search query string
         search_type: Type of search to perform (hybrid, semantic, fulltext, etc.)
         limit: Maximum number of results to return
+        profile: Field profile limiting the columns fetched (grid, detail, export)
             
     Returns:
         Tuple of (success, results_or_error, status_code)
@@ -149,7 +292,8 @@ def perform_search(query='', search_type='hybrid', limit=20) -> Tuple[bool, Dict
             query=query, 
             search_type=search_type, 
             match_count=limit,
-            weights=search_params
+            weights=search_params,
+            profile=profile
         )
         formatted_results = format_search_results(results, search_type)
         
@@ -205,19 +349,15 @@ def get_recent_videos(limit: int = 20, return_json: bool = True):
                 logger.warning(f"Database query failed: {str(e)}")
                 # Fall through to JSON files
         
-        # Try to get from JSON files
-        json_files = get_json_files()
-        if json_files:
-            results = []
-            for json_file in sorted(json_files, key=lambda x: x.get('processed_at', ''), reverse=True)[:limit]:
-                results.append(json_file)
-                
-            response_data = {
-                "results": results,
-                "total": len(results),
-                "source": "json_files"
-            }
-            return jsonify(response_data) if return_json else response_data
+        # Try the local run catalog (one indexed query; stored results are sent as-is)
+        catalog = get_run_catalog()
+        docs = catalog.query_docs(limit=limit) if catalog else []
+        if docs:
+            if return_json:
+                body = docs_to_json(docs, total=catalog.count(status="processed"), source="run_catalog")
+                return Response(body, content_type="application/json")
+            return {"results": [loads(doc) for doc in docs], "total": catalog.count(status="processed"),
+                    "source": "run_catalog"}
         
         # No results found
         response_data = {
@@ -232,7 +372,29 @@ def get_recent_videos(limit: int = 20, return_json: bool = True):
         error_response = {"error": "Failed to load recent videos"}
         return (jsonify(error_response), 500) if return_json else (error_response, 500)
 
+@app.before_request
+def start_request_timer():
+    """Start timing the request for the latency histogram."""
+    g.request_started = time.perf_counter()
+    telemetry.HTTP_REQUESTS_IN_FLIGHT.inc()
+
+@app.after_request
+def record_request_latency(response):
+    """Record request latency under the route template (bounded label cardinality)."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        telemetry.HTTP_REQUESTS_IN_FLIGHT.dec()
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        telemetry.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route=route,
+                                               method=request.method, status=str(response.status_code))
+    return response
+
 # API Routes
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint."""
+    return Response(telemetry.render(), content_type=telemetry.CONTENT_TYPE)
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
@@ -289,6 +451,7 @@ def auth_login():
         
         auth_manager = AuthManager()
         success = auth_manager.login(email, password)
+        lookup_cache.invalidate()
         
         if success:
             # Get user profile
@@ -344,6 +507,7 @@ def auth_logout():
     try:
         auth_manager = AuthManager()
         success = auth_manager.logout()
+        lookup_cache.invalidate()
         return jsonify({"success": success})
         
     except Exception as e:
@@ -362,7 +526,7 @@ def start_ingest():
         }), 500
     
     # Check if already running
-    if ingest_progress["status"] in ["starting", "scanning", "processing"]:
+    if is_ingest_running():
         return jsonify({
             "error": "Ingest job already running",
             "current_status": ingest_progress["status"]
@@ -384,40 +548,8 @@ def start_ingest():
             "error": f"Directory not found or not accessible: {directory}"
         }), 400
     
-    # Reset progress
-    ingest_progress = {
-        "status": "starting",
-        "progress": 0,
-        "total": 0,
-        "current_file": "",
-        "message": "Initializing...",
-        "results": [],
-        "processed_files": []
-    }
-    
-    # Start ingest task in background thread
-    from threading import Thread
-    
     try:
-        # Create thread with execute_ingest_task
-        ingest_thread = Thread(
-            target=execute_ingest_task,
-            args=(directory,),
-            kwargs={
-                'recursive': data.get('recursive', True),
-                'limit': data.get('limit', 0),
-                'store_database': data.get('store_database', False),
-                'generate_embeddings': data.get('generate_embeddings', False),
-                'force_reprocess': data.get('force_reprocess', False),
-                'ai_analysis': data.get('ai_analysis', False),
-                'compression_fps': data.get('compression_fps', DEFAULT_COMPRESSION_CONFIG['fps']),
-                'compression_bitrate': data.get('compression_bitrate', DEFAULT_COMPRESSION_CONFIG['video_bitrate'])
-            },
-            daemon=True
-        )
-        
-        # Start the thread
-        ingest_thread.start()
+        start_ingest_job(directory, data)
         
         return jsonify({
             "status": "started",
@@ -435,9 +567,25 @@ def get_ingest_progress():
     
     return jsonify(ingest_progress)
 
+@app.route('/api/ingest/profiling', methods=['GET', 'POST'])
+def ingest_profiling_endpoint():
+    """Get or set the profiling mode for subsequent ingest runs."""
+    if request.method == 'GET':
+        return jsonify(ingest_profiling)
+    settings, error = configure_ingest_profiling(request.get_json(silent=True))
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify(settings)
+
 @app.route('/api/ingest/results', methods=['GET'])
 def get_ingest_results():
-    """Get results from the most recent ingest job."""
+    """
+    Get results from the most recent ingest job.
+    
+    Each result is the run index entry of a processed file (clip ID, file
+    name and path, checksum, size, duration and run_id); the full results
+    are served by /api/runs/results?run=<run_id>.
+    """
     global ingest_progress
     
     if ingest_progress and "results" in ingest_progress and ingest_progress["results"]:
@@ -451,6 +599,22 @@ def get_ingest_results():
             "count": 0
         })
 
+@app.route('/api/runs', methods=['GET'])
+def list_runs():
+    """Recent ingest runs recorded in the local run catalog, with per-status counts."""
+    catalog = get_run_catalog()
+    if catalog is None:
+        return jsonify({"error": "Run catalog not available"}), 503
+    return jsonify({"runs": catalog.runs(limit=request.args.get('limit', 20, type=int))})
+
+@app.route('/api/runs/results', methods=['GET'])
+def list_run_results():
+    """Results of ingest runs from the local run catalog, newest first (filters: see query_run_catalog)."""
+    body, error, status_code = query_run_catalog(request.args)
+    if error:
+        return jsonify({"error": error}), status_code
+    return Response(body, status=status_code, content_type="application/json")
+
 # Search endpoints
 @app.route('/api/search', methods=['GET'])
 def search_videos():
@@ -458,13 +622,25 @@ def search_videos():
     query = request.args.get('query', '')
     search_type = request.args.get('type', 'hybrid')
     limit = request.args.get('limit', 20, type=int)
+    profile = request.args.get('profile', DEFAULT_LIST_PROFILE)
     
-    success, results_or_error, status_code = perform_search(query, search_type, limit)
+    success, results_or_error, status_code = perform_search(query, search_type, limit, profile)
     return jsonify(results_or_error), status_code
 
 @app.route('/api/clips', methods=['GET'])
 def list_videos_endpoint():
-    """HTTP API endpoint for listing videos with sorting and filtering."""
+    """
+    HTTP API endpoint for listing videos with sorting and filtering.
+    
+    Supports keyset pagination: pass the `next_cursor` from the previous
+    response as `cursor` to get the next page. `offset` still works for the
+    first page. `count` selects how the total is computed (exact, estimated,
+    planned or none; defaults to estimated on the first page and none after,
+    in which case `total` is null).
+    `profile` picks a named field profile (grid by default, detail or export)
+    and `fields` is an explicit comma-separated column projection that
+    overrides it.
+    """
     if not BACKEND_AVAILABLE:
         return jsonify({"error": "Backend not available"}), 503
 
@@ -472,38 +648,8 @@ def list_videos_endpoint():
         return jsonify({"error": "Authentication required"}), 401
 
     try:
-        sort_by = request.args.get('sort_by', 'processed_at')
-        sort_order = request.args.get('sort_order', 'descending')
-        limit = request.args.get('limit', 20, type=int)
-        offset = request.args.get('offset', 0, type=int)
-        date_start = request.args.get('date_start') # ISO format string
-        date_end = request.args.get('date_end')     # ISO format string
-
-        filters = {}
-        if date_start:
-            filters['date_start'] = date_start
-        if date_end:
-            filters['date_end'] = date_end
-        
-        # Validate sort_by and sort_order against SortField and SortOrder literals if possible
-        # For simplicity, direct pass-through for now. Add validation if needed.
-        # from video_ingest_tool.search import SortField, SortOrder (potential import)
-        # if sort_by not in get_args(SortField): ... error
-        # if sort_order not in get_args(SortOrder): ... error
-
-        searcher = VideoSearcher()
-        videos = searcher.list_videos(
-            sort_by=sort_by,
-            sort_order=sort_order,
-            limit=limit,
-            offset=offset,
-            filters=filters
-        )
-        
-        # format_search_results might not be directly applicable here as list_videos returns raw data.
-        # The client might expect a consistent structure, or we return the raw video objects.
-        # For now, returning raw video objects.
-        return jsonify({"results": videos, "total": len(videos)}), 200 # Consider adding total count from DB if pagination is used
+        page = VideoSearcher().list_videos_page(**parse_list_args(request.args))
+        return jsonify(format_list_page(page)), 200
 
     except ValueError as e:
         error_msg = str(e)
@@ -524,6 +670,7 @@ def search_similar_videos():
     try:
         clip_id = request.args.get('clip_id')
         limit = request.args.get('limit', 5, type=int)
+        profile = request.args.get('profile', DEFAULT_LIST_PROFILE)
         
         if not clip_id:
             return jsonify({"error": "Clip ID required"}), 400
@@ -536,7 +683,8 @@ def search_similar_videos():
         searcher = VideoSearcher()
         results = searcher.find_similar(
             clip_id=clip_id,
-            match_count=limit
+            match_count=limit,
+            profile=profile
         )
         
         # Format results
@@ -593,48 +741,11 @@ def get_clip_details(clip_id):
         if not check_and_refresh_auth():
             return jsonify({"error": "Authentication required"}), 401
         
-        # Get authenticated client
-        auth_manager = AuthManager()
-        client = auth_manager.get_authenticated_client()
-        
-        # Get clip details directly from the clips table
-        clip_result = client.table('clips').select('*').eq('id', clip_id).execute()
-        
-        if not clip_result.data:
+        bundle = lookup_cache.get_or_load(('clip', clip_id), lambda: load_clip_bundle(clip_id))
+        if bundle is None:
             return jsonify({"error": "Clip not found"}), 404
         
-        clip = clip_result.data[0]
-        
-        # Get transcript if available
-        transcript_result = client.table('transcripts').select('*').eq('clip_id', clip_id).execute()
-        transcript = transcript_result.data[0] if transcript_result.data else None
-        
-        # Get analysis if available - use 'analysis' (singular) instead of 'analyses' (plural)
-        analysis_result = client.table('analysis').select('*').eq('clip_id', clip_id).execute()
-        analysis = analysis_result.data[0] if analysis_result.data else None
-        
-        # Ensure all_thumbnail_urls is properly formatted
-        # If all_thumbnail_urls exists and is already a list, use it
-        # If it's a JSON string, parse it
-        # If it doesn't exist, create an empty list
-        if 'all_thumbnail_urls' in clip and clip['all_thumbnail_urls']:
-            if isinstance(clip['all_thumbnail_urls'], list):
-                # Already in the right format
-                pass
-            elif isinstance(clip['all_thumbnail_urls'], str):
-                # Try to parse JSON string
-                try:
-                    clip['all_thumbnail_urls'] = json.loads(clip['all_thumbnail_urls'])
-                except:
-                    clip['all_thumbnail_urls'] = []
-        else:
-            clip['all_thumbnail_urls'] = []
-        
-        return jsonify({
-            "clip": clip,
-            "transcript": transcript,
-            "analysis": analysis
-        })
+        return jsonify(bundle)
         
     except ValueError as e:
         error_msg = str(e)
@@ -648,6 +759,62 @@ def get_clip_details(clip_id):
         logger.error(f"Failed to get clip details: {str(e)}")
         return jsonify({"error": f"Failed to get clip details: {str(e)}"}), 500
 
+@app.route('/api/clips/batch', methods=['POST'])
+def get_clip_details_batch():
+    """
+    Get details for several clips in one round trip.
+    
+    Expects a JSON body {"ids": [...]} and returns {"results": [...], "missing": [...]}
+    with each result shaped like the /api/clips/<clip_id> response. Clips, transcripts
+    and analysis for all uncached IDs are fetched with a single embedded query.
+    """
+    if not BACKEND_AVAILABLE:
+        return jsonify({"error": "Backend not available"}), 500
+    
+    data = request.get_json(silent=True) or {}
+    clip_ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(clip_ids, list) or not clip_ids:
+        return jsonify({"error": "Request body must include a non-empty 'ids' list"}), 400
+    if not all(isinstance(clip_id, str) for clip_id in clip_ids):
+        return jsonify({"error": "'ids' must be a list of clip ID strings"}), 400
+    if len(clip_ids) > MAX_BATCH_CLIPS:
+        return jsonify({"error": f"At most {MAX_BATCH_CLIPS} clip IDs per request"}), 400
+    
+    try:
+        if not check_and_refresh_auth():
+            return jsonify({"error": "Authentication required"}), 401
+        
+        bundles = {}
+        to_fetch = []
+        for clip_id in dict.fromkeys(clip_ids):
+            found, bundle = lookup_cache.peek(('clip', clip_id))
+            if found:
+                bundles[clip_id] = bundle
+            else:
+                to_fetch.append(clip_id)
+        
+        if to_fetch:
+            fetched = load_clip_bundles(to_fetch)
+            for clip_id in to_fetch:
+                bundle = fetched.get(clip_id)
+                lookup_cache.put(('clip', clip_id), bundle)
+                bundles[clip_id] = bundle
+        
+        return jsonify({
+            "results": [bundles[clip_id] for clip_id in clip_ids if bundles.get(clip_id)],
+            "missing": [clip_id for clip_id in clip_ids if not bundles.get(clip_id)]
+        })
+        
+    except ValueError as e:
+        error_msg = str(e)
+        logger.error(f"Batch clip details ValueError: {error_msg}")
+        if "Authentication required" in error_msg or "Invalid Refresh Token" in error_msg or "Failed to create authenticated client" in error_msg:
+            return jsonify({"error": error_msg}), 401
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Failed to get batch clip details: {str(e)}")
+        return jsonify({"error": f"Failed to get clip details: {str(e)}"}), 500
+
 @app.route('/api/stats', methods=['GET'])
 def get_catalog_stats():
     """Get statistics about the video catalog."""
@@ -686,12 +853,12 @@ def get_pipeline_steps():
         
         # Format steps for display
         formatted_steps = []
-        for step_id, step_info in steps.items():
+        for step_info in steps:
             formatted_steps.append({
-                "id": step_id,
-                "name": step_info.get('name', step_id),
+                "id": step_info['name'],
+                "name": step_info['name'],
                 "description": step_info.get('description', ''),
-                "enabled_by_default": step_info.get('enabled_by_default', True)
+                "enabled_by_default": step_info.get('enabled', True)
             })
         
         return jsonify({
@@ -728,10 +895,11 @@ def handle_search_request(data):
         query = data.get('query', '')
         search_type = data.get('searchType', 'hybrid')
         limit = data.get('limit', 20)
+        profile = data.get('profile', DEFAULT_LIST_PROFILE)
 
         # perform_search now handles auth and backend checks internally
         # and will use the centralized search parameters from search_config.py
-        success, results_or_error, _ = perform_search(query, search_type, limit)
+        success, results_or_error, _ = perform_search(query, search_type, limit, profile)
         
         response_data = {"requestId": request_id}
         if success:
@@ -764,43 +932,11 @@ def handle_start_ingest(data):
             emit_error(request_id, f"Directory not found: {directory}")
             return
         
-        if ingest_progress["status"] in ["starting", "scanning", "processing"]:
+        if is_ingest_running():
             emit_error(request_id, "Ingest job already running")
             return
         
-        # Reset progress
-        ingest_progress = {
-            "status": "starting",
-            "progress": 0,
-            "total": 0,
-            "current_file": "",
-            "message": "Initializing...",
-            "results": [],
-            "processed_files": []
-        }
-        
-        # Start ingest task in background thread
-        from threading import Thread
-        
-        # Create thread with execute_ingest_task
-        ingest_thread = Thread(
-            target=execute_ingest_task,
-            args=(directory,),
-            kwargs={
-                'recursive': options.get('recursive', True),
-                'limit': options.get('limit', 0),
-                'store_database': options.get('store_database', False),
-                'generate_embeddings': options.get('generate_embeddings', False),
-                'force_reprocess': options.get('force_reprocess', False),
-                'ai_analysis': options.get('ai_analysis', False),
-                'compression_fps': options.get('compression_fps', DEFAULT_COMPRESSION_CONFIG['fps']),
-                'compression_bitrate': options.get('compression_bitrate', DEFAULT_COMPRESSION_CONFIG['video_bitrate'])
-            },
-            daemon=True
-        )
-        
-        # Start the thread
-        ingest_thread.start()
+        start_ingest_job(directory, options)
         
         # Send response
         socketio.emit('response', {
@@ -911,7 +1047,7 @@ def handle_get_similar_videos(data):
             return
         
         searcher = VideoSearcher()
-        results = searcher.find_similar(clip_id=clip_id, match_count=limit)
+        results = searcher.find_similar(clip_id=clip_id, match_count=limit, profile=data.get('profile', DEFAULT_LIST_PROFILE))
         formatted_results = format_search_results(results, "similar")
         
         socketio.emit('response', {
@@ -943,10 +1079,129 @@ def emit_error(request_id: Optional[str], message: str):
         # socketio.emit('error_occurred', {"error": message}) # Example of a general error event
 
 # Helper functions for ingest
+def is_ingest_running() -> bool:
+    """Return True while an ingest job is in flight."""
+    return ingest_progress.get("status") in INGEST_ACTIVE_STATUSES
+
+def start_ingest_job(directory: str, options: Dict[str, Any]) -> Thread:
+    """
+    Reset ingest progress and run execute_ingest_task on a background thread.
+    
+    Shared by the HTTP and WebSocket handlers here and by the async server.
+    
+    Args:
+        directory: Directory to scan for video files
+        options: Ingest options as sent by the client
+        
+    Returns:
+        Thread: The started ingest thread
+    """
+    global ingest_progress
+    
+    ingest_progress = {
+        "status": "starting",
+        "progress": 0,
+        "total": 0,
+        "current_file": "",
+        "message": "Initializing...",
+        "results": [],
+        "processed_files": []
+    }
+    
+    ingest_thread = Thread(
+        target=execute_ingest_task,
+        args=(directory,),
+        kwargs={
+            'recursive': options.get('recursive', True),
+            'limit': options.get('limit', 0),
+            'store_database': options.get('store_database', False),
+            'generate_embeddings': options.get('generate_embeddings', False),
+            'force_reprocess': options.get('force_reprocess', False),
+            'ai_analysis': options.get('ai_analysis', False),
+            'compression_fps': options.get('compression_fps', DEFAULT_COMPRESSION_CONFIG['fps']),
+            'compression_bitrate': options.get('compression_bitrate', DEFAULT_COMPRESSION_CONFIG['video_bitrate'])
+        },
+        daemon=True
+    )
+    ingest_thread.start()
+    return ingest_thread
+
+def configure_ingest_profiling(options: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Update the profiling settings used by the next ingest runs.
+    
+    Shared by this server and the async server. A running ingest keeps the
+    settings it started with.
+    
+    Args:
+        options: {"mode": "cpu" | "wall" | "memory" | null, "steps": [step names]}
+        
+    Returns:
+        Tuple of the current settings and an error message (None if valid)
+    """
+    if not isinstance(options, dict):
+        return ingest_profiling, "Expected a JSON object with 'mode' and optionally 'steps'"
+    mode = options.get('mode')
+    steps = options.get('steps') or []
+    if mode is not None and mode not in PROFILE_MODES:
+        return ingest_profiling, f"Unknown profile mode '{mode}' (choose from {', '.join(PROFILE_MODES)} or null)"
+    known_steps = {step['name'] for step in get_available_pipeline_steps()}
+    unknown = [step for step in steps if step not in known_steps]
+    if unknown:
+        return ingest_profiling, f"Unknown steps: {', '.join(map(str, unknown))}"
+    ingest_profiling.update(mode=mode, steps=list(steps))
+    logger.info("Ingest profiling configured", mode=mode, steps=steps or "all")
+    return ingest_profiling, None
+
+def query_run_catalog(args) -> Tuple[Optional[bytes], Optional[str], int]:
+    """
+    Query the local run catalog for the /api/runs/results endpoint.
+    
+    Shared by this server and the async server. Processed results are
+    returned as stored, without parsing them; other statuses return the
+    run index entries.
+    
+    Args:
+        args: Request query args: run, checksum, category, clip_id, status
+            (processed, skipped, failed or all; default processed), since
+            (ISO timestamp), limit and offset
+        
+    Returns:
+        Tuple of the JSON response body, an error message and the status code
+    """
+    catalog = get_run_catalog()
+    if catalog is None:
+        return None, "Run catalog not available", 503
+    status = args.get('status', 'processed')
+    if status not in ('processed', 'skipped', 'failed', 'all'):
+        return None, f"Unknown status '{status}' (choose from processed, skipped, failed or all)", 400
+    filters = {
+        'run_id': args.get('run'),
+        'checksum': args.get('checksum'),
+        'category': args.get('category'),
+        'clip_id': args.get('clip_id'),
+    }
+    limit = args.get('limit', 20, type=int)
+    offset = args.get('offset', 0, type=int)
+    since = args.get('since')
+    if status == 'processed':
+        docs = catalog.query_docs(limit=limit, offset=offset, since=since, **filters)
+        total = catalog.count(since=since, status='processed', **filters)
+        return docs_to_json(docs, total=total, source="run_catalog"), None, 200
+    if status != 'all':
+        filters['status'] = status
+    entries = catalog.query_entries(limit=limit, offset=offset, since=since, **filters)
+    total = catalog.count(since=since, **filters)
+    return dumps({"results": entries, "total": total, "source": "run_catalog"}), None, 200
+
 def update_ingest_progress(status, message="", current_file="", progress=0, total=0, processed_count=0, total_count=0, results=None, processed_file=None):
     """Update the global ingest_progress dictionary with new values."""
     global ingest_progress
     
+    # Stored clips may have changed; drop memoized lookups so the panel sees them
+    if processed_file or status in ("completed", "failed"):
+        lookup_cache.invalidate()
+    
     # Update values
     ingest_progress["status"] = status
     ingest_progress["message"] = message
@@ -1017,7 +1272,7 @@ def update_ingest_progress(status, message="", current_file="", progress=0, tota
             progress_update["processed_files"] = ingest_progress["processed_files"]
             
         # Broadcast progress update to all clients
-        socketio.emit('ingest_progress_update', progress_update)
+        progress_emitter('ingest_progress_update', progress_update)
     except Exception as e:
         logger.error(f"Failed to emit WebSocket progress update: {str(e)}")
 
@@ -1046,6 +1301,8 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
     
     # Initial progress update
     update_ingest_progress("starting", message="Initializing ingest...")
+    profiler = None
+    output_writer = None
     
     try:
         # Setup logging and get paths - similar to cli.py
@@ -1059,7 +1316,7 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
         os.makedirs(thumbnails_dir, exist_ok=True)
         
         # Create summary filename
-        summary_filename = f"api_ingest_{os.path.basename(directory)}_{timestamp}.json"
+        summary_filename = f"api_ingest_{os.path.basename(directory)}_{timestamp}.jsonl"
         
         logger_task.info("Starting API ingest task", 
                     directory=directory, 
@@ -1163,10 +1420,15 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
             total_count=len(video_files)
         )
         
-        # Process each video file
-        processed_files = []
+        # Process each video file; results are streamed to the run's JSONL output
+        processed_count = 0
         failed_files = []
         skipped_files = []
+        output_writer = RunOutputWriter(run_dir, summary_filename, logger_task, catalog=get_run_catalog())
+        run_metrics = RunMetrics(run_id=os.path.basename(run_dir), on_record=telemetry.observe_step)
+        if ingest_profiling["mode"]:
+            profiler = StepProfiler(ingest_profiling["mode"], steps=ingest_profiling["steps"], logger=logger_task)
+        throughput = telemetry.IngestThroughput(len(video_files))
         
         for i, file_path in enumerate(video_files):
             # Update progress for current file
@@ -1238,7 +1500,9 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
                     compression_fps=compression_fps,
                     compression_bitrate=compression_bitrate,
                     force_reprocess=force_reprocess,
-                    step_callback=step_progress_callback
+                    step_callback=step_progress_callback,
+                    metrics=run_metrics,
+                    hooks=[profiler] if profiler else None
                 )
                 
                 # Handle skipped files (duplicates)
@@ -1250,9 +1514,11 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
                         'existing_file_name': result.get('existing_file_name'),
                         'existing_processed_at': result.get('existing_processed_at')
                     })
+                    output_writer.add_skipped(**skipped_files[-1])
                     logger_task.info("Skipped duplicate file", 
                                file=file_path, 
                                existing_id=result.get('existing_clip_id'))
+                    throughput.file_done("skipped")
                     
                     # Update processed file status to skipped
                     update_ingest_progress(
@@ -1273,7 +1539,8 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
                 else:
                     # Normal processing result
                     video_file = result
-                    processed_files.append(video_file)
+                    output_writer.add_result(video_file)
+                    processed_count += 1
                     
                     # Create filename with original name and UUID
                     base_name = os.path.splitext(os.path.basename(file_path))[0]
@@ -1282,6 +1549,7 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
                     # Save individual JSON to run directory
                     individual_json_path = os.path.join(json_dir, json_filename)
                     save_to_json(video_file, individual_json_path, logger_task)
+                    throughput.file_done("processed", os.path.getsize(file_path))
                     
                     # Update processed file status to completed
                     update_ingest_progress(
@@ -1300,7 +1568,9 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
                     )
             except Exception as e:
                 failed_files.append(file_path)
+                output_writer.add_failed(file_path, str(e))
                 logger_task.error("Error processing video file", path=file_path, error=str(e))
+                throughput.file_done("failed")
                 
                 # Update processed file status to failed
                 update_ingest_progress(
@@ -1319,38 +1589,31 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
                     }
                 )
         
-        # Save run outputs
-        output_paths = save_run_outputs(
-            processed_files,
-            run_dir,
-            summary_filename,
-            json_dir,
-            log_file,
-            logger_task
-        )
+        # Finish run outputs
+        output_paths = output_writer.close()
+        copy_run_log(run_dir, log_file, logger_task)
+        run_metrics.write(run_dir)
+        if profiler:
+            profiler.write(run_dir)
+        throughput.finish()
         
-        # Compile results for the API response
-        api_results = []
-        for video_file in processed_files:
-            # Convert to dict if it's an object
-            if hasattr(video_file, 'to_dict'):
-                api_results.append(video_file.to_dict())
-            elif hasattr(video_file, '__dict__'):
-                api_results.append(video_file.__dict__)
-            else:
-                api_results.append(video_file)
+        # The progress payload lists each processed file's small index entry; full
+        # results stay on disk (see /api/runs/results?run=<run_id>)
+        run_id = os.path.basename(run_dir)
+        api_results = [{**entry, "run_id": run_id}
+                       for entry in iter_run_index(output_paths['run_index'], status="processed")]
         
         # Final progress update
         update_ingest_progress(
             "completed",
-            message=f"Completed processing {len(processed_files)} files, skipped {len(skipped_files)}, failed {len(failed_files)}",
+            message=f"Completed processing {processed_count} files, skipped {len(skipped_files)}, failed {len(failed_files)}",
             processed_count=len(video_files),
             total_count=len(video_files),
             results=api_results
         )
         
         logger_task.info("API ingest task completed", 
-                    files_processed=len(processed_files),
+                    files_processed=processed_count,
                     skipped_files=len(skipped_files),
                     failed_files=len(failed_files),
                     run_directory=run_dir)
@@ -1359,6 +1622,10 @@ def execute_ingest_task(directory, recursive=True, limit=0, store_database=False
         error_msg = f"Ingest task failed: {str(e)}"
         logger.error(error_msg, exc_info=True)
         update_ingest_progress("failed", message=error_msg)
+        if profiler:
+            profiler.stop()
+        if output_writer:
+            output_writer.close()
 
 @app.route('/api/thumbnail/<clip_id>', methods=['GET'])
 def get_thumbnail(clip_id):
@@ -1382,47 +1649,16 @@ def get_thumbnail(clip_id):
         if not check_and_refresh_auth(log_to_console=False):
             return jsonify({"error": "Authentication required"}), 401
         
-        # Get authenticated client
-        auth_manager = AuthManager()
-        client = auth_manager.get_authenticated_client()
-        
-        # Get clip details
-        clip_result = client.table('clips').select('id, thumbnail_url, updated_at').eq('id', clip_id).execute()
-        
-        if not clip_result.data or not clip_result.data[0]:
-            return jsonify({"error": "Clip not found"}), 404
-        
-        clip = clip_result.data[0]
-        thumbnail_url = clip.get('thumbnail_url')
-        
-        if not thumbnail_url:
-            return jsonify({"error": "Thumbnail not found for clip"}), 404
+        thumbnail = lookup_cache.get_or_load(('thumbnail', clip_id), lambda: load_thumbnail(clip_id))
+        if "error" in thumbnail:
+            return jsonify({"error": thumbnail["error"]}), thumbnail["status"]
         
         # Include cache header based on updated_at timestamp if available
-        last_updated = clip.get('updated_at')
-        
-        # Remove any trailing question mark from the URL
-        thumbnail_url = thumbnail_url.rstrip('?')
+        last_updated = thumbnail.get('updated_at')
         
-        # Parse URL to determine storage path
-        # URL format: https://{project}.supabase.co/storage/v1/object/public/{bucket}/{path}
         try:
-            # Extract bucket and path from the URL
-            parts = thumbnail_url.split('/storage/v1/object/public/')
-            if len(parts) != 2:
-                return jsonify({"error": "Invalid thumbnail URL format"}), 500
-            
-            bucket_and_path = parts[1]
-            # The first segment is the bucket name
-            bucket, *path_parts = bucket_and_path.split('/', 1)
-            path = path_parts[0] if path_parts else ""
-            
-            # Use storage admin API to download the file
-            response = client.storage.from_(bucket).download(path)
-            
-            # Determine content type based on file extension
-            import mimetypes
-            content_type = mimetypes.guess_type(path)[0] or 'image/jpeg'
+            response = download_thumbnail(thumbnail)
+            content_type = thumbnail["content_type"]
             
             # Create response with image data
             image_response = Response(response, mimetype=content_type)
@@ -1478,13 +1714,9 @@ def get_transcript(clip_id):
         if not check_and_refresh_auth():
             return jsonify({"error": "Authentication required"}), 401
         
-        # Get authenticated client
-        auth_manager = AuthManager()
-        client = auth_manager.get_authenticated_client()
-        
-        # Get transcript if available
-        transcript_result = client.table('transcripts').select('*').eq('clip_id', clip_id).execute()
-        transcript = transcript_result.data[0] if transcript_result.data else None
+        transcript = lookup_cache.get_or_load(
+            ('transcript', clip_id), lambda: load_clip_row('transcripts', clip_id)
+        )
         
         if not transcript:
             return jsonify({"message": "No transcript found for this clip"}), 404
@@ -1514,13 +1746,9 @@ def get_analysis(clip_id):
         if not check_and_refresh_auth():
             return jsonify({"error": "Authentication required"}), 401
         
-        # Get authenticated client
-        auth_manager = AuthManager()
-        client = auth_manager.get_authenticated_client()
-        
-        # Get analysis if available
-        analysis_result = client.table('analyses').select('*').eq('clip_id', clip_id).execute()
-        analysis = analysis_result.data[0] if analysis_result.data else None
+        analysis = lookup_cache.get_or_load(
+            ('analysis', clip_id), lambda: load_clip_row('analyses', clip_id)
+        )
         
         if not analysis:
             return jsonify({"message": "No analysis found for this clip"}), 404
@@ -1548,6 +1776,10 @@ if __name__ == "__main__":
     print(f"🔌 WebSocket available at: ws://localhost:8000/socket.io/")
     print("=" * 80 + "\n")
     
+    # Keep the session in memory and refresh it in the background so
+    # per-request auth checks don't touch the auth file or the network
+    auth_state.start()
+    
     # Start the server
     socketio.run(
         app,
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Load test for the API server simulating concurrent extension panels.
+
+Each simulated client does what the panel does on open: list clips, then
+fetch every thumbnail and the detail view for each clip on the page. Per-route
+latencies are collected and reported as p50/p99 along with overall throughput.
+
+Point it at a running server (threaded or async) that is logged in:
+
+    python benchmarks/api_load.py --url http://localhost:8000/api --clients 200
+
+Compare two servers in one run by passing --url more than once, optionally as
+label=url:
+
+    python benchmarks/api_load.py --url threaded=http://localhost:8000/api \\
+        --url async=http://localhost:8001/api --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Recorder:
+    """Collects per-route latencies and error counts."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def timed_get(self, client: httpx.AsyncClient, route: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[route] += 1
+            raise
+        self.latencies[route].append((time.perf_counter() - start) * 1000.0)
+        if response.status_code >= 400:
+            self.errors[route] += 1
+        return response
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        routes = {}
+        for route in sorted(set(self.latencies) | set(self.errors)):
+            values = self.latencies.get(route, [])
+            routes[route] = {
+                "requests": len(values),
+                "errors": self.errors.get(route, 0),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "mean_ms": round(statistics.fmean(values), 2) if values else 0.0,
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        routes["_all"] = {
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "elapsed_s": round(elapsed, 3),
+            "requests_per_s": round(total / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile([x for v in self.latencies.values() for x in v], 50), 2),
+            "p99_ms": round(percentile([x for v in self.latencies.values() for x in v], 99), 2),
+        }
+        return routes
+
+
+async def panel_session(client: httpx.AsyncClient, base_url: str, page_size: int, recorder: Recorder) -> None:
+    """One panel open: list clips, then fetch thumbnails and details concurrently."""
+    try:
+        response = await recorder.timed_get(
+            client, "clips", f"{base_url}/clips", params={"limit": page_size, "offset": 0}
+        )
+    except httpx.HTTPError:
+        return
+    if response.status_code != 200:
+        return
+
+    clip_ids = [clip.get("id") for clip in response.json().get("results", []) if clip.get("id")]
+    requests = []
+    for clip_id in clip_ids:
+        requests.append(recorder.timed_get(client, "thumbnail", f"{base_url}/thumbnail/{clip_id}"))
+        requests.append(recorder.timed_get(client, "clip_details", f"{base_url}/clips/{clip_id}"))
+    await asyncio.gather(*requests, return_exceptions=True)
+
+
+async def run_load(base_url: str, clients: int, rounds: int, page_size: int, timeout: float) -> Dict[str, Dict[str, float]]:
+    """Run `clients` concurrent panel sessions `rounds` times against base_url."""
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=clients * 2, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        # Warm up connections and server-side caches
+        await panel_session(client, base_url, page_size, Recorder())
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(panel_session(client, base_url, page_size, recorder) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+    return recorder.summary(elapsed)
+
+
+def parse_targets(urls: List[str]) -> List[Tuple[str, str]]:
+    targets = []
+    for i, entry in enumerate(urls):
+        label, sep, url = entry.partition("=")
+        if not sep:
+            label, url = (f"target{i + 1}" if len(urls) > 1 else "server"), entry
+        targets.append((label, url.rstrip("/")))
+    return targets
+
+
+def print_report(label: str, summary: Dict[str, Dict[str, float]]) -> None:
+    overall = summary["_all"]
+    print(f"\n== {label}: {overall['requests']} requests in {overall['elapsed_s']}s "
+          f"({overall['requests_per_s']} req/s, {overall['errors']} errors)")
+    print(f"{'route':<16}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for route, stats in summary.items():
+        if route == "_all":
+            continue
+        print(f"{route:<16}{stats['requests']:>10}{stats['errors']:>8}{stats['p50_ms']:>10}{stats['p99_ms']:>10}")
+    print(f"{'all':<16}{overall['requests']:>10}{overall['errors']:>8}{overall['p50_ms']:>10}{overall['p99_ms']:>10}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent panel load test for the API server")
+    parser.add_argument("--url", action="append", default=[], help="API base URL, optionally label=url (repeatable)")
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent simulated panels")
+    parser.add_argument("--rounds", type=int, default=1, help="Times each client opens the panel")
+    parser.add_argument("--page-size", type=int, default=20, help="Clips listed per panel open")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    targets = parse_targets(args.url or ["http://localhost:8000/api"])
+    results = {}
+    for label, url in targets:
+        summary = asyncio.run(run_load(url, args.clients, args.rounds, args.page_size, args.timeout))
+        results[label] = {"url": url, "clients": args.clients, "rounds": args.rounds, "routes": summary}
+        print_report(label, summary)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
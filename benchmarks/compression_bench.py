@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Single-process vs segment-parallel proxy compression.
+
+Generates a synthetic source with ffmpeg's lavfi test sources (4K by default,
+GOP of 2 seconds like most camera files), then compresses it with
+VideoCompressor twice: once as a single ffmpeg process and once split on
+GOP boundaries across parallel ffmpeg processes. Reports wall time, speedup
+and checks that both proxies have the same duration and frame count.
+
+    python benchmarks/compression_bench.py --duration 300 --size 3840x2160
+    python benchmarks/compression_bench.py --workers 4 --codec libx265 --json compression.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_ingest_tool.video_processor.compression import VideoCompressor, probe_duration  # noqa: E402
+
+
+def make_source(path: str, duration: int, size: str, rate: int) -> None:
+    """Synthetic camera-like source: moving test pattern, tone, keyframe every 2 seconds."""
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error",
+         "-f", "lavfi", "-i", f"testsrc2=size={size}:rate={rate}:duration={duration}",
+         "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=48000:duration={duration}",
+         "-c:v", "libx264", "-preset", "ultrafast", "-g", str(rate * 2), "-pix_fmt", "yuv420p",
+         "-c:a", "aac", "-shortest", path],
+        check=True, capture_output=True, text=True
+    )
+
+
+def frame_count(path: str) -> int:
+    result = subprocess.run(
+        ["ffprobe", "-v", "quiet", "-select_streams", "v:0", "-count_packets",
+         "-show_entries", "stream=nb_read_packets", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True
+    )
+    return int(result.stdout.strip())
+
+
+def run(source: str, output_dir: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    output = VideoCompressor(config).compress(source, output_dir)
+    seconds = time.perf_counter() - start
+    return {"seconds": round(seconds, 2), "duration": round(probe_duration(output) or 0.0, 2),
+            "frames": frame_count(output), "bytes": os.path.getsize(output)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Proxy compression benchmark")
+    parser.add_argument("--duration", type=int, default=300, help="Source length in seconds")
+    parser.add_argument("--size", default="3840x2160")
+    parser.add_argument("--rate", type=int, default=25)
+    parser.add_argument("--codec", default="libx264", help="Software codec to compare (libx264 or libx265)")
+    parser.add_argument("--workers", type=int, default=0, help="Parallel encoders (default: one per two cores)")
+    parser.add_argument("--segment-seconds", type=int, default=60)
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+        print("ffmpeg and ffprobe are required", file=sys.stderr)
+        return 1
+
+    work_dir = tempfile.mkdtemp(prefix="compression-bench-")
+    try:
+        source = os.path.join(work_dir, "source.mp4")
+        start = time.perf_counter()
+        make_source(source, args.duration, args.size, args.rate)
+        print(f"Source: {args.duration}s {args.size}@{args.rate} in {time.perf_counter() - start:.1f}s, "
+              f"{os.cpu_count()} CPUs")
+
+        base = {"codec_priority": [args.codec], "use_hardware_accel": False, "long_clip_codec": None,
+                "segment_seconds": args.segment_seconds}
+        single = run(source, os.path.join(work_dir, "single"),
+                     {**base, "parallel_min_duration": float("inf")})
+        parallel = run(source, os.path.join(work_dir, "parallel"),
+                       {**base, "parallel_min_duration": 0, "parallel_workers": args.workers})
+        speedup = single["seconds"] / parallel["seconds"] if parallel["seconds"] else 0.0
+
+        print(f"{'mode':>10}{'seconds':>10}{'duration':>10}{'frames':>8}{'MB':>8}")
+        for name, result in (("single", single), ("parallel", parallel)):
+            print(f"{name:>10}{result['seconds']:>10}{result['duration']:>10}{result['frames']:>8}"
+                  f"{result['bytes'] / 1e6:>8.1f}")
+        print(f"Speedup: {speedup:.2f}x")
+        if single["frames"] != parallel["frames"]:
+            print(f"Warning: frame counts differ ({single['frames']} vs {parallel['frames']})")
+
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump({"source": {"duration": args.duration, "size": args.size, "rate": args.rate},
+                           "codec": args.codec, "cpus": os.cpu_count(), "single": single,
+                           "parallel": parallel, "speedup": round(speedup, 2)}, f, indent=2)
+            print(f"\nResults written to {args.json_path}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Image embedding throughput: per-image JSON requests vs batched binary transport.
+
+Generates synthetic JPEG thumbnails and embeds them three ways, reporting
+images per second for each:
+
+    legacy     generate_thumbnail_embedding, one base64 JSON request per image
+    multipart  ImageEmbeddingClient, batched raw file parts
+    npy        ImageEmbeddingClient, batched uint8 tensor
+
+By default an in-process stub server (benchmarks/siglip_stub_server.py) is
+used, so the numbers show transport and request overhead. Pass --url to
+measure a real SigLIP server instead:
+
+    python benchmarks/image_embedding_throughput.py --images 512 --latency-ms 5
+    python benchmarks/image_embedding_throughput.py --url http://gpu-box:8001 --json results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from siglip_stub_server import start_stub_server  # noqa: E402
+from video_ingest_tool.embeddings_image import ImageEmbeddingClient, generate_thumbnail_embedding  # noqa: E402
+
+
+def make_thumbnails(directory: str, count: int, width: int, height: int) -> List[str]:
+    """Write `count` deterministic gradient-plus-noise JPEGs and return their paths."""
+    rng = np.random.default_rng(0)
+    ramp = np.linspace(0, 200, width, dtype=np.float32)[None, :, None]
+    paths = []
+    for i in range(count):
+        noise = rng.normal(0, 12, size=(height, width, 3))
+        pixels = np.clip(ramp + (i * 37) % 56 + noise, 0, 255).astype(np.uint8)
+        path = os.path.join(directory, f"thumb_{i:04d}.jpg")
+        Image.fromarray(pixels).save(path, quality=85)
+        paths.append(path)
+    return paths
+
+
+def run_legacy(url: str, paths: List[str], logger) -> Dict[str, float]:
+    start = time.perf_counter()
+    embeddings = [generate_thumbnail_embedding(path, "benchmark", api_base=url, logger=logger) for path in paths]
+    return summarize(time.perf_counter() - start, embeddings)
+
+
+def run_batched(url: str, paths: List[str], transport: str, batch_size: int, concurrency: int, logger) -> Dict[str, float]:
+    with ImageEmbeddingClient(api_base=url, batch_size=batch_size, concurrency=concurrency,
+                              transport=transport, logger=logger) as client:
+        client.embed_images(paths[:1])  # warm the connection pool
+        start = time.perf_counter()
+        embeddings = client.embed_images(paths)
+        return summarize(time.perf_counter() - start, embeddings)
+
+
+def summarize(elapsed: float, embeddings: List) -> Dict[str, float]:
+    ok = sum(1 for embedding in embeddings if embedding)
+    return {
+        "images": len(embeddings),
+        "failed": len(embeddings) - ok,
+        "elapsed_s": round(elapsed, 3),
+        "images_per_s": round(ok / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Image embedding throughput benchmark")
+    parser.add_argument("--url", help="Embedding server URL (default: start a local stub server)")
+    parser.add_argument("--images", type=int, default=256, help="Number of thumbnails to embed")
+    parser.add_argument("--size", default="640x360", help="Thumbnail size WxH")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--modes", default="legacy,multipart,npy", help="Comma-separated modes to run")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Stub: fixed delay per request")
+    parser.add_argument("--per-image-ms", type=float, default=0.0, help="Stub: simulated model time per image")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("image_embedding_benchmark")
+    logger.setLevel(logging.ERROR)
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    server = None
+    url = args.url
+    if not url:
+        server = start_stub_server(latency_ms=args.latency_ms, per_image_ms=args.per_image_ms)
+        url = server.url
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_thumbnails(tmp, args.images, width, height)
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            if mode == "legacy":
+                results[mode] = run_legacy(url, paths, logger)
+            else:
+                results[mode] = run_batched(url, paths, mode, args.batch_size, args.concurrency, logger)
+
+    if server:
+        server.shutdown()
+
+    print(f"{args.images} images ({args.size}) against {url}"
+          f" | batch_size={args.batch_size} concurrency={args.concurrency}")
+    print(f"{'mode':<12}{'images/s':>10}{'elapsed s':>11}{'failed':>8}")
+    for mode, stats in results.items():
+        print(f"{mode:<12}{stats['images_per_s']:>10}{stats['elapsed_s']:>11}{stats['failed']:>8}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"url": url, "images": args.images, "size": args.size, "batch_size": args.batch_size,
+                       "concurrency": args.concurrency, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Cold-start import time of the CLI, with a budget.
+
+Runs ``python -X importtime -c "import video_ingest_tool.cli"`` in fresh
+interpreters, takes the median cumulative time of the top-level import,
+lists the slowest modules and checks that none of the heavy optional
+dependencies (torch, OpenCV, PyAV, the Gemini SDK, supabase) were imported.
+Exits non-zero when the budget is exceeded or a heavy module leaks into
+startup, so it can guard against regressions in CI.
+
+    python benchmarks/import_time_bench.py
+    python benchmarks/import_time_bench.py --budget-ms 600 --runs 7 --json import_time.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported once a step that needs them runs
+HEAVY_MODULES = ["torch", "cv2", "av", "google.genai", "supabase", "transformers", "PIL.Image"]
+
+
+def import_profile(module: str) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns:
+        ({module: (self_us, cumulative_us)}, heavy modules left in sys.modules)
+    """
+    # importtime also lists failed optional imports, so check sys.modules for what actually loaded
+    code = (f"import {module}, sys; "
+            f"print('HEAVY=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    env = {**os.environ, "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, env=env, cwd=ROOT)
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    profile: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            profile[name.strip()] = (int(self_us), int(cumulative_us))
+    heavy = result.stdout.strip().splitlines()[-1][len("HEAVY="):]
+    return profile, [name for name in heavy.split(",") if name]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CLI import time benchmark")
+    parser.add_argument("--module", default="video_ingest_tool.cli")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=800.0,
+                        help="Fail when the median cumulative import time exceeds this")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    totals: List[float] = []
+    profile: Dict[str, Tuple[int, int]] = {}
+    leaked: List[str] = []
+    for _ in range(args.runs):
+        profile, leaked = import_profile(args.module)
+        totals.append(profile[args.module][1] / 1000.0)
+    median_ms = statistics.median(totals)
+
+    slowest = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    print(f"{'module':<60}{'self ms':>10}{'cum ms':>10}")
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{name:<60}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+
+    print(f"\n{args.module}: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}), budget {args.budget_ms:.0f} ms, "
+          f"{len(profile)} modules")
+    if leaked:
+        print(f"Heavy modules imported at startup: {', '.join(leaked)}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"module": args.module, "runs": [round(t, 1) for t in totals],
+                       "median_ms": round(median_ms, 1), "budget_ms": args.budget_ms,
+                       "modules": len(profile), "heavy_modules": leaked,
+                       "slowest": [{"module": name, "self_ms": round(s / 1000, 1),
+                                    "cumulative_ms": round(c / 1000, 1)} for name, (s, c) in slowest]},
+                      f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+
+    if median_ms > args.budget_ms or leaked:
+        print("FAIL: import time regression")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Cost of the precomputed "find similar" neighbour graph.
+
+Fills a LocalVectorIndex with synthetic clustered summary vectors, builds the
+kNN graph with blocked matrix multiplies, then times:
+
+    - graph lookups (what find_similar does when the graph exists)
+    - the exact scan find_similar does without a graph
+    - incremental patches when clips are added or replaced
+
+    python benchmarks/knn_graph_bench.py --clips 20000 --dim 1024
+    python benchmarks/knn_graph_bench.py --clips 5000 --k 20 --json knn.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_ingest_tool.vector_index import LocalVectorIndex  # noqa: E402
+from local_index_bench import percentile, synthetic_vectors  # noqa: E402
+
+
+def timed(fn, repeat: int) -> List[float]:
+    latencies = []
+    for i in range(repeat):
+        t = time.perf_counter()
+        fn(i)
+        latencies.append((time.perf_counter() - t) * 1000.0)
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="kNN graph benchmark")
+    parser.add_argument("--clips", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--updates", type=int, default=20, help="Clips added and replaced incrementally")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="knn-graph-bench-"))
+    try:
+        index = LocalVectorIndex("bench", directory)
+        vectors = np.concatenate(list(synthetic_vectors(args.clips + args.updates * 2, args.dim,
+                                                        clusters=max(16, args.clips // 200), seed=0)))
+        start = time.perf_counter()
+        for i in range(args.clips):
+            index.upsert_clip(f"clip-{i}", {"summary": {0: vectors[i]}}, patch_graph=False)
+        load_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.build_neighbor_graph(args.k)
+        build_s = time.perf_counter() - start
+        print(f"{args.clips} clips x {args.dim}: load {load_s:.1f}s, graph build {build_s:.1f}s (k={args.k})")
+
+        rng = np.random.default_rng(1)
+        targets = [f"clip-{i}" for i in rng.integers(0, args.clips, args.lookups)]
+        graph_ms = timed(lambda i: index.neighbors(targets[i], 10), args.lookups)
+        scan_ms = timed(lambda i: index.search("summary", index.clip_vector("summary", targets[i]), 10,
+                                               exclude=[targets[i]]), min(args.lookups, 100))
+        add_ms = timed(lambda i: index.upsert_clip(f"new-{i}", {"summary": {0: vectors[args.clips + i]}}),
+                       args.updates)
+        replace_ms = timed(lambda i: index.upsert_clip(
+            targets[i], {"summary": {0: vectors[args.clips + args.updates + i]}}), args.updates)
+
+        results: Dict[str, Dict[str, float]] = {}
+        print(f"{'operation':>16}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, latencies in (("graph lookup", graph_ms), ("exact scan", scan_ms),
+                                ("add clip", add_ms), ("replace clip", replace_ms)):
+            results[name] = {"p50_ms": round(percentile(latencies, 50), 3),
+                             "p95_ms": round(percentile(latencies, 95), 3)}
+            print(f"{name:>16}{results[name]['p50_ms']:>10}{results[name]['p95_ms']:>10}")
+
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump({"clips": args.clips, "dim": args.dim, "k": args.k, "load_s": round(load_s, 2),
+                           "build_s": round(build_s, 2), "operations": results}, f, indent=2)
+            print(f"\nResults written to {args.json_path}")
+        index.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Latency and recall of the local IVF vector index.
+
+Builds a VectorField from synthetic clustered unit vectors (float16 on disk),
+reclusters it, then times top-k queries and measures recall@k against an
+exact scan of the same data:
+
+    python benchmarks/local_index_bench.py --vectors 1000000 --dim 1024
+    python benchmarks/local_index_bench.py --vectors 200000 --nprobe 8 --nprobe 16 --json index.json
+
+The index directory is a temporary one unless --dir is given (1M x 1024
+float16 needs about 2 GB of disk).
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_ingest_tool.vector_index import VectorField  # noqa: E402
+
+
+def percentile(values: List[float], pct: float) -> float:
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int, seed: int, chunk: int = 100_000):
+    """Yield chunks of unit vectors drawn around `clusters` random topic centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    for start in range(0, count, chunk):
+        n = min(chunk, count - start)
+        block = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        yield block
+
+
+def exact_top_k(field: VectorField, query: np.ndarray, k: int) -> np.ndarray:
+    scores = np.concatenate([
+        np.asarray(field.vectors[s:min(field.count, s + 65_536)], dtype=np.float32) @ query
+        for s in range(0, field.count, 65_536)
+    ])
+    return np.argpartition(scores, -k)[-k:]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local vector index benchmark")
+    parser.add_argument("--vectors", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--recall-queries", type=int, default=50, help="Queries checked against an exact scan")
+    parser.add_argument("--nprobe", type=int, action="append", help="IVF lists to probe (repeatable)")
+    parser.add_argument("--dir", help="Index directory (default: temporary)")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+    nprobes = args.nprobe or [8, 12, 24]
+
+    tmp = None
+    directory = Path(args.dir) if args.dir else Path(tmp := tempfile.mkdtemp(prefix="vector-index-bench-"))
+    directory.mkdir(parents=True, exist_ok=True)
+    field = VectorField(directory, "bench")
+
+    start = time.perf_counter()
+    for block in synthetic_vectors(args.vectors, args.dim, clusters=max(64, args.vectors // 2000), seed=0):
+        field.append(block)
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    field.rebuild()
+    train_s = time.perf_counter() - start
+    print(f"{field.count} x {args.dim} vectors: append {build_s:.1f}s, rebuild {train_s:.1f}s, "
+          f"{len(field.centroids) if field.centroids is not None else 0} lists")
+
+    queries = next(synthetic_vectors(args.queries, args.dim, clusters=max(64, args.vectors // 2000), seed=0))
+    queries = queries + 0.05 * np.random.default_rng(1).standard_normal(queries.shape).astype(np.float32)
+    truth = [set(exact_top_k(field, q, args.k).tolist()) for q in queries[:args.recall_queries]]
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'nprobe':>8}{'p50 ms':>10}{'p99 ms':>10}{'recall@' + str(args.k):>12}")
+    for nprobe in nprobes:
+        field.search(queries[0], args.k, nprobe)  # warm up
+        latencies = []
+        for q in queries:
+            t = time.perf_counter()
+            field.search(q, args.k, nprobe)
+            latencies.append((time.perf_counter() - t) * 1000.0)
+        recall = np.mean([
+            len(truth[i] & set(field.search(q, args.k, nprobe)[0].tolist())) / args.k
+            for i, q in enumerate(queries[:args.recall_queries])
+        ])
+        results[str(nprobe)] = {"p50_ms": round(percentile(latencies, 50), 3),
+                                "p99_ms": round(percentile(latencies, 99), 3),
+                                "recall": round(float(recall), 4)}
+        print(f"{nprobe:>8}{results[str(nprobe)]['p50_ms']:>10}{results[str(nprobe)]['p99_ms']:>10}"
+              f"{results[str(nprobe)]['recall']:>12}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"vectors": field.count, "dim": args.dim, "k": args.k, "append_s": round(build_s, 2),
+                       "rebuild_s": round(train_s, 2), "nprobe": results}, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+
+    if tmp:
+        import shutil
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
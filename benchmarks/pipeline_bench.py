@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+End-to-end ingest pipeline benchmark on synthetic media.
+
+Renders a suite of deterministic clips (synthetic_media.py), starts local
+stand-ins for Supabase, Gemini, the text embedding API and the SigLIP server
+(service_stubs.py, siglip_stub_server.py), points the tool at them through
+its environment variables and a throwaway HOME, then runs process_video_file
+on every clip several times. Each run records every step's wall/CPU time,
+bytes read and written and RSS delta (pipeline RunMetrics) plus the total
+time. The stand-ins are reset between runs, so every run takes the
+first-ingest path.
+
+The JSON report is keyed by clip and step. Pass an earlier report with
+--compare to print per-step p50 changes; the exit status is 1 when any step
+got slower than --threshold percent:
+
+    python benchmarks/pipeline_bench.py --suite quick --json before.json
+    git checkout my-branch
+    python benchmarks/pipeline_bench.py --suite quick --json after.json --compare before.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from service_stubs import EmbeddingStub, GeminiStub, SupabaseStub  # noqa: E402
+from siglip_stub_server import start_stub_server  # noqa: E402
+from synthetic_media import SUITES, ffmpeg_version, render_suite  # noqa: E402
+
+# Steps off by default that the stand-ins make runnable
+ENABLE_BY_DEFAULT = ["ai_video_analysis", "video_compression"]
+# Needs a Hugging Face model download, which would measure the network
+DISABLE_BY_DEFAULT = ["ai_focal_length"]
+
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def start_services(latency_ms: float, gemini_ms: float, work_dir: str) -> Dict[str, Any]:
+    """Start the stand-ins and point the tool's environment at them."""
+    supabase = SupabaseStub(latency_ms=latency_ms).start()
+    gemini = GeminiStub(latency_ms=latency_ms, per_request_ms=gemini_ms).start()
+    embedding = EmbeddingStub(latency_ms=latency_ms).start()
+    siglip = start_stub_server(latency_ms=latency_ms)
+
+    # Settings are read at import time, so this has to happen before video_ingest_tool is imported
+    home = os.path.join(work_dir, "home")
+    os.makedirs(home)
+    with open(os.path.join(home, ".video_ingest_auth.json"), "w") as f:
+        json.dump(supabase.auth_file_contents(), f)
+    os.environ.update({
+        "HOME": home,
+        "SUPABASE_URL": supabase.url,
+        "SUPABASE_ANON_KEY": "bench-anon-key",
+        "GEMINI_API_KEY": "bench-gemini-key",
+        "GEMINI_API_BASE": gemini.url,
+        "DEEPINFRA_API_KEY": "bench-embedding-key",
+        "EMBEDDING_API_BASE": f"{embedding.url}/v1/openai",
+        "IMAGE_EMBEDDING_API_BASE": siglip.url,
+        "IMAGE_EMBEDDING_BACKENDS": "remote",
+    })
+    return {"supabase": supabase, "gemini": gemini, "embedding": embedding, "siglip": siglip}
+
+
+def summarize_clip(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-step and total statistics over the measured runs of one clip."""
+    # Same interpolation as the ingest metrics.json summaries; imported here
+    # because video_ingest_tool must not load before start_services() runs
+    from video_ingest_tool.pipeline.metrics import percentile
+
+    totals = [run["total_s"] for run in runs]
+    by_step: Dict[str, List[Dict[str, Any]]] = {}
+    for run in runs:
+        for entry in run["steps"]:
+            by_step.setdefault(entry["step"], []).append(entry)
+    steps = {}
+    for step, entries in by_step.items():
+        walls = [e["wall_s"] for e in entries]
+        cpus = [e["cpu_s"] for e in entries]
+        steps[step] = {
+            "runs": len(entries),
+            "errors": sorted({e["error"] for e in entries if e.get("error")}),
+            "wall_s_p50": round(percentile(walls, 50), 6),
+            "wall_s_p95": round(percentile(walls, 95), 6),
+            "wall_s_min": round(min(walls), 6),
+            "cpu_s_p50": round(percentile(cpus, 50), 6),
+            "read_bytes_p50": int(percentile([e["read_bytes"] for e in entries], 50)),
+            "write_bytes_p50": int(percentile([e["write_bytes"] for e in entries], 50)),
+            "rss_delta_p50": int(percentile([e["rss_delta"] for e in entries], 50)),
+        }
+    return {
+        "total_s_p50": round(percentile(totals, 50), 6),
+        "total_s_p95": round(percentile(totals, 95), 6),
+        "total_s_min": round(min(totals), 6),
+        "total_s_stdev": round(statistics.pstdev(totals), 6),
+        "runs": [round(t, 6) for t in totals],
+        "steps": steps,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print p50 changes against a baseline report; returns the number of regressions."""
+    regressions = 0
+    print(f"\nCompared with {baseline.get('git', {}).get('commit') or 'baseline'} "
+          f"(regression threshold {threshold:.0f}%)")
+    print(f"{'clip':<28}{'step':<26}{'before':>10}{'after':>10}{'change':>9}")
+    for clip, result in report["results"].items():
+        before_clip = baseline.get("results", {}).get(clip)
+        if not before_clip:
+            continue
+        if baseline["clips"].get(clip, {}).get("sha256") != report["clips"][clip]["sha256"]:
+            print(f"{clip:<28}{'(input differs from baseline)':<26}")
+        rows = [("TOTAL", before_clip["total_s_p50"], result["total_s_p50"])]
+        rows += [(step, before_clip["steps"][step]["wall_s_p50"], stats["wall_s_p50"])
+                 for step, stats in result["steps"].items() if step in before_clip["steps"]]
+        for step, before, after in rows:
+            change = (after - before) / before * 100.0 if before > 0 else 0.0
+            # Ignore sub-10ms steps: their percentage swings are timer noise
+            regressed = change > threshold and after - before > 0.01
+            regressions += regressed
+            marker = "  <-- slower" if regressed else ""
+            print(f"{clip:<28}{step:<26}{before:>10.3f}{after:>10.3f}{change:>8.1f}%{marker}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest pipeline benchmark on synthetic media")
+    parser.add_argument("--suite", default="quick", choices=sorted(SUITES))
+    parser.add_argument("--clip", action="append", help="Only benchmark these clips of the suite (repeatable)")
+    parser.add_argument("--media-dir", default=os.path.join(tempfile.gettempdir(), "ait-bench-media"),
+                        help="Cache directory for rendered clips")
+    parser.add_argument("--repeats", type=int, default=3, help="Measured runs per clip")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="Unmeasured runs first (step modules are imported on first use)")
+    parser.add_argument("--enable", action="append", default=[], help="Extra steps to enable (repeatable)")
+    parser.add_argument("--disable", action="append", default=[], help="Steps to disable (repeatable)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added to every stand-in request")
+    parser.add_argument("--gemini-ms", type=float, default=0.0, help="Simulated model time per Gemini request")
+    parser.add_argument("--json", dest="json_path", help="Write the machine-readable report to this file")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Percent slowdown counted as a regression")
+    args = parser.parse_args()
+
+    if not ffmpeg_version():
+        print("ffmpeg and ffprobe are required", file=sys.stderr)
+        return 1
+
+    clips = render_suite(args.suite, args.media_dir, args.clip)
+    print(f"{len(clips)} clips from suite '{args.suite}' in {args.media_dir}")
+
+    work_dir = tempfile.mkdtemp(prefix="pipeline-bench-")
+    services = start_services(args.latency_ms, args.gemini_ms, work_dir)
+    try:
+        import logging
+
+        import structlog
+
+        from video_ingest_tool.config.settings import get_default_pipeline_config
+        from video_ingest_tool.pipeline import RunMetrics
+        from video_ingest_tool.steps import process_video_file
+
+        # Step logging would dominate the shorter steps
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+        logger = structlog.get_logger("pipeline_bench")
+
+        config = get_default_pipeline_config()
+        for step in ENABLE_BY_DEFAULT + args.enable:
+            config[step] = True
+        for step in DISABLE_BY_DEFAULT + args.disable:
+            if step not in args.enable:
+                config[step] = False
+
+        results: Dict[str, Any] = {}
+        for clip in clips:
+            runs = []
+            for attempt in range(args.warmup + args.repeats):
+                services["supabase"].reset()
+                thumbnails_dir = tempfile.mkdtemp(prefix="thumbs-", dir=work_dir)
+                metrics = RunMetrics(run_id=f"{clip['name']}-{attempt}")
+                start = time.perf_counter()
+                error = None
+                try:
+                    process_video_file(clip["path"], thumbnails_dir, logger, config=config, metrics=metrics)
+                except Exception as e:
+                    error = str(e)
+                total = time.perf_counter() - start
+                shutil.rmtree(thumbnails_dir, ignore_errors=True)
+                if attempt >= args.warmup:
+                    runs.append({"total_s": total, "error": error, "steps": metrics.file_metrics(clip["path"])})
+            results[clip["name"]] = summarize_clip(runs)
+            results[clip["name"]]["errors"] = sorted({r["error"] for r in runs if r["error"]})
+            print(f"  {clip['name']:<28} p50 {results[clip['name']]['total_s_p50']:7.2f}s  "
+                  f"({len(results[clip['name']]['steps'])} steps)")
+    finally:
+        for server in services.values():
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    step_names = list(dict.fromkeys(step for r in results.values() for step in r["steps"]))
+    print(f"\n{'step':<26}" + "".join(f"{name[:16]:>18}" for name in results))
+    for step in step_names + ["TOTAL"]:
+        cells = []
+        for result in results.values():
+            if step == "TOTAL":
+                cells.append(f"{result['total_s_p50']:>17.3f}s")
+            elif step in result["steps"]:
+                stats = result["steps"][step]
+                cells.append(f"{stats['wall_s_p50']:>17.3f}{'!' if stats['errors'] else 's'}")
+            else:
+                cells.append(f"{'-':>18}")
+        print(f"{step:<26}" + "".join(cells))
+    failing = {f"{clip}/{step}": stats["errors"] for clip, r in results.items()
+               for step, stats in r["steps"].items() if stats["errors"]}
+    if failing:
+        print("\nSteps that raised (marked !):")
+        for name, errors in failing.items():
+            print(f"  {name}: {errors[0][:120]}")
+
+    report = {
+        "schema": 1,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git": git_revision(),
+        "host": {"python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "ffmpeg": ffmpeg_version()},
+        "settings": {"suite": args.suite, "repeats": args.repeats, "warmup": args.warmup,
+                     "latency_ms": args.latency_ms, "gemini_ms": args.gemini_ms,
+                     "steps": {name: enabled for name, enabled in sorted(config.items())}},
+        "clips": {clip["name"]: {"sha256": clip["sha256"], "bytes": clip["bytes"], "spec": clip["spec"]}
+                  for clip in clips},
+        "results": results,
+    }
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json_path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{regressions} regression(s) over {args.threshold:.0f}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
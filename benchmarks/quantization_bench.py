@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Speed, recall and size of quantized candidate retrieval in the local vector index.
+
+Loads vectors into a VectorField, then for each quantization mode (none,
+binary, int8) and re-rank depth measures query latency, recall@k against an
+exact float scan, and the bytes stored per vector. Vectors are synthetic
+unit vectors drawn around topic centres, or copied from your own local
+mirror with --user so the numbers reflect the real catalogue.
+
+    python benchmarks/quantization_bench.py --vectors 200000 --dim 1024
+    python benchmarks/quantization_bench.py --user <user-id> --field summary --json quant.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_ingest_tool.vector_index import QUANTIZATION_MODES, VectorField  # noqa: E402
+from local_index_bench import exact_top_k, percentile, synthetic_vectors  # noqa: E402
+
+
+def load_catalog(field: VectorField, user_id: str, name: str) -> None:
+    """Copy the live vectors of one field of a user's local mirror into the benchmark field."""
+    from video_ingest_tool.vector_index import LocalVectorIndex
+
+    if not LocalVectorIndex.exists(user_id):
+        raise SystemExit(f"No local vector index for {user_id}; run 'ait index sync' first")
+    source = LocalVectorIndex(user_id, quantization=None).fields[name]
+    if not source.count:
+        raise SystemExit(f"Field '{name}' of the local index is empty")
+    for s in range(0, source.count, 65_536):
+        e = min(source.count, s + 65_536)
+        live = np.asarray(source.alive[s:e], dtype=bool)
+        field.append(np.asarray(source.vectors[s:e], dtype=np.float32)[live])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Quantized vector index benchmark")
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--user", help="Benchmark the vectors of this user's local mirror instead of synthetic ones")
+    parser.add_argument("--field", default="summary", help="Mirror field used with --user")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--rerank", type=int, action="append", help="Re-rank depths to try (repeatable)")
+    parser.add_argument("--ivf", action="store_true", help="Cluster the field first and probe IVF lists")
+    parser.add_argument("--json", dest="json_path", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+    reranks = args.rerank or [50, 200, 1000]
+
+    directory = Path(tempfile.mkdtemp(prefix="quantization-bench-"))
+    try:
+        field = VectorField(directory, "bench")
+        if args.user:
+            load_catalog(field, args.user, args.field)
+        else:
+            for block in synthetic_vectors(args.vectors, args.dim, clusters=max(64, args.vectors // 2000), seed=0):
+                field.append(block)
+        if args.ivf:
+            field.rebuild()
+        print(f"{field.count} x {field.dim} vectors{' (IVF)' if args.ivf else ' (full scan)'}")
+
+        rng = np.random.default_rng(1)
+        picks = rng.integers(0, field.count, args.queries)
+        queries = np.asarray(field.vectors[np.sort(picks)], dtype=np.float32)
+        queries += 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        truth = [set(exact_top_k(field, q, args.k).tolist()) for q in queries]
+
+        results: List[Dict[str, float]] = []
+        print(f"{'mode':>8}{'rerank':>8}{'p50 ms':>10}{'p99 ms':>10}{'recall@' + str(args.k):>12}{'bytes/vec':>11}")
+        for mode in QUANTIZATION_MODES:
+            start = time.perf_counter()
+            field.set_quantization(mode)
+            encode_s = time.perf_counter() - start
+            # Bytes a query reads per vector in the first stage
+            scanned = {"none": 2 * field.dim, "int8": field.dim + 4, "binary": (field.dim + 7) // 8}[mode]
+            stored = sum(field.memory_bytes().values()) / max(1, field.count)
+            for rerank in ([0] if mode == "none" else reranks):
+                field.search(queries[0], args.k, rerank=rerank)  # warm up
+                latencies = []
+                hits = 0
+                for i, q in enumerate(queries):
+                    t = time.perf_counter()
+                    rows, _ = field.search(q, args.k, rerank=rerank)
+                    latencies.append((time.perf_counter() - t) * 1000.0)
+                    hits += len(truth[i] & set(rows.tolist()))
+                row = {"mode": mode, "rerank": rerank, "p50_ms": round(percentile(latencies, 50), 3),
+                       "p99_ms": round(percentile(latencies, 99), 3),
+                       "recall": round(hits / (args.k * len(queries)), 4),
+                       "scanned_bytes_per_vector": scanned, "stored_bytes_per_vector": round(stored, 1),
+                       "encode_s": round(encode_s, 2)}
+                results.append(row)
+                print(f"{mode:>8}{rerank or '-':>8}{row['p50_ms']:>10}{row['p99_ms']:>10}"
+                      f"{row['recall']:>12}{scanned:>11}")
+
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump({"vectors": field.count, "dim": field.dim, "k": args.k, "ivf": args.ivf,
+                           "source": f"user:{args.field}" if args.user else "synthetic",
+                           "results": results}, f, indent=2)
+            print(f"\nResults written to {args.json_path}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
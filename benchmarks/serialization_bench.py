@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Serialization cost of analysis-heavy VideoIngestOutput models.
+
+Builds models shaped like a long interview clip after full Gemini analysis
+(hundreds of transcript segments, shot list, entities, keyframes) and times
+everything the ingest path serializes per clip:
+
+    legacy  - what ingest did before serialization.py: model_dump() +
+              json.dumps(indent=2, default=str) for the per-file JSON and
+              again for the run summary, model_dump() of each metadata
+              subtree for the clips row and of the AI analysis twice (analysis
+              row and local text index).
+    cached  - one SerializedOutput per clip: model_dump_json() bytes shared
+              by the per-file JSON and the run JSONL, one
+              model_dump(mode="json") shared by the database payloads.
+
+Both paths also JSON-encode the database payloads the way the HTTP client
+does, so the numbers cover the request bodies too.
+
+    python benchmarks/serialization_bench.py
+    python benchmarks/serialization_bench.py --segments 1500 --shots 300 --clips 50 --json serialization.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from video_ingest_tool.models import VideoIngestOutput  # noqa: E402
+from video_ingest_tool.serialization import SerializedOutput, orjson  # noqa: E402
+
+WORDS = ("camera light interview story city morning people talk river studio archive "
+         "sound design music frame colour editor timeline moment question answer").split()
+
+
+def _sentence(i: int, length: int) -> str:
+    return " ".join(WORDS[(i * 7 + k * 3) % len(WORDS)] for k in range(length)).capitalize() + "."
+
+
+def analysis_heavy_model(seed: int, segments: int, shots: int) -> VideoIngestOutput:
+    """A VideoIngestOutput with a full, large AI analysis."""
+    transcript = [{"timestamp": f"{i * 4}s0ms", "speaker": f"Speaker {i % 3 + 1}",
+                   "text": _sentence(seed + i, 24), "confidence": 0.93} for i in range(segments)]
+    analysis = {
+        "summary": {"overall": _sentence(seed, 60), "key_activities": [_sentence(seed + i, 5) for i in range(8)],
+                    "content_category": "Interview", "condensed_summary": _sentence(seed, 12)},
+        "visual_analysis": {
+            "shot_types": [{"timestamp": f"{i * 6}s0ms", "duration_seconds": 6.0,
+                            "shot_attributes_ordered": ["Medium Shot", "Static", "Eye Level", "Interview"],
+                            "description": _sentence(seed + i, 14), "confidence": 0.88} for i in range(shots)],
+            "technical_quality": {"overall_focus_quality": "Good", "stability_assessment": "Stable",
+                                  "detected_artifacts": [{"type": "noise", "severity": "low"}], "usability_rating": "Good"},
+            "text_and_graphics": {"detected_text": [{"timestamp": f"{i}s0ms", "text_content": _sentence(i, 4),
+                                                     "text_type": "Lower Third", "readability": "High"}
+                                                    for i in range(20)],
+                                  "detected_logos_icons": []},
+            "keyframe_analysis": {"recommended_keyframes": [
+                {"timestamp": f"{i * 30}s0ms", "reason": _sentence(seed + i, 10), "visual_quality": "Good"}
+                for i in range(20)]},
+        },
+        "audio_analysis": {
+            "transcript": {"full_text": " ".join(s["text"] for s in transcript), "segments": transcript},
+            "speaker_analysis": {"speaker_count": 3, "speakers": [
+                {"speaker_id": f"Speaker {i + 1}", "speaking_time_seconds": 300.0, "segments_count": segments // 3}
+                for i in range(3)]},
+            "sound_events": [{"timestamp": f"{i * 20}s0ms", "event_type": "Music", "description": _sentence(i, 6),
+                              "duration_seconds": 4.0, "prominence": "Low"} for i in range(40)],
+            "audio_quality": {"clarity": "Good", "background_noise_level": "Low", "dialogue_intelligibility": "Clear"},
+        },
+        "content_analysis": {
+            "entities": {
+                "people_count": 3,
+                "people_details": [{"description": _sentence(i, 12), "role": "Interviewee",
+                                    "visibility_duration": "10m"} for i in range(3)],
+                "locations": [{"name": f"Location {i}", "type": "Indoor", "description": _sentence(i, 10)}
+                              for i in range(10)],
+                "objects_of_interest": [{"object": WORDS[i % len(WORDS)], "significance": "Background",
+                                         "timestamp": f"{i}s0ms"} for i in range(30)],
+            },
+            "activity_summary": [{"activity": _sentence(i, 6), "timestamp": f"{i * 10}s0ms", "duration": "10s",
+                                  "importance": "Medium"} for i in range(40)],
+            "content_warnings": [],
+            "ai_thumbnail_selection": {"selected_thumbnails": [
+                {"timestamp": f"{i * 60}s0ms", "description": _sentence(i, 12), "reason": _sentence(i, 8),
+                 "rank": str(i + 1)} for i in range(3)]},
+        },
+    }
+    return VideoIngestOutput.model_validate({
+        "file_info": {"file_path": f"/media/interviews/clip_{seed:04d}.mov", "file_name": f"clip_{seed:04d}.mov",
+                      "file_checksum": f"{seed:032x}", "file_size_bytes": 4_000_000_000,
+                      "created_at": "2024-05-04T12:34:56"},
+        "video": {"duration_seconds": 1800.0, "codec": {"name": "prores", "profile": "HQ", "bit_depth": 10},
+                  "resolution": {"width": 3840, "height": 2160}, "frame_rate": 25.0,
+                  "color": {"color_primaries": "bt709", "hdr": {"is_hdr": False}}, "exposure": {}},
+        "audio_tracks": [{"track_id": str(i), "codec": "pcm_s24le", "channels": 2} for i in range(4)],
+        "camera": {"make": "BenchCam", "model": "BC-1", "focal_length": {"value_mm": 35.0},
+                   "settings": {"iso": 800}, "location": {}},
+        "thumbnails": [f"/thumbs/clip_{seed:04d}_{i}.jpg" for i in range(5)],
+        "analysis": {"content_tags": ["Interview", "speakers:3"], "content_summary": _sentence(seed, 40),
+                     "ai_analysis": analysis},
+    })
+
+
+def legacy_path(model: VideoIngestOutput) -> int:
+    """Per-clip serialization before serialization.py; returns bytes produced."""
+    produced = 0
+    # Per-file JSON, then the same model again inside the run summary list
+    for _ in range(2):
+        produced += len(json.dumps(model.model_dump(), indent=2, default=str))
+    # clips row subtrees, analysis row, local text index mirror
+    row = {
+        "technical_metadata": {"codec_details": model.video.codec.model_dump(),
+                               "color_details": model.video.color.model_dump(),
+                               "exposure_details": model.video.exposure.model_dump()},
+        "camera_details": model.camera.model_dump(),
+        "audio_tracks": [track.model_dump() for track in model.audio_tracks],
+        "subtitle_tracks": [track.model_dump() for track in model.subtitle_tracks],
+    }
+    analysis_row = {"ai_analysis": model.analysis.ai_analysis.model_dump()}
+    # The text index mirror got its own dump of the analysis (it is not encoded whole)
+    model.analysis.ai_analysis.model_dump()
+    return produced + len(json.dumps(row, default=str)) + len(json.dumps(analysis_row, default=str))
+
+
+def cached_path(model: VideoIngestOutput) -> int:
+    """Per-clip serialization through one SerializedOutput; returns bytes produced."""
+    output = SerializedOutput(model)
+    # Per-file JSON and the run JSONL line share the same bytes
+    produced = 2 * len(output.json)
+    payload = output.data
+    row = {
+        "technical_metadata": {"codec_details": payload["video"]["codec"],
+                               "color_details": payload["video"]["color"],
+                               "exposure_details": payload["video"]["exposure"]},
+        "camera_details": payload["camera"],
+        "audio_tracks": payload["audio_tracks"],
+        "subtitle_tracks": payload["subtitle_tracks"],
+    }
+    analysis_row = {"ai_analysis": payload["analysis"]["ai_analysis"]}
+    produced += len(json.dumps(row)) + len(json.dumps(analysis_row))
+    # The text index mirror reuses the same analysis dict without encoding it
+    return produced
+
+
+def time_path(path: Callable[[VideoIngestOutput], int], models: List[VideoIngestOutput],
+              repeats: int) -> Dict[str, Any]:
+    per_clip = []
+    produced = 0
+    for _ in range(repeats):
+        for model in models:
+            start = time.perf_counter()
+            produced = path(model)
+            per_clip.append(time.perf_counter() - start)
+    ordered = sorted(per_clip)
+    return {
+        "p50_ms": round(statistics.median(per_clip) * 1000, 3),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 3),
+        "mean_ms": round(statistics.mean(per_clip) * 1000, 3),
+        "bytes_per_clip": produced,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="VideoIngestOutput serialization benchmark")
+    parser.add_argument("--clips", type=int, default=20, help="Distinct models")
+    parser.add_argument("--segments", type=int, default=600, help="Transcript segments per clip")
+    parser.add_argument("--shots", type=int, default=150, help="Shot list entries per clip")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args()
+
+    models = [analysis_heavy_model(seed, args.segments, args.shots) for seed in range(args.clips)]
+    size = len(models[0].model_dump_json())
+    print(f"{args.clips} clips, {args.segments} transcript segments, {args.shots} shots, "
+          f"{size / 1024:.0f} KB of compact JSON each (orjson {'available' if orjson else 'not installed'})")
+
+    # Warm pydantic-core's serializers and the allocator before measuring
+    legacy_path(models[0])
+    cached_path(models[0])
+    results = {"legacy": time_path(legacy_path, models, args.repeats),
+               "cached": time_path(cached_path, models, args.repeats)}
+    speedup = results["legacy"]["p50_ms"] / results["cached"]["p50_ms"]
+
+    print(f"{'path':<8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'bytes/clip':>14}")
+    for name, stats in results.items():
+        print(f"{name:<8}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['mean_ms']:>10.2f}"
+              f"{stats['bytes_per_clip']:>14,}")
+    print(f"\ncached path is {speedup:.1f}x faster per clip")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"settings": vars(args), "model_json_bytes": size, "results": results,
+                       "speedup_p50": round(speedup, 2)}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the remote services the ingest pipeline talks to.
+
+    SupabaseStub   PostgREST tables, Storage objects and the Auth endpoints
+                   supabase-py uses, backed by in-memory dicts
+    GeminiStub     generateContent, answering with a canned structured analysis
+    EmbeddingStub  OpenAI-compatible /embeddings for the text embedding model
+
+The SigLIP image embedding server has its own stand-in in
+siglip_stub_server.py. All servers answer deterministically and can add a
+fixed latency per request (``latency_ms``) so benchmarks can model network
+cost without depending on it. They implement only what the pipeline calls,
+not the full APIs.
+
+    python benchmarks/service_stubs.py            # run all three until Ctrl-C
+"""
+
+import argparse
+import base64
+import datetime
+import hashlib
+import json
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+
+STUB_USER_ID = "00000000-0000-4000-8000-000000000001"
+STUB_EMAIL = "bench@example.com"
+
+
+def _now_iso() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def fake_jwt(user_id: str = STUB_USER_ID, lifetime: int = 30 * 86400) -> str:
+    """An unsigned-looking JWT that supabase-py accepts as a live access token."""
+    def part(payload: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=").decode()
+    claims = {"sub": user_id, "aud": "authenticated", "role": "authenticated", "email": STUB_EMAIL,
+              "exp": int(time.time()) + lifetime, "iat": int(time.time())}
+    return f"{part({'alg': 'HS256', 'typ': 'JWT'})}.{part(claims)}.{part({'sig': 'stub'})}"
+
+
+def fake_vector(text: str, dim: int) -> List[float]:
+    """Deterministic unit vector for a string."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request plumbing shared by the stand-ins."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    server: "StubServer"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+
+    def _json_body(self) -> Any:
+        body = self._body()
+        return json.loads(body) if body else None
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, json.dumps(payload, default=str).encode("utf-8"), headers=headers)
+
+    def _dispatch(self, method: str) -> None:
+        self.server.count_request()
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000.0)
+        try:
+            self.handle_request(method, urlsplit(self.path))
+        except Exception as e:  # surface stub bugs as 500s instead of dropped connections
+            self._send_json(500, {"message": f"stub error: {e}"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def do_HEAD(self):
+        self._dispatch("HEAD")
+
+    def handle_request(self, method: str, url) -> None:
+        raise NotImplementedError
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 verbose: bool = False):
+        super().__init__((host, port), handler)
+        self.latency_ms = latency_ms
+        self.verbose = verbose
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "StubServer":
+        """Serve on a background thread."""
+        threading.Thread(target=self.serve_forever, name=type(self).__name__, daemon=True).start()
+        return self
+
+
+# --- Supabase -------------------------------------------------------------------------------
+
+def _coerce(value: str) -> Any:
+    """Best-effort typing of a PostgREST filter literal."""
+    if value == "null":
+        return None
+    if value in ("true", "false"):
+        return value == "true"
+    return value
+
+
+def _literal(value: Any) -> str:
+    """A stored value as PostgREST spells it in a filter."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    """Evaluate one PostgREST filter (``col=op.value``) against a row."""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, raw = expression.partition(".")
+    current = row.get(column)
+    if op == "eq":
+        result = _literal(current) == raw if current is not None else False
+    elif op == "neq":
+        result = _literal(current) != raw
+    elif op == "is":
+        result = current is _coerce(raw) if raw in ("null", "true", "false") else False
+    elif op == "in":
+        options = [v.strip().strip('"') for v in raw.strip("()").split(",") if v.strip()]
+        result = _literal(current) in options
+    elif op in ("gt", "gte", "lt", "lte"):
+        if current is None:
+            result = False
+        else:
+            try:
+                left, right = float(current), float(raw)
+            except (TypeError, ValueError):
+                left, right = str(current), raw
+            result = {"gt": left > right, "gte": left >= right, "lt": left < right, "lte": left <= right}[op]
+    elif op in ("like", "ilike"):
+        pattern = raw.replace("*", "%")
+        text, needle = str(current or ""), pattern.strip("%")
+        if op == "ilike":
+            text, needle = text.lower(), needle.lower()
+        result = needle in text
+    else:
+        result = True  # unsupported operators don't filter
+    return not result if negate else result
+
+
+def _project(row: Dict[str, Any], select: str) -> Dict[str, Any]:
+    """Apply a ``select`` list; embedded resources and casts are ignored."""
+    if not select or select.strip() == "*":
+        return dict(row)
+    columns = []
+    depth = 0
+    current = ""
+    for char in select:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            columns.append(current.strip())
+            current = ""
+            continue
+        if depth == 0 and char not in "()":
+            current += char
+    columns.append(current.strip())
+    projected = {}
+    for column in columns:
+        if column == "*":
+            projected.update(row)
+            continue
+        if not column:
+            continue
+        name = column.split("::")[0].split(":")[-1]
+        if name == "count":
+            continue
+        projected[name] = row.get(name)
+    return projected
+
+
+class SupabaseHandler(StubHandler):
+    server: "SupabaseStub"
+
+    def handle_request(self, method: str, url) -> None:
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        if parts[:2] == ["rest", "v1"]:
+            self._rest(method, parts[2:], parse_qsl(url.query, keep_blank_values=True))
+        elif parts[:2] == ["storage", "v1"]:
+            self._storage(method, parts[2:])
+        elif parts[:2] == ["auth", "v1"]:
+            self._auth(method, parts[2:], dict(parse_qsl(url.query)))
+        else:
+            self._send_json(404, {"message": f"no stub for {url.path}"})
+
+    # PostgREST
+    def _rest(self, method: str, parts: List[str], query: List[Tuple[str, str]]) -> None:
+        if not parts:
+            self._send_json(200, {})
+            return
+        if parts[0] == "rpc":
+            self._body()
+            self._send_json(200, self.server.rpc(parts[1] if len(parts) > 1 else ""))
+            return
+
+        table = parts[0]
+        params = {"select": "*", "order": None, "limit": None, "offset": None, "on_conflict": None, "columns": None}
+        filters: List[Tuple[str, str]] = []
+        for key, value in query:
+            if key in params:
+                params[key] = value
+            else:
+                filters.append((key, value))
+        prefer = self.headers.get("Prefer", "")
+        single = "vnd.pgrst.object" in self.headers.get("Accept", "")
+
+        with self.server.lock:
+            rows = self.server.tables.setdefault(table, [])
+            if method in ("GET", "HEAD"):
+                result = [r for r in rows if all(_matches(r, c, e) for c, e in filters)]
+                if params["order"]:
+                    for clause in reversed(params["order"].split(",")):
+                        column, *flags = clause.split(".")
+                        result.sort(key=lambda r: (r.get(column) is None, str(r.get(column))),
+                                    reverse="desc" in flags)
+                total = len(result)
+                offset = int(params["offset"] or 0)
+                result = result[offset:offset + int(params["limit"])] if params["limit"] else result[offset:]
+                payload = [_project(r, params["select"]) for r in result]
+            elif method == "POST":
+                body = self._json_body()
+                incoming = body if isinstance(body, list) else [body]
+                keys = (params["on_conflict"] or "id").split(",")
+                merge = "resolution=merge-duplicates" in prefer
+                payload = []
+                for item in incoming:
+                    existing = None
+                    if merge:
+                        existing = next((r for r in rows if all(str(r.get(k)) == str(item.get(k)) for k in keys)), None)
+                    if existing is not None:
+                        existing.update(item)
+                        existing["updated_at"] = _now_iso()
+                        payload.append(dict(existing))
+                    else:
+                        row = {"id": str(uuid.uuid4()), "created_at": _now_iso(), "updated_at": _now_iso(), **item}
+                        rows.append(row)
+                        payload.append(dict(row))
+                total = len(payload)
+                payload = [_project(r, params["select"]) for r in payload]
+            elif method == "PATCH":
+                changes = self._json_body() or {}
+                payload = []
+                for row in rows:
+                    if all(_matches(row, c, e) for c, e in filters):
+                        row.update(changes)
+                        row["updated_at"] = _now_iso()
+                        payload.append(_project(row, params["select"]))
+                total = len(payload)
+            elif method == "DELETE":
+                payload = [dict(r) for r in rows if all(_matches(r, c, e) for c, e in filters)]
+                self.server.tables[table] = [r for r in rows if not all(_matches(r, c, e) for c, e in filters)]
+                total = len(payload)
+            else:
+                self._send_json(405, {"message": method})
+                return
+
+        headers = {"Content-Range": f"0-{max(0, len(payload) - 1)}/{total}"}
+        if method != "GET" and "return=minimal" in prefer:
+            self._send(204 if method != "POST" else 201, b"", headers=headers)
+        elif single:
+            if len(payload) != 1:
+                self._send_json(406, {"code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned"})
+            else:
+                self._send_json(200, payload[0], headers=headers)
+        else:
+            self._send_json(201 if method == "POST" else 200, payload, headers=headers)
+
+    # Storage
+    def _storage(self, method: str, parts: List[str]) -> None:
+        if parts[:1] != ["object"]:
+            self._send_json(200, [] if method == "GET" else {})
+            return
+        parts = parts[1:]
+        if parts[:1] == ["list"] and method == "POST":
+            bucket = parts[1]
+            prefix = ((self._json_body() or {}).get("prefix") or "").strip("/")
+            with self.server.lock:
+                names = [key[len(prefix):].lstrip("/") for (b, key) in self.server.objects
+                         if b == bucket and key.startswith(prefix)]
+            self._send_json(200, [{"name": name, "id": hashlib.md5(name.encode()).hexdigest(),
+                                   "metadata": {}} for name in sorted(names) if "/" not in name])
+            return
+        if parts[:1] in (["public"], ["authenticated"]):
+            parts = parts[1:]
+        if not parts:
+            self._send_json(400, {"message": "missing bucket"})
+            return
+        bucket, key = parts[0], "/".join(parts[1:])
+        if method in ("POST", "PUT"):
+            body = self._body()
+            with self.server.lock:
+                self.server.objects[(bucket, key)] = body
+            self._send_json(200, {"Key": f"{bucket}/{key}", "Id": str(uuid.uuid4())})
+        elif method in ("GET", "HEAD"):
+            with self.server.lock:
+                body = self.server.objects.get((bucket, key))
+            if body is None:
+                self._send_json(404, {"message": "Object not found"})
+            else:
+                self._send(200, body if method == "GET" else b"", "application/octet-stream")
+        elif method == "DELETE":
+            with self.server.lock:
+                self.server.objects.pop((bucket, key), None)
+            self._send_json(200, {})
+        else:
+            self._send_json(405, {"message": method})
+
+    # Auth
+    def _auth(self, method: str, parts: List[str], query: Dict[str, str]) -> None:
+        if parts[:1] == ["user"]:
+            self._send_json(200, self.server.user())
+        elif parts[:1] == ["token"] or parts[:1] == ["signup"]:
+            self._body()
+            self._send_json(200, self.server.session())
+        elif parts[:1] == ["logout"]:
+            self._body()
+            self._send(204)
+        else:
+            self._send_json(200, {})
+
+
+class SupabaseStub(StubServer):
+    """In-memory Supabase: PostgREST tables, Storage objects, Auth for one user."""
+
+    def __init__(self, **kwargs):
+        super().__init__(SupabaseHandler, **kwargs)
+        self.lock = threading.Lock()
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+
+    def reset(self) -> None:
+        """Forget all rows and objects (e.g. between benchmark repeats)."""
+        with self.lock:
+            self.tables.clear()
+            self.objects.clear()
+
+    def rpc(self, name: str) -> Any:
+        if name == "get_user_profile":
+            return [{"id": STUB_USER_ID, "profile_type": "user", "display_name": "Benchmark"}]
+        return []
+
+    def user(self) -> Dict[str, Any]:
+        created = "2024-01-01T00:00:00+00:00"
+        return {"id": STUB_USER_ID, "aud": "authenticated", "role": "authenticated", "email": STUB_EMAIL,
+                "app_metadata": {"provider": "email"}, "user_metadata": {}, "created_at": created,
+                "updated_at": created, "identities": []}
+
+    def session(self) -> Dict[str, Any]:
+        lifetime = 30 * 86400
+        return {"access_token": fake_jwt(lifetime=lifetime), "refresh_token": "stub-refresh-token",
+                "token_type": "bearer", "expires_in": lifetime, "expires_at": int(time.time()) + lifetime,
+                "user": self.user()}
+
+    def auth_file_contents(self) -> Dict[str, Any]:
+        """What ``ait auth login`` would have saved for this user."""
+        session = self.session()
+        return {"access_token": session["access_token"], "refresh_token": session["refresh_token"],
+                "expires_at": session["expires_at"], "user_id": STUB_USER_ID, "email": STUB_EMAIL}
+
+
+# --- Gemini ---------------------------------------------------------------------------------
+
+def canned_analysis(seed: str) -> Dict[str, Any]:
+    """A small but complete structured analysis, varied deterministically by ``seed``."""
+    digest = hashlib.sha256(seed.encode()).hexdigest()
+    label = f"synthetic test pattern {digest[:6]}"
+    return {
+        "summary": {
+            "overall": f"A {label} with moving colour bars and a sweeping gradient.",
+            "key_activities": ["Test pattern animation", "Tone playback"],
+            "content_category": "Test Footage",
+            "condensed_summary": f"Animated {label}",
+        },
+        "visual_analysis": {
+            "shot_types": [{"timestamp": "0s0ms", "duration_seconds": 5.0,
+                            "shot_attributes_ordered": ["Static Shot", "Graphics"],
+                            "description": "Full-frame test pattern", "confidence": 0.9}],
+            "technical_quality": {"overall_focus_quality": "Good", "stability_assessment": "Very Stable",
+                                  "detected_artifacts": [], "usability_rating": "Good"},
+            "text_and_graphics": {"detected_text": [], "detected_logos_icons": []},
+            "keyframe_analysis": {"recommended_keyframes": [
+                {"timestamp": "1s0ms", "reason": "Representative frame", "visual_quality": "Good"}]},
+        },
+        "audio_analysis": {
+            "transcript": {"full_text": "", "segments": []},
+            "speaker_analysis": {"speaker_count": 0, "speakers": []},
+            "sound_events": [{"timestamp": "0s0ms", "event_type": "Tone", "description": "Sine tone",
+                              "duration_seconds": 5.0, "prominence": "High"}],
+            "audio_quality": {"clarity": "Good", "background_noise_level": "None",
+                              "dialogue_intelligibility": "N/A"},
+        },
+        "content_analysis": {
+            "entities": {"people_count": 0, "people_details": [], "locations": [], "objects_of_interest": []},
+            "activity_summary": [],
+            "content_warnings": [],
+            "ai_thumbnail_selection": {"selected_thumbnails": [
+                {"timestamp": "1s0ms", "description": "Test pattern", "reason": "Clearest frame", "rank": "1"}]},
+        },
+    }
+
+
+class GeminiHandler(StubHandler):
+    server: "GeminiStub"
+
+    def handle_request(self, method: str, url) -> None:
+        body = self._body()
+        if method == "POST" and url.path.endswith(":generateContent"):
+            if self.server.per_request_ms:
+                time.sleep(self.server.per_request_ms / 1000.0)
+            text = json.dumps(canned_analysis(hashlib.sha256(body).hexdigest()))
+            self._send_json(200, {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]},
+                                "finishReason": "STOP", "index": 0}],
+                "usageMetadata": {"promptTokenCount": len(body) // 4, "candidatesTokenCount": len(text) // 4,
+                                  "totalTokenCount": (len(body) + len(text)) // 4},
+                "modelVersion": url.path.rsplit("/", 1)[-1].split(":")[0],
+            })
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": f"no stub for {method} {url.path}"}})
+
+
+class GeminiStub(StubServer):
+    """generateContent answering with canned_analysis; ``per_request_ms`` mimics model time."""
+
+    def __init__(self, per_request_ms: float = 0.0, **kwargs):
+        super().__init__(GeminiHandler, **kwargs)
+        self.per_request_ms = per_request_ms
+
+
+# --- Text embeddings ------------------------------------------------------------------------
+
+class EmbeddingHandler(StubHandler):
+    server: "EmbeddingStub"
+
+    def handle_request(self, method: str, url) -> None:
+        if method != "POST" or not url.path.endswith("/embeddings"):
+            self._send_json(404, {"error": {"message": f"no stub for {method} {url.path}"}})
+            return
+        request = self._json_body() or {}
+        texts = request.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        data = []
+        for i, text in enumerate(texts):
+            vector = fake_vector(str(text), self.server.dim)
+            if request.get("encoding_format") == "base64":
+                vector = base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode()
+            data.append({"object": "embedding", "index": i, "embedding": vector})
+        tokens = sum(len(str(t)) // 4 for t in texts)
+        self._send_json(200, {"object": "list", "data": data, "model": request.get("model"),
+                              "usage": {"prompt_tokens": tokens, "total_tokens": tokens}})
+
+
+class EmbeddingStub(StubServer):
+    """OpenAI-compatible embeddings with deterministic unit vectors."""
+
+    def __init__(self, dim: int = 1024, **kwargs):
+        super().__init__(EmbeddingHandler, **kwargs)
+        self.dim = dim
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local Supabase/Gemini/embedding stand-ins")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--supabase-port", type=int, default=54321)
+    parser.add_argument("--gemini-port", type=int, default=54322)
+    parser.add_argument("--embedding-port", type=int, default=54323)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay per request")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    common = {"host": args.host, "latency_ms": args.latency_ms, "verbose": args.verbose}
+    servers = [SupabaseStub(port=args.supabase_port, **common).start(),
+               GeminiStub(port=args.gemini_port, **common).start(),
+               EmbeddingStub(port=args.embedding_port, **common).start()]
+    supabase, gemini, embedding = servers
+    print(f"SUPABASE_URL={supabase.url}\nGEMINI_API_BASE={gemini.url}\nEMBEDDING_API_BASE={embedding.url}/v1/openai")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the SigLIP image embedding server.
+
+Implements the same endpoints as the real server so the embedding client can
+be exercised without a GPU box:
+
+    POST /v1/embeddings        {"input": "data:image/...;base64,..."}  (legacy, one image)
+    POST /v1/embeddings/batch  multipart "images" parts, or an npy uint8 (N, H, W, 3) body
+
+Embeddings are deterministic unit vectors derived from a hash of the image
+bytes, so the same image always maps to the same vector. Batch responses are
+npy float32 when the client accepts it, JSON otherwise. `--latency-ms` adds a
+fixed per-request delay and `--per-image-ms` a per-image cost to mimic model
+time.
+
+    python benchmarks/siglip_stub_server.py --port 8001
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+NPY_CONTENT_TYPE = "application/x-npy"
+
+
+def fake_embedding(payload: bytes, dim: int) -> np.ndarray:
+    """Deterministic unit vector for some bytes."""
+    seed = int.from_bytes(hashlib.sha256(payload).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def parse_multipart(content_type: str, body: bytes) -> List[bytes]:
+    """Return the payloads of the "images" parts of a multipart/form-data body."""
+    boundary = content_type.split("boundary=", 1)[1].split(";", 1)[0].strip().strip('"')
+    delimiter = b"--" + boundary.encode("latin-1")
+    images = []
+    for part in body.split(delimiter)[1:]:
+        if part.startswith(b"--"):
+            break
+        headers, _, payload = part.partition(b"\r\n\r\n")
+        if b'name="images"' in headers:
+            images.append(payload[:-2] if payload.endswith(b"\r\n") else payload)
+    return images
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    server: "StubServer"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.count_request()
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000.0)
+
+        if self.path == "/v1/embeddings":
+            try:
+                data_uri = json.loads(body)["input"]
+                image = base64.b64decode(data_uri.split(",", 1)[1])
+            except (ValueError, KeyError, IndexError):
+                self._send_json(400, {"error": "Expected JSON with a base64 data URI in 'input'"})
+                return
+            self.server.simulate_model(1)
+            self._send_json(200, {"data": [{"index": 0, "embedding": fake_embedding(image, self.server.dim).tolist()}]})
+            return
+
+        if self.path == "/v1/embeddings/batch" and self.server.batch_enabled:
+            content_type = self.headers.get("Content-Type", "")
+            if content_type.startswith(NPY_CONTENT_TYPE):
+                pixels = np.load(io.BytesIO(body), allow_pickle=False)
+                images = [frame.tobytes() for frame in pixels]
+            elif content_type.startswith("multipart/form-data"):
+                images = parse_multipart(content_type, body)
+            else:
+                self._send_json(415, {"error": f"Unsupported Content-Type: {content_type}"})
+                return
+
+            self.server.simulate_model(len(images))
+            matrix = np.stack([fake_embedding(image, self.server.dim) for image in images]) if images \
+                else np.zeros((0, self.server.dim), dtype=np.float32)
+            if NPY_CONTENT_TYPE in self.headers.get("Accept", ""):
+                buffer = io.BytesIO()
+                np.save(buffer, matrix, allow_pickle=False)
+                self._send(200, buffer.getvalue(), NPY_CONTENT_TYPE)
+            else:
+                self._send_json(200, {"data": [{"index": i, "embedding": row.tolist()} for i, row in enumerate(matrix)]})
+            return
+
+        self._send_json(404, {"error": "Not found"})
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], dim: int = 768, latency_ms: float = 0.0,
+                 per_image_ms: float = 0.0, batch_enabled: bool = True, verbose: bool = False):
+        super().__init__(address, StubHandler)
+        self.dim = dim
+        self.latency_ms = latency_ms
+        self.per_image_ms = per_image_ms
+        self.batch_enabled = batch_enabled
+        self.verbose = verbose
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def simulate_model(self, images: int) -> None:
+        if self.per_image_ms:
+            time.sleep(images * self.per_image_ms / 1000.0)
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, **kwargs) -> StubServer:
+    """Start a stub server on a background thread (port 0 picks a free port)."""
+    server = StubServer((host, port), **kwargs)
+    threading.Thread(target=server.serve_forever, name="siglip-stub", daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stub SigLIP embedding server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay per request")
+    parser.add_argument("--per-image-ms", type=float, default=0.0, help="Simulated model time per image")
+    parser.add_argument("--no-batch", action="store_true", help="Only serve the legacy single-image endpoint")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = StubServer((args.host, args.port), dim=args.dim, latency_ms=args.latency_ms,
+                        per_image_ms=args.per_image_ms, batch_enabled=not args.no_batch, verbose=args.verbose)
+    print(f"Stub SigLIP server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
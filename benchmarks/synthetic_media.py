@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic clips for pipeline benchmarks.
+
+Every clip is rendered by ffmpeg from lavfi sources (testsrc2 video, sine
+audio) with bit-exact flags, so a spec always produces the same kind of file
+and benchmark runs on different commits see identical inputs. Specs cover the
+variations the extraction steps care about: codec and container, resolution,
+frame rate, duration, 10-bit HDR signalling, audio, a subtitle track and
+camera metadata tags.
+
+Clips are cached in a directory keyed by a hash of their spec, so a suite is
+only rendered once per machine:
+
+    python benchmarks/synthetic_media.py --suite quick --output ~/.cache/ait-bench-media
+    python benchmarks/synthetic_media.py --list
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+# Container and codec arguments per codec name
+CODECS: Dict[str, Dict[str, Any]] = {
+    "h264": {"ext": "mp4", "args": ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"]},
+    "hevc": {"ext": "mp4", "args": ["-c:v", "libx265", "-preset", "veryfast", "-tag:v", "hvc1",
+                                    "-x265-params", "log-level=error"]},
+    "prores": {"ext": "mov", "args": ["-c:v", "prores_ks", "-profile:v", "2", "-pix_fmt", "yuv422p10le"]},
+    "mpeg4": {"ext": "mp4", "args": ["-c:v", "mpeg4", "-q:v", "4", "-pix_fmt", "yuv420p"]},
+}
+
+CAMERA_TAGS = {
+    "make": "BenchCam",
+    "model": "BC-1 Synthetic",
+    "creation_time": "2024-05-04T12:34:56.000000Z",
+    "location": "+51.5007-000.1246/",
+    "com.apple.quicktime.make": "BenchCam",
+    "com.apple.quicktime.model": "BC-1 Synthetic",
+}
+
+DEFAULT_SPEC: Dict[str, Any] = {
+    "codec": "h264",
+    "size": "1920x1080",
+    "rate": 25,
+    "duration": 10,
+    "audio": True,
+    "subtitles": False,
+    "exif": False,
+    "hdr": False,
+    "gop_seconds": 2,
+}
+
+SUITES: Dict[str, List[Dict[str, Any]]] = {
+    # A few seconds per clip; enough to catch per-step regressions quickly
+    "quick": [
+        {"name": "h264_1080p_10s", "codec": "h264", "size": "1920x1080", "duration": 10},
+        {"name": "h264_720p_5s_silent", "codec": "h264", "size": "1280x720", "duration": 5, "audio": False},
+        {"name": "hevc_1080p_10s_hdr", "codec": "hevc", "size": "1920x1080", "duration": 10, "hdr": True},
+        {"name": "prores_720p_5s_subs_exif", "codec": "prores", "size": "1280x720", "duration": 5,
+         "subtitles": True, "exif": True},
+    ],
+    # Adds 4K, high frame rate and longer clips (compression and AI segmentation paths)
+    "full": [
+        {"name": "h264_1080p_10s", "codec": "h264", "size": "1920x1080", "duration": 10},
+        {"name": "h264_720p_5s_silent", "codec": "h264", "size": "1280x720", "duration": 5, "audio": False},
+        {"name": "hevc_1080p_10s_hdr", "codec": "hevc", "size": "1920x1080", "duration": 10, "hdr": True},
+        {"name": "prores_720p_5s_subs_exif", "codec": "prores", "size": "1280x720", "duration": 5,
+         "subtitles": True, "exif": True},
+        {"name": "h264_2160p_30s_exif", "codec": "h264", "size": "3840x2160", "duration": 30, "exif": True},
+        {"name": "hevc_2160p_60fps_20s", "codec": "hevc", "size": "3840x2160", "rate": 60, "duration": 20},
+        {"name": "mpeg4_480p_60s_subs", "codec": "mpeg4", "size": "854x480", "duration": 60, "subtitles": True},
+        {"name": "h264_1080p_300s", "codec": "h264", "size": "1920x1080", "duration": 300},
+    ],
+}
+
+
+def normalize(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill defaults and derive a name for a spec."""
+    spec = {**DEFAULT_SPEC, **spec}
+    if spec["codec"] not in CODECS:
+        raise ValueError(f"Unknown codec '{spec['codec']}' (choose from {', '.join(CODECS)})")
+    if not spec.get("name"):
+        flags = [flag for flag in ("hdr", "exif", "subtitles") if spec[flag]] + ([] if spec["audio"] else ["silent"])
+        spec["name"] = "_".join([spec["codec"], spec["size"], f"{spec['duration']}s", *flags])
+    return spec
+
+
+def spec_key(spec: Dict[str, Any]) -> str:
+    """Short hash of everything that affects the rendered file (not the name)."""
+    relevant = {k: v for k, v in sorted(normalize(spec).items()) if k != "name"}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _subtitle_file(directory: str, duration: int) -> str:
+    """An SRT with one cue every two seconds."""
+    path = os.path.join(directory, "cues.srt")
+
+    def stamp(seconds: int) -> str:
+        return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d},000"
+
+    with open(path, "w") as f:
+        for i, start in enumerate(range(0, max(duration, 1), 2), 1):
+            f.write(f"{i}\n{stamp(start)} --> {stamp(min(start + 2, duration))}\nBenchmark cue {i}\n\n")
+    return path
+
+
+def ffmpeg_command(spec: Dict[str, Any], output: str, work_dir: str) -> List[str]:
+    """The ffmpeg invocation rendering ``spec`` into ``output``."""
+    spec = normalize(spec)
+    codec = CODECS[spec["codec"]]
+    duration, rate = spec["duration"], spec["rate"]
+    command = ["ffmpeg", "-y", "-v", "error",
+               "-f", "lavfi", "-i", f"testsrc2=size={spec['size']}:rate={rate}:duration={duration}"]
+    inputs = 1
+    if spec["audio"]:
+        command += ["-f", "lavfi", "-i", f"sine=frequency=440:beep_factor=4:sample_rate=48000:duration={duration}"]
+        inputs += 1
+    if spec["subtitles"]:
+        command += ["-i", _subtitle_file(work_dir, duration)]
+    command += ["-map", "0:v"]
+    if spec["audio"]:
+        command += ["-map", "1:a"]
+    if spec["subtitles"]:
+        command += ["-map", f"{inputs}:s"]
+
+    command += codec["args"] + ["-g", str(rate * spec["gop_seconds"]), "-r", str(rate)]
+    if spec["hdr"]:
+        if spec["codec"] != "prores":  # prores_ks is already 10-bit 4:2:2
+            command += ["-pix_fmt", "yuv420p10le"]
+        command += ["-color_primaries", "bt2020", "-color_trc", "smpte2084", "-colorspace", "bt2020nc",
+                    "-color_range", "tv"]
+        if spec["codec"] == "hevc":
+            command[command.index("log-level=error")] = (
+                "log-level=error:hdr10=1:colorprim=bt2020:transfer=smpte2084:colormatrix=bt2020nc:"
+                "master-display=G(13250,34500)B(7500,3000)R(34000,16000)WP(15635,16450)L(10000000,1):"
+                "max-cll=1000,400")
+    if spec["audio"]:
+        command += ["-c:a", "pcm_s16le" if codec["ext"] == "mov" else "aac", "-b:a", "128k"]
+    if spec["subtitles"]:
+        command += ["-c:s", "mov_text"]
+
+    # Bit-exact output: no encoder version strings or wall-clock timestamps
+    command += ["-fflags", "+bitexact", "-flags:v", "+bitexact", "-map_metadata", "-1"]
+    if spec["audio"]:
+        command += ["-flags:a", "+bitexact"]
+    if spec["exif"]:
+        command += ["-movflags", "use_metadata_tags"]
+        for key, value in CAMERA_TAGS.items():
+            command += ["-metadata", f"{key}={value}"]
+    command.append(output)
+    return command
+
+
+def render(spec: Dict[str, Any], directory: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Render a clip unless an identical spec is already cached.
+
+    Returns:
+        Dict[str, Any]: {"name", "path", "bytes", "sha256", "key", "spec", "cached"}
+    """
+    spec = normalize(spec)
+    key = spec_key(spec)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{spec['name']}_{key}.{CODECS[spec['codec']]['ext']}")
+    cached = os.path.exists(path) and not force
+    if not cached:
+        work_dir = tempfile.mkdtemp(prefix="synthetic-media-")
+        try:
+            partial = os.path.join(work_dir, os.path.basename(path))
+            result = subprocess.run(ffmpeg_command(spec, partial, work_dir), capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg failed for {spec['name']}: {result.stderr.strip()[-2000:]}")
+            shutil.move(partial, path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"name": spec["name"], "path": path, "bytes": os.path.getsize(path), "sha256": digest.hexdigest(),
+            "key": key, "spec": spec, "cached": cached}
+
+
+def render_suite(suite: str, directory: str, only: Optional[List[str]] = None,
+                 force: bool = False) -> List[Dict[str, Any]]:
+    """Render (or reuse) every clip of a named suite, optionally filtered by name."""
+    if suite not in SUITES:
+        raise ValueError(f"Unknown suite '{suite}' (choose from {', '.join(SUITES)})")
+    specs = [s for s in SUITES[suite] if not only or s["name"] in only]
+    return [render(spec, directory, force=force) for spec in specs]
+
+
+def ffmpeg_version() -> Optional[str]:
+    if not shutil.which("ffmpeg"):
+        return None
+    result = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True)
+    return result.stdout.splitlines()[0] if result.stdout else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render deterministic synthetic benchmark clips")
+    parser.add_argument("--suite", default="quick", choices=sorted(SUITES))
+    parser.add_argument("--output", default=os.path.join(tempfile.gettempdir(), "ait-bench-media"))
+    parser.add_argument("--clip", action="append", help="Only render these clips (repeatable)")
+    parser.add_argument("--force", action="store_true", help="Re-render cached clips")
+    parser.add_argument("--list", action="store_true", help="Print the suite's specs and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for spec in SUITES[args.suite]:
+            print(json.dumps(normalize(spec)))
+        return 0
+    if not ffmpeg_version():
+        print("ffmpeg is required", file=sys.stderr)
+        return 1
+    for clip in render_suite(args.suite, args.output, args.clip, args.force):
+        print(f"{'cached ' if clip['cached'] else 'rendered'} {clip['name']:<28} {clip['bytes'] / 1e6:8.1f} MB  "
+              f"{clip['sha256'][:12]}  {clip['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
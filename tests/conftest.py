@@ -0,0 +1,12 @@
+"""
+Shared pytest setup.
+
+The package is not installed, so the repository root is put on sys.path.
+These tests need no network, Supabase project, ffmpeg or exiftool; the
+top-level test_*.py scripts are the manual checks that do.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,137 @@
+"""Tests for the Flask API server's request and response helpers."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+import api_server_new
+
+
+def test_list_page_total_is_null_when_not_counted():
+    page = {"results": [{"id": "a"}], "total": None, "count_type": None, "next_cursor": "c", "has_more": True}
+    assert api_server_new.format_list_page(page)["total"] is None
+    assert api_server_new.format_list_page({**page, "total": 40, "count_type": "exact"})["total"] == 40
+
+
+def test_only_the_first_list_page_is_counted_by_default():
+    assert api_server_new.parse_list_args(MultiDict())["count"] == "estimated"
+    assert api_server_new.parse_list_args(MultiDict({"cursor": "abc"}))["count"] is None
+    assert api_server_new.parse_list_args(MultiDict({"cursor": "abc", "count": "exact"}))["count"] == "exact"
+
+
+def test_run_results_total_counts_every_match(tmp_path, monkeypatch):
+    from video_ingest_tool.run_catalog import RunCatalog
+
+    catalog = RunCatalog(str(tmp_path / "catalog.db"))
+    for i in range(5):
+        catalog.record("run_1", {"status": "processed", "id": f"clip-{i}", "file_path": f"/card/{i}.mov"},
+                       json.dumps({"id": f"clip-{i}"}).encode(), processed_at=f"2024-05-01T10:0{i}:00")
+    catalog.record("run_1", {"status": "failed", "file_path": "/card/bad.mov", "error": "boom"},
+                   processed_at="2024-05-01T11:00:00")
+    monkeypatch.setattr(api_server_new, "get_run_catalog", lambda: catalog)
+    try:
+        body, error, status_code = api_server_new.query_run_catalog(MultiDict({"limit": "2"}))
+        page = json.loads(body)
+        assert (error, status_code) == (None, 200)
+        assert [row["id"] for row in page["results"]] == ["clip-4", "clip-3"]
+        assert page["total"] == 5
+
+        page = json.loads(api_server_new.query_run_catalog(MultiDict({"status": "all", "limit": "1"}))[0])
+        assert len(page["results"]) == 1 and page["total"] == 6
+        page = json.loads(api_server_new.query_run_catalog(MultiDict({"status": "failed"}))[0])
+        assert page["total"] == 1
+
+        monkeypatch.setattr(api_server_new, "check_and_refresh_auth", lambda **kwargs: False)
+        recent = api_server_new.get_recent_videos(limit=2, return_json=False)
+        assert recent["source"] == "run_catalog" and recent["total"] == 5
+    finally:
+        catalog.close()
+
+
+@pytest.mark.parametrize("body", [{"ids": [{}]}, {"ids": ["a", 3]}, ["a"], {"ids": []}])
+def test_batch_clip_details_rejects_malformed_ids(body):
+    response = api_server_new.app.test_client().post("/api/clips/batch", json=body)
+    assert response.status_code == 400
+    assert "ids" in response.get_json()["error"]
+
+
+def test_async_batch_clip_details_rejects_malformed_ids():
+    import api_server_async
+
+    async def post():
+        client = api_server_async.app.test_client()
+        response = await client.post("/api/clips/batch", json={"ids": [{}]})
+        return response.status_code, await response.get_json()
+
+    status_code, body = asyncio.run(post())
+    assert status_code == 400 and "ids" in body["error"]
+
+
+_BACKEND_ROUTES = [
+    ("get", "/api/auth/status", None),
+    ("post", "/api/auth/login", {"email": "a@b.c", "password": "pw"}),
+    ("post", "/api/auth/logout", None),
+    ("post", "/api/ingest", {"directory": "/"}),
+    ("get", "/api/clips", None),
+    ("get", "/api/similar?clip_id=c1", None),
+    ("get", "/api/database/status", None),
+    ("get", "/api/clips/c1", None),
+    ("post", "/api/clips/batch", {"ids": ["c1"]}),
+    ("get", "/api/stats", None),
+    ("get", "/api/pipeline/steps", None),
+    ("get", "/api/thumbnail/c1", None),
+    ("get", "/api/transcript/c1", None),
+    ("get", "/api/analysis/c1", None),
+]
+
+
+def test_async_routes_match_threaded_server_without_backend(monkeypatch):
+    import api_server_async
+
+    monkeypatch.setattr(api_server_new, "BACKEND_AVAILABLE", False)
+    threaded = api_server_new.app.test_client()
+
+    async def call_async(method, path, body):
+        response = await getattr(api_server_async.app.test_client(), method)(path, json=body)
+        return response.status_code, await response.get_json()
+
+    for method, path, body in _BACKEND_ROUTES:
+        expected = getattr(threaded, method)(path, json=body)
+        assert asyncio.run(call_async(method, path, body)) == (expected.status_code, expected.get_json()), path
+
+
+class _Storage:
+    def __init__(self):
+        self.downloads = 0
+
+    def from_(self, bucket):
+        return self
+
+    def download(self, path):
+        self.downloads += 1
+        return b"\xff\xd8jpeg"
+
+
+def test_thumbnail_bytes_stay_out_of_the_lookup_cache(monkeypatch):
+    storage = _Storage()
+    monkeypatch.setattr(api_server_new, "check_and_refresh_auth", lambda **kwargs: True)
+    monkeypatch.setattr(api_server_new, "AuthManager",
+                        lambda: SimpleNamespace(get_authenticated_client=lambda: SimpleNamespace(storage=storage)))
+    monkeypatch.setattr(api_server_new, "load_thumbnail", lambda clip_id: {
+        "bucket": "thumbnails", "path": f"{clip_id}.jpg", "content_type": "image/jpeg", "updated_at": None,
+    })
+    api_server_new.lookup_cache.invalidate()
+    client = api_server_new.app.test_client()
+    try:
+        for _ in range(2):
+            response = client.get("/api/thumbnail/clip-1")
+            assert response.status_code == 200 and response.data == b"\xff\xd8jpeg"
+        found, cached = api_server_new.lookup_cache.peek(("thumbnail", "clip-1"))
+        assert found and "data" not in cached
+        assert storage.downloads == 2
+        assert api_server_new.thumbnail_downloads.stats()["entries"] == 0
+    finally:
+        api_server_new.lookup_cache.invalidate()
@@ -0,0 +1,121 @@
+"""Tests for the in-memory auth state the API servers read sessions from."""
+
+import base64
+import json
+import os
+import time
+
+import pytest
+
+from video_ingest_tool import auth
+
+
+def _jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def _session(token="t1", expires_in=3600):
+    expires_at = time.time() + expires_in
+    return {"access_token": _jwt(expires_at) if token is None else token, "refresh_token": "r",
+            "expires_at": expires_at, "email": "a@b.c", "user_id": "u1"}
+
+
+@pytest.fixture
+def auth_file(tmp_path, monkeypatch):
+    path = tmp_path / "auth.json"
+    monkeypatch.setattr(auth, "AUTH_FILE", path)
+    return path
+
+
+def _save(path, session):
+    path.write_text(json.dumps(session))
+    # Make sure the change is visible to the mtime check even on coarse clocks
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_session_is_served_from_memory_while_running(auth_file, monkeypatch):
+    _save(auth_file, _session())
+    state = auth.AuthState(poll_interval=60).start()
+    monkeypatch.setattr(auth, "auth_state", state)
+    try:
+        auth_file.unlink()
+        # No file read on the request path: the session loaded at start is returned
+        assert auth.AuthManager().get_current_session()["user_id"] == "u1"
+        assert state._file_changed()
+    finally:
+        state.stop()
+    assert not state.running
+
+
+def test_reload_follows_the_file(auth_file):
+    state = auth.AuthState()
+    state.reload()
+    assert state.session is None and not state._file_changed()
+
+    _save(auth_file, _session())
+    assert state._file_changed()
+    state.reload()
+    assert state.session["email"] == "a@b.c" and not state._file_changed()
+
+    _save(auth_file, _session(expires_in=-1))
+    state.reload()
+    assert state.session is None
+
+
+def test_client_is_reused_until_the_token_changes(auth_file, monkeypatch):
+    created = []
+
+    class _Client:
+        def __init__(self):
+            self.auth = self
+            created.append(self)
+
+        def set_session(self, access_token, refresh_token):
+            self.token = access_token
+
+    monkeypatch.setattr(auth, "get_supabase_client", _Client)
+    state = auth.AuthState()
+    _save(auth_file, _session("t1"))
+    state.reload()
+    assert state.get_client() is state.get_client()
+    assert len(created) == 1
+
+    _save(auth_file, _session("t2"))
+    state.reload()
+    assert state.get_client().token == "t2" and len(created) == 2
+
+
+def test_token_is_refreshed_before_it_expires(auth_file, monkeypatch):
+    refreshed = []
+
+    def refresh(self, session):
+        refreshed.append(session["access_token"])
+        _save(auth_file, _session(None, expires_in=3600))
+        return True
+
+    monkeypatch.setattr(auth.AuthManager, "_refresh_session", refresh)
+    state = auth.AuthState(refresh_margin=300)
+    _save(auth_file, _session(None, expires_in=3600))
+    state.reload()
+    state._refresh_if_needed()
+    assert refreshed == []
+
+    _save(auth_file, _session(None, expires_in=120))
+    state.reload()
+    old_token = state.session["access_token"]
+    state._refresh_if_needed()
+    assert refreshed == [old_token]
+    assert state.session["access_token"] != old_token
+
+
+def test_failed_refresh_backs_off(auth_file, monkeypatch):
+    attempts = []
+    monkeypatch.setattr(auth.AuthManager, "_refresh_session", lambda self, session: attempts.append(1) and False)
+    state = auth.AuthState(refresh_margin=300)
+    _save(auth_file, _session(None, expires_in=120))
+    state.reload()
+    state._refresh_if_needed()
+    state._refresh_if_needed()
+    assert len(attempts) == 1 and state._retry_at > time.time()
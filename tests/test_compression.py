@@ -0,0 +1,83 @@
+"""Tests for planning segmented proxy encodes and splitting clips on keyframes."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from video_ingest_tool.video_processor import compression
+from video_ingest_tool.video_processor.compression import VideoCompressor, probe_keyframes, split_on_keyframes
+
+
+def test_segments_start_on_keyframes_and_cover_the_clip():
+    keyframes = [float(t) for t in range(0, 300, 2)]
+    segments = split_on_keyframes(299.5, keyframes, 60)
+    assert segments[0][0] == 0.0 and segments[-1][1] == 299.5
+    assert all(end == next_start for (_, end), (next_start, _) in zip(segments, segments[1:]))
+    assert all(start in keyframes for start, _ in segments)
+    assert [round(end - start) for start, end in segments] == [60, 60, 60, 60, 60]
+
+
+def test_short_tail_is_merged_into_the_last_segment():
+    # A keyframe at 120 would leave a 10 s tail, shorter than half a segment
+    assert split_on_keyframes(130, [0, 60, 120], 60) == [(0.0, 60), (60, 130)]
+
+
+def test_sparse_keyframes_give_longer_segments():
+    assert split_on_keyframes(200, [0, 150], 60) == [(0.0, 150), (150, 200)]
+    assert split_on_keyframes(200, [], 60) == [(0.0, 200)]
+
+
+@pytest.mark.parametrize("codec, duration, expected", [
+    ("hevc_videotoolbox", 3600, ("hevc_videotoolbox", 1)),
+    ("libx265", None, ("libx265", 1)),
+    ("libx265", 119, ("libx265", 1)),
+    ("libx265", 600, ("libx265", 4)),
+    ("libx265", 1800, ("libx264", 4)),
+    ("libx264", 7200, ("libx264", 4)),
+])
+def test_plan_encode(codec, duration, expected):
+    compressor = VideoCompressor({"parallel_workers": 4})
+    assert compressor._plan_encode(codec, duration) == expected
+
+
+def test_default_workers_follow_the_core_count(monkeypatch):
+    monkeypatch.setattr(compression.os, "cpu_count", lambda: 8)
+    assert VideoCompressor()._plan_encode("libx264", 600) == ("libx264", 4)
+    monkeypatch.setattr(compression.os, "cpu_count", lambda: 1)
+    assert VideoCompressor()._plan_encode("libx264", 600) == ("libx264", 1)
+
+
+def test_probe_keyframes_reads_flagged_packets(monkeypatch):
+    stdout = "2.002000,K__\n0.000000,K__\n0.033367,___\nN/A,K__\n4.004000,K_\n"
+    monkeypatch.setattr(compression.subprocess, "run", lambda *a, **k: SimpleNamespace(stdout=stdout))
+    assert probe_keyframes("clip.mov") == [0.0, 2.002, 4.004]
+
+
+def test_segments_are_encoded_separately_and_joined_without_reencoding(tmp_path, monkeypatch):
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        if "-f" in cmd and "concat" in cmd:
+            with open(cmd[cmd.index("-i") + 1]) as f:
+                commands.append(f.read().splitlines())
+        else:
+            open(cmd[-1], "wb").close()
+        return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+    monkeypatch.setattr(compression.subprocess, "run", run)
+    output = str(tmp_path / "out.mp4")
+    video_args = ["-c:v", "libx264", "-crf", "25"]
+    VideoCompressor()._compress_segments("in.mov", output, [(0.0, 60.0), (60.0, 95.5)], video_args,
+                                         ["-c:a", "aac"], workers=2)
+
+    segment_cmds = [cmd for cmd in commands if isinstance(cmd, list) and "-ss" in cmd]
+    assert sorted(cmd[cmd.index("-ss") + 1] for cmd in segment_cmds) == ["0.000000", "60.000000"]
+    assert all("-an" in cmd and cmd[-len(video_args) - 1:-1] == video_args for cmd in segment_cmds)
+    join = next(cmd for cmd in commands if "concat" in cmd)
+    assert join[-1] == output and join[join.index("-c") + 1] == "copy"
+    assert ["-map", "0:v", "-map", "1:a"] == join[join.index("-map"):join.index("-map") + 4]
+    listed = commands[commands.index(join) + 1]
+    assert [line.rsplit("/", 1)[-1] for line in listed] == ["segment_0000.mp4'", "segment_0001.mp4'"]
+    # The work directory is removed afterwards
+    assert [p.name for p in tmp_path.iterdir()] == []
@@ -0,0 +1,130 @@
+"""Tests for content-hash diffing of embedding inputs and in-place vectors updates."""
+
+import pytest
+
+from video_ingest_tool import embeddings
+from video_ingest_tool import vector_index
+from video_ingest_tool.auth import AuthManager
+from video_ingest_tool.embeddings import (
+    changed_embedding_inputs,
+    content_hash,
+    embedding_input_hashes,
+    store_embeddings,
+)
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _VectorsTable:
+    """The slice of the PostgREST table builder store_embeddings uses, over one in-memory table."""
+
+    def __init__(self, rows, writes):
+        self.rows = rows
+        self.writes = writes
+        self.filters = {}
+        self.action = ("select", None)
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def limit(self, count):
+        return self
+
+    def insert(self, data):
+        self.action = ("insert", data)
+        return self
+
+    def update(self, data):
+        self.action = ("update", data)
+        return self
+
+    def execute(self):
+        kind, data = self.action
+        matching = [row for row in self.rows if all(row.get(k) == v for k, v in self.filters.items())]
+        if kind == "select":
+            return _Result([dict(row) for row in matching])
+        self.writes.append((kind, dict(data)))
+        if kind == "insert":
+            self.rows.append({"id": f"vec-{len(self.rows)}", **data})
+            return _Result([dict(self.rows[-1])])
+        for row in matching:
+            row.update(data)
+        return _Result([dict(row) for row in matching])
+
+
+class _Client:
+    def __init__(self):
+        self.rows = []
+        self.writes = []
+
+    def table(self, name):
+        assert name == "vectors"
+        return _VectorsTable(self.rows, self.writes)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = _Client()
+    monkeypatch.setattr(AuthManager, "get_authenticated_client", lambda self: client)
+    monkeypatch.setattr(AuthManager, "get_user_id", lambda self: "user")
+    monkeypatch.setattr(vector_index, "local_index_enabled", lambda user_id: False)
+    return client
+
+
+def _store(summary=None, keyword=None, thumbnails=None, hashes=None):
+    return store_embeddings(
+        "clip-1", summary, keyword, "summary text", "original", {"summary_tokens": 2},
+        thumbnail_embeddings=thumbnails or {}, thumbnail_descriptions={1: "a drone shot", 2: "a crowd"},
+        content_hashes=hashes,
+    )
+
+
+def test_hashes_change_with_content_model_and_image_bytes(tmp_path):
+    thumb = tmp_path / "1.jpg"
+    thumb.write_bytes(b"jpeg-1")
+    before = embedding_input_hashes("summary", "keywords", {1: str(thumb), 2: str(tmp_path / "missing.jpg")})
+    # An unreadable thumbnail has no hash, so it always counts as changed
+    assert set(before) == {"summary", "keyword", "thumbnail_1"}
+    assert content_hash("summary") != content_hash("summary", model="other/model")
+
+    thumb.write_bytes(b"jpeg-2")
+    after = embedding_input_hashes("summary", "new keywords", {1: str(thumb)})
+    assert changed_embedding_inputs(after, before) == ["keyword", "thumbnail_1"]
+    assert changed_embedding_inputs(after, {}) == ["summary", "keyword", "thumbnail_1"]
+
+
+def test_reingest_updates_only_changed_vectors_in_place(client):
+    hashes = {"summary": "s1", "keyword": "k1", "thumbnail_1": "t1", "thumbnail_2": "t2"}
+    assert _store([0.1], [0.2], {1: [1.0], 2: [2.0]}, hashes)
+    assert [kind for kind, _ in client.writes] == ["insert"]
+    row = client.rows[0]
+    assert row["metadata"][embeddings.CONTENT_HASHES_KEY] == hashes
+    assert set(row["thumbnail_embeddings"]) == {"1", "2"}
+
+    # Nothing re-embedded and every hash unchanged: no write at all
+    assert _store(hashes=hashes)
+    assert len(client.writes) == 1
+
+    # New summary; thumbnail 1 unchanged; thumbnail 2 dropped from the inputs
+    new_hashes = {"summary": "s2", "keyword": "k1", "thumbnail_1": "t1"}
+    assert _store(summary=[0.9], hashes=new_hashes)
+    kind, update = client.writes[-1]
+    assert kind == "update"
+    assert update["summary_embedding"] == [0.9] and update["thumbnail_2_embedding"] is None
+    assert "keyword_embedding" not in update and "thumbnail_1_embedding" not in update
+    assert "created_at" in update
+    assert len(client.rows) == 1
+    assert client.rows[0]["keyword_embedding"] == [0.2] and client.rows[0]["thumbnail_1_embedding"] == [1.0]
+    assert set(client.rows[0]["thumbnail_embeddings"]) == {"1"}
+
+
+def test_new_clip_needs_both_text_embeddings(client):
+    assert _store(summary=[0.1], hashes={"summary": "s1"}) is False
+    assert client.writes == []
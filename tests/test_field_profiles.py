@@ -0,0 +1,101 @@
+"""Tests for the named column projections applied to clip queries and search RPCs."""
+
+import pytest
+
+from video_ingest_tool.field_profiles import (
+    CLIP_FIELD_PROFILES,
+    SEARCH_RPC_COLUMNS,
+    apply_profile,
+    clip_select,
+    rpc_select,
+)
+from video_ingest_tool.search import VideoSearcher
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+        self.count = None
+
+
+class _RecordingQuery:
+    """Query builder that records the select clause and returns canned rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.selected = None
+
+    def select(self, projection, count=None):
+        self.selected = projection
+        return self
+
+    def __getattr__(self, name):
+        # eq/order/limit/... only need to chain
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return _Result([dict(row) for row in self.rows])
+
+
+class _RecordingClient:
+    def __init__(self, rows):
+        self.query = _RecordingQuery(rows)
+        self.rpc_calls = []
+
+    def from_(self, table):
+        return self.query
+
+    def rpc(self, name, params):
+        self.rpc_calls.append(name)
+        return self.query
+
+
+def _searcher(client):
+    searcher = VideoSearcher.__new__(VideoSearcher)
+    searcher.local = False
+    searcher._get_authenticated_client = lambda: client
+    searcher._get_current_user_id = lambda: "user"
+    return searcher
+
+
+def test_clip_select_lists_profile_columns():
+    assert clip_select(None) == "*"
+    assert clip_select("grid").split(",") == CLIP_FIELD_PROFILES["grid"]
+    with pytest.raises(ValueError, match="Invalid field profile"):
+        clip_select("everything")
+
+
+def test_rpc_select_keeps_returned_and_ranking_columns_only():
+    columns = rpc_select("hybrid_search_clips", "grid").split(",")
+    assert set(columns) <= set(SEARCH_RPC_COLUMNS["hybrid_search_clips"])
+    assert {"similarity_score", "search_rank", "match_type"} <= set(columns)
+    # transcript_preview isn't in the grid profile
+    assert "transcript_preview" not in columns
+    assert rpc_select("hybrid_search_clips", None) is None
+    assert rpc_select("unknown_rpc", "grid") is None
+
+
+def test_grid_trims_long_summaries():
+    rows = apply_profile([{"content_summary": "word " * 100}, {"content_summary": "short"}], "grid")
+    assert len(rows[0]["content_summary"]) <= 241 and rows[0]["content_summary"].endswith("…")
+    assert rows[1]["content_summary"] == "short"
+    untouched = apply_profile([{"content_summary": "word " * 100}], "detail")
+    assert untouched[0]["content_summary"] == "word " * 100
+
+
+def test_list_page_selects_the_profile_columns():
+    client = _RecordingClient([{"id": "c1", "processed_at": "2024-05-01", "content_summary": "x" * 500}])
+    page = _searcher(client).list_videos_page(profile="grid")
+    assert set(client.query.selected.split(",")) == set(CLIP_FIELD_PROFILES["grid"])
+    assert page["results"][0]["content_summary"].endswith("…")
+
+    _searcher(client).list_videos_page(columns=["file_name"], sort_by="duration_seconds")
+    assert client.query.selected == "id,duration_seconds,file_name"
+
+
+def test_search_rpc_requests_the_profile_columns():
+    client = _RecordingClient([{"id": "c1", "fts_rank": 1.0}])
+    results = _searcher(client).search("drone", search_type="fulltext", profile="grid")
+    assert client.rpc_calls == ["fulltext_search_clips"]
+    assert client.query.selected == rpc_select("fulltext_search_clips", "grid")
+    assert results == [{"id": "c1", "fts_rank": 1.0}]
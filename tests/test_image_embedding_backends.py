@@ -0,0 +1,113 @@
+"""Tests for image embedding backend failover."""
+
+import requests
+from PIL import Image
+
+from video_ingest_tool.embeddings_image import ImageEmbeddingClient
+from video_ingest_tool.image_embedding_backends import (
+    BackendUnavailable,
+    FailoverImageEmbedder,
+    ImageEmbeddingBackend,
+    RemoteSigLIPBackend,
+)
+
+
+class _Response:
+    def __init__(self, status_code=200, count=0):
+        self.status_code = status_code
+        self.count = count
+        self.headers = {"Content-Type": "application/json"}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code), response=self)
+
+    def json(self):
+        return {"data": [{"index": i, "embedding": [float(i)]} for i in range(self.count)]}
+
+
+def _client(post):
+    client = ImageEmbeddingClient(api_base="http://embeddings.test", batch_size=8)
+    client.session.post = post
+    return client
+
+
+def _thumbnail(tmp_path, name):
+    path = tmp_path / name
+    Image.new("RGB", (8, 8), "red").save(path)
+    return str(path)
+
+
+class _Local(ImageEmbeddingBackend):
+    name = "local"
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_images(self, images):
+        self.calls += 1
+        return [[9.0] for _ in images]
+
+
+def _failover(post):
+    local = _Local()
+    return FailoverImageEmbedder([RemoteSigLIPBackend(client=_client(post)), local], cooldown=60), local
+
+
+def test_unreachable_server_goes_on_cooldown(tmp_path):
+    def post(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("refused")
+
+    embedder, _ = _failover(post)
+    assert embedder.embed_images([_thumbnail(tmp_path, "a.jpg")]) == [[9.0]]
+    assert not embedder._usable(embedder.backends[0])
+
+
+def test_server_errors_go_on_cooldown(tmp_path):
+    embedder, _ = _failover(lambda *args, **kwargs: _Response(status_code=503))
+    assert embedder.embed_images([_thumbnail(tmp_path, "a.jpg")]) == [[9.0]]
+    assert not embedder._usable(embedder.backends[0])
+
+
+def test_rejected_images_fail_over_without_cooldown(tmp_path):
+    # The server answers but embeds nothing (e.g. it cannot decode these images)
+    embedder, _ = _failover(lambda *args, files=None, **kwargs: _Response(status_code=400))
+    assert embedder.embed_images([_thumbnail(tmp_path, "a.jpg"), b"not an image"]) == [[9.0], [9.0]]
+    assert embedder._usable(embedder.backends[0])
+
+    embedder, _ = _failover(lambda *args, files=None, **kwargs: _Response(count=0))
+    assert embedder.embed_images([_thumbnail(tmp_path, "a.jpg")]) == [[9.0]]
+    assert embedder._usable(embedder.backends[0])
+
+
+def test_unavailable_local_backend_goes_on_cooldown():
+    class Broken(ImageEmbeddingBackend):
+        name = "broken"
+
+        def embed_images(self, images):
+            raise BackendUnavailable("model not downloaded")
+
+    local = _Local()
+    embedder = FailoverImageEmbedder([Broken(), local], cooldown=60)
+    assert embedder.embed_images([b"x"]) == [[9.0]]
+    assert not embedder._usable(embedder.backends[0])
+    assert embedder.embed_images([b"y"]) == [[9.0]]
+    assert local.calls == 2
+
+
+def test_local_backend_is_opt_in(monkeypatch):
+    from video_ingest_tool import image_embedding_backends
+    from video_ingest_tool.search import VideoSearcher
+
+    assert image_embedding_backends.backend_names(" remote , local,") == ("remote", "local")
+    searcher = VideoSearcher.__new__(VideoSearcher)
+    monkeypatch.setattr(image_embedding_backends, "IMAGE_EMBEDDING_BACKENDS", "remote")
+    assert image_embedding_backends.backend_names() == ("remote",)
+    # Remote thumbnail vectors are not ranked by a local text tower unless local is opted in
+    assert searcher._thumbnail_text_backend() is None
+
+    local = _Local()
+    local.is_available = lambda: True
+    monkeypatch.setattr(image_embedding_backends, "IMAGE_EMBEDDING_BACKENDS", "remote,local")
+    monkeypatch.setattr(image_embedding_backends, "get_image_embedding_backend", lambda name: local)
+    assert searcher._thumbnail_text_backend() is local
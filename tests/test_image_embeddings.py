@@ -0,0 +1,53 @@
+"""Tests for batched thumbnail embedding."""
+
+import requests
+from PIL import Image
+
+from video_ingest_tool.embeddings_image import ImageEmbeddingClient, batch_generate_thumbnail_embeddings
+
+
+class _Response:
+    def __init__(self, status_code=200, count=0):
+        self.status_code = status_code
+        self.count = count
+        self.headers = {"Content-Type": "application/json"}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code), response=self)
+
+    def json(self):
+        return {"data": [{"index": i, "embedding": [float(i)]} for i in range(self.count)]}
+
+
+def _client(post):
+    client = ImageEmbeddingClient(api_base="http://embeddings.test", batch_size=8)
+    client.session.post = post
+    return client
+
+
+def _thumbnail(tmp_path, name):
+    path = tmp_path / name
+    Image.new("RGB", (8, 8), "red").save(path)
+    return str(path)
+
+
+def test_missing_thumbnails_come_back_as_none(tmp_path):
+    sent = []
+
+    def post(url, files=None, **kwargs):
+        sent.append([name for _, (name, _) in files])
+        return _Response(count=len(files))
+
+    client = _client(post)
+    assert batch_generate_thumbnail_embeddings(
+        [{"path": "/nonexistent.jpg", "description": "x", "rank": 1}], client=client
+    ) == {1: None}
+    assert sent == []
+
+    good = _thumbnail(tmp_path, "good.jpg")
+    embeddings = client.embed_images([good, "/nonexistent.jpg", good])
+    # Only the readable images are sent, and results land in their original slots
+    assert sent == [["0.jpg", "1.jpg"]]
+    assert embeddings == [[0.0], None, [1.0]]
+
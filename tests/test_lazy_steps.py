@@ -0,0 +1,74 @@
+"""Tests for pipeline steps declared before their implementation is imported."""
+
+import json
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from video_ingest_tool.pipeline.base import ProcessingStep
+from video_ingest_tool.pipeline.registry import declare_step, get_all_steps, get_pipeline
+
+
+@pytest.fixture
+def step_module(tmp_path, monkeypatch):
+    """Write a throwaway step module and return its dotted name."""
+    def write(name, body):
+        (tmp_path / f"{name}.py").write_text(textwrap.dedent(body))
+        return name
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return write
+
+
+def test_declared_step_binds_on_first_run(step_module, request):
+    pipeline_name = request.node.name
+    module = step_module("lazy_step_impl", f"""
+        from video_ingest_tool.pipeline.registry import register_step
+
+        @register_step("double", enabled=False, pipeline_name={pipeline_name!r})
+        def double(data, logger=None):
+            return {{"value": data["value"] * 2}}
+    """)
+    declare_step("double", module, description="Double the value", pipeline_name=pipeline_name)
+    declare_step("after", "unused_module", pipeline_name=pipeline_name)
+    assert module not in sys.modules
+
+    listed = get_all_steps(pipeline_name)
+    assert [(s["name"], s["enabled"], s["description"]) for s in listed] == [
+        ("double", True, "Double the value"), ("after", True, ""),
+    ]
+
+    pipeline = get_pipeline(pipeline_name)
+    step = pipeline.get_step("double")
+    pipeline.disable_step("after")
+    # Extra keyword arguments are filtered out once the signature is known
+    assert step.execute({"value": 21}, logger=None, unrelated=1) == {"value": 42}
+    assert step.loaded and module in sys.modules
+    # Binding kept the declared position and state instead of re-adding the step
+    assert [(s.name, s.enabled) for s in pipeline.steps] == [("double", True), ("after", False)]
+
+
+def test_module_that_does_not_register_the_step(step_module):
+    step = ProcessingStep("missing", module=step_module("lazy_step_empty", "VALUE = 1\n"))
+    with pytest.raises(RuntimeError, match="did not register step 'missing'"):
+        step.execute({})
+
+
+def test_step_needs_a_function_or_module():
+    with pytest.raises(ValueError):
+        ProcessingStep("nothing")
+
+
+def test_listing_steps_skips_heavy_imports():
+    code = textwrap.dedent("""
+        import json, sys
+        import video_ingest_tool.steps
+        from video_ingest_tool.pipeline.registry import get_all_steps
+        heavy = ["torch", "cv2", "av", "google.genai", "supabase", "transformers"]
+        print(json.dumps({"steps": len(get_all_steps()), "loaded": [m for m in heavy if m in sys.modules]}))
+    """)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report == {"steps": 21, "loaded": []}
@@ -0,0 +1,88 @@
+"""Tests for log sampling (RateLimitFilter) and the non-blocking queue handler."""
+
+import logging
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from video_ingest_tool.config import logging as log_config
+from video_ingest_tool.config.logging import NonBlockingQueueHandler, RateLimitFilter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(log_config, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def _record(msg, level=logging.INFO, name="video_ingest_tool.processor", args=()):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_repeats_beyond_the_limit_are_suppressed_per_message(clock):
+    sampler = RateLimitFilter(limit=3, window=10)
+    passed = [sampler.filter(_record("Extracting frame %d", args=(i,))) for i in range(5)]
+    assert passed == [True, True, True, False, False]
+    assert sampler.suppressed_total == 2
+    # A different message or logger has its own budget
+    assert sampler.filter(_record("Uploading thumbnail"))
+    assert sampler.filter(_record("Extracting frame %d", name="other", args=(1,)))
+
+
+def test_warnings_are_never_sampled(clock):
+    sampler = RateLimitFilter(limit=1, window=10)
+    assert sampler.filter(_record("Retrying"))
+    assert all(sampler.filter(_record("Retrying", level=logging.WARNING)) for _ in range(5))
+    assert all(sampler.filter(_record("Retrying", level=logging.ERROR)) for _ in range(5))
+    assert sampler.suppressed_total == 0
+
+
+def test_next_window_reports_what_was_suppressed(clock):
+    sampler = RateLimitFilter(limit=2, window=10)
+    for _ in range(5):
+        sampler.filter(_record("Polling"))
+    clock.now += 10
+    record = _record("Polling")
+    assert sampler.filter(record)
+    assert record.getMessage() == "Polling (3 similar messages suppressed)"
+    # Only the first record of the window carries the note
+    following = _record("Polling")
+    assert sampler.filter(following) and following.getMessage() == "Polling"
+
+
+def test_structlog_events_are_keyed_by_event(clock):
+    sampler = RateLimitFilter(limit=1, window=10)
+    assert sampler.filter(_record({"event": "File ready", "path": "/a.mov"}))
+    assert not sampler.filter(_record({"event": "File ready", "path": "/b.mov"}))
+    clock.now += 11
+    record = _record({"event": "File ready", "path": "/c.mov"})
+    assert sampler.filter(record)
+    assert record.msg == {"event": "File ready", "path": "/c.mov", "suppressed_similar": 1}
+
+
+def test_zero_limit_disables_sampling(clock):
+    sampler = RateLimitFilter(limit=0, window=10)
+    assert all(sampler.filter(_record("Polling")) for _ in range(100))
+
+
+def test_full_queue_drops_info_but_not_warnings():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(_record("first"))
+    handler.handle(_record("dropped"))
+    assert handler.dropped == 1
+    record = handler.queue.get_nowait()
+    # Records are queued unformatted; the listener thread formats them
+    assert record.msg == "first"
+
+    handler.handle(_record("kept", level=logging.WARNING))
+    assert handler.queue.get_nowait().msg == "kept"
@@ -0,0 +1,54 @@
+"""Tests for per-step resource sampling and the per-run step summary."""
+
+import threading
+import time
+
+import pytest
+
+from video_ingest_tool.pipeline.metrics import RunMetrics, measure, percentile, sample
+
+
+def _metrics(wall, cpu=0.0, read=0, rss=100):
+    return {"wall_s": wall, "cpu_s": cpu, "read_bytes": read, "write_bytes": 0, "rss_delta": 0, "rss": rss}
+
+
+def test_percentile_interpolates():
+    assert percentile([5.0], 95) == 5.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.5
+    assert percentile(list(range(101)), 95) == 95
+
+
+def test_summary_aggregates_per_step_in_execution_order():
+    run = RunMetrics(run_id="run_1")
+    for i, wall in enumerate([1.0, 2.0, 3.0, 4.0]):
+        run.record(f"/card/{i}.mov", "checksum", _metrics(wall, read=10_000_000, rss=100 + i))
+        run.record(f"/card/{i}.mov", "ffprobe", _metrics(0.5), error="boom" if i == 3 else None)
+
+    summary = run.summary()
+    assert list(summary) == ["checksum", "ffprobe"]
+    checksum = summary["checksum"]
+    assert checksum["count"] == 4 and checksum["errors"] == 0
+    assert checksum["wall_s_p50"] == 2.5
+    assert checksum["wall_s_p95"] == pytest.approx(3.85)
+    assert checksum["wall_s_total"] == 10.0
+    assert checksum["rss_peak"] == 103
+    # 40 MB read over 10 s of step time
+    assert checksum["read_mb_per_s"] == 4.0
+    assert summary["ffprobe"]["errors"] == 1
+    assert run.file_metrics("/card/3.mov")[1]["error"] == "boom"
+
+
+def test_samples_include_helper_thread_cpu():
+    def spin():
+        end = time.thread_time() + 0.2
+        while time.thread_time() < end:
+            pass
+
+    before = sample()
+    helper = threading.Thread(target=spin)
+    helper.start()
+    helper.join()
+    usage = measure(before)
+    # The step's own thread only waited; the CPU was spent by the helper
+    assert usage["cpu_s"] >= 0.15
+    assert usage["wall_s"] >= usage["cpu_s"] * 0.5
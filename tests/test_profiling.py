@@ -0,0 +1,106 @@
+"""Tests for the folded-stack output of StepProfiler."""
+
+import json
+import os
+import time
+
+import pytest
+
+from video_ingest_tool.pipeline import PROFILE_MODES, ProcessingPipeline, ProcessingStep, StepProfiler
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _wait(seconds):
+    time.sleep(seconds)
+
+
+def busy_step(data):
+    _spin(0.15)
+
+
+def idle_step(data):
+    _wait(0.15)
+
+
+def retain_step(data):
+    return {"retained": [bytearray(1024) for _ in range(512)]}
+
+
+def _run(profiler, *funcs, files=("a.mov",)):
+    pipeline = ProcessingPipeline()
+    for func in funcs:
+        pipeline.add_step(ProcessingStep(func.__name__, func))
+    for path in files:
+        pipeline.execute_pipeline({"file_path": path}, hooks=[profiler])
+
+
+def _folded(path):
+    """Parse a folded file into {stack: weight}, checking the line format."""
+    stacks = {}
+    with open(path) as f:
+        for line in f:
+            stack, _, weight = line.rstrip("\n").rpartition(" ")
+            assert stack and weight.isdigit() and int(weight) > 0, line
+            assert stack not in stacks
+            stacks[stack] = int(weight)
+    return stacks
+
+
+@pytest.mark.parametrize("mode", ["wall", "cpu"])
+def test_sampled_stacks_are_folded_per_step_and_per_run(tmp_path, mode):
+    profiler = StepProfiler(mode=mode, interval=0.002)
+    _run(profiler, busy_step, idle_step)
+    profile_dir = profiler.write(str(tmp_path))
+
+    busy = _folded(os.path.join(profile_dir, "busy_step.folded"))
+    # Stacks start at the step function, below the pipeline's own frames
+    assert all(stack.split(";")[0].startswith("busy_step (") for stack in busy)
+    assert any(stack.split(";")[-1].startswith("_spin (") for stack in busy)
+
+    run = _folded(os.path.join(profile_dir, "run.folded"))
+    assert {stack.split(";")[0] for stack in run} <= {"step:busy_step", "step:idle_step"}
+    assert sum(w for s, w in run.items() if s.startswith("step:busy_step;")) == sum(busy.values())
+
+    summary = json.load(open(os.path.join(profile_dir, "profile.json")))
+    assert summary["mode"] == profiler.mode and summary["unit"] == "microseconds"
+    idle_weight = summary["steps"]["idle_step"]["weight_total"]
+    # Sleeping counts as wall time but (almost) no CPU time
+    if profiler.mode == "wall":
+        assert idle_weight > 100_000
+    else:
+        assert idle_weight < 50_000
+    assert summary["steps"]["busy_step"]["weight_total"] > 100_000
+
+
+def test_only_selected_steps_are_profiled(tmp_path):
+    profiler = StepProfiler(mode="wall", steps=["idle_step"], interval=0.002)
+    _run(profiler, busy_step, idle_step)
+    profile_dir = profiler.write(str(tmp_path))
+    assert set(json.load(open(os.path.join(profile_dir, "profile.json")))["steps"]) == {"idle_step"}
+    assert not os.path.exists(os.path.join(profile_dir, "busy_step.folded"))
+
+
+def test_memory_mode_folds_retained_allocations(tmp_path):
+    profiler = StepProfiler(mode="memory")
+    _run(profiler, retain_step, files=("a.mov", "b.mov"))
+    profile_dir = profiler.write(str(tmp_path))
+
+    stacks = _folded(os.path.join(profile_dir, "retain_step.alloc.folded"))
+    assert any("test_profiling.py" in stack.split(";")[-1] for stack in stacks)
+    assert sum(stacks.values()) >= 2 * 512 * 1024
+    summary = json.load(open(os.path.join(profile_dir, "profile.json")))
+    step = summary["steps"]["retain_step"]
+    assert summary["unit"] == "bytes" and step["files"] == 2
+    assert step["retained_bytes_max"] >= 512 * 1024
+    assert os.path.exists(os.path.join(profile_dir, step["top"]))
+    assert os.path.exists(os.path.join(profile_dir, step["snapshot"]))
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match=", ".join(PROFILE_MODES)):
+        StepProfiler(mode="gpu")
@@ -0,0 +1,96 @@
+"""Tests for the SQLite run catalog and its pass-through JSON responses."""
+
+import json
+
+import pytest
+
+from video_ingest_tool.run_catalog import MAX_LIMIT, RunCatalog, docs_to_json
+
+
+def _processed(clip_id, checksum, category, processed_at):
+    entry = {"status": "processed", "id": clip_id, "file_path": f"/card/{clip_id}.mov",
+             "file_name": f"{clip_id}.mov", "checksum": checksum, "size_bytes": 10, "duration_seconds": 1.5}
+    doc = json.dumps({"id": clip_id, "category": category}).encode()
+    return entry, doc
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = RunCatalog(str(tmp_path / "catalog.db"))
+    for run_id, clip_id, checksum, category, processed_at in [
+        ("run_1", "a", "s1", "Vlog", "2024-05-01T10:00:00"),
+        ("run_1", "b", "s2", "Interview", "2024-05-01T11:00:00"),
+        ("run_2", "c", "s1", "Vlog", "2024-05-02T09:00:00"),
+        ("run_2", "d", "s3", None, "2024-05-02T10:00:00"),
+    ]:
+        entry, doc = _processed(clip_id, checksum, category, processed_at)
+        catalog.record(run_id, entry, doc, category=category, processed_at=processed_at)
+    catalog.record("run_2", {"status": "skipped", "file_path": "/card/a.mov", "reason": "duplicate"},
+                   processed_at="2024-05-02T10:30:00")
+    catalog.record("run_2", {"status": "failed", "file_path": "/card/e.mov", "error": "boom"},
+                   processed_at="2024-05-02T11:00:00")
+    yield catalog
+    catalog.close()
+
+
+def _ids(docs):
+    return [json.loads(doc)["id"] for doc in docs]
+
+
+def test_query_docs_returns_processed_results_newest_first(catalog):
+    assert _ids(catalog.query_docs()) == ["d", "c", "b", "a"]
+    assert _ids(catalog.query_docs(limit=2, offset=1)) == ["c", "b"]
+    assert _ids(catalog.query_docs(since="2024-05-02")) == ["d", "c"]
+
+
+def test_query_docs_filters(catalog):
+    assert _ids(catalog.query_docs(checksum="s1")) == ["c", "a"]
+    assert _ids(catalog.query_docs(category="Vlog", run_id="run_1")) == ["a"]
+    assert _ids(catalog.query_docs(clip_id="b")) == ["b"]
+    # None means "don't filter", not "IS NULL"
+    assert _ids(catalog.query_docs(category=None)) == ["d", "c", "b", "a"]
+    with pytest.raises(ValueError):
+        catalog.query_docs(doc="anything")
+
+
+def test_entries_counts_and_runs(catalog):
+    entries = catalog.query_entries(run_id="run_2")
+    assert [entry["status"] for entry in entries] == ["failed", "skipped", "processed", "processed"]
+    assert entries[0]["run_id"] == "run_2" and entries[0]["error"] == "boom"
+    assert catalog.count() == 6
+    assert catalog.count(status="processed", since="2024-05-02") == 2
+    assert catalog.runs() == [
+        {"run_id": "run_2", "first_processed_at": "2024-05-02T09:00:00", "last_processed_at": "2024-05-02T11:00:00",
+         "processed": 2, "skipped": 1, "failed": 1},
+        {"run_id": "run_1", "first_processed_at": "2024-05-01T10:00:00", "last_processed_at": "2024-05-01T11:00:00",
+         "processed": 2, "skipped": 0, "failed": 0},
+    ]
+
+
+def test_recording_a_file_again_in_the_same_run_replaces_it(catalog):
+    entry, _ = _processed("a", "s1", "Vlog", None)
+    catalog.record("run_1", {**entry, "status": "failed", "error": "retry failed"}, processed_at="2024-05-03T00:00:00")
+    assert catalog.count(run_id="run_1") == 2
+    assert _ids(catalog.query_docs(run_id="run_1")) == ["b"]
+
+
+def test_limits_are_clamped(catalog):
+    assert len(catalog.query_docs(limit=0)) == 1
+    assert len(catalog.query_docs(limit=MAX_LIMIT * 10, offset=-5)) == 4
+
+
+def test_catalog_is_shared_between_connections(catalog):
+    reopened = RunCatalog(catalog.path)
+    try:
+        assert reopened.count() == 6
+    finally:
+        reopened.close()
+
+
+def test_docs_to_json_embeds_documents_unparsed():
+    docs = ['{"id": "a", "nested": {"x": [1, 2]}}', '{"id": "b"}']
+    assert json.loads(docs_to_json(docs, count=2, source="catalog")) == {
+        "results": [{"id": "a", "nested": {"x": [1, 2]}}, {"id": "b"}], "count": 2, "source": "catalog",
+    }
+    assert json.loads(docs_to_json([])) == {"results": []}
+    assert json.loads(docs_to_json([], next_offset=None)) == {"results": [], "next_offset": None}
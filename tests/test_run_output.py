@@ -0,0 +1,90 @@
+"""Tests for streaming run output (RunOutputWriter) and reading it back."""
+
+import json
+
+from video_ingest_tool.output import RunOutputWriter, iter_run_index, iter_run_results, load_run_result
+from video_ingest_tool.run_catalog import RunCatalog
+
+
+def _result(clip_id, category="Vlog"):
+    return {
+        "id": clip_id,
+        "file_info": {"file_path": f"/card/{clip_id}.mov", "file_name": f"{clip_id}.mov",
+                      "file_checksum": f"sum-{clip_id}", "file_size_bytes": 100,
+                      "processed_at": "2024-05-01T10:00:00"},
+        "video": {"duration_seconds": 12.5},
+        "analysis": {"ai_analysis": {"summary": {"content_category": category}}},
+    }
+
+
+def test_results_and_index_round_trip(tmp_path):
+    with RunOutputWriter(str(tmp_path / "run_1"), "run_summary.json") as writer:
+        first = writer.add_result(_result("a"))
+        writer.add_skipped("/card/dup.mov", reason="duplicate", existing_clip_id="a")
+        writer.add_result(_result("b"))
+        writer.add_failed("/card/bad.mov", "ffprobe failed")
+    assert writer.counts == {"processed": 2, "skipped": 1, "failed": 1}
+    assert writer.results_path.endswith("run_summary.jsonl")
+
+    assert [result["id"] for result in iter_run_results(writer.results_path)] == ["a", "b"]
+    assert [entry["status"] for entry in iter_run_index(writer.index_path)] == [
+        "processed", "skipped", "processed", "failed",
+    ]
+    failed = list(iter_run_index(writer.index_path, status="failed"))
+    assert failed == [{"status": "failed", "file_path": "/card/bad.mov", "error": "ffprobe failed"}]
+    assert first["checksum"] == "sum-a" and first["offset"] == 0
+    processed = list(iter_run_index(writer.index_path, status="processed"))
+    assert load_run_result(writer.results_path, processed[0]) == _result("a")
+    assert load_run_result(writer.results_path, processed[1])["id"] == "b"
+
+
+def test_torn_last_lines_are_skipped(tmp_path):
+    writer = RunOutputWriter(str(tmp_path / "run_1"), "run_summary")
+    writer.add_result(_result("a"))
+    writer.add_failed("/card/bad.mov", "boom")
+    writer.close()
+    # A crash mid-write leaves a partial line without its newline
+    with open(writer.results_path, "ab") as f:
+        f.write(json.dumps(_result("b")).encode()[:40])
+    with open(writer.index_path, "ab") as f:
+        f.write(b'{"status": "proc')
+
+    assert [result["id"] for result in iter_run_results(writer.results_path)] == ["a"]
+    assert [entry["status"] for entry in iter_run_index(writer.index_path)] == ["processed", "failed"]
+
+
+def test_reopened_writer_appends(tmp_path):
+    run_dir = str(tmp_path / "run_1")
+    with RunOutputWriter(run_dir, "run_summary") as writer:
+        writer.add_result(_result("a"))
+    with RunOutputWriter(run_dir, "run_summary") as writer:
+        entry = writer.add_result(_result("b"))
+    assert [result["id"] for result in iter_run_results(writer.results_path)] == ["a", "b"]
+    assert load_run_result(writer.results_path, entry)["id"] == "b"
+
+
+def test_writer_records_every_entry_in_the_catalog(tmp_path):
+    catalog = RunCatalog(str(tmp_path / "catalog.db"))
+    with RunOutputWriter(str(tmp_path / "run_7"), "run_summary", catalog=catalog) as writer:
+        writer.add_result(_result("a", category="Interview"))
+        writer.add_skipped("/card/dup.mov", reason="duplicate")
+        writer.add_failed("/card/bad.mov", "boom")
+
+    assert [json.loads(doc)["id"] for doc in catalog.query_docs(run_id="run_7")] == ["a"]
+    assert catalog.query_docs(category="Interview", checksum="sum-a")
+    assert catalog.count(run_id="run_7") == 3
+    assert catalog.count(status="failed") == 1
+    catalog.close()
+
+
+class _BrokenCatalog:
+    def record(self, *args, **kwargs):
+        raise OSError("disk full")
+
+
+def test_catalog_failures_do_not_lose_run_output(tmp_path):
+    with RunOutputWriter(str(tmp_path / "run_1"), "run_summary", catalog=_BrokenCatalog()) as writer:
+        writer.add_result(_result("a"))
+        writer.add_failed("/card/bad.mov", "boom")
+    assert writer.counts == {"processed": 1, "skipped": 0, "failed": 1}
+    assert [result["id"] for result in iter_run_results(writer.results_path)] == ["a"]
@@ -0,0 +1,269 @@
+"""Tests for keyset pagination (cursors and filters) and reciprocal rank fusion."""
+
+import pytest
+
+from video_ingest_tool import search
+from video_ingest_tool.search import (
+    VideoSearcher,
+    _keyset_filter,
+    decode_cursor,
+    encode_cursor,
+    reciprocal_rank_fusion,
+)
+
+
+def _split(text):
+    """Split a PostgREST logic tree at top-level commas."""
+    parts, depth, quoted, start, i = [], 0, False, 0, 0
+    while i < len(text):
+        char = text[i]
+        if quoted and char == "\\":
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return parts
+
+
+def _matches(condition, row):
+    """Evaluate one condition of the filters _keyset_filter builds, as PostgREST would."""
+    if condition.startswith("and(") and condition.endswith(")"):
+        return all(_matches(part, row) for part in _split(condition[4:-1]))
+    if condition.endswith(".not.is.null"):
+        return row[condition[:-len(".not.is.null")]] is not None
+    if condition.endswith(".is.null"):
+        return row[condition[:-len(".is.null")]] is None
+    column, op, quoted = condition.split(".", 2)
+    assert quoted.startswith('"') and quoted.endswith('"'), condition
+    value = quoted[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    cell = row[column]
+    if cell is None:
+        # NULL compares as unknown, so the condition fails
+        return False
+    if isinstance(cell, (int, float)):
+        value = float(value)
+    return {"lt": cell < value, "gt": cell > value, "eq": cell == value}[op]
+
+
+def _postgres_order(rows, sort_by, descending):
+    """ORDER BY sort_by, id with Postgres' default NULL placement (first for DESC, last for ASC)."""
+    present = sorted((r for r in rows if r[sort_by] is not None), key=lambda r: (r[sort_by], r["id"]),
+                     reverse=descending)
+    missing = sorted((r for r in rows if r[sort_by] is None), key=lambda r: r["id"], reverse=descending)
+    return missing + present if descending else present + missing
+
+
+class _Result:
+    def __init__(self, data, count):
+        self.data = data
+        self.count = count
+
+
+class _FakeClipsQuery:
+    """The slice of the PostgREST query builder list_videos_page uses."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.sort = []
+        self.limit_rows = None
+        self.offset_rows = 0
+        self.count = None
+
+    def from_(self, table):
+        assert table == "clips"
+        return self
+
+    def select(self, projection, count=None):
+        self.count = count
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row[column] == value)
+        return self
+
+    def or_(self, expression):
+        self.filters.append(lambda row: any(_matches(part, row) for part in _split(expression)))
+        return self
+
+    def order(self, column, desc=False):
+        self.sort.append((column, desc))
+        return self
+
+    def limit(self, rows):
+        self.limit_rows = rows
+        return self
+
+    def offset(self, rows):
+        self.offset_rows = rows
+        return self
+
+    def execute(self):
+        rows = [row for row in self.rows if all(f(row) for f in self.filters)]
+        (sort_by, descending), (tiebreak, _) = self.sort
+        assert tiebreak == "id"
+        rows = _postgres_order(rows, sort_by, descending)
+        total = len(rows)
+        rows = rows[self.offset_rows:self.offset_rows + self.limit_rows]
+        return _Result([dict(row) for row in rows], total if self.count else None)
+
+
+class _FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def from_(self, table):
+        return _FakeClipsQuery(self.rows).from_(table)
+
+
+def _searcher(rows):
+    searcher = VideoSearcher.__new__(VideoSearcher)
+    searcher.local = False
+    searcher._get_authenticated_client = lambda: _FakeClient(rows)
+    searcher._get_current_user_id = lambda: "user"
+    return searcher
+
+
+# Duplicate sort values and NULLs on both sides of the page boundaries
+CLIPS = [
+    {
+        "id": f"clip-{i:02d}",
+        "user_id": "user",
+        "file_name": f'take "{i % 4}"\\{i % 3}.mov',
+        "duration_seconds": None if i % 5 == 0 else float(i % 6),
+        "processed_at": None if i % 7 == 3 else f"2024-05-{1 + i % 4:02d}T10:00:00",
+    }
+    for i in range(23)
+] + [{"id": "other", "user_id": "someone-else", "file_name": "x.mov", "duration_seconds": 1.0,
+      "processed_at": "2024-05-01T10:00:00"}]
+
+
+@pytest.mark.parametrize("sort_by", ["duration_seconds", "file_name", "processed_at"])
+@pytest.mark.parametrize("sort_order", ["ascending", "descending"])
+def test_cursor_pages_cover_every_row_once(sort_by, sort_order):
+    searcher = _searcher(CLIPS)
+    seen, cursor = [], None
+    for _ in range(20):
+        page = searcher.list_videos_page(sort_by=sort_by, sort_order=sort_order, limit=4, cursor=cursor)
+        assert len(page["results"]) <= 4
+        seen.extend(row["id"] for row in page["results"])
+        cursor = page["next_cursor"]
+        assert page["has_more"] == (cursor is not None)
+        if cursor is None:
+            break
+
+    users_clips = [row for row in CLIPS if row["user_id"] == "user"]
+    expected = [row["id"] for row in _postgres_order(users_clips, sort_by, sort_order == "descending")]
+    assert seen == expected
+
+
+def test_last_page_has_no_cursor():
+    page = _searcher(CLIPS[:3]).list_videos_page(limit=3, count="exact")
+    assert page["has_more"] is False
+    assert page["next_cursor"] is None
+    assert page["total"] == 3
+
+
+def test_offset_applies_only_without_a_cursor():
+    searcher = _searcher(CLIPS)
+    first = searcher.list_videos_page(sort_by="file_name", sort_order="ascending", limit=5)
+    by_offset = searcher.list_videos_page(sort_by="file_name", sort_order="ascending", limit=5, offset=5)
+    by_cursor = searcher.list_videos_page(sort_by="file_name", sort_order="ascending", limit=5, offset=5,
+                                          cursor=first["next_cursor"])
+    assert by_offset["results"] == by_cursor["results"]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("duration_seconds", "descending", {"id": "clip-1", "duration_seconds": None})
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "duration_seconds", "descending") == {
+        "s": "duration_seconds", "o": "descending", "v": None, "id": "clip-1",
+    }
+
+
+def test_cursor_rejects_other_orderings_and_garbage():
+    cursor = encode_cursor("file_name", "ascending", {"id": "clip-1", "file_name": "a.mov"})
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "file_name", "descending")
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "processed_at", "ascending")
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!", "file_name", "ascending")
+    with pytest.raises(ValueError):
+        _searcher(CLIPS).list_videos_page(sort_by="file_name", sort_order="descending", cursor=cursor)
+
+
+def test_keyset_filter_null_handling():
+    # ASC: NULLs sort last, so rows after a non-NULL value include every NULL row
+    assert _keyset_filter("duration_seconds", False, 3.0, "c5") == \
+        'duration_seconds.gt."3.0",and(duration_seconds.eq."3.0",id.gt."c5"),duration_seconds.is.null'
+    # DESC: NULLs sort first, so rows after the NULL block include every non-NULL row
+    assert _keyset_filter("duration_seconds", True, None, "c5") == \
+        'and(duration_seconds.is.null,id.lt."c5"),duration_seconds.not.is.null'
+    assert _keyset_filter("duration_seconds", True, 3.0, "c5") == \
+        'duration_seconds.lt."3.0",and(duration_seconds.eq."3.0",id.lt."c5")'
+    assert _keyset_filter("duration_seconds", False, None, "c5") == 'and(duration_seconds.is.null,id.gt."c5")'
+
+
+def test_keyset_filter_quotes_values():
+    assert _keyset_filter("file_name", False, 'a "b"\\c,d', "id,1") == (
+        'file_name.gt."a \\"b\\"\\\\c,d",and(file_name.eq."a \\"b\\"\\\\c,d",id.gt."id,1"),file_name.is.null'
+    )
+
+
+def test_reciprocal_rank_fusion_scores():
+    fused = reciprocal_rank_fusion(
+        {"fulltext": ["a", "b", "c"], "summary": ["b", "d"]},
+        {"fulltext": 1.0, "summary": 2.0},
+        k=10,
+    )
+    scores = {clip_id: score for clip_id, score, _ in fused}
+    assert [clip_id for clip_id, _, _ in fused] == ["b", "d", "a", "c"]
+    assert scores["b"] == pytest.approx(1.0 / 12 + 2.0 / 11)
+    assert scores["d"] == pytest.approx(2.0 / 12)
+    assert scores["c"] == pytest.approx(1.0 / 13)
+    assert dict((clip_id, ranks) for clip_id, _, ranks in fused)["b"] == {"fulltext": 2, "summary": 1}
+
+
+def test_reciprocal_rank_fusion_edge_cases():
+    assert reciprocal_rank_fusion({}, {}) == []
+    assert reciprocal_rank_fusion({"fulltext": []}, {"fulltext": 1.0}) == []
+    # Missing weights count as 0; a repeated ID keeps its first rank; ties keep first-seen order
+    fused = reciprocal_rank_fusion({"fulltext": ["a", "b", "a"], "thumbnail": ["c"]}, {"fulltext": 1.0}, k=50)
+    assert [(clip_id, ranks) for clip_id, _, ranks in fused] == [
+        ("a", {"fulltext": 1}), ("b", {"fulltext": 2}), ("c", {"thumbnail": 1}),
+    ]
+    assert fused[2][1] == 0.0
+
+
+def test_remote_fusion_leaves_out_the_keyword_retriever(monkeypatch):
+    monkeypatch.setattr(search, "generate_embeddings", lambda summary, keyword: ([1.0], [2.0]))
+    searcher = _searcher([])
+    calls = []
+
+    def rpc(client, name, params, profile=None):
+        calls.append((name, params))
+        if name == "fulltext_search_clips":
+            return [{"id": "b", "fts_rank": 0.5}]
+        return [
+            {"id": "a", "summary_similarity": 0.9, "keyword_similarity": 0.5},
+            {"id": "b", "summary_similarity": 0.8, "keyword_similarity": 0.99},
+        ]
+
+    searcher._call_search_rpc = rpc
+    params = {"summary_weight": 1.0, "keyword_weight": 1.0, "fulltext_weight": 1.0, "similarity_threshold": 0.1}
+    results = searcher._fused_search(None, "user", "sunset", 5, params)
+
+    assert [name for name, _ in calls].count("semantic_search_clips") == 1
+    assert [row["id"] for row in results] == ["b", "a"]
+    assert results[0]["retriever_ranks"] == {"fulltext": 1, "summary": 2}
+    assert all("keyword" not in row["retriever_ranks"] for row in results)
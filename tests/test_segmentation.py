@@ -0,0 +1,111 @@
+"""Tests for planning and merging segmented AI analysis of long clips."""
+
+import pytest
+
+from video_ingest_tool.video_processor.segmentation import format_timestamp, merge_segment_analyses, plan_segments
+
+
+def _check_coverage(windows, duration, overlap):
+    assert windows[0]["start"] == 0.0 and windows[-1]["end"] == duration
+    assert windows[0]["own_start"] == 0.0 and windows[-1]["own_end"] == duration
+    for window, following in zip(windows, windows[1:]):
+        assert following["start"] > window["start"]
+        assert window["end"] - following["start"] >= overlap - 1e-9
+        # Ownership splits the overlap, so every instant belongs to exactly one window
+        assert window["own_end"] == following["own_start"]
+        assert following["start"] <= window["own_end"] <= window["end"]
+
+
+def test_windows_start_on_keyframes():
+    keyframes = [i * 2.0 for i in range(600)]
+    windows = plan_segments(1190.0, keyframes, segment_seconds=300, overlap_seconds=15)
+    _check_coverage(windows, 1190.0, 15)
+    assert all(window["keyframe"] for window in windows)
+    assert all(window["start"] in keyframes for window in windows)
+    assert [window["start"] for window in windows] == [0.0, 284.0, 568.0, 852.0]
+
+
+def test_windows_without_keyframes_are_flagged_for_reencoding():
+    windows = plan_segments(1000.0, [], segment_seconds=300, overlap_seconds=15)
+    _check_coverage(windows, 1000.0, 15)
+    assert [window["start"] for window in windows] == [0.0, 285.0, 570.0, 855.0]
+    assert [window["keyframe"] for window in windows] == [True, False, False, False]
+
+
+def test_short_tail_is_merged_into_the_last_window():
+    windows = plan_segments(620.0, [], segment_seconds=300, overlap_seconds=15)
+    assert [(window["start"], window["end"]) for window in windows] == [(0.0, 300.0), (285.0, 620.0)]
+
+
+@pytest.mark.parametrize("segment_seconds, overlap_seconds", [(15, 15), (10, 30), (0, 0), (300, -1)])
+def test_configs_that_cannot_advance_are_rejected(segment_seconds, overlap_seconds):
+    with pytest.raises(ValueError):
+        plan_segments(1000.0, [], segment_seconds=segment_seconds, overlap_seconds=overlap_seconds)
+
+
+def test_format_timestamp():
+    assert format_timestamp(3725.6) == "3725s600ms"
+    assert format_timestamp(-1) == "0s0ms"
+
+
+def _analysis(summary, segments, thumbnails=(), people=()):
+    return {
+        "summary": summary,
+        "visual_analysis": {
+            "technical_quality": {"usability_rating": "Good"},
+            "keyframe_analysis": {"recommended_thumbnails": list(thumbnails)},
+        },
+        "audio_analysis": {
+            "transcript": {"full_text": " ".join(s["text"] for s in segments), "segments": segments},
+            "speaker_analysis": {"speaker_count": 1, "speakers": [{"speaker_id": "A", "speaking_time_seconds": 10.0}]},
+        },
+        "content_analysis": {"entities": {"people_count": len(people), "people_details": list(people)}},
+    }
+
+
+def test_merge_offsets_timestamps_and_drops_overlap_duplicates():
+    windows = plan_segments(620.0, [], segment_seconds=300, overlap_seconds=20)
+    first, second = windows
+    assert (first["own_end"], second["start"]) == (290.0, 280.0)
+    results = [
+        (first, _analysis(
+            {"overall": "Part one.", "key_activities": ["walking"], "content_category": "Vlog"},
+            [{"timestamp": "10s", "text": "hello"}, {"timestamp": "285s", "text": "in the overlap"}],
+            thumbnails=[{"timestamp": "5s", "rank": "1", "description": "start"}],
+            people=[{"description": "Man in red", "appearances": [{"timestamp": "1s"}]}],
+        )),
+        (second, _analysis(
+            {"overall": "Part two.", "key_activities": ["walking", "talking"], "content_category": "Interview"},
+            [{"timestamp": "5s", "text": "in the overlap"}, {"timestamp": "20s", "text": "goodbye"}],
+            thumbnails=[{"timestamp": "100s", "rank": "1", "description": "end"}],
+            people=[{"description": "man in red", "appearances": [{"timestamp": "30s"}]}],
+        )),
+    ]
+
+    merged = merge_segment_analyses(results)
+
+    segments = merged["audio_analysis"]["transcript"]["segments"]
+    # 285s in the first window and 280s + 5s in the second are the same line; only the owner keeps it
+    assert [(s["timestamp"], s["text"]) for s in segments] == [
+        ("10s0ms", "hello"), ("285s0ms", "in the overlap"), ("300s0ms", "goodbye"),
+    ]
+    assert merged["audio_analysis"]["transcript"]["full_text"] == "hello in the overlap goodbye"
+    assert merged["summary"]["overall"] == "Part one. Part two."
+    assert merged["summary"]["key_activities"] == ["walking", "talking"]
+    # The second window owns more of the clip (290s-620s), so its category wins
+    assert merged["summary"]["content_category"] == "Interview"
+    thumbnails = merged["visual_analysis"]["keyframe_analysis"]["recommended_thumbnails"]
+    assert [(t["timestamp"], t["rank"]) for t in thumbnails] == [("5s0ms", "1"), ("380s0ms", "2")]
+    people = merged["content_analysis"]["entities"]["people_details"]
+    assert len(people) == 1
+    assert [a["timestamp"] for a in people[0]["appearances"]] == ["1s0ms", "310s0ms"]
+    assert merged["audio_analysis"]["speaker_analysis"]["speakers"] == [
+        {"speaker_id": "A", "speaking_time_seconds": 20.0},
+    ]
+
+
+def test_merge_uses_a_given_clip_summary():
+    window = plan_segments(100.0, [], segment_seconds=300, overlap_seconds=15)[0]
+    summary = {"overall": "Whole clip.", "key_activities": [], "content_category": "Other"}
+    merged = merge_segment_analyses([(window, _analysis({"overall": "Part."}, []))], summary=summary)
+    assert merged["summary"] is summary
@@ -0,0 +1,74 @@
+"""Tests for the cached encodings of output models shared by file, database and API output."""
+
+import json
+
+from pydantic import BaseModel
+
+from video_ingest_tool.models import VideoIngestOutput
+from video_ingest_tool.output import save_to_json
+from video_ingest_tool.serialization import dumps, loads, serialized
+
+
+def _model(file_name="a.mov"):
+    return VideoIngestOutput.model_validate({
+        "file_info": {"file_path": f"/card/{file_name}", "file_name": file_name, "file_checksum": "sum",
+                      "file_size_bytes": 1, "processed_at": "2024-05-01T10:00:00"},
+        "video": {"codec": {}, "resolution": {}, "color": {"hdr": {}}, "exposure": {}},
+        "camera": {"focal_length": {}, "settings": {}, "location": {}},
+        "analysis": {},
+    })
+
+
+def test_each_encoding_is_computed_once(monkeypatch):
+    calls = []
+    original = VideoIngestOutput.model_dump_json
+    monkeypatch.setattr(VideoIngestOutput, "model_dump_json",
+                        lambda self, **kw: calls.append(1) or original(self, **kw))
+    model = _model()
+    cached = serialized(model)
+    assert serialized(model) is cached and calls == []
+
+    assert loads(cached.json)["file_info"]["processed_at"] == "2024-05-01T10:00:00"
+    assert serialized(model).json is cached.json and len(calls) == 1
+    # The dict form is JSON-compatible: dates are already strings
+    assert json.loads(json.dumps(cached.data)) == cached.data
+
+
+def test_refresh_after_modifying_the_model():
+    model = _model()
+    before = serialized(model).data
+    model.thumbnails.append("thumb.jpg")
+    # Models are final once serialized: the cache is only rebuilt on request
+    assert serialized(model).data is before
+    assert serialized(model, refresh=True).data["thumbnails"] == ["thumb.jpg"]
+    assert loads(serialized(model).json)["thumbnails"] == ["thumb.jpg"]
+
+
+def test_copies_do_not_reuse_the_original_cache():
+    model = _model()
+    original = serialized(model).json
+    copy = model.model_copy(update={"thumbnails": ["other.jpg"]})
+    assert loads(serialized(copy).json)["thumbnails"] == ["other.jpg"]
+    assert serialized(model).json is original
+    assert loads(original)["thumbnails"] == []
+
+
+def test_models_without_a_cache_slot_are_encoded_fresh():
+    class Plain(BaseModel):
+        value: int
+
+    plain = Plain(value=1)
+    assert serialized(plain) is not serialized(plain)
+    assert loads(dumps(plain)) == {"value": 1}
+
+
+def test_file_output_uses_the_cached_bytes(tmp_path):
+    model = _model()
+    path = str(tmp_path / "json" / "a.json")
+    save_to_json(model, path)
+    with open(path, "rb") as f:
+        assert f.read() == serialized(model).json
+
+
+def test_dumps_handles_non_json_types():
+    assert loads(dumps({"big": 2 ** 70, 1: "key"})) == {"big": 2 ** 70, "1": "key"}
@@ -0,0 +1,114 @@
+"""Tests for SingleFlightCache coalescing, memoization and invalidation."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from video_ingest_tool.single_flight import SingleFlightCache
+
+
+def test_concurrent_callers_share_one_load():
+    cache = SingleFlightCache(ttl=60)
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return {"id": "clip"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("clip", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Let every caller reach the in-flight lookup before it finishes
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 7 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 8 and all(result is results[0] for result in results)
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["entries"]) == (1, 7, 1)
+
+
+def test_results_are_memoized_until_the_ttl_expires():
+    cache = SingleFlightCache(ttl=0.05)
+    values = iter(range(10))
+
+    assert cache.get_or_load("k", lambda: next(values)) == 0
+    assert cache.get_or_load("k", lambda: next(values)) == 0
+    assert cache.peek("k") == (True, 0)
+    time.sleep(0.06)
+    assert cache.peek("k") == (False, None)
+    assert cache.get_or_load("k", lambda: next(values)) == 1
+
+
+def test_failures_reach_every_caller_and_are_not_cached():
+    cache = SingleFlightCache(ttl=60)
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", failing)
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
+
+
+def test_full_invalidation_drops_entries_and_results_still_loading():
+    cache = SingleFlightCache(ttl=60)
+    cache.put("a", 1)
+
+    def loader():
+        # An ingest finished while this lookup was running
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_load("b", loader) == "stale"
+    assert cache.peek("a") == (False, None)
+    assert cache.peek("b") == (False, None)
+
+
+def test_invalidation_by_predicate():
+    cache = SingleFlightCache(ttl=60)
+    cache.put(("clip", "1"), 1)
+    cache.put(("clip", "2"), 2)
+    cache.put(("search", "cats"), 3)
+
+    assert cache.invalidate(lambda key: key[0] == "clip") == 2
+    assert cache.peek(("clip", "1"))[0] is False
+    assert cache.peek(("search", "cats")) == (True, 3)
+
+
+def test_max_entries_evicts_least_recently_used():
+    cache = SingleFlightCache(ttl=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.peek("a")
+    cache.put("c", 3)
+
+    assert cache.peek("b")[0] is False
+    assert cache.peek("a") == (True, 1)
+    assert cache.peek("c") == (True, 3)
+
+
+def test_async_callers_share_one_load():
+    cache = SingleFlightCache(ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_load("k", loader) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["value"] * 5
+    assert len(calls) == 1
+    assert cache.peek("k") == (True, "value")
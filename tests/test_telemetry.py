@@ -0,0 +1,123 @@
+"""Tests for the Prometheus text rendering behind the API servers' /metrics endpoint."""
+
+import re
+
+import pytest
+
+from video_ingest_tool import telemetry
+from video_ingest_tool.telemetry import Counter, Gauge, Histogram, Registry
+
+# One sample line of the text exposition format: name{labels} value
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? '
+                    r'(-?[0-9.e+-]+|[+-]Inf|NaN)$')
+
+
+def _check_format(text):
+    """Every line is HELP/TYPE or a sample, and each metric's TYPE precedes its samples."""
+    assert text.endswith("\n")
+    typed = set()
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            name = line.split()[2]
+            assert name not in typed, f"duplicate TYPE for {name}"
+            typed.add(name)
+            continue
+        assert SAMPLE.match(line), line
+        name = re.split(r"[{ ]", line, 1)[0]
+        assert name in typed or re.sub(r"_(bucket|sum|count)$", "", name) in typed, line
+
+
+def test_counter_and_gauge_lines():
+    registry = Registry()
+    requests = registry.register(Counter("t_requests_total", "Requests.", ["route"]))
+    idle = registry.register(Gauge("t_idle", "Idle workers."))
+    requests.inc(route='/api/clips/<clip_id>')
+    requests.inc(2, route='/api/clips/<clip_id>')
+    requests.inc(route='say "hi"\n')
+    idle.set(1.5)
+
+    text = registry.render()
+    _check_format(text)
+    assert text.splitlines() == [
+        "# HELP t_requests_total Requests.",
+        "# TYPE t_requests_total counter",
+        't_requests_total{route="/api/clips/<clip_id>"} 3',
+        't_requests_total{route="say \\"hi\\"\\n"} 1',
+        "# HELP t_idle Idle workers.",
+        "# TYPE t_idle gauge",
+        "t_idle 1.5",
+    ]
+    with pytest.raises(ValueError):
+        requests.inc(status="200")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.register(Histogram("t_seconds", "Latency.", ["route"], buckets=(0.1, 1.0)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, route="/x")
+
+    text = registry.render()
+    _check_format(text)
+    assert text.splitlines()[2:] == [
+        't_seconds_bucket{route="/x",le="0.1"} 2',
+        't_seconds_bucket{route="/x",le="1"} 3',
+        't_seconds_bucket{route="/x",le="+Inf"} 4',
+        't_seconds_sum{route="/x"} 3.65',
+        't_seconds_count{route="/x"} 4',
+    ]
+
+
+def test_collectors_share_one_header_and_failures_are_skipped():
+    class _Cache:
+        def __init__(self, hits, misses):
+            self.hits, self.misses = hits, misses
+
+        def stats(self):
+            return {"hits": self.hits, "misses": self.misses}
+
+    registry = Registry()
+
+    def broken():
+        raise RuntimeError("collector failed")
+        yield
+
+    registry.register_collector(broken)
+    for name, cache in (("a", _Cache(3, 1)), ("b", _Cache(0, 0))):
+        def collect(name=name, cache=cache):
+            stats = cache.stats()
+            total = stats["hits"] + stats["misses"]
+            yield ("t_cache_hit_ratio", "gauge", "Hit ratio.",
+                   [({"cache": name}, stats["hits"] / total if total else 0.0)])
+        registry.register_collector(collect)
+
+    text = registry.render()
+    _check_format(text)
+    assert text.count("# TYPE t_cache_hit_ratio gauge") == 1
+    assert 't_cache_hit_ratio{cache="a"} 0.75' in text and 't_cache_hit_ratio{cache="b"} 0' in text
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://x.supabase.co/rest/v1/clips?select=id", ("rest", "clips")),
+    ("https://x.supabase.co/rest/v1/rpc/hybrid_search_clips", ("rest", "rpc/hybrid_search_clips")),
+    ("https://x.supabase.co/storage/v1/object/authenticated/clips/u1/c1/thumb.jpg", ("storage", "clips")),
+    ("https://x.supabase.co/auth/v1/token?grant_type=refresh_token", ("auth", "token")),
+])
+def test_supabase_targets_keep_labels_bounded(url, expected):
+    assert telemetry._supabase_target(url) == expected
+
+
+def test_metrics_endpoint_serves_the_default_registry():
+    import api_server_new
+
+    client = api_server_new.app.test_client()
+    client.get("/api/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == telemetry.CONTENT_TYPE
+    text = response.get_data(as_text=True)
+    _check_format(text)
+    assert 'ait_http_request_duration_seconds_count{route="/api/health",method="GET",status="200"}' in text
+    assert 'ait_cache_hit_ratio{cache="lookup"}' in text
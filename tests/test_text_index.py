@@ -0,0 +1,110 @@
+"""Tests for the local FTS5 index: query translation and transcript segment hits."""
+
+import pytest
+
+from video_ingest_tool.text_index import LocalTextIndex, websearch_to_fts5
+from video_ingest_tool.utils import parse_timestamp
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("cat dog", '"cat" AND "dog"'),
+    ('"red car" wash', '"red car" AND "wash"'),
+    ("cat or dog", '("cat" OR "dog")'),
+    ("cat OR dog fish", '("cat" OR "dog") AND "fish"'),
+    ("cat -dog", '("cat") NOT ("dog")'),
+    ("or cat", '"cat"'),
+    ('"unterminated phrase', '"unterminated phrase"'),
+    # Punctuation is never passed through as FTS5 syntax
+    ("c++ (a) NEAR:", '"c" AND "a" AND "NEAR"'),
+    ("-dog", None),
+    ("  ", None),
+])
+def test_websearch_to_fts5(query, expected):
+    assert websearch_to_fts5(query) == expected
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("5s600ms", 5.6),
+    ("1m5s", 65.0),
+    ("1h2m", 3720.0),
+    ("01:05", 65.0),
+    ("00:01:05.5", 65.5),
+    ("12.5", 12.5),
+    (3, 3.0),
+    ("soon", None),
+    ("5s later", None),
+    (None, None),
+])
+def test_parse_timestamp(value, seconds):
+    if seconds is None:
+        assert parse_timestamp(value) is None
+    else:
+        assert parse_timestamp(value) == pytest.approx(seconds)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LocalTextIndex("user", directory=tmp_path)
+    index.upsert_clip(
+        {"id": "harbor", "file_name": "harbor.mov", "content_summary": "Boats in a harbor at dawn",
+         "content_tags": ["boats", "harbor"], "full_transcript": "The ferry leaves at six. Gulls everywhere."},
+        segments=[
+            {"text": "The ferry leaves at six.", "timestamp": "0s0ms", "speaker": "A"},
+            {"text": "Gulls everywhere, gulls on the ferry.", "timestamp": "1m5s", "speaker": "B"},
+            {"text": "No segment time here.", "timestamp": None},
+        ],
+        version="v1",
+    )
+    index.upsert_clip(
+        {"id": "kitchen", "file_name": "kitchen.mov", "content_summary": "Cooking pasta",
+         "full_transcript": "Boil the water, then add the pasta. The ferry is late."},
+        segments=[
+            {"text": "Boil the water, then add the pasta.", "timestamp": "00:00:02.5"},
+            {"text": "The ferry is late.", "timestamp": "00:01:00"},
+        ],
+        version="v1",
+    )
+    yield index
+    index.close()
+
+
+def test_segment_hits_carry_their_clip_and_start_time(index):
+    hits = index.search_segments("gulls")
+    assert [(hit["clip_id"], hit["seq"], hit["start_seconds"], hit["speaker"]) for hit in hits] == [
+        ("harbor", 1, 65.0, "B"),
+    ]
+    assert "**Gulls**" in hits[0]["snippet"]
+
+
+def test_segment_hits_per_clip_and_clip_filter(index):
+    hits = index.search_segments("ferry", per_clip=1)
+    assert sorted(hit["clip_id"] for hit in hits) == ["harbor", "kitchen"]
+    only_kitchen = index.search_segments("ferry", clip_ids=["kitchen"])
+    assert [(hit["clip_id"], hit["start_seconds"]) for hit in only_kitchen] == [("kitchen", 60.0)]
+    assert index.search_segments("ferry", clip_ids=[]) == []
+
+
+def test_search_transcripts_attaches_matching_segments(index):
+    results = index.search_transcripts("ferry", min_content_length=10)
+    assert {result["clip_id"] for result in results} == {"harbor", "kitchen"}
+    by_clip = {result["clip_id"]: result for result in results}
+    assert sorted(segment["seq"] for segment in by_clip["harbor"]["matching_segments"]) == [0, 1]
+    assert by_clip["kitchen"]["full_text"].startswith("Boil the water")
+
+
+def test_clip_search_ranks_and_restricts_columns(index):
+    assert [clip["id"] for clip in index.search_clips("harbor")] == ["harbor"]
+    assert index.search_clips("pasta", columns=["file_name"]) == []
+    assert index.search_clips("-harbor") == []
+
+
+def test_reindex_and_delete_replace_segments(index):
+    index.upsert_clip({"id": "harbor", "full_transcript": "Quiet now."},
+                      segments=[{"text": "Quiet now.", "timestamp": "3s"}], version="v2")
+    assert index.search_segments("gulls") == []
+    assert [hit["start_seconds"] for hit in index.search_segments("quiet")] == [3.0]
+    assert index.versions() == {"harbor": "v2", "kitchen": "v1"}
+
+    index.delete_clips(["harbor"])
+    assert index.search_segments("quiet") == []
+    assert index.stats()["segments"] == 2
@@ -0,0 +1,252 @@
+"""Tests for the local vector index mirror: upserts, deletes, IVF rebuild recall and quantized codes."""
+
+import numpy as np
+import pytest
+
+from video_ingest_tool import vector_index
+from video_ingest_tool.vector_index import LocalVectorIndex, VectorField
+
+DIM = 32
+
+
+def _unit(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _clustered(count, clusters=24, seed=0):
+    """Vectors around a few random directions, like embeddings of similar footage."""
+    rng = np.random.default_rng(seed)
+    centers = _unit(rng.normal(size=(clusters, DIM)))
+    return _unit(centers[rng.integers(clusters, size=count)] + 0.35 * rng.normal(size=(count, DIM)))
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LocalVectorIndex("user", directory=tmp_path, quantization="none")
+    yield index
+    index.close()
+
+
+def test_upsert_replaces_a_clips_vectors(index):
+    a, b, c = _unit(np.eye(DIM)[:3])
+    index.upsert_clip("clip-1", {"summary": {0: a}}, clip_row={"id": "clip-1", "file_name": "one.mov"}, version="v1")
+    index.upsert_clip("clip-2", {"summary": {0: b}}, version="v1")
+    assert [clip_id for clip_id, _ in index.search("summary", a, k=1)] == ["clip-1"]
+
+    index.upsert_clip("clip-1", {"summary": {0: c}}, version="v2")
+    hits = index.search("summary", c, k=2)
+    assert hits[0] == ("clip-1", pytest.approx(1.0, abs=1e-3))
+    assert "clip-1" not in [clip_id for clip_id, score in index.search("summary", a, k=2) if score > 0.5]
+    assert index.versions() == {"clip-1": "v2", "clip-2": "v1"}
+    # The display row survives an upsert without one
+    assert index.clip_rows(["clip-1"])["clip-1"]["file_name"] == "one.mov"
+
+
+def test_thumbnail_clips_are_scored_by_their_best_slot(index):
+    a, b, c = _unit(np.eye(DIM)[:3])
+    index.upsert_clip("clip-1", {"thumbnail": {1: a, 2: b, 3: c}})
+    index.upsert_clip("clip-2", {"thumbnail": {1: _unit(a + b)}})
+    hits = index.search("thumbnail", c, k=5)
+    assert [clip_id for clip_id, _ in hits] == ["clip-1", "clip-2"]
+    assert np.allclose(index.clip_vector("thumbnail", "clip-1", slot=3), c, atol=1e-3)
+
+
+def test_delete_and_exclude(index):
+    vectors = _clustered(50)
+    for i, vector in enumerate(vectors):
+        index.upsert_clip(f"clip-{i}", {"summary": {0: vector}}, patch_graph=False)
+
+    index.delete_clips(["clip-0", "clip-1"], patch_graph=False)
+    found = [clip_id for clip_id, _ in index.search("summary", vectors[0], k=50)]
+    assert "clip-0" not in found and "clip-1" not in found
+    assert len(found) == 48
+    assert "clip-2" not in [clip_id for clip_id, _ in index.search("summary", vectors[2], k=5, exclude=["clip-2"])]
+    assert index.clip_vector("summary", "clip-0") is None
+
+
+def test_rebuild_keeps_mapping_and_recall(index, monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN_VECTORS", 500)
+    vectors = _clustered(2000)
+    for start in range(0, len(vectors), 100):
+        for i in range(start, start + 100):
+            index.upsert_clip(f"clip-{i}", {"summary": {0: vectors[i]}}, patch_graph=False)
+    # Leave dead rows behind so the rebuild has to compact them
+    index.delete_clips([f"clip-{i}" for i in range(0, 2000, 10)], patch_graph=False)
+    live = {f"clip-{i}": vectors[i] for i in range(2000) if i % 10}
+
+    assert index.rebuild(["summary"], force=True) == {"summary": len(live)}
+    field = index.fields["summary"]
+    assert field.centroids is not None
+    assert field.count == len(live)
+
+    # Every clip still maps to its own vector after compaction
+    for clip_id in ("clip-1", "clip-999", "clip-1999"):
+        assert np.allclose(index.clip_vector("summary", clip_id), live[clip_id], atol=1e-2)
+
+    ids = list(live)
+    matrix = np.stack([live[clip_id] for clip_id in ids])
+    rng = np.random.default_rng(1)
+    queries = _unit(matrix[rng.choice(len(ids), 20)] + 0.1 * rng.normal(size=(20, DIM)))
+
+    def recall(nprobe):
+        hits = 0
+        for query in queries:
+            exact = {ids[i] for i in np.argsort(-(matrix @ query))[:10]}
+            hits += len(exact & {clip_id for clip_id, _ in index.search("summary", query, k=10, nprobe=nprobe)})
+        return hits / (10 * len(queries))
+
+    # Probing every list is exact (up to float16 ties); a third of them still finds nearly everything
+    assert recall(len(field.centroids)) >= 0.98
+    assert recall(len(field.centroids) // 3) >= 0.9
+
+    # Rows added after the rebuild are searchable before the next one
+    fresh = _unit(np.ones(DIM))
+    index.upsert_clip("fresh", {"summary": {0: fresh}}, patch_graph=False)
+    assert index.search("summary", fresh, k=1)[0][0] == "fresh"
+
+
+def test_reopening_sees_the_same_vectors(tmp_path):
+    vector = _unit(np.arange(1, DIM + 1))
+    index = LocalVectorIndex("user", directory=tmp_path)
+    index.upsert_clip("clip-1", {"keyword": {0: vector}}, version="v1")
+    index.close()
+
+    reopened = LocalVectorIndex("user", directory=tmp_path)
+    try:
+        assert LocalVectorIndex.exists("user", directory=tmp_path)
+        assert reopened.search("keyword", vector, k=1)[0][0] == "clip-1"
+    finally:
+        reopened.close()
+
+
+def test_binary_codes_score_by_hamming_distance(tmp_path):
+    # 20 dimensions: the packed codes end in a partial byte
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(40, 20)).astype(np.float32)
+    field = VectorField(tmp_path, "summary", quantization="binary")
+    field.append(vectors)
+    query = rng.normal(size=20).astype(np.float32)
+
+    expected = -((vectors > 0) != (query > 0)).sum(axis=1)
+    score_rows = field._score_function(query)
+    assert np.array_equal(score_rows(slice(0, 40)), expected)
+    assert np.array_equal(score_rows(np.array([3, 17, 39])), expected[[3, 17, 39]])
+
+
+def test_int8_codes_approximate_inner_products(tmp_path):
+    vectors = _clustered(100)
+    field = VectorField(tmp_path, "summary", quantization="int8")
+    field.append(vectors)
+    query = vectors[5]
+    assert np.allclose(field._score_function(query)(slice(0, 100)), vectors @ query, atol=0.02)
+
+
+@pytest.mark.parametrize("quantization", ["binary", "int8"])
+def test_quantized_search_reranks_with_exact_scores(tmp_path, quantization):
+    vectors = _clustered(500)
+    field = VectorField(tmp_path, "summary", quantization=quantization)
+    field.append(vectors)
+    stored = np.asarray(field.vectors[:500], dtype=np.float32)
+    for query in vectors[:5]:
+        exact = stored @ query
+        # Re-ranking every candidate gives the exact top-k
+        rows, scores = field.search(query, k=10, rerank=500)
+        assert set(rows.tolist()) == set(np.argsort(-exact)[:10].tolist())
+        # A short re-rank list still returns exact scores, best first, and finds the query itself
+        rows, scores = field.search(query, k=10, rerank=30)
+        assert np.allclose(scores, exact[rows], atol=1e-5)
+        assert np.all(np.diff(scores) <= 0)
+        assert rows[0] == np.argmax(exact)
+
+
+def test_switching_quantization_encodes_stored_vectors(tmp_path):
+    vectors = _clustered(64)
+    field = VectorField(tmp_path, "summary", quantization="none")
+    field.append(vectors)
+    field.set_quantization("binary")
+    assert np.array_equal(np.asarray(field.codes[:64]), np.packbits(vectors > 0, axis=1))
+
+    reopened = VectorField(tmp_path, "summary")
+    assert reopened.quantization == "binary"
+    assert reopened.search(vectors[7], k=1)[0][0] == 7
+
+
+def _fail(*args, **kwargs):
+    raise RuntimeError("boom")
+
+
+def test_failed_upsert_restores_the_previous_vectors(index):
+    a, b, c = _unit(np.eye(DIM)[:3])
+    index.upsert_clip("clip-1", {"summary": {0: a}})
+    index.upsert_clip("clip-2", {"summary": {0: b}})
+    index.build_neighbor_graph(k=1)
+    index._graph_link = _fail
+
+    with pytest.raises(RuntimeError):
+        index.upsert_clip("clip-1", {"summary": {0: c}})
+    field = index.fields["summary"]
+    assert field.live_count() == 2
+    assert np.allclose(index.clip_vector("summary", "clip-1"), a, atol=1e-3)
+    assert index.search("summary", a, k=1)[0] == ("clip-1", pytest.approx(1.0, abs=1e-3))
+    # The row appended by the failed upsert is dead
+    assert index.search("summary", c, k=1)[0][1] < 0.5
+
+
+def test_failed_delete_restores_the_vectors(index):
+    vectors = _unit(np.eye(DIM)[:3] + 0.1)
+    for i, vector in enumerate(vectors):
+        index.upsert_clip(f"clip-{i}", {"summary": {0: vector}})
+    index.build_neighbor_graph(k=2)
+    index._write_neighbor_lists = _fail
+
+    with pytest.raises(RuntimeError):
+        index.delete_clips(["clip-0"])
+    assert index.fields["summary"].live_count() == 3
+    assert index.search("summary", vectors[0], k=1)[0][0] == "clip-0"
+    assert index.neighbors("clip-1", 2) is not None
+
+
+def _graph(index, clip_ids, k):
+    return {clip_id: [neighbor for neighbor, _ in index.neighbors(clip_id, k)] for clip_id in clip_ids}
+
+
+def test_patched_graph_matches_a_full_build(index):
+    vectors = _clustered(300, seed=3)
+    for i, vector in enumerate(vectors):
+        index.upsert_clip(f"clip-{i}", {"summary": {0: vector}}, patch_graph=False)
+    assert index.build_neighbor_graph(k=5) == 300
+    assert index.neighbors("clip-0", 6) is None  # larger than the graph's k
+
+    rng = np.random.default_rng(4)
+    moved = _clustered(20, seed=5)
+    for i, vector in zip(rng.choice(300, 20, replace=False), moved):
+        index.upsert_clip(f"clip-{i}", {"summary": {0: vector}})
+    index.delete_clips([f"clip-{i}" for i in range(0, 300, 30)])
+    for i, vector in enumerate(_clustered(10, seed=6)):
+        index.upsert_clip(f"new-{i}", {"summary": {0: vector}})
+
+    live = [clip_id for clip_id in index.versions()]
+    patched = _graph(index, live, 5)
+    assert "clip-0" not in {neighbor for neighbors in patched.values() for neighbor in neighbors}
+    index.build_neighbor_graph(k=5)
+    assert patched == _graph(index, live, 5)
+
+
+def test_graph_follows_writes_from_another_connection(tmp_path):
+    vectors = _unit(np.eye(DIM)[:4] + 0.05)
+    first = LocalVectorIndex("user", directory=tmp_path, quantization="none")
+    second = LocalVectorIndex("user", directory=tmp_path, quantization="none")
+    try:
+        for i, vector in enumerate(vectors[:3]):
+            first.upsert_clip(f"clip-{i}", {"summary": {0: vector}})
+        first.build_neighbor_graph(k=1)
+        first.upsert_clip("clip-0", {"summary": {0: vectors[0]}})  # loads the cached graph rows
+
+        second.upsert_clip("clip-3", {"summary": {0: _unit(vectors[1] + 0.01)}})
+        first.upsert_clip("clip-1", {"summary": {0: vectors[1]}})
+        assert first.neighbors("clip-1", 1)[0][0] == "clip-3"
+        assert first.neighbors("clip-3", 1)[0][0] == "clip-1"
+    finally:
+        first.close()
+        second.close()
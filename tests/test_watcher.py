@@ -0,0 +1,163 @@
+"""Tests for FolderWatcher's decision of when a watched file has finished arriving."""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from video_ingest_tool import watcher as watcher_module
+from video_ingest_tool.watcher import FolderWatcher
+
+
+@pytest.fixture
+def writers(monkeypatch):
+    """Paths that some process has open for writing (instead of scanning /proc)."""
+    open_paths = set()
+    monkeypatch.setattr(watcher_module, "open_for_writing", lambda path: path in open_paths)
+    return open_paths
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(watcher_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _watch(directory, **options):
+    ready = []
+    watcher = FolderWatcher(str(directory), ready.append, use_inotify=False, settle_seconds=10, **options)
+    return watcher, ready
+
+
+def _write(path, data=b"frame"):
+    with open(path, "ab") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_reported_once_after_settling(tmp_path, writers, clock):
+    watcher, ready = _watch(tmp_path)
+    path = _write(tmp_path / "A001.mov")
+    watcher._observe(path, watcher_module._signature(path))
+
+    clock[0] += 9
+    watcher._check_pending()
+    assert ready == [] and watcher.pending == 1
+
+    clock[0] += 1
+    watcher._check_pending()
+    assert ready == [path] and watcher.pending == 0
+
+    # Seeing the same file again (e.g. a rescan or a touch event) doesn't report it twice
+    watcher._observe(path, watcher_module._signature(path))
+    clock[0] += 60
+    watcher._check_pending()
+    assert ready == [path]
+
+
+def test_growing_file_restarts_the_settle_time(tmp_path, writers, clock):
+    watcher, ready = _watch(tmp_path)
+    path = _write(tmp_path / "A001.mov")
+    watcher._observe(path, watcher_module._signature(path))
+
+    clock[0] += 8
+    _write(path, b"more frames")
+    watcher._check_pending()
+    clock[0] += 8
+    watcher._check_pending()
+    assert ready == []
+
+    clock[0] += 2
+    watcher._check_pending()
+    assert ready == [path]
+
+
+def test_file_open_for_writing_waits(tmp_path, writers, clock):
+    watcher, ready = _watch(tmp_path)
+    path = _write(tmp_path / "A001.mov")
+    watcher._observe(path, watcher_module._signature(path))
+    writers.add(path)
+
+    clock[0] += 30
+    watcher._check_pending()
+    assert ready == [] and watcher.pending == 1
+
+    # Closed: it still has to stay unchanged for the settle time from now
+    writers.clear()
+    clock[0] += 5
+    watcher._check_pending()
+    assert ready == []
+    clock[0] += 5
+    watcher._check_pending()
+    assert ready == [path]
+
+
+def test_empty_and_vanished_files_are_not_reported(tmp_path, writers, clock):
+    watcher, ready = _watch(tmp_path)
+    empty = str(tmp_path / "empty.mov")
+    open(empty, "wb").close()
+    gone = _write(tmp_path / "gone.mov")
+    for path in (empty, gone):
+        watcher._observe(path, watcher_module._signature(path))
+    os.remove(gone)
+
+    clock[0] += 60
+    watcher._check_pending()
+    assert ready == []
+    assert watcher.pending == 1  # the empty file, until data arrives
+
+
+def test_modified_file_is_reported_again(tmp_path, writers, clock):
+    watcher, ready = _watch(tmp_path)
+    path = _write(tmp_path / "A001.mov")
+    watcher._observe(path, watcher_module._signature(path))
+    clock[0] += 10
+    watcher._check_pending()
+
+    _write(path, b"re-exported")
+    watcher._observe(path, watcher_module._signature(path))
+    clock[0] += 10
+    watcher._check_pending()
+    assert ready == [path, path]
+
+
+def test_scan_skips_hidden_and_non_video_files(tmp_path):
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / "day1").mkdir()
+    for name in ("day1/A001.mov", ".hidden/B001.mov", "._A002.mov", "notes.txt", "A003.mp4"):
+        _write(tmp_path / name)
+    watcher, _ = _watch(tmp_path)
+    assert sorted(os.path.relpath(path, tmp_path) for path, _ in watcher._scan()) == ["A003.mp4", "day1/A001.mov"]
+    flat, _ = _watch(tmp_path, recursive=False)
+    assert [os.path.relpath(path, tmp_path) for path, _ in flat._scan()] == ["A003.mp4"]
+
+
+class _FullInotify:
+    """inotify that has run out of watches."""
+
+    closed = False
+
+    def add_watch(self, path):
+        raise watcher_module.InotifyUnavailable(28, "Out of inotify watches")
+
+    def close(self):
+        self.closed = True
+
+
+def test_unwatchable_new_directory_falls_back_to_polling(tmp_path, writers, clock):
+    watcher, ready = _watch(tmp_path)
+    inotify = watcher._inotify = _FullInotify()
+    subdir = tmp_path / "card2"
+    subdir.mkdir()
+    path = _write(subdir / "B001.mov")
+    other = tmp_path / "card3"
+    other.mkdir()
+
+    watcher._handle_events([(str(subdir), watcher_module.IN_CREATE | watcher_module.IN_ISDIR),
+                            (str(other), watcher_module.IN_CREATE | watcher_module.IN_ISDIR)])
+    assert inotify.closed and watcher.mode == "polling"
+    # Files already in the new directory are still picked up
+    clock[0] += 10
+    watcher._check_pending()
+    assert ready == [path]
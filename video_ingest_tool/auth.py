@@ -5,7 +5,9 @@ CLI Authentication module for Supabase integration.
 import json
 import os
 import time
+import base64
 import getpass
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -20,6 +22,148 @@ logger = structlog.get_logger(__name__)
 # Auth file location
 AUTH_FILE = Path.home() / ".video_ingest_auth.json"
 
+# Background refresher settings for long-running processes (API servers)
+AUTH_POLL_INTERVAL = float(os.getenv("AUTH_POLL_INTERVAL", "5"))
+AUTH_REFRESH_MARGIN = 5 * 60  # Renew access tokens this many seconds before they expire
+
+def _token_expiry(access_token: str) -> Optional[float]:
+    """Read the exp claim of a JWT access token without verifying it."""
+    try:
+        payload = access_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except Exception:
+        return None
+
+class AuthState:
+    """In-memory copy of the saved session for long-running processes.
+    
+    Once started, a daemon thread keeps the session current: it reloads
+    AUTH_FILE when its mtime changes (e.g. after `ait auth login` in another
+    shell) and refreshes the access token shortly before it expires. Request
+    handlers then read the session from memory instead of parsing the file
+    and possibly refreshing synchronously on every call.
+    """
+    
+    def __init__(self, poll_interval: float = AUTH_POLL_INTERVAL, refresh_margin: float = AUTH_REFRESH_MARGIN):
+        self.poll_interval = poll_interval
+        self.refresh_margin = refresh_margin
+        self._lock = threading.RLock()
+        self._session: Optional[Dict[str, Any]] = None
+        self._mtime: Optional[int] = None
+        self._client: Optional[Client] = None
+        self._client_token: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._retry_at = 0.0
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def session(self) -> Optional[Dict[str, Any]]:
+        """Current session, or None if logged out or expired."""
+        session = self._session
+        if session and session.get('expires_at', 0) >= time.time():
+            return session
+        return None
+    
+    def start(self) -> "AuthState":
+        """Load the session and start the background refresher (idempotent)."""
+        with self._lock:
+            if self.running:
+                return self
+            self._stop.clear()
+            self.reload()
+            self._thread = threading.Thread(target=self._run, name="auth-refresher", daemon=True)
+            self._thread.start()
+        logger.info("Started background auth refresher", poll_interval=self.poll_interval)
+        return self
+    
+    def stop(self) -> None:
+        """Stop the background refresher."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+        self._thread = None
+    
+    def reload(self) -> None:
+        """Re-read AUTH_FILE into memory."""
+        with self._lock:
+            try:
+                stat = AUTH_FILE.stat()
+            except FileNotFoundError:
+                self._mtime = None
+                self._set_session(None)
+                return
+            try:
+                session = json.loads(AUTH_FILE.read_text())
+            except Exception as e:
+                logger.error(f"Failed to load session: {str(e)}")
+                return
+            self._mtime = stat.st_mtime_ns
+            self._set_session(session)
+    
+    def get_client(self) -> Optional[Client]:
+        """Authenticated client for the current session, reused until the token changes."""
+        session = self.session
+        if not session:
+            return None
+        with self._lock:
+            if self._client is None or self._client_token != session['access_token']:
+                try:
+                    client = get_supabase_client()
+                    client.auth.set_session(
+                        access_token=session['access_token'],
+                        refresh_token=session['refresh_token']
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to create authenticated client: {str(e)}")
+                    return None
+                self._client = client
+                self._client_token = session['access_token']
+            return self._client
+    
+    def _set_session(self, session: Optional[Dict[str, Any]]) -> None:
+        if session is None or self._session is None or session.get('access_token') != self._session.get('access_token'):
+            self._client = None
+            self._client_token = None
+        self._session = session
+    
+    def _file_changed(self) -> bool:
+        try:
+            return AUTH_FILE.stat().st_mtime_ns != self._mtime
+        except FileNotFoundError:
+            return self._mtime is not None
+    
+    def _refresh_if_needed(self) -> None:
+        session = self._session
+        if not session or time.time() < self._retry_at:
+            return
+        token_expires = _token_expiry(session.get('access_token', ''))
+        expires_at = min(filter(None, [token_expires, session.get('expires_at')]), default=0)
+        if expires_at - time.time() > self.refresh_margin:
+            return
+        if AuthManager()._refresh_session(session):
+            self.reload()
+        else:
+            # Back off instead of hammering the auth endpoint every poll
+            self._retry_at = time.time() + 60
+    
+    def _run(self) -> None:
+        while True:
+            try:
+                if self._file_changed():
+                    logger.info("Auth file changed on disk, reloading session")
+                    self.reload()
+                # Network refresh happens outside the lock so request threads never wait on it
+                self._refresh_if_needed()
+            except Exception as e:
+                logger.error(f"Background auth refresh failed: {str(e)}")
+            if self._stop.wait(self.poll_interval):
+                break
+
 class AuthManager:
     """Manages CLI authentication with Supabase."""
     
@@ -81,6 +225,8 @@ class AuthManager:
             # Clear local session file
             if AUTH_FILE.exists():
                 AUTH_FILE.unlink()
+                if auth_state.running:
+                    auth_state.reload()
                 logger.info("Successfully logged out")
                 return True
             else:
@@ -94,8 +240,12 @@ class AuthManager:
         """Get current session if valid.
         
         Automatically attempts to refresh the token if it's expired or
-        approaching expiration (within 1 hour).
+        approaching expiration (within 1 hour). In processes that started the
+        shared auth_state refresher this is an in-memory read instead.
         """
+        if auth_state.running:
+            return auth_state.session
+        
         if not AUTH_FILE.exists():
             return None
         
@@ -172,6 +322,9 @@ class AuthManager:
             
     def get_authenticated_client(self) -> Optional[Client]:
         """Get authenticated Supabase client."""
+        if auth_state.running:
+            return auth_state.get_client()
+        
         session = self.get_current_session()
         if not session:
             return None
@@ -260,4 +413,10 @@ class AuthManager:
         
         # Save with restricted permissions
         AUTH_FILE.write_text(json.dumps(session_data, indent=2))
-        AUTH_FILE.chmod(0o600)  # Read/write for owner only
\ No newline at end of file
+        AUTH_FILE.chmod(0o600)  # Read/write for owner only
+        
+        if auth_state.running:
+            auth_state.reload()
+
+# Shared in-memory auth state; started by long-running processes such as the API servers
+auth_state = AuthState()
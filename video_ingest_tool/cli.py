@@ -5,24 +5,32 @@ Contains the CLI application built with Typer.
 """
 
 import os
+import queue
+import signal
+import threading
 import time
 import json
 import typer
 import requests
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 from rich.progress import BarColumn, Progress
 
 from .config import setup_logging, console, DEFAULT_COMPRESSION_CONFIG
 from .discovery import scan_directory
 from .pipeline.registry import get_available_pipeline_steps, get_default_pipeline
+from .pipeline.metrics import RunMetrics
+from .pipeline.profiling import PROFILE_MODES, StepProfiler
 from .steps import process_video_file
 from .config.settings import get_default_pipeline_config
-from .output import save_to_json, save_run_outputs
+from .output import RunOutputWriter, copy_run_log, save_to_json
+from .run_catalog import get_run_catalog
 from .utils import calculate_checksum
+from .watcher import WATCH_POLL_INTERVAL, WATCH_SETTLE_SECONDS, FolderWatcher
 
 # Create Typer app
 app = typer.Typer(help="AI-Powered Video Ingest & Catalog Tool")
@@ -30,52 +38,24 @@ app = typer.Typer(help="AI-Powered Video Ingest & Catalog Tool")
 # API server URL
 API_SERVER_URL = "http://localhost:8000/api"
 
-@app.command()
-def ingest(
-    directory: str = typer.Argument(..., help="Directory to scan for video files"),
-    recursive: bool = typer.Option(True, "--recursive/--no-recursive", "-r/-nr", help="Scan subdirectories"),
-    output_dir: str = typer.Option("output", "--output-dir", "-o", help="Base output directory for all processing runs"),
-    limit: int = typer.Option(0, "--limit", "-l", help="Limit number of files to process (0 = no limit)"),
-    disable_steps: List[str] = typer.Option(None, "--disable", "-d", help="Steps to disable in the pipeline"),
-    enable_steps: List[str] = typer.Option(None, "--enable", "-e", help="Steps to enable in the pipeline"),
-    config_file: Optional[str] = typer.Option(None, "--config", "-c", help="JSON configuration file for pipeline steps"),
-    compression_fps: int = typer.Option(DEFAULT_COMPRESSION_CONFIG['fps'], "--fps", help=f"Frame rate for compressed videos (default: {DEFAULT_COMPRESSION_CONFIG['fps']})"),
-    compression_bitrate: str = typer.Option(DEFAULT_COMPRESSION_CONFIG['video_bitrate'], "--bitrate", help=f"Video bitrate for compression (default: {DEFAULT_COMPRESSION_CONFIG['video_bitrate']})"),
-    store_database: bool = typer.Option(False, "--store-database", help="Store results in Supabase database (requires authentication)"),
-    generate_embeddings: bool = typer.Option(False, "--generate-embeddings", help="Generate vector embeddings for semantic search (requires authentication)"),
-    upload_thumbnails: bool = typer.Option(False, "--upload-thumbnails", help="Upload thumbnails to Supabase storage (requires authentication)"),
-    force_reprocess: bool = typer.Option(False, "--force-reprocess", "-f", help="Force reprocessing of files even if they already exist in database")
-):
-    """
-    Scan a directory for video files and extract metadata.
+def _format_bytes(value: float) -> str:
+    """Human-readable byte count (signed, for memory deltas)."""
+    sign = "-" if value < 0 else ""
+    size = abs(value)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GB"
+
+def _build_pipeline_config(logger, config_file: Optional[str], disable_steps: Optional[List[str]],
+                           enable_steps: Optional[List[str]], store_database: bool, generate_embeddings: bool,
+                           upload_thumbnails: bool) -> Dict[str, bool]:
     """
-    start_time = time.time()
-    
-    # Setup logging and get paths - this creates the run directory structure
-    logger, timestamp, json_dir, log_file = setup_logging()
-    
-    # The run directory is already created by setup_logging
-    # Extract run directory from json_dir path
-    run_dir = os.path.dirname(json_dir)  # json_dir is run_dir/json, so get parent
-    
-    # Create subdirectories for this run (json directory already created by setup_logging)
-    thumbnails_dir = os.path.join(run_dir, "thumbnails")
-    os.makedirs(thumbnails_dir, exist_ok=True)
-    
-    # JSON directory already exists from setup_logging
-    # json_dir is already set to run_dir/json
-    
-    # Create identifiable summary filename with timestamp
-    summary_filename = f"all_videos_{os.path.basename(directory)}_{timestamp}.json"
-    
-    logger.info("Starting ingestion process", 
-                directory=directory, 
-                recursive=recursive,
-                run_dir=run_dir,
-                limit=limit,
-                compression_fps=compression_fps,
-                compression_bitrate=compression_bitrate)
+    Pipeline step configuration from the defaults, a config file and command-line overrides.
     
+    Exits if a database option is requested without a working, authenticated Supabase connection.
+    """
     # Set up pipeline configuration
     pipeline_config = get_default_pipeline_config()
     
@@ -147,6 +127,113 @@ def ingest(
             logger.info("Enabled thumbnail uploads")
             console.print("[green]✓[/green] Thumbnail uploads enabled")
     
+    return pipeline_config
+
+def _ingest_file(file_path: str, thumbnails_dir: str, json_dir: str, output_writer: RunOutputWriter, logger,
+                 pipeline_config: Dict[str, bool], **process_options) -> Tuple[str, Dict[str, Any]]:
+    """
+    Run one file through the pipeline and record the outcome in the run output.
+    
+    Args:
+        process_options: Passed to process_video_file (compression settings, force_reprocess, metrics, hooks)
+        
+    Returns:
+        Tuple of the status (processed, skipped or failed) and its details
+    """
+    try:
+        result = process_video_file(
+            file_path, 
+            thumbnails_dir, 
+            logger,
+            config=pipeline_config,
+            **process_options
+        )
+    except Exception as e:
+        output_writer.add_failed(file_path, str(e))
+        logger.error("Error processing video file", path=file_path, error=str(e))
+        return "failed", {'file_path': file_path, 'error': str(e)}
+    
+    # Handle skipped files (duplicates)
+    if isinstance(result, dict) and result.get('skipped'):
+        skipped = {
+            'file_path': file_path,
+            'reason': result.get('reason'),
+            'existing_clip_id': result.get('existing_clip_id'),
+            'existing_file_name': result.get('existing_file_name'),
+            'existing_processed_at': result.get('existing_processed_at')
+        }
+        output_writer.add_skipped(**skipped)
+        logger.info("Skipped duplicate file", 
+                   file=file_path, 
+                   existing_id=result.get('existing_clip_id'))
+        return "skipped", skipped
+    
+    # Normal processing result
+    video_file = result
+    output_writer.add_result(video_file)
+    
+    # Create filename with original name and UUID
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+    json_filename = f"{base_name}_{video_file.id}.json"
+    
+    # Save individual JSON to run directory
+    individual_json_path = os.path.join(json_dir, json_filename)
+    save_to_json(video_file, individual_json_path, logger)
+    return "processed", {'file_path': file_path, 'id': video_file.id}
+
+@app.command()
+def ingest(
+    directory: str = typer.Argument(..., help="Directory to scan for video files"),
+    recursive: bool = typer.Option(True, "--recursive/--no-recursive", "-r/-nr", help="Scan subdirectories"),
+    output_dir: str = typer.Option("output", "--output-dir", "-o", help="Base output directory for all processing runs"),
+    limit: int = typer.Option(0, "--limit", "-l", help="Limit number of files to process (0 = no limit)"),
+    disable_steps: List[str] = typer.Option(None, "--disable", "-d", help="Steps to disable in the pipeline"),
+    enable_steps: List[str] = typer.Option(None, "--enable", "-e", help="Steps to enable in the pipeline"),
+    config_file: Optional[str] = typer.Option(None, "--config", "-c", help="JSON configuration file for pipeline steps"),
+    compression_fps: int = typer.Option(DEFAULT_COMPRESSION_CONFIG['fps'], "--fps", help=f"Frame rate for compressed videos (default: {DEFAULT_COMPRESSION_CONFIG['fps']})"),
+    compression_bitrate: str = typer.Option(DEFAULT_COMPRESSION_CONFIG['video_bitrate'], "--bitrate", help=f"Video bitrate for compression (default: {DEFAULT_COMPRESSION_CONFIG['video_bitrate']})"),
+    store_database: bool = typer.Option(False, "--store-database", help="Store results in Supabase database (requires authentication)"),
+    generate_embeddings: bool = typer.Option(False, "--generate-embeddings", help="Generate vector embeddings for semantic search (requires authentication)"),
+    upload_thumbnails: bool = typer.Option(False, "--upload-thumbnails", help="Upload thumbnails to Supabase storage (requires authentication)"),
+    force_reprocess: bool = typer.Option(False, "--force-reprocess", "-f", help="Force reprocessing of files even if they already exist in database"),
+    profile: Optional[str] = typer.Option(None, "--profile", help="Profile steps into the run's profile/ directory: cpu, wall or memory"),
+    profile_steps: List[str] = typer.Option(None, "--profile-step", help="Only profile these steps (repeatable; default: every step)")
+):
+    """
+    Scan a directory for video files and extract metadata.
+    """
+    if profile and profile not in PROFILE_MODES:
+        raise typer.BadParameter(f"Choose from {', '.join(PROFILE_MODES)}", param_hint="--profile")
+    start_time = time.time()
+    
+    # Setup logging and get paths - this creates the run directory structure
+    logger, timestamp, json_dir, log_file = setup_logging()
+    
+    # The run directory is already created by setup_logging
+    # Extract run directory from json_dir path
+    run_dir = os.path.dirname(json_dir)  # json_dir is run_dir/json, so get parent
+    
+    # Create subdirectories for this run (json directory already created by setup_logging)
+    thumbnails_dir = os.path.join(run_dir, "thumbnails")
+    os.makedirs(thumbnails_dir, exist_ok=True)
+    
+    # JSON directory already exists from setup_logging
+    # json_dir is already set to run_dir/json
+    
+    # Create identifiable summary filename with timestamp
+    summary_filename = f"all_videos_{os.path.basename(directory)}_{timestamp}.jsonl"
+    
+    logger.info("Starting ingestion process", 
+                directory=directory, 
+                recursive=recursive,
+                run_dir=run_dir,
+                limit=limit,
+                compression_fps=compression_fps,
+                compression_bitrate=compression_bitrate)
+    
+    pipeline_config = _build_pipeline_config(logger, config_file, disable_steps, enable_steps,
+                                             store_database, generate_embeddings, upload_thumbnails)
+    
     # Save the active configuration to the run directory
     config_path = os.path.join(run_dir, "pipeline_config.json")
     with open(config_path, 'w') as f:
@@ -186,9 +273,13 @@ def ingest(
     console.print(f"[green]Found {len(video_files)} video files[/green]")
     
     console.print(f"[bold yellow]Step 2:[/bold yellow] Processing video files...")
-    processed_files = []
+    processed_count = 0
     failed_files = []
     skipped_files = []
+    # Results are streamed to disk as each file finishes rather than kept in memory
+    output_writer = RunOutputWriter(run_dir, summary_filename, logger, catalog=get_run_catalog())
+    run_metrics = RunMetrics(run_id=os.path.basename(run_dir))
+    profiler = StepProfiler(profile, steps=profile_steps, logger=logger) if profile else None
     
     with Progress(
         SpinnerColumn(),
@@ -204,57 +295,32 @@ def ingest(
         for file_path in video_files:
             progress.update(task, advance=0, description=f"[cyan]Processing {os.path.basename(file_path)}")
             
-            try:
-                result = process_video_file(
-                    file_path, 
-                    thumbnails_dir, 
-                    logger,
-                    config=pipeline_config,
-                    compression_fps=compression_fps,
-                    compression_bitrate=compression_bitrate,
-                    force_reprocess=force_reprocess
-                )
-                
-                # Handle skipped files (duplicates)
-                if isinstance(result, dict) and result.get('skipped'):
-                    skipped_files.append({
-                        'file_path': file_path,
-                        'reason': result.get('reason'),
-                        'existing_clip_id': result.get('existing_clip_id'),
-                        'existing_file_name': result.get('existing_file_name'),
-                        'existing_processed_at': result.get('existing_processed_at')
-                    })
-                    logger.info("Skipped duplicate file", 
-                               file=file_path, 
-                               existing_id=result.get('existing_clip_id'))
-                else:
-                    # Normal processing result
-                    video_file = result
-                    processed_files.append(video_file)
-                    
-                    # Create filename with original name and UUID
-                    base_name = os.path.splitext(os.path.basename(file_path))[0]
-                    json_filename = f"{base_name}_{video_file.id}.json"
-                    
-                    # Save individual JSON to run directory
-                    individual_json_path = os.path.join(json_dir, json_filename)
-                    save_to_json(video_file, individual_json_path, logger)
-                
-            except Exception as e:
+            status, details = _ingest_file(
+                file_path,
+                thumbnails_dir,
+                json_dir,
+                output_writer,
+                logger,
+                pipeline_config,
+                compression_fps=compression_fps,
+                compression_bitrate=compression_bitrate,
+                force_reprocess=force_reprocess,
+                metrics=run_metrics,
+                hooks=[profiler] if profiler else None
+            )
+            if status == "processed":
+                processed_count += 1
+            elif status == "skipped":
+                skipped_files.append(details)
+            else:
                 failed_files.append(file_path)
-                logger.error("Error processing video file", path=file_path, error=str(e))
             
             progress.update(task, advance=1)
     
-    # Save run outputs with directory name in the summary filename
-    output_paths = save_run_outputs(
-        processed_files,
-        run_dir,
-        summary_filename,
-        json_dir,
-        log_file,
-        logger
-    )
+    output_paths = output_writer.close()
+    output_paths['run_log'] = copy_run_log(run_dir, log_file, logger)
+    metrics_path = run_metrics.write(run_dir)
+    profile_dir = profiler.write(run_dir) if profiler else None
     
     # Check if we had skipped files and inform the user
     if skipped_files:
@@ -277,26 +343,211 @@ def ingest(
     summary_table.add_column("Metric", style="cyan")
     summary_table.add_column("Value", style="green")
     
-    summary_table.add_row("Total files processed", str(len(processed_files)))
+    summary_table.add_row("Total files processed", str(processed_count))
     if skipped_files:
         summary_table.add_row("Skipped files (duplicates)", str(len(skipped_files)))
     if failed_files:
         summary_table.add_row("Failed files", str(len(failed_files)))
     summary_table.add_row("Processing time", f"{processing_time:.2f} seconds")
-    summary_table.add_row("Average time per file", f"{processing_time / len(processed_files):.2f} seconds" if processed_files else "N/A")
+    summary_table.add_row("Average time per file", f"{processing_time / processed_count:.2f} seconds" if processed_count else "N/A")
     summary_table.add_row("Run directory", run_dir)
-    summary_table.add_row("Summary JSON", output_paths.get('run_summary', 'N/A'))
+    summary_table.add_row("Results (JSONL)", output_paths['run_summary'])
+    summary_table.add_row("Results index", output_paths['run_index'])
     summary_table.add_row("Log file", output_paths.get('run_log', 'N/A'))
+    summary_table.add_row("Step metrics", metrics_path)
+    if profile_dir:
+        summary_table.add_row(f"Profiles ({profiler.mode})", profile_dir)
     
     console.print(summary_table)
     
+    step_summary = run_metrics.summary()
+    if step_summary:
+        metrics_table = Table(title="Step Timings (per file)",
+                              caption="CPU and I/O are process-wide: helper threads and ffmpeg count toward the step")
+        metrics_table.add_column("Step", style="cyan")
+        metrics_table.add_column("Files", justify="right")
+        metrics_table.add_column("Wall p50", justify="right", style="green")
+        metrics_table.add_column("Wall p95", justify="right", style="green")
+        metrics_table.add_column("CPU p50", justify="right")
+        metrics_table.add_column("CPU p95", justify="right")
+        metrics_table.add_column("Read p50", justify="right")
+        metrics_table.add_column("Written p50", justify="right")
+        metrics_table.add_column("Read MB/s", justify="right")
+        metrics_table.add_column("RSS Δ p95", justify="right")
+        for step_name, stats in step_summary.items():
+            metrics_table.add_row(
+                step_name + (f" [red]({stats['errors']} failed)[/red]" if stats['errors'] else ""),
+                str(stats['count']),
+                f"{stats['wall_s_p50']:.2f}s",
+                f"{stats['wall_s_p95']:.2f}s",
+                f"{stats['cpu_s_p50']:.2f}s",
+                f"{stats['cpu_s_p95']:.2f}s",
+                _format_bytes(stats['read_bytes_p50']),
+                _format_bytes(stats['write_bytes_p50']),
+                f"{stats['read_mb_per_s']:.1f}" if stats['read_mb_per_s'] is not None else "-",
+                _format_bytes(stats['rss_delta_p95'])
+            )
+        console.print(metrics_table)
+    
     logger.info("Ingestion process completed", 
-                files_processed=len(processed_files),
+                files_processed=processed_count,
                 skipped_files=len(skipped_files),
                 failed_files=len(failed_files),
                 processing_time=processing_time,
                 run_directory=run_dir)
 
+@app.command()
+def watch(
+    directory: str = typer.Argument(..., help="Directory to watch for new video files"),
+    recursive: bool = typer.Option(True, "--recursive/--no-recursive", "-r/-nr", help="Watch subdirectories"),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="Files processed in parallel"),
+    settle: float = typer.Option(WATCH_SETTLE_SECONDS, "--settle", help="Seconds a file's size and mtime must stay unchanged before it is ingested"),
+    poll: bool = typer.Option(False, "--poll", help="Poll instead of using inotify (e.g. for network shares)"),
+    poll_interval: float = typer.Option(WATCH_POLL_INTERVAL, "--poll-interval", help="Seconds between directory scans when polling"),
+    existing: bool = typer.Option(True, "--existing/--new-only", help="Also ingest files already in the directory"),
+    disable_steps: List[str] = typer.Option(None, "--disable", "-d", help="Steps to disable in the pipeline"),
+    enable_steps: List[str] = typer.Option(None, "--enable", "-e", help="Steps to enable in the pipeline"),
+    config_file: Optional[str] = typer.Option(None, "--config", "-c", help="JSON configuration file for pipeline steps"),
+    compression_fps: int = typer.Option(DEFAULT_COMPRESSION_CONFIG['fps'], "--fps", help=f"Frame rate for compressed videos (default: {DEFAULT_COMPRESSION_CONFIG['fps']})"),
+    compression_bitrate: str = typer.Option(DEFAULT_COMPRESSION_CONFIG['video_bitrate'], "--bitrate", help=f"Video bitrate for compression (default: {DEFAULT_COMPRESSION_CONFIG['video_bitrate']})"),
+    store_database: bool = typer.Option(False, "--store-database", help="Store results in Supabase database (requires authentication)"),
+    generate_embeddings: bool = typer.Option(False, "--generate-embeddings", help="Generate vector embeddings for semantic search (requires authentication)"),
+    upload_thumbnails: bool = typer.Option(False, "--upload-thumbnails", help="Upload thumbnails to Supabase storage (requires authentication)"),
+    force_reprocess: bool = typer.Option(False, "--force-reprocess", "-f", help="Force reprocessing of files even if they already exist in database")
+):
+    """
+    Watch a directory and ingest video files as soon as they finish copying.
+    
+    Runs until interrupted (Ctrl+C) as one long-lived process: the pipeline,
+    ExifTool processes, embedding clients and the database session stay warm
+    between files. All files go into a single run directory and the run catalog.
+    """
+    if not os.path.isdir(directory):
+        raise typer.BadParameter("Not a directory", param_hint="directory")
+    start_time = time.time()
+    
+    logger, timestamp, json_dir, log_file = setup_logging()
+    run_dir = os.path.dirname(json_dir)
+    thumbnails_dir = os.path.join(run_dir, "thumbnails")
+    os.makedirs(thumbnails_dir, exist_ok=True)
+    summary_filename = f"watch_{os.path.basename(os.path.normpath(directory))}_{timestamp}.jsonl"
+    
+    logger.info("Starting watch", directory=directory, recursive=recursive, run_dir=run_dir, workers=workers)
+    pipeline_config = _build_pipeline_config(logger, config_file, disable_steps, enable_steps,
+                                             store_database, generate_embeddings, upload_thumbnails)
+    with open(os.path.join(run_dir, "pipeline_config.json"), 'w') as f:
+        json.dump(pipeline_config, f, indent=2)
+    if pipeline_config.get('database_storage'):
+        # Keep one refreshed, authenticated client for the whole session
+        from .auth import auth_state
+        auth_state.start()
+    
+    output_writer = RunOutputWriter(run_dir, summary_filename, logger, catalog=get_run_catalog())
+    run_metrics = RunMetrics(run_id=os.path.basename(run_dir))
+    work_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+    counts = {"processed": 0, "skipped": 0, "failed": 0}
+    counts_lock = threading.Lock()
+    
+    def work() -> None:
+        while True:
+            file_path = work_queue.get()
+            if file_path is None:
+                return
+            started = time.time()
+            try:
+                status, details = _ingest_file(
+                    file_path,
+                    thumbnails_dir,
+                    json_dir,
+                    output_writer,
+                    logger,
+                    pipeline_config,
+                    compression_fps=compression_fps,
+                    compression_bitrate=compression_bitrate,
+                    force_reprocess=force_reprocess,
+                    metrics=run_metrics
+                )
+                with counts_lock:
+                    counts[status] += 1
+                name = os.path.basename(file_path)
+                if status == "processed":
+                    console.print(f"[green]✓[/green] {name} [dim]({time.time() - started:.1f}s, {work_queue.qsize()} queued)[/dim]")
+                elif status == "skipped":
+                    console.print(f"[yellow]-[/yellow] {name} [dim](exists as {details.get('existing_file_name')})[/dim]")
+                else:
+                    console.print(f"[red]✗[/red] {name}: {details['error']}")
+            except Exception as e:
+                # Keep the worker alive: a failure while recording the result only loses this file
+                logger.error("Error recording watched file", path=file_path, error=str(e))
+                try:
+                    output_writer.add_failed(file_path, str(e))
+                except Exception as record_error:
+                    logger.error("Could not record failed file", path=file_path, error=str(record_error))
+                with counts_lock:
+                    counts["failed"] += 1
+                console.print(f"[red]✗[/red] {os.path.basename(file_path)}: {e}")
+    
+    worker_threads = [threading.Thread(target=work, name=f"ingest-worker-{i}", daemon=True) for i in range(workers)]
+    for thread in worker_threads:
+        thread.start()
+    
+    watcher = FolderWatcher(directory, work_queue.put, recursive=recursive, settle_seconds=settle,
+                            poll_interval=poll_interval, use_inotify=not poll, include_existing=existing,
+                            logger=logger)
+    console.print(Panel.fit(
+        f"[cyan]Watching:[/cyan] {os.path.abspath(directory)} ({watcher.mode})\n"
+        f"[cyan]Workers:[/cyan] {workers}\n"
+        f"[cyan]Settle time:[/cyan] {settle:g}s\n"
+        f"[cyan]Output Directory:[/cyan] {run_dir}\n"
+        f"[cyan]Log File:[/cyan] {log_file}\n"
+        "[dim]Press Ctrl+C to stop[/dim]",
+        title="Watch Folder",
+        border_style="green"
+    ))
+    
+    stop = threading.Event()
+    # Stop as on Ctrl+C when run as a service
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        watcher.run(stop)
+    except KeyboardInterrupt:
+        stop.set()
+    
+    # Files not started yet are left for the next run (duplicates are skipped then)
+    abandoned = 0
+    while True:
+        try:
+            work_queue.get_nowait()
+            abandoned += 1
+        except queue.Empty:
+            break
+    console.print(f"[yellow]Stopping; waiting for files in progress...[/yellow]" +
+                  (f" ({abandoned} queued file(s) left for the next run)" if abandoned else ""))
+    for _ in worker_threads:
+        work_queue.put(None)
+    for thread in worker_threads:
+        thread.join()
+    
+    output_paths = output_writer.close()
+    output_paths['run_log'] = copy_run_log(run_dir, log_file, logger)
+    metrics_path = run_metrics.write(run_dir)
+    
+    summary_table = Table(title="Watch Summary")
+    summary_table.add_column("Metric", style="cyan")
+    summary_table.add_column("Value", style="green")
+    summary_table.add_row("Files processed", str(counts["processed"]))
+    summary_table.add_row("Skipped files (duplicates)", str(counts["skipped"]))
+    summary_table.add_row("Failed files", str(counts["failed"]))
+    if abandoned:
+        summary_table.add_row("Queued, not processed", str(abandoned))
+    summary_table.add_row("Watched for", f"{time.time() - start_time:.0f} seconds")
+    summary_table.add_row("Run directory", run_dir)
+    summary_table.add_row("Results (JSONL)", output_paths['run_summary'])
+    summary_table.add_row("Step metrics", metrics_path)
+    console.print(summary_table)
+    
+    logger.info("Watch stopped", abandoned=abandoned, run_directory=run_dir, **counts)
+
 @app.command()
 def list_steps():
     """
@@ -325,7 +576,8 @@ app.add_typer(search_app, name="search")
 @search_app.command("recent")
 def list_recent_videos(
     limit: int = typer.Option(10, "--limit", "-l", help="Maximum number of results"),
-    output_format: str = typer.Option("table", "--format", help="Output format: table, json")
+    output_format: str = typer.Option("table", "--format", help="Output format: table, json"),
+    profile: str = typer.Option("grid", "--profile", "-p", help="Field profile: grid, detail, export")
 ):
     """List recent videos from your catalog."""
     from .search import VideoSearcher, format_search_results # Import here to avoid circular deps
@@ -339,7 +591,7 @@ def list_recent_videos(
     try:
         video_searcher = VideoSearcher()
         # Call the new list_videos method, default sort is 'processed_at' descending
-        results = video_searcher.list_videos(limit=limit) 
+        results = video_searcher.list_videos(limit=limit, profile=profile)
 
         if not results:
             console.print("No recent videos found.")
@@ -382,19 +634,24 @@ def list_recent_videos(
 # and to be more descriptive of its action (querying with text)
 def search_videos(
     query: str = typer.Argument(..., help="Search query"),
-    search_type: str = typer.Option("hybrid", "--type", "-t", help="Search type: semantic, fulltext, hybrid, transcripts"),
+    search_type: str = typer.Option("hybrid", "--type", "-t", help="Search type: semantic, fulltext, hybrid, transcripts, fused"),
     limit: int = typer.Option(10, "--limit", "-l", help="Maximum number of results"),
     show_scores: bool = typer.Option(True, "--scores/--no-scores", help="Show similarity/ranking scores"),
     summary_weight: float = typer.Option(1.0, "--summary-weight", help="Weight for summary embeddings (hybrid/semantic)"),
     keyword_weight: float = typer.Option(0.8, "--keyword-weight", help="Weight for keyword embeddings (hybrid/semantic)"),
-    fulltext_weight: float = typer.Option(1.0, "--fulltext-weight", help="Weight for full-text search (hybrid)"),
-    output_format: str = typer.Option("table", "--format", help="Output format: table, json")
+    fulltext_weight: float = typer.Option(1.0, "--fulltext-weight", help="Weight for full-text search (hybrid/fused)"),
+    thumbnail_weight: Optional[float] = typer.Option(None, "--thumbnail-weight", help="Weight for thumbnail similarity (fused)"),
+    transcript_weight: Optional[float] = typer.Option(None, "--transcript-weight", help="Weight for transcript hits (fused)"),
+    retrievers: Optional[List[str]] = typer.Option(None, "--retriever", "-r", help="Retriever to fuse (repeatable; fused search): fulltext, summary, keyword, thumbnail, transcript (keyword and thumbnail need --local)"),
+    output_format: str = typer.Option("table", "--format", help="Output format: table, json"),
+    profile: str = typer.Option("grid", "--profile", "-p", help="Field profile: grid, detail, export"),
+    local: bool = typer.Option(False, "--local", help="Search the local vector and full-text indexes (see 'ait index sync')")
 ):
     """Search the video catalog using various search methods."""
     from .search import VideoSearcher, format_search_results, format_duration
     
     # Validate search type
-    valid_types = ["semantic", "fulltext", "hybrid", "transcripts", "similar", "recent"]
+    valid_types = ["semantic", "fulltext", "hybrid", "transcripts", "fused", "similar", "recent"]
     if search_type not in valid_types:
         console.print(f"[red]Error:[/red] Invalid search type. Must be one of: {', '.join(valid_types)}")
         raise typer.Exit(1)
@@ -403,14 +660,14 @@ def search_videos(
     if search_type == "recent":
         # Redirect to the recent command
         console.print("[yellow]Redirecting to 'recent' command...[/yellow]")
-        list_recent_videos(limit=limit, output_format=output_format)
+        list_recent_videos(limit=limit, output_format=output_format, profile=profile)
         return
     elif search_type == "similar":
         console.print("[red]Error:[/red] For similar search, use: python -m video_ingest_tool search similar <clip_id>")
         raise typer.Exit(1)
     
     try:
-        searcher = VideoSearcher()
+        searcher = VideoSearcher(local=local)
         
         # Set weights for search
         weights = {
@@ -418,6 +675,10 @@ def search_videos(
             'keyword_weight': keyword_weight,
             'fulltext_weight': fulltext_weight
         }
+        if thumbnail_weight is not None:
+            weights['thumbnail_weight'] = thumbnail_weight
+        if transcript_weight is not None:
+            weights['transcript_weight'] = transcript_weight
         
         console.print(f"[cyan]Searching for:[/cyan] '{query}' [dim]({search_type} search)[/dim]")
         
@@ -426,7 +687,9 @@ def search_videos(
             query=query,
             search_type=search_type,
             match_count=limit,
-            weights=weights
+            weights=weights,
+            profile=profile,
+            retrievers=retrievers or None
         )
         
         if not results:
@@ -448,7 +711,7 @@ def search_videos(
             results_table.add_column("Category", style="magenta")
             
             if show_scores:
-                if search_type == "hybrid":
+                if search_type in ["hybrid", "fused"]:
                     results_table.add_column("Score", style="yellow")
                     results_table.add_column("Type", style="dim")
                 elif search_type == "semantic":
@@ -465,7 +728,7 @@ def search_videos(
                 ]
                 
                 if show_scores:
-                    if search_type == "hybrid":
+                    if search_type in ["hybrid", "fused"]:
                         search_rank_val = result.get('search_rank')
                         search_rank_str = f"{search_rank_val:.3f}" if search_rank_val is not None else "N/A"
                         row.extend([
@@ -485,6 +748,25 @@ def search_videos(
             
             console.print(results_table)
             
+            # Segment-level transcript hits (local text index only)
+            segment_results = [r for r in formatted_results if r.get('matching_segments')]
+            if segment_results:
+                segments_table = Table(title="Matching Transcript Segments")
+                segments_table.add_column("File", style="cyan", max_width=30)
+                segments_table.add_column("At", style="blue")
+                segments_table.add_column("Speaker", style="magenta")
+                segments_table.add_column("Text", style="white", max_width=70)
+                for result in segment_results:
+                    for segment in result['matching_segments']:
+                        start = segment.get('start_seconds')
+                        segments_table.add_row(
+                            result.get('file_name', 'Unknown'),
+                            f"{int(start // 60)}:{start % 60:04.1f}" if start is not None else (segment.get('timestamp') or "?"),
+                            segment.get('speaker') or "",
+                            _highlight_snippet(segment.get('snippet') or segment.get('text', ''))
+                        )
+                console.print(segments_table)
+            
             # Show example commands
             console.print(f"\n[dim]💡 To view details: python -m video_ingest_tool search show <clip_id>[/dim]")
             
@@ -496,18 +778,26 @@ def search_videos(
         console.print(f"[red]Search failed:[/red] {str(e)}")
         raise typer.Exit(1)
 
+def _highlight_snippet(snippet: str) -> Text:
+    """Render a '**'-delimited search snippet with the matched terms in bold."""
+    text = Text()
+    for i, part in enumerate(snippet.split("**")):
+        text.append(part, style="bold yellow" if i % 2 else None)
+    return text
+
 @search_app.command("similar")
 def find_similar_videos(
     clip_id: str = typer.Argument(..., help="ID of the source clip"),
     limit: int = typer.Option(5, "--limit", "-l", help="Maximum number of similar clips"),
     threshold: float = typer.Option(0.5, "--threshold", "-t", help="Minimum similarity threshold"),
-    output_format: str = typer.Option("table", "--format", help="Output format: table, json")
+    output_format: str = typer.Option("table", "--format", help="Output format: table, json"),
+    local: bool = typer.Option(False, "--local", help="Use the local vector index instead of the database")
 ):
     """Find videos similar to a given clip."""
     from .search import VideoSearcher, format_search_results, format_duration
     
     try:
-        searcher = VideoSearcher()
+        searcher = VideoSearcher(local=local)
         
         console.print(f"[cyan]Finding clips similar to:[/cyan] {clip_id}")
         
@@ -558,6 +848,7 @@ def show_clip_details(
     """Show detailed information about a specific clip."""
     from .auth import AuthManager
     from .search import format_duration, format_file_size
+    from .field_profiles import clip_select
     
     try:
         auth_manager = AuthManager()
@@ -569,7 +860,7 @@ def show_clip_details(
             raise typer.Exit(1)
         
         # Get clip details
-        clip_result = client.table('clips').select('*').eq('id', clip_id).execute()
+        clip_result = client.table('clips').select(clip_select('detail')).eq('id', clip_id).execute()
         
         if not clip_result.data:
             console.print(f"[red]Error:[/red] Clip with ID {clip_id} not found")
@@ -660,6 +951,123 @@ def show_catalog_stats():
         console.print(f"[red]Failed to get statistics:[/red] {str(e)}")
         raise typer.Exit(1)
 
+# Local vector index commands
+index_app = typer.Typer(help="Manage the local vector and full-text indexes used by 'search --local'")
+app.add_typer(index_app, name="index")
+
+@index_app.command("sync")
+def sync_local_index_command(
+    full: bool = typer.Option(False, "--full", help="Re-download every clip"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Recluster the vector index even if not needed yet"),
+    vectors: bool = typer.Option(True, "--vectors/--no-vectors", help="Sync the vector index"),
+    text: bool = typer.Option(True, "--text/--no-text", help="Sync the full-text index"),
+    knn: bool = typer.Option(True, "--knn/--no-knn", help="Recompute the 'find similar' neighbour graph")
+):
+    """Create or update the local mirrors of your vectors and clip text."""
+    from .auth import AuthManager
+    from .vector_index import sync_local_index
+    from .text_index import sync_text_index
+    
+    auth_manager = AuthManager()
+    client = auth_manager.get_authenticated_client()
+    user_id = auth_manager.get_user_id()
+    if not client or not user_id:
+        console.print("[red]Authentication required. Please login using 'ait auth login'.[/red]")
+        raise typer.Exit(code=1)
+    
+    try:
+        with Progress(TextColumn("[progress.description]{task.description}"), BarColumn(),
+                      TextColumn("{task.completed}/{task.total}"), console=console) as progress:
+            result = text_result = None
+            if vectors:
+                task = progress.add_task("Syncing vectors", total=None)
+                result = sync_local_index(
+                    client, user_id, full=full, rebuild=rebuild, knn=knn,
+                    progress=lambda done, total: progress.update(task, completed=done, total=total)
+                )
+            if text:
+                text_task = progress.add_task("Syncing clip text", total=None)
+                text_result = sync_text_index(
+                    client, user_id, full=full,
+                    progress=lambda done, total: progress.update(text_task, completed=done, total=total)
+                )
+    except Exception as e:
+        console.print(f"[red]Sync failed:[/red] {str(e)}")
+        raise typer.Exit(1)
+    
+    if result:
+        console.print(f"[green]Vector index synced:[/green] {result['remote_clips']} clips, "
+                      f"{result['fetched']} fetched, {result['removed']} removed in {result['seconds']}s")
+        if result['rebuilt']:
+            console.print(f"Rebuilt: {', '.join(f'{field} ({count} vectors)' for field, count in result['rebuilt'].items())}")
+        if result['knn_clips'] is not None:
+            console.print(f"Neighbour graph recomputed for {result['knn_clips']} clips")
+    if text_result:
+        console.print(f"[green]Text index synced:[/green] {text_result['remote_clips']} clips, "
+                      f"{text_result['fetched']} fetched, {text_result['removed']} removed in {text_result['seconds']}s")
+
+@index_app.command("status")
+def local_index_status():
+    """Show what the local vector and full-text indexes contain."""
+    from .auth import AuthManager
+    from .vector_index import LocalVectorIndex, get_local_index
+    from .text_index import LocalTextIndex, get_text_index
+    
+    user_id = AuthManager().get_user_id()
+    if not user_id:
+        console.print("[red]Authentication required. Please login using 'ait auth login'.[/red]")
+        raise typer.Exit(code=1)
+    if LocalTextIndex.exists(user_id):
+        text_stats = get_text_index(user_id).stats()
+        console.print(f"Text index: {text_stats['clips']} clips ({text_stats['transcribed_clips']} transcribed), "
+                      f"{text_stats['segments']} transcript segments, last sync {text_stats['last_sync'] or 'never'}")
+    if not LocalVectorIndex.exists(user_id):
+        console.print("[yellow]No local vector index yet. Run 'ait index sync' to create it.[/yellow]")
+        return
+    
+    stats = get_local_index(user_id).stats()
+    table = Table(title=f"Local Vector Index ({stats['clips']} clips, last sync {stats['last_sync'] or 'never'})")
+    table.add_column("Field", style="cyan")
+    table.add_column("Dim", style="blue")
+    table.add_column("Live Vectors", style="green")
+    table.add_column("Rows", style="white")
+    table.add_column("IVF Lists", style="magenta")
+    table.add_column("Unclustered", style="yellow")
+    table.add_column("Quantization", style="white")
+    table.add_column("Size", style="blue")
+    for field, info in stats['fields'].items():
+        table.add_row(field, str(info['dim']), str(info['live']), str(info['rows']),
+                      str(info['lists']), str(info['unclustered']), info['quantization'],
+                      f"{info['bytes'] / (1024 * 1024):.1f} MB")
+    console.print(table)
+    if stats['knn']['k']:
+        console.print(f"Neighbour graph: {stats['knn']['clips']} clips, {stats['knn']['k']} neighbours each")
+    console.print(f"[dim]{stats['directory']}[/dim]")
+
+@index_app.command("quantize")
+def quantize_local_index_command(
+    mode: str = typer.Argument(..., help="Compact code format: none, binary or int8")
+):
+    """Store compact codes for fast candidate retrieval; results are re-ranked on the full vectors."""
+    from .auth import AuthManager
+    from .vector_index import QUANTIZATION_MODES, LocalVectorIndex, get_local_index
+    
+    user_id = AuthManager().get_user_id()
+    if not user_id:
+        console.print("[red]Authentication required. Please login using 'ait auth login'.[/red]")
+        raise typer.Exit(code=1)
+    if mode not in QUANTIZATION_MODES:
+        console.print(f"[red]Invalid mode '{mode}'. Must be one of: {', '.join(QUANTIZATION_MODES)}[/red]")
+        raise typer.Exit(code=1)
+    if not LocalVectorIndex.exists(user_id):
+        console.print("[yellow]No local vector index yet. Run 'ait index sync' to create it.[/yellow]")
+        raise typer.Exit(code=1)
+    
+    index = get_local_index(user_id)
+    index.quantize(mode)
+    for field, info in index.stats()['fields'].items():
+        console.print(f"{field}: {info['live']} vectors, {info['bytes'] / (1024 * 1024):.1f} MB on disk ({mode})")
+
 @app.command("check-progress")
 def check_ingest_progress():
     """Check the progress of the current ingest job running on the API server.
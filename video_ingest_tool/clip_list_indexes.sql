@@ -0,0 +1,20 @@
+-- =====================================================
+-- INDEXES FOR KEYSET PAGINATION OF THE CLIP LIST
+-- =====================================================
+
+-- VideoSearcher.list_videos_page orders by (sort_by, id) within a user's clips
+-- and resumes after the previous page's last row. One composite index per
+-- sortable field lets every page be an index range scan, however deep.
+-- Postgres can scan these backwards, so they serve both sort orders.
+
+CREATE INDEX IF NOT EXISTS clips_user_processed_at_id_idx
+  ON clips (user_id, processed_at, id);
+
+CREATE INDEX IF NOT EXISTS clips_user_created_at_id_idx
+  ON clips (user_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS clips_user_file_name_id_idx
+  ON clips (user_id, file_name, id);
+
+CREATE INDEX IF NOT EXISTS clips_user_duration_seconds_id_idx
+  ON clips (user_id, duration_seconds, id);
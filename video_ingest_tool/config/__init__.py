@@ -11,7 +11,7 @@ from .constants import (
     DEFAULT_COMPRESSION_CONFIG
 )
 from .settings import Config
-from .logging import setup_logging, console
+from .logging import setup_logging, flush_logging, stop_logging, console
 
 __all__ = [
     # Constants
@@ -25,5 +25,7 @@ __all__ = [
     
     # Functions and objects
     'setup_logging',
+    'flush_logging',
+    'stop_logging',
     'console',
 ]
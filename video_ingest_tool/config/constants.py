@@ -23,6 +23,14 @@ DEFAULT_COMPRESSION_CONFIG = {
     'use_hardware_accel': True,
     'codec_priority': ['hevc_videotoolbox', 'h264_videotoolbox', 'libx265', 'libx264'],
     'crf_value': '25',
+    # Software encodes of clips at least this long (seconds) are split on GOP
+    # boundaries and encoded as parallel ffmpeg processes
+    'parallel_min_duration': 120,
+    'segment_seconds': 60,
+    'parallel_workers': 0,  # 0 = one per two CPU cores
+    # Software codec for clips at least this long (x265 is several times slower)
+    'long_clip_codec': 'libx264',
+    'long_clip_duration': 1800,
 }
 
 # Check if required modules are available
@@ -1,25 +1,196 @@
 """
 Logging configuration for the video ingest tool.
 
-Sets up structured logging with both console and file output.
+Sets up structured logging with console, file and JSON Lines output.
+
+Logging never blocks the threads doing the work: the root logger only has
+a queue handler, and a background listener thread renders records to the
+Rich console, the plain-text log file and the JSON Lines log
+(``ingestor_<ts>.jsonl``, one object per record, for machine parsing).
+Repetitive INFO/DEBUG messages are sampled per logger and message: after
+LOG_RATE_LIMIT records within LOG_RATE_WINDOW seconds the rest are dropped
+until the window ends, and the next one that gets through carries the
+number suppressed. Warnings and errors are never sampled.
 """
 
 import os
+import atexit
 import datetime
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 import structlog
 from rich.console import Console
 from rich.logging import RichHandler
 from logging import FileHandler
-from typing import Tuple, Any
+from typing import Any, Dict, Optional, Tuple
+
+from ..serialization import dumps
 
 # Initialize console for rich output
 console = Console()
 
+# Records waiting for the listener; when full, INFO/DEBUG records are dropped
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Records per logger and message allowed in each window (0 disables sampling)
+LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", "20"))
+LOG_RATE_WINDOW = float(os.getenv("LOG_RATE_WINDOW", "10"))
+# Set to 0 to skip the JSON Lines log
+LOG_JSON = os.getenv("LOG_JSON", "1") != "0"
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Samples repetitive records per (logger, message).
+
+    Structlog records are keyed by their event, stdlib records by their
+    unformatted message, so messages that only differ in their arguments
+    count as the same message.
+    """
+
+    def __init__(self, limit: int = LOG_RATE_LIMIT, window: float = LOG_RATE_WINDOW):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.suppressed_total = 0
+        self._lock = threading.Lock()
+        # key -> [window start, records passed, records suppressed]
+        self._counts: Dict[Tuple[str, Any], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno >= logging.WARNING:
+            return True
+        message = record.msg.get("event") if isinstance(record.msg, dict) else record.msg
+        key = (record.name, message if isinstance(message, str) else str(message))
+        now = time.monotonic()
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None or now - counts[0] >= self.window:
+                suppressed = counts[2] if counts else 0
+                self._counts[key] = [now, 1, 0]
+            elif counts[1] < self.limit:
+                counts[1] += 1
+                return True
+            else:
+                counts[2] += 1
+                self.suppressed_total += 1
+                return False
+        if suppressed:
+            _note_suppressed(record, suppressed)
+        return True
+
+
+def _note_suppressed(record: logging.LogRecord, count: int) -> None:
+    """Mark a record as the first after `count` similar records were dropped."""
+    if isinstance(record.msg, dict):
+        record.msg = {**record.msg, "suppressed_similar": count}
+    else:
+        record.msg = f"{record.msg} ({count} similar messages suppressed)"
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves all formatting to the listener thread.
+
+    Records are enqueued as they are (the stock QueueHandler formats them
+    first). INFO/DEBUG records are dropped when the queue is full; warnings
+    and errors wait for room.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            # Structlog event dict: already has event, level, logger and timestamp
+            data = dict(record.msg)
+        else:
+            data = {
+                "event": record.getMessage(),
+                "level": record.levelname.lower(),
+                "logger": record.name,
+                "timestamp": datetime.datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S.%f"),
+            }
+        if record.exc_info and "exception" not in data:
+            data["exception"] = self.formatException(record.exc_info)
+        return dumps(data).decode()
+
+
+# State of the current setup_logging() call
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_rate_filter: Optional[RateLimitFilter] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def flush_logging(timeout: float = 5.0) -> None:
+    """
+    Wait until the listener has written the records queued so far.
+
+    Args:
+        timeout: Give up after this many seconds
+    """
+    listener = _listener
+    if listener is None:
+        return
+    deadline = time.monotonic() + timeout
+    while listener.queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for handler in listener.handlers:
+        handler.flush()
+
+
+def stop_logging() -> None:
+    """Write out queued records, stop the listener and close the log files."""
+    global _queue_handler, _rate_filter, _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        notes = []
+        if _queue_handler.dropped:
+            notes.append(f"Log queue was full; dropped {_queue_handler.dropped} INFO/DEBUG records")
+        if _rate_filter.suppressed_total:
+            notes.append(f"Log sampling suppressed {_rate_filter.suppressed_total} repetitive records")
+        for handler in _listener.handlers:
+            for note in notes:
+                handler.handle(logging.makeLogRecord({
+                    "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING", "msg": note,
+                }))
+            handler.close()
+        _queue_handler = _rate_filter = _listener = None
+
+
+atexit.register(stop_logging)
+
+
 def setup_logging() -> Tuple[Any, str, str, str]:
     """
     Setup logging configurations for both file and console output.
     
+    Calling it again (e.g. for the next API ingest run) replaces the
+    previous run's handlers.
+    
     Returns:
         Tuple containing:
             - logger: The configured logger
@@ -27,6 +198,8 @@ def setup_logging() -> Tuple[Any, str, str, str]:
             - json_dir: Directory for JSON output files
             - log_file: Path to the log file
     """
+    global _queue_handler, _rate_filter, _listener
+    
     # Get the package directory
     package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     parent_dir = os.path.dirname(package_dir)
@@ -74,7 +247,7 @@ def setup_logging() -> Tuple[Any, str, str, str]:
         cache_logger_on_first_use=True,
     )
     
-    # Configure standard Python logging handlers
+    # Configure standard Python logging handlers (run by the listener thread)
     log_format = "%(message)s"
     
     # Console Handler (using Rich for pretty output)
@@ -86,15 +259,31 @@ def setup_logging() -> Tuple[Any, str, str, str]:
     file_log_handler = FileHandler(log_file, mode='w', encoding='utf-8')
     file_log_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)-5.5s] [%(name)s] %(message)s"))
     file_log_handler.setLevel(logging.INFO)
+    handlers = [rich_console_handler, file_log_handler]
+    
+    # JSON Lines handler (machine-readable copy of the log file)
+    if LOG_JSON:
+        json_log_handler = FileHandler(os.path.splitext(log_file)[0] + ".jsonl", mode='w', encoding='utf-8')
+        json_log_handler.setFormatter(JsonLinesFormatter())
+        json_log_handler.setLevel(logging.INFO)
+        handlers.append(json_log_handler)
+    
+    # Replace the previous run's pipeline, then route the root logger through the queue
+    stop_logging()
+    with _listener_lock:
+        log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+        _queue_handler = NonBlockingQueueHandler(log_queue)
+        _rate_filter = RateLimitFilter()
+        _queue_handler.addFilter(_rate_filter)
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
     
-    # Get the root logger and add handlers
-    std_root_logger = logging.getLogger()
-    std_root_logger.addHandler(rich_console_handler)
-    std_root_logger.addHandler(file_log_handler)
-    std_root_logger.setLevel(logging.INFO)
+        std_root_logger = logging.getLogger()
+        std_root_logger.addHandler(_queue_handler)
+        std_root_logger.setLevel(logging.INFO)
     
     # Create a logger instance using structlog
     logger = structlog.get_logger(__name__)
     logger.info("Logging configured successfully for console and file.")
     
-    return logger, timestamp, json_dir, log_file 
\ No newline at end of file
+    return logger, timestamp, json_dir, log_file
@@ -9,6 +9,8 @@ import structlog
 
 from .auth import AuthManager
 from .models import VideoIngestOutput
+from .serialization import serialized
+from .text_index import mirror_clip_text, text_index_enabled
 
 logger = structlog.get_logger(__name__)
 
@@ -208,6 +210,9 @@ def store_video_in_database(
             raise ValueError("Unable to get authenticated user ID")
         user_id = user_response.user.id
         
+        # JSON-compatible view of the model, shared with the file and API output
+        payload = serialized(video_data).data
+        
         # Generate comprehensive searchable content
         searchable_content = generate_searchable_content(video_data)
         if logger and searchable_content:
@@ -248,13 +253,13 @@ def store_video_in_database(
             
             # Complex metadata as JSONB
             "technical_metadata": {
-                "codec_details": video_data.video.codec.model_dump() if video_data.video.codec else {},
-                "color_details": video_data.video.color.model_dump() if video_data.video.color else {},
-                "exposure_details": video_data.video.exposure.model_dump() if video_data.video.exposure else {}
+                "codec_details": payload['video']['codec'] or {},
+                "color_details": payload['video']['color'] or {},
+                "exposure_details": payload['video']['exposure'] or {}
             },
-            "camera_details": video_data.camera.model_dump() if video_data.camera else {},
-            "audio_tracks": [track.model_dump() for track in video_data.audio_tracks] if video_data.audio_tracks else [],
-            "subtitle_tracks": [track.model_dump() for track in video_data.subtitle_tracks] if video_data.subtitle_tracks else [],
+            "camera_details": payload['camera'] or {},
+            "audio_tracks": payload['audio_tracks'],
+            "subtitle_tracks": payload['subtitle_tracks'],
             "thumbnails": video_data.thumbnails if video_data.thumbnails else [],
             # Initialize all_thumbnail_urls as empty array if not already present
             "all_thumbnail_urls": []
@@ -328,7 +333,7 @@ def store_video_in_database(
                 "user_id": user_id,
                 "analysis_type": "ai",
                 "analysis_scope": "full_clip",
-                "ai_analysis": video_data.analysis.ai_analysis.model_dump()
+                "ai_analysis": payload['analysis']['ai_analysis']
             }
             
             if existing_clip_id:
@@ -342,6 +347,17 @@ def store_video_in_database(
                 if logger:
                     logger.info(f"Stored AI analysis for clip: {clip_id}")
         
+        # Keep the local full-text index current once it exists
+        if text_index_enabled(user_id):
+            stored_row = clip_result.data[0] if clip_result.data else {}
+            mirror_clip_text(
+                user_id,
+                {**clip_data, **stored_row, "id": clip_id},
+                payload['analysis']['ai_analysis'] if video_data.analysis else None,
+                version=stored_row.get('updated_at'),
+                logger=logger
+            )
+        
         return {
             'clip_id': clip_id,
             'stored_in_database': True,
@@ -1,9 +1,16 @@
 """
 Vector embeddings generation using BAAI/bge-m3 via DeepInfra.
 Following Supabase best practices for hybrid search.
+
+Every embedded input (summary text, keyword text, each AI thumbnail image)
+is fingerprinted with a content hash stored in the vectors row metadata.
+Re-ingesting a clip only embeds inputs whose hash changed and updates only
+those vector columns in place.
 """
 
 import os
+import hashlib
+from datetime import datetime, timezone
 import openai
 import tiktoken
 from typing import List, Dict, Any, Optional, Tuple
@@ -11,11 +18,22 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+EMBEDDING_MODEL = "BAAI/bge-m3"
+# OpenAI-compatible endpoint serving EMBEDDING_MODEL
+EMBEDDING_API_BASE = os.getenv("EMBEDDING_API_BASE", "https://api.deepinfra.com/v1/openai")
+# Key in vectors.metadata holding the hash of each embedded input
+CONTENT_HASHES_KEY = "content_hashes"
+THUMBNAIL_EMBEDDING_COLUMNS = {
+    1: "thumbnail_1_embedding",
+    2: "thumbnail_2_embedding",
+    3: "thumbnail_3_embedding",
+}
+
 def get_embedding_client():
     """Get OpenAI client configured for DeepInfra API."""
     return openai.OpenAI(
         api_key=os.getenv("DEEPINFRA_API_KEY"),
-        base_url="https://api.deepinfra.com/v1/openai"
+        base_url=EMBEDDING_API_BASE
     )
 
 def count_tokens(text: str) -> int:
@@ -402,6 +420,17 @@ def prepare_embedding_content(video_data) -> Tuple[str, str, Dict[str, Any]]:
     
     return summary_content, keyword_content, metadata
 
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed several texts with BAAI/bge-m3 in a single request."""
+    if not texts:
+        return []
+    response = get_embedding_client().embeddings.create(
+        input=texts,
+        model=EMBEDDING_MODEL,
+        encoding_format="float"
+    )
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
 def generate_embeddings(
     summary_content: str,
     keyword_content: str,
@@ -409,23 +438,7 @@ def generate_embeddings(
 ) -> Tuple[List[float], List[float]]:
     """Generate embeddings using BAAI/bge-m3 via DeepInfra."""
     try:
-        client = get_embedding_client()
-        
-        # Generate summary embedding
-        summary_response = client.embeddings.create(
-            input=summary_content,
-            model="BAAI/bge-m3",
-            encoding_format="float"
-        )
-        summary_embedding = summary_response.data[0].embedding
-        
-        # Generate keyword embedding
-        keyword_response = client.embeddings.create(
-            input=keyword_content,
-            model="BAAI/bge-m3",
-            encoding_format="float"
-        )
-        keyword_embedding = keyword_response.data[0].embedding
+        summary_embedding, keyword_embedding = embed_texts([summary_content, keyword_content])
         
         if logger:
             logger.info(f"Generated embeddings - Summary: {len(summary_embedding)}D, Keywords: {len(keyword_embedding)}D")
@@ -437,25 +450,101 @@ def generate_embeddings(
             logger.error(f"Failed to generate embeddings: {str(e)}")
         raise
 
+def content_hash(content: str, model: str = EMBEDDING_MODEL) -> str:
+    """Hash of a text input together with the model that embeds it."""
+    return hashlib.sha256(f"{model}\0{content}".encode("utf-8")).hexdigest()
+
+def file_hash(path: str) -> Optional[str]:
+    """SHA-256 of a file's bytes, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def embedding_input_hashes(
+    summary_content: str,
+    keyword_content: str,
+    thumbnail_paths: Optional[Dict[int, str]] = None
+) -> Dict[str, str]:
+    """
+    Content hashes of every input embedded for a clip.
+    
+    Args:
+        summary_content: Text embedded into summary_embedding
+        keyword_content: Text embedded into keyword_embedding
+        thumbnail_paths: Thumbnail rank -> image path
+        
+    Returns:
+        Dict[str, str]: Input key ('summary', 'keyword', 'thumbnail_<rank>') -> hash.
+        Thumbnails that cannot be read are left out, so they always count as changed.
+    """
+    hashes = {
+        "summary": content_hash(summary_content),
+        "keyword": content_hash(keyword_content),
+    }
+    for rank, path in (thumbnail_paths or {}).items():
+        digest = file_hash(path)
+        if digest:
+            hashes[f"thumbnail_{int(rank)}"] = digest
+    return hashes
+
+def get_stored_embeddings(client, clip_id: str) -> Optional[Dict[str, Any]]:
+    """
+    The clip's existing full_clip vectors row, without the vectors themselves.
+    
+    Returns:
+        Optional[Dict[str, Any]]: Row with id, metadata, thumbnail_embeddings,
+        embedded_content and original_content, or None if the clip has none
+    """
+    result = client.table('vectors') \
+        .select('id, metadata, thumbnail_embeddings, embedded_content, original_content') \
+        .eq('clip_id', clip_id) \
+        .eq('embedding_type', 'full_clip') \
+        .limit(1) \
+        .execute()
+    return result.data[0] if result.data else None
+
+def stored_content_hashes(stored_row: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Input hashes recorded with a vectors row (empty for rows written before hashing)."""
+    if not stored_row:
+        return {}
+    return dict((stored_row.get('metadata') or {}).get(CONTENT_HASHES_KEY) or {})
+
+def changed_embedding_inputs(hashes: Dict[str, str], stored_hashes: Dict[str, str]) -> List[str]:
+    """Input keys whose hash differs from (or is missing in) the stored hashes."""
+    return [key for key, digest in hashes.items() if stored_hashes.get(key) != digest]
+
 def store_embeddings(
     clip_id: str,
-    summary_embedding: List[float],
-    keyword_embedding: List[float],
+    summary_embedding: Optional[List[float]],
+    keyword_embedding: Optional[List[float]],
     summary_content: str,
     original_content: str,
     metadata: Dict[str, Any],
     thumbnail_embeddings: Optional[Dict[int, List[float]]] = None,
     thumbnail_descriptions: Optional[Dict[int, str]] = None,
     thumbnail_reasons: Optional[Dict[int, str]] = None,
-    logger=None
+    logger=None,
+    content_hashes: Optional[Dict[str, str]] = None,
+    stored_row: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Store embeddings in Supabase database.
     
+    A clip has one full_clip vectors row. If it already exists, only the vector
+    columns passed here are rewritten in place; a None summary/keyword embedding
+    or a missing thumbnail rank whose hash is unchanged keeps the stored vector.
+    Thumbnail ranks that are neither re-embedded nor unchanged are cleared. When
+    nothing differs from the stored row, no write happens at all.
+    
     Args:
         clip_id: ID of the clip the embeddings are for
-        summary_embedding: Vector embedding of the summary content
-        keyword_embedding: Vector embedding for keyword search
+        summary_embedding: Vector embedding of the summary content (None = unchanged)
+        keyword_embedding: Vector embedding for keyword search (None = unchanged)
         summary_content: The content that was embedded (used as primary matching content)
         original_content: The original unprocessed content
         metadata: Additional metadata about the embeddings
@@ -463,6 +552,9 @@ def store_embeddings(
         thumbnail_descriptions: Optional dictionary mapping thumbnail ranks to descriptions
         thumbnail_reasons: Optional dictionary mapping thumbnail ranks to selection reasons
         logger: Optional logger
+        content_hashes: Hashes of the current inputs (from embedding_input_hashes),
+                        recorded in the row metadata for the next re-ingest
+        stored_row: The clip's row from get_stored_embeddings, if already fetched
         
     Returns:
         bool: True if embeddings were stored successfully, False otherwise
@@ -486,72 +578,96 @@ def store_embeddings(
                 logger.error("Cannot store embeddings: No authenticated user")
             return False
         
-        # First, delete any existing vectors for this clip
-        if logger:
-            logger.info(f"Deleting existing vector records for clip: {clip_id}")
+        if stored_row is None:
+            stored_row = get_stored_embeddings(client, clip_id)
+        thumbnail_embeddings = thumbnail_embeddings or {}
+        thumbnail_descriptions = thumbnail_descriptions or {}
+        thumbnail_reasons = thumbnail_reasons or {}
+        if content_hashes:
+            metadata = {**metadata, CONTENT_HASHES_KEY: content_hashes}
+        previous_hashes = stored_content_hashes(stored_row)
+        
+        # Vector columns to write, and the thumbnails the row describes afterwards
+        vector_columns: Dict[str, Optional[List[float]]] = {}
+        if summary_embedding is not None:
+            vector_columns["summary_embedding"] = summary_embedding
+        if keyword_embedding is not None:
+            vector_columns["keyword_embedding"] = keyword_embedding
+        thumbnail_data = {}
+        stored_thumbnails = (stored_row or {}).get('thumbnail_embeddings') or {}
+        for rank, column in THUMBNAIL_EMBEDDING_COLUMNS.items():
+            embedding = thumbnail_embeddings.get(rank, thumbnail_embeddings.get(str(rank)))
+            key = f"thumbnail_{rank}"
+            if embedding is not None:
+                vector_columns[column] = embedding
+            elif not (content_hashes and key in content_hashes and previous_hashes.get(key) == content_hashes[key]):
+                # Neither re-embedded nor unchanged: clear a previously stored thumbnail
+                if str(rank) in stored_thumbnails:
+                    vector_columns[column] = None
+                continue
             
-        client.table('vectors').delete().eq('clip_id', clip_id).execute()
+            # Store metadata in the JSONB field (without the embedding)
+            thumbnail_info = {"rank": str(rank)}
+            description = thumbnail_descriptions.get(rank, thumbnail_descriptions.get(str(rank)))
+            if description:
+                thumbnail_info["description"] = description
+            reason = thumbnail_reasons.get(rank, thumbnail_reasons.get(str(rank)))
+            if reason:
+                thumbnail_info["reason"] = reason
+            thumbnail_data[str(rank)] = thumbnail_info
         
-        # Create base vector data
-        vector_data = {
-            "clip_id": clip_id,
-            "user_id": user_id,
-            "embedding_type": "full_clip",  # Must be 'full_clip' when segment_id is NULL
-            "embedding_source": "BAAI/bge-m3",
-            "summary_embedding": summary_embedding,
-            "keyword_embedding": keyword_embedding,
-            "embedded_content": summary_content,  # Primary content for matching
-            "original_content": original_content, # Original content before processing
-            "metadata": metadata,
-            # Add thumbnails metadata as JSONB (without the actual embeddings)
-            "thumbnail_embeddings": {}
-        }
+        # Local mirror fields whose vectors change with this write
+        from .vector_index import VECTOR_COLUMNS, local_index_enabled, mirror_clip_vectors
+        changed_fields = [
+            field for field, columns in VECTOR_COLUMNS.items()
+            if any(column in vector_columns for column in columns.values())
+        ]
         
-        # Add thumbnail embeddings if available
-        if thumbnail_embeddings and thumbnail_descriptions:
-            # Store thumbnail embeddings in dedicated vector columns
-            # and store metadata in the JSONB structure
-            thumbnail_data = {}
-            
-            for rank, embedding in thumbnail_embeddings.items():
-                if embedding is not None:
-                    # Store embedding in the dedicated vector column
-                    if str(rank) == "1":
-                        vector_data["thumbnail_1_embedding"] = embedding
-                    elif str(rank) == "2":
-                        vector_data["thumbnail_2_embedding"] = embedding
-                    elif str(rank) == "3":
-                        vector_data["thumbnail_3_embedding"] = embedding
-                    
-                    # Store metadata in the JSONB field (without the embedding)
-                    thumbnail_info = {
-                        "rank": str(rank)  # Ensure rank is stored as string
-                    }
-                    
-                    # Add description if available
-                    if thumbnail_descriptions and rank in thumbnail_descriptions:
-                        thumbnail_info["description"] = thumbnail_descriptions[rank]
-                    
-                    # Add reason if available
-                    if thumbnail_reasons and rank in thumbnail_reasons:
-                        thumbnail_info["reason"] = thumbnail_reasons[rank]
-                    
-                    # Use rank as the key in the JSONB
-                    thumbnail_data[str(rank)] = thumbnail_info
-            
-            vector_data["thumbnail_embeddings"] = thumbnail_data
+        if stored_row is None:
+            if summary_embedding is None or keyword_embedding is None:
+                raise ValueError(f"Summary and keyword embeddings are required for new clip {clip_id}")
+            vector_data = {
+                "clip_id": clip_id,
+                "user_id": user_id,
+                "embedding_type": "full_clip",  # Must be 'full_clip' when segment_id is NULL
+                "embedding_source": EMBEDDING_MODEL,
+                "embedded_content": summary_content,  # Primary content for matching
+                "original_content": original_content, # Original content before processing
+                "metadata": metadata,
+                "thumbnail_embeddings": thumbnail_data,
+                **{column: value for column, value in vector_columns.items() if value is not None}
+            }
+            result = client.table('vectors').insert(vector_data).execute()
+        else:
+            vector_data = dict(vector_columns)
+            for column, value in (("embedded_content", summary_content),
+                                  ("original_content", original_content),
+                                  ("metadata", metadata),
+                                  ("thumbnail_embeddings", thumbnail_data)):
+                if stored_row.get(column) != value:
+                    vector_data[column] = value
+            if not vector_data:
+                if logger:
+                    logger.info(f"Embeddings unchanged for clip: {clip_id}")
+                return True
+            if vector_columns:
+                # Rewritten vectors get a new version so local mirrors re-sync them
+                vector_data["created_at"] = datetime.now(timezone.utc).isoformat()
+            result = client.table('vectors').update(vector_data).eq('id', stored_row['id']).execute()
         
-        result = client.table('vectors').insert(vector_data).execute()
+        # Keep the local vector index mirror current if the user has one
+        if changed_fields and local_index_enabled(user_id):
+            mirror_clip_vectors(client, user_id, clip_id, result.data[0] if result.data else vector_data, logger,
+                                fields=changed_fields)
         
         if logger:
-            logger.info(f"Stored embeddings for clip: {clip_id}")
-            if thumbnail_embeddings:
-                thumbnail_count = sum(1 for rank in thumbnail_embeddings if thumbnail_embeddings[rank] is not None)
-                logger.info(f"Stored {thumbnail_count} thumbnail embeddings")
+            written = [column for column, value in vector_columns.items() if value is not None]
+            logger.info(f"Stored embeddings for clip: {clip_id} "
+                        f"(vectors written: {', '.join(written) or 'none'})")
         
         return True
         
     except Exception as e:
         if logger:
             logger.error(f"Failed to store embeddings: {str(e)}")
-        return False
\ No newline at end of file
+        return False
@@ -2,17 +2,35 @@
 Image embedding preparation module for the video ingest tool.
 
 This module handles image preparation for embedding generation using the SigLIP model.
+Thumbnails are sent to the embedding server in batches as raw binary (multipart
+file parts or a single npy tensor) over a pooled keep-alive session; servers
+without the batch endpoint fall back to one base64 JSON request per image.
 """
 
 import os
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 import requests
-from typing import Dict, List, Optional, Union
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, Union
 import logging
+import numpy as np
 from PIL import Image
 from openai import OpenAI
 
+# Embedding server settings (override with environment variables)
+DEFAULT_IMAGE_EMBEDDING_API_BASE = os.getenv("IMAGE_EMBEDDING_API_BASE", "http://100.121.182.8:8001")
+IMAGE_EMBEDDING_BATCH_SIZE = int(os.getenv("IMAGE_EMBEDDING_BATCH_SIZE", "32"))
+IMAGE_EMBEDDING_CONCURRENCY = int(os.getenv("IMAGE_EMBEDDING_CONCURRENCY", "4"))
+IMAGE_EMBEDDING_TRANSPORT = os.getenv("IMAGE_EMBEDDING_TRANSPORT", "multipart")
+IMAGE_EMBEDDING_TIMEOUT = float(os.getenv("IMAGE_EMBEDDING_TIMEOUT", "60"))
+
+NPY_CONTENT_TYPE = "application/x-npy"
+
+ImageTransport = Literal["multipart", "npy"]
+
 def resize_image(image_path: str, target_width: int = 512, target_height: int = 512) -> Image.Image:
     """
     Resize an image while maintaining aspect ratio with padding.
@@ -106,7 +124,7 @@ def generate_thumbnail_embedding(
 
     try:
         if not api_base:
-            api_base = "http://100.121.182.8:8001" # Ensure this IP/port is correct for your server
+            api_base = DEFAULT_IMAGE_EMBEDDING_API_BASE
 
         # Convert original image to base64 directly.
         # The server will handle resizing and preprocessing.
@@ -177,51 +195,338 @@ def generate_thumbnail_embedding(
         return None
 
 
+def encode_npy(array: np.ndarray) -> bytes:
+    """Serialize an array in .npy format."""
+    buffer = BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def decode_npy(payload: bytes) -> np.ndarray:
+    """Deserialize an array from .npy bytes."""
+    return np.load(BytesIO(payload), allow_pickle=False)
+
+
+class ImageEmbeddingClient:
+    """
+    Batched client for the SigLIP image embedding server.
+    
+    Images are grouped into batches of `batch_size` and each batch is one
+    POST to `/v1/embeddings/batch`, sent as raw binary instead of base64:
+    
+    - multipart: every image file is a part named "images", in input order.
+    - npy: images are letterboxed to `image_size` client-side and sent as one
+      uint8 array of shape (N, H, W, 3).
+    
+    The server answers with an npy float32 matrix of shape (N, D) (NaN rows
+    for images it could not embed) or JSON `{"data": [{"index", "embedding"}]}`.
+    Up to `concurrency` batches are in flight at once over a pooled keep-alive
+    session. If the server has no batch endpoint the client falls back to the
+    legacy one-request-per-image JSON API.
+    """
+    
+    def __init__(
+        self,
+        api_base: Optional[str] = None,
+        batch_size: int = IMAGE_EMBEDDING_BATCH_SIZE,
+        concurrency: int = IMAGE_EMBEDDING_CONCURRENCY,
+        transport: ImageTransport = IMAGE_EMBEDDING_TRANSPORT,
+        image_size: int = 512,
+        timeout: float = IMAGE_EMBEDDING_TIMEOUT,
+        logger=None
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            api_base: Embedding server URL (default: IMAGE_EMBEDDING_API_BASE)
+            batch_size: Images per request
+            concurrency: Maximum batches in flight
+            transport: 'multipart' (encoded files) or 'npy' (decoded uint8 tensor)
+            image_size: Square size images are padded to for the npy transport
+            timeout: Per-request timeout in seconds
+            logger: Optional logger
+        """
+        if transport not in ("multipart", "npy"):
+            raise ValueError(f"Invalid image transport: {transport}. Must be 'multipart' or 'npy'")
+        self.api_base = (api_base or DEFAULT_IMAGE_EMBEDDING_API_BASE).rstrip("/")
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.transport = transport
+        self.image_size = image_size
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger("image_embeddings")
+        self.batch_supported: Optional[bool] = None
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def __repr__(self) -> str:
+        return f"ImageEmbeddingClient({self.api_base}, {self.transport})"
+    
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+    
+    def __enter__(self) -> "ImageEmbeddingClient":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def embed_images(self, images: Sequence[Union[str, bytes]],
+                     raise_unavailable: bool = False) -> List[Optional[List[float]]]:
+        """
+        Embed images, preserving input order.
+        
+        Args:
+            images: File paths or encoded image bytes
+            raise_unavailable: Raise the RequestException when the server is unreachable,
+                               times out or answers with a server error, instead of
+                               returning None for the affected images
+            
+        Returns:
+            List[Optional[List[float]]]: One embedding per image, None where it failed
+        """
+        if not images:
+            return []
+        batches = [list(images[i:i + self.batch_size]) for i in range(0, len(images), self.batch_size)]
+        if len(batches) == 1 or self.concurrency == 1:
+            results = [self._embed_batch(batch, raise_unavailable) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches)),
+                                    thread_name_prefix="image-embed") as pool:
+                results = list(pool.map(lambda batch: self._embed_batch(batch, raise_unavailable), batches))
+        return [embedding for batch in results for embedding in batch]
+    
+    def _embed_batch(self, batch: List[Union[str, bytes]],
+                     raise_unavailable: bool = False) -> List[Optional[List[float]]]:
+        # Read every image up front; one missing or corrupt file only loses its own slot
+        embeddings: List[Optional[List[float]]] = [None] * len(batch)
+        prepared: List[Tuple[int, Union[str, bytes], object]] = []
+        for index, image in enumerate(batch):
+            try:
+                prepared.append((index, image, self._prepare(image)))
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Could not read image {image if isinstance(image, str) else index}: {str(e)}")
+        if not prepared:
+            return embeddings
+        
+        results: Optional[List[Optional[List[float]]]] = None
+        if self.batch_supported is not False:
+            try:
+                results = self._post_batch([payload for _, _, payload in prepared])
+            except _BatchEndpointMissing:
+                self.logger.warning(f"{self.api_base} has no batch embedding endpoint, falling back to per-image requests")
+                self.batch_supported = False
+            except requests.exceptions.RequestException as e:
+                if raise_unavailable and server_unavailable(e):
+                    raise
+                self.logger.error(f"Batch embedding request failed: {str(e)}")
+                return embeddings
+            except ValueError as e:
+                self.logger.error(f"Could not decode embedding batch: {str(e)}")
+                return embeddings
+        if results is None:
+            results = [self._post_single(image, raise_unavailable) for _, image, _ in prepared]
+        for (index, _, _), embedding in zip(prepared, results):
+            embeddings[index] = embedding
+        return embeddings
+    
+    def _prepare(self, image: Union[str, bytes]):
+        """Request payload for one image: a uint8 array (npy) or a (file name, bytes) part (multipart)."""
+        if self.transport == "npy":
+            return np.asarray(self._letterbox(image), dtype=np.uint8)
+        return (self._suffix(image), self._read(image))
+    
+    def _post_batch(self, payloads: List) -> List[Optional[List[float]]]:
+        url = f"{self.api_base}/v1/embeddings/batch"
+        headers = {"Accept": f"{NPY_CONTENT_TYPE}, application/json"}
+        if self.transport == "npy":
+            headers["Content-Type"] = NPY_CONTENT_TYPE
+            response = self.session.post(url, data=encode_npy(np.stack(payloads)), headers=headers, timeout=self.timeout)
+        else:
+            files = [("images", (f"{index}{suffix}", data)) for index, (suffix, data) in enumerate(payloads)]
+            response = self.session.post(url, files=files, headers=headers, timeout=self.timeout)
+        
+        if response.status_code in (404, 405):
+            raise _BatchEndpointMissing()
+        response.raise_for_status()
+        self.batch_supported = True
+        
+        if response.headers.get("Content-Type", "").startswith(NPY_CONTENT_TYPE):
+            matrix = decode_npy(response.content)
+            if matrix.ndim != 2 or matrix.shape[0] != len(payloads):
+                raise ValueError(f"Expected {len(payloads)} embeddings, got array of shape {matrix.shape}")
+            return [None if np.isnan(row).any() else row.astype(np.float32).tolist() for row in matrix]
+        
+        embeddings: List[Optional[List[float]]] = [None] * len(payloads)
+        for position, item in enumerate(response.json().get("data", [])):
+            index = item.get("index", position)
+            if 0 <= index < len(payloads):
+                embeddings[index] = item.get("embedding")
+        return embeddings
+    
+    def _post_single(self, image: Union[str, bytes], raise_unavailable: bool = False) -> Optional[List[float]]:
+        """Legacy JSON request with a base64 data URI for one image."""
+        try:
+            data = self._read(image)
+        except OSError as e:
+            self.logger.error(f"Could not read image {image if isinstance(image, str) else ''}: {str(e)}")
+            return None
+        data_uri = f"data:image/{self._suffix(image).lstrip('.').replace('jpg', 'jpeg')};base64," + \
+            base64.b64encode(data).decode("utf-8")
+        try:
+            response = self.session.post(f"{self.api_base}/v1/embeddings", json={"input": data_uri}, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json().get("data") or []
+            return data[0].get("embedding") if data else None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            if raise_unavailable and isinstance(e, requests.exceptions.RequestException) and server_unavailable(e):
+                raise
+            self.logger.error(f"Image embedding request failed: {str(e)}")
+            return None
+    
+    def _letterbox(self, image: Union[str, bytes]) -> Image.Image:
+        source = image if isinstance(image, str) else BytesIO(image)
+        return resize_image(source, self.image_size, self.image_size)
+    
+    @staticmethod
+    def _read(image: Union[str, bytes]) -> bytes:
+        if isinstance(image, bytes):
+            return image
+        with open(image, "rb") as f:
+            return f.read()
+    
+    @staticmethod
+    def _suffix(image: Union[str, bytes]) -> str:
+        if isinstance(image, str) and image.lower().endswith(".png"):
+            return ".png"
+        return ".jpg"
+
+
+def server_unavailable(error: requests.exceptions.RequestException) -> bool:
+    """
+    Whether a request failed because of the server rather than the images sent.
+    
+    Connection errors, timeouts, rate limiting and 5xx responses count; other
+    HTTP errors (e.g. 400 for an image the server cannot decode) do not.
+    """
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return True
+
+
+class _BatchEndpointMissing(Exception):
+    """The server does not implement /v1/embeddings/batch."""
+
+
+_clients: Dict[str, ImageEmbeddingClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_image_embedding_client(api_base: Optional[str] = None, logger=None) -> ImageEmbeddingClient:
+    """Shared client per server, so connections stay pooled across clips."""
+    base = (api_base or DEFAULT_IMAGE_EMBEDDING_API_BASE).rstrip("/")
+    with _clients_lock:
+        client = _clients.get(base)
+        if client is None:
+            client = _clients[base] = ImageEmbeddingClient(api_base=base, logger=logger)
+        return client
+
+
+def _valid_thumbnails(thumbnails: List[Dict], logger) -> List[Tuple[int, str]]:
+    """(rank, path) pairs for thumbnails that have everything needed to embed them."""
+    valid = []
+    for thumbnail in thumbnails:
+        path = thumbnail.get('path')
+        description = thumbnail.get('description')
+        rank = thumbnail.get('rank')
+        
+        if not path or not description or rank is None:
+            logger.warning(f"Missing required fields in thumbnail: {thumbnail}")
+            continue
+        
+        # Convert rank to int if it's a string
+        valid.append((int(rank) if isinstance(rank, str) else rank, path))
+    return valid
+
+
 def batch_generate_thumbnail_embeddings(
     thumbnails: List[Dict], 
     api_base: Optional[str] = None,
     api_key: Optional[str] = None,
-    logger=None
+    logger=None,
+    client: Optional[ImageEmbeddingClient] = None
 ) -> Dict[int, Optional[List[float]]]:
     """
     Generate embeddings for multiple thumbnails.
     
+    All thumbnails are sent through the batched client, so a clip's thumbnails
+    usually go out in a single request.
+    
     Args:
         thumbnails: List of dictionaries with 'path', 'description', and 'rank' keys
-        api_base: API base URL (default: http://100.121.182.8:8001)
+        api_base: API base URL (default: IMAGE_EMBEDDING_API_BASE)
         api_key: API key (not required for direct server)
         logger: Optional logger
+        client: Anything with embed_images (an ImageEmbeddingClient or an image
+                embedding backend) to use instead of the shared client for api_base
         
     Returns:
         Dict[int, Optional[List[float]]]: Dictionary mapping thumbnail ranks to embeddings
     """
     if logger is None:
         logger = logging.getLogger("image_embeddings")
-        
-    embeddings = {}
     
-    for thumbnail in thumbnails:
-        path = thumbnail.get('path')
-        description = thumbnail.get('description')
-        rank = thumbnail.get('rank')
-        
-        if not path or not description or rank is None:
-            logger.warning(f"Missing required fields in thumbnail: {thumbnail}")
-            continue
-        
-        # Convert rank to int if it's a string
-        rank_int = int(rank) if isinstance(rank, str) else rank
-        
-        logger.info(f"Processing thumbnail with rank {rank}")
-        
-        embedding = generate_thumbnail_embedding(
-            image_path=path,
-            description=description,
-            api_base=api_base,
-            api_key=api_key,
-            logger=logger
-        )
+    valid = _valid_thumbnails(thumbnails, logger)
+    if not valid:
+        return {}
+    
+    client = client or get_image_embedding_client(api_base, logger)
+    logger.info(f"Embedding {len(valid)} thumbnails with {client!r}")
+    embeddings = client.embed_images([path for _, path in valid])
+    return {rank: embedding for (rank, _), embedding in zip(valid, embeddings)}
+
+
+def batch_generate_clip_thumbnail_embeddings(
+    clips: Dict[str, List[Dict]],
+    api_base: Optional[str] = None,
+    logger=None,
+    client: Optional[ImageEmbeddingClient] = None
+) -> Dict[str, Dict[int, Optional[List[float]]]]:
+    """
+    Generate thumbnail embeddings for many clips with shared batches.
+    
+    Thumbnails from all clips are flattened into one stream so batches are
+    filled across clip boundaries.
+    
+    Args:
+        clips: Mapping of clip key to that clip's thumbnail dictionaries
+        api_base: API base URL (default: IMAGE_EMBEDDING_API_BASE)
+        logger: Optional logger
+        client: Client to use instead of the shared one for api_base
         
-        embeddings[rank_int] = embedding
+    Returns:
+        Dict[str, Dict[int, Optional[List[float]]]]: Per clip, thumbnail rank to embedding
+    """
+    if logger is None:
+        logger = logging.getLogger("image_embeddings")
+    
+    keys: List[Tuple[str, int]] = []
+    paths: List[str] = []
+    for clip_key, thumbnails in clips.items():
+        for rank, path in _valid_thumbnails(thumbnails, logger):
+            keys.append((clip_key, rank))
+            paths.append(path)
+    
+    results: Dict[str, Dict[int, Optional[List[float]]]] = {clip_key: {} for clip_key in clips}
+    if not paths:
+        return results
     
-    return embeddings
\ No newline at end of file
+    client = client or get_image_embedding_client(api_base, logger)
+    for (clip_key, rank), embedding in zip(keys, client.embed_images(paths)):
+        results[clip_key][rank] = embedding
+    return results
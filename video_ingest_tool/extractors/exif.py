@@ -2,14 +2,70 @@
 EXIF information extractors for the video ingest tool.
 
 Contains functions for extracting EXIF metadata using ExifTool.
+
+ExifTool runs in -stay_open mode: each thread keeps one process for the
+life of the program instead of starting Perl for every call, which matters
+for long-running processes such as `ait watch` and the API servers.
 """
 
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
 import exiftool
-from typing import Any, Dict
+from exiftool.exceptions import ExifToolExecuteError
 
 from ..utils import categorize_focal_length, parse_datetime_string, map_exposure_mode, map_white_balance
 from ..config import FOCAL_LENGTH_RANGES
 
+_local = threading.local()
+# (owning thread, process) for every running helper
+_helpers: List[Tuple[threading.Thread, exiftool.ExifToolHelper]] = []
+_helpers_lock = threading.Lock()
+
+@contextmanager
+def _exiftool() -> Iterator[exiftool.ExifToolHelper]:
+    """This thread's ExifTool process (started on first use)."""
+    helper = getattr(_local, 'helper', None)
+    if helper is None:
+        # Threads come and go (e.g. one per API ingest job); stop the processes of finished ones
+        with _helpers_lock:
+            finished = [entry for entry in _helpers if not entry[0].is_alive()]
+        for _, stale in finished:
+            _terminate(stale)
+        helper = exiftool.ExifToolHelper()
+        _local.helper = helper
+        with _helpers_lock:
+            _helpers.append((threading.current_thread(), helper))
+    try:
+        yield helper
+    except ExifToolExecuteError:
+        # ExifTool reported an error for this file; the process is fine
+        raise
+    except Exception:
+        # The process may be dead or out of sync; start a fresh one next time
+        _local.helper = None
+        _terminate(helper)
+        raise
+
+def _terminate(helper: exiftool.ExifToolHelper) -> None:
+    with _helpers_lock:
+        _helpers[:] = [entry for entry in _helpers if entry[1] is not helper]
+    try:
+        if helper.running:
+            helper.terminate()
+    except Exception:
+        pass
+
+@atexit.register
+def _close_exiftool() -> None:
+    """Stop every thread's ExifTool process."""
+    with _helpers_lock:
+        helpers = [helper for _, helper in _helpers]
+    for helper in helpers:
+        _terminate(helper)
+
 def extract_exiftool_info(file_path: str, logger=None) -> Dict[str, Any]:
     """
     Extract metadata using ExifTool.
@@ -25,7 +81,7 @@ def extract_exiftool_info(file_path: str, logger=None) -> Dict[str, Any]:
         logger.info("Extracting ExifTool metadata", path=file_path)
     
     try:
-        with exiftool.ExifToolHelper() as et:
+        with _exiftool() as et:
             metadata = et.get_metadata(file_path)[0]
             
             # Get the raw focal length
@@ -75,7 +131,7 @@ def extract_extended_exif_metadata(file_path: str, logger=None) -> Dict[str, Any
         logger.info("Extracting extended EXIF metadata", path=file_path)
     
     try:
-        with exiftool.ExifToolHelper() as et:
+        with _exiftool() as et:
             metadata = et.get_metadata(file_path)[0]
             
             # Initialize the result dict
@@ -0,0 +1,135 @@
+"""
+Named column projections for clip queries and search results.
+
+List and search views only render a handful of fields, but `select('*')`
+and the search RPCs return every column, including long summaries,
+transcripts and JSON metadata. A field profile names the columns a view
+needs so VideoSearcher, the CLI and the API servers can ask the database
+for just those.
+
+Profiles:
+    grid:   Result cards and table rows; long summaries are trimmed to a preview.
+    detail: Everything the clip detail views show.
+    export: Flat columns suitable for CSV/JSON export.
+"""
+
+from typing import Any, Dict, List, Literal, Optional, get_args
+
+FieldProfile = Literal["grid", "detail", "export"]
+
+CLIP_FIELD_PROFILES: Dict[str, List[str]] = {
+    "grid": [
+        "id", "file_name", "local_path", "duration_seconds",
+        "content_summary", "content_tags", "content_category",
+        "camera_make", "camera_model", "processed_at",
+        "thumbnail_url", "all_thumbnail_urls",
+    ],
+    "detail": [
+        "id", "user_id", "file_name", "file_path", "local_path", "file_checksum",
+        "file_size_bytes", "duration_seconds", "created_at", "processed_at", "updated_at",
+        "width", "height", "frame_rate", "codec", "container",
+        "camera_make", "camera_model", "content_category", "content_summary", "content_tags",
+        "full_transcript", "transcript_preview",
+        "technical_metadata", "camera_details", "audio_tracks", "subtitle_tracks",
+        "thumbnails", "thumbnail_url", "all_thumbnail_urls",
+    ],
+    "export": [
+        "id", "file_name", "file_path", "local_path", "file_checksum", "file_size_bytes",
+        "duration_seconds", "created_at", "processed_at",
+        "width", "height", "frame_rate", "codec", "container",
+        "camera_make", "camera_model", "content_category", "content_summary", "content_tags",
+        "transcript_preview",
+    ],
+}
+
+# Text columns trimmed per profile after fetching (PostgREST can't substring in select)
+PROFILE_TRUNCATE: Dict[str, Dict[str, int]] = {
+    "grid": {"content_summary": 240},
+}
+
+# Columns each search RPC returns (see hybrid_search.sql)
+_RPC_CLIP_COLUMNS = [
+    "id", "file_name", "local_path", "content_summary", "content_tags", "duration_seconds",
+    "camera_make", "camera_model", "content_category", "processed_at",
+]
+SEARCH_RPC_COLUMNS: Dict[str, List[str]] = {
+    "semantic_search_clips": _RPC_CLIP_COLUMNS + ["summary_similarity", "keyword_similarity", "combined_similarity"],
+    "hybrid_search_clips": _RPC_CLIP_COLUMNS + ["transcript_preview", "similarity_score", "search_rank", "match_type"],
+    "fulltext_search_clips": _RPC_CLIP_COLUMNS + ["transcript_preview", "fts_rank"],
+    "search_transcripts": [
+        "clip_id", "file_name", "local_path", "content_summary", "full_text",
+        "transcript_preview", "duration_seconds", "processed_at", "fts_rank",
+    ],
+    "find_similar_clips": [
+        "id", "file_name", "local_path", "content_summary", "content_tags",
+        "duration_seconds", "content_category", "similarity_score",
+    ],
+}
+
+# Ranking and key columns kept regardless of profile
+SEARCH_SCORE_COLUMNS = {
+    "clip_id", "summary_similarity", "keyword_similarity", "combined_similarity",
+    "similarity_score", "search_rank", "match_type", "fts_rank",
+}
+
+
+def validate_profile(profile: Optional[str]) -> Optional[str]:
+    """
+    Check a profile name.
+
+    Args:
+        profile: Profile name or None for all columns
+
+    Returns:
+        The profile name
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile is not None and profile not in get_args(FieldProfile):
+        raise ValueError(f"Invalid field profile: {profile}. Must be one of: {', '.join(get_args(FieldProfile))}")
+    return profile
+
+
+def profile_columns(profile: Optional[str]) -> Optional[List[str]]:
+    """Return the clip columns for a profile, or None for all columns."""
+    if validate_profile(profile) is None:
+        return None
+    return list(CLIP_FIELD_PROFILES[profile])
+
+
+def clip_select(profile: Optional[str]) -> str:
+    """PostgREST select clause for the clips table under a profile."""
+    columns = profile_columns(profile)
+    return ",".join(columns) if columns else "*"
+
+
+def rpc_select(rpc_name: str, profile: Optional[str]) -> Optional[str]:
+    """
+    PostgREST select clause for a search RPC under a profile.
+
+    Only columns the RPC actually returns are requested; ranking columns are
+    always kept.
+
+    Returns:
+        Select clause, or None to return the RPC's full row
+    """
+    columns = profile_columns(profile)
+    rpc_columns = SEARCH_RPC_COLUMNS.get(rpc_name)
+    if columns is None or rpc_columns is None:
+        return None
+    wanted = set(columns) | SEARCH_SCORE_COLUMNS
+    return ",".join(c for c in rpc_columns if c in wanted)
+
+
+def apply_profile(rows: List[Dict[str, Any]], profile: Optional[str]) -> List[Dict[str, Any]]:
+    """Trim long text columns in place according to the profile."""
+    limits = PROFILE_TRUNCATE.get(profile or "", {})
+    if not limits:
+        return rows
+    for row in rows:
+        for column, max_chars in limits.items():
+            value = row.get(column)
+            if isinstance(value, str) and len(value) > max_chars:
+                row[column] = value[:max_chars].rstrip() + "…"
+    return rows
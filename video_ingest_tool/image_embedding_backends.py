@@ -0,0 +1,419 @@
+"""
+Pluggable image embedding backends with automatic failover.
+
+Thumbnail embeddings used to come only from the remote SigLIP server, so an
+unreachable or saturated server stalled every ingest on timeouts. Backends
+share one small interface (`embed_images`) and are tried in the configured
+order:
+
+    remote: the SigLIP HTTP server via the batched ImageEmbeddingClient
+    local:  SigLIP running in-process on the CPU (lazy-loaded, optional int8)
+
+A backend that is unavailable (unreachable, timing out, failing with server
+errors, or unable to load its model) is skipped for a cooldown period, so
+later clips go straight to the next backend instead of waiting for the same
+timeout again. Images that one backend could not embed are retried on the
+next one without putting the backend on cooldown.
+
+Backends are chosen with IMAGE_EMBEDDING_BACKENDS (comma-separated, default
+"remote") or the pipeline data key 'image_embedding_backends'. The local
+backend is opt-in ("remote,local"): LOCAL_SIGLIP_MODEL must be the same
+SigLIP checkpoint the server runs, otherwise vectors from the two backends
+are not comparable. Listing it is also what lets search embed text queries
+with its text tower and rank thumbnails by them.
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import requests
+import structlog
+from PIL import Image
+
+from .config.constants import HAS_TRANSFORMERS
+from .embeddings_image import ImageEmbeddingClient, get_image_embedding_client
+
+logger = structlog.get_logger(__name__)
+
+# A file path, encoded image bytes, or a decoded HxWx3 uint8 RGB frame
+ImageInput = Union[str, bytes, np.ndarray]
+
+# "local" is opt-in: only add it when LOCAL_SIGLIP_MODEL matches the server's checkpoint
+IMAGE_EMBEDDING_BACKENDS = os.getenv("IMAGE_EMBEDDING_BACKENDS", "remote")
+IMAGE_EMBEDDING_FAILOVER_COOLDOWN = float(os.getenv("IMAGE_EMBEDDING_FAILOVER_COOLDOWN", "120"))
+
+LOCAL_SIGLIP_MODEL = os.getenv("LOCAL_SIGLIP_MODEL", "google/siglip-base-patch16-512")
+LOCAL_SIGLIP_QUANTIZE = os.getenv("LOCAL_SIGLIP_QUANTIZE", "none")
+LOCAL_SIGLIP_BATCH_SIZE = int(os.getenv("LOCAL_SIGLIP_BATCH_SIZE", "8"))
+LOCAL_SIGLIP_THREADS = int(os.getenv("LOCAL_SIGLIP_THREADS", "0"))
+
+
+class BackendUnavailable(Exception):
+    """The backend as a whole cannot embed anything right now."""
+
+
+# Errors that put a backend on cooldown; anything else only fails that call
+BACKEND_FAILURES = (BackendUnavailable, requests.exceptions.RequestException, ConnectionError, TimeoutError)
+
+
+class ImageEmbeddingBackend(ABC):
+    """Interface for anything that turns images into embedding vectors."""
+
+    name: str = "base"
+
+    @abstractmethod
+    def embed_images(self, images: Sequence[ImageInput]) -> List[Optional[List[float]]]:
+        """
+        Embed images, preserving input order.
+
+        Args:
+            images: File paths, encoded image bytes or decoded RGB frames
+
+        Returns:
+            List[Optional[List[float]]]: One embedding per image, None where it failed
+
+        Raises:
+            BackendUnavailable: If the backend as a whole is unusable (one of
+                BACKEND_FAILURES puts it on cooldown)
+        """
+
+    def is_available(self) -> bool:
+        """Cheap check whether this backend can be used at all in this process."""
+        return True
+
+
+def frame_to_jpeg(frame: np.ndarray, quality: int = 95) -> bytes:
+    """Encode a decoded RGB frame as JPEG bytes."""
+    buffer = BytesIO()
+    Image.fromarray(np.ascontiguousarray(frame, dtype=np.uint8)).save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def load_frame(image: ImageInput) -> np.ndarray:
+    """Decode an image input into an HxWx3 uint8 RGB array."""
+    if isinstance(image, np.ndarray):
+        if image.ndim == 2:
+            return np.repeat(image[:, :, None], 3, axis=2)
+        return image[:, :, :3]
+    source = image if isinstance(image, str) else BytesIO(image)
+    with Image.open(source) as img:
+        return np.asarray(img.convert("RGB"))
+
+
+class RemoteSigLIPBackend(ImageEmbeddingBackend):
+    """The SigLIP HTTP server, through the shared batched client."""
+
+    name = "remote"
+
+    def __init__(self, client: Optional[ImageEmbeddingClient] = None, api_base: Optional[str] = None):
+        self.client = client or get_image_embedding_client(api_base)
+
+    def embed_images(self, images: Sequence[ImageInput]) -> List[Optional[List[float]]]:
+        # The server decodes images itself, so frames are sent as JPEG parts
+        payload = [frame_to_jpeg(image) if isinstance(image, np.ndarray) else image for image in images]
+        # Server and transport failures raise (and fail over); rejected images come back as None
+        return self.client.embed_images(payload, raise_unavailable=True)
+
+
+class LocalSigLIPBackend(ImageEmbeddingBackend):
+    """
+    SigLIP vision tower running in-process on the CPU.
+
+    The model is loaded on first use (and only once per process), frames are
+    preprocessed as one batch in NumPy, and with quantize='int8' the Linear
+    layers are dynamically quantized, which roughly halves CPU latency at a
+    small cost in embedding fidelity.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        model_name: str = LOCAL_SIGLIP_MODEL,
+        quantize: str = LOCAL_SIGLIP_QUANTIZE,
+        batch_size: int = LOCAL_SIGLIP_BATCH_SIZE,
+        num_threads: int = LOCAL_SIGLIP_THREADS
+    ):
+        """
+        Initialize the backend without loading the model.
+
+        Args:
+            model_name: Hugging Face checkpoint of the SigLIP model
+            quantize: 'int8' for dynamic int8 quantization, 'none' for float32
+            batch_size: Images per forward pass
+            num_threads: Torch intra-op threads (0 leaves the torch default)
+        """
+        if quantize not in ("none", "int8"):
+            raise ValueError(f"Invalid quantization: {quantize}. Must be 'none' or 'int8'")
+        self.model_name = model_name
+        self.quantize = quantize
+        self.batch_size = max(1, batch_size)
+        self.num_threads = num_threads
+        self._model = None
+        self._text_model = None
+        self._tokenizer = None
+        self._image_size = 512
+        self._mean = np.full(3, 0.5, dtype=np.float32)
+        self._std = np.full(3, 0.5, dtype=np.float32)
+        self._load_lock = threading.Lock()
+        # One forward pass at a time; torch already uses every core for each
+        self._infer_lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return HAS_TRANSFORMERS
+
+    def _load(self):
+        if self._model is not None:
+            return self._model
+        with self._load_lock:
+            if self._model is not None:
+                return self._model
+
+            try:
+                import torch
+                from transformers import AutoImageProcessor, SiglipVisionModel
+            except ImportError as e:
+                raise BackendUnavailable(f"Local SigLIP needs torch and transformers: {e}") from e
+
+            start = time.perf_counter()
+            if self.num_threads:
+                torch.set_num_threads(self.num_threads)
+
+            try:
+                processor = AutoImageProcessor.from_pretrained(self.model_name)
+                model = SiglipVisionModel.from_pretrained(self.model_name).eval()
+            except OSError as e:
+                # Not downloaded and no network, or not a SigLIP checkpoint
+                raise BackendUnavailable(f"Could not load {self.model_name}: {e}") from e
+            size = getattr(processor, "size", None) or {}
+            self._image_size = int(size.get("height") or size.get("shortest_edge") or self._image_size)
+            self._mean = np.asarray(getattr(processor, "image_mean", self._mean), dtype=np.float32)
+            self._std = np.asarray(getattr(processor, "image_std", self._std), dtype=np.float32)
+
+            if self.quantize == "int8":
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+            logger.info("Loaded local SigLIP model", model=self.model_name, quantize=self.quantize,
+                        image_size=self._image_size, seconds=round(time.perf_counter() - start, 2))
+            self._model = model
+            return model
+
+    def preprocess(self, frames: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Resize and normalize RGB frames into a float32 (N, 3, S, S) batch.
+
+        Args:
+            frames: HxWx3 uint8 RGB arrays of any size
+
+        Returns:
+            np.ndarray: Model-ready pixel values
+        """
+        size = self._image_size
+        batch = np.empty((len(frames), size, size, 3), dtype=np.uint8)
+        for i, frame in enumerate(frames):
+            if frame.shape[0] == size and frame.shape[1] == size:
+                batch[i] = frame
+            else:
+                batch[i] = np.asarray(Image.fromarray(frame).resize((size, size), Image.BICUBIC))
+        pixels = batch.astype(np.float32) * np.float32(1.0 / 255.0)
+        pixels = (pixels - self._mean) / self._std
+        return np.ascontiguousarray(pixels.transpose(0, 3, 1, 2))
+
+    def embed_images(self, images: Sequence[ImageInput]) -> List[Optional[List[float]]]:
+        import torch
+
+        model = self._load()
+        embeddings: List[Optional[List[float]]] = [None] * len(images)
+
+        frames: List[np.ndarray] = []
+        indices: List[int] = []
+        for index, image in enumerate(images):
+            try:
+                frames.append(load_frame(image))
+                indices.append(index)
+            except Exception as e:
+                logger.warning("Could not decode image for local embedding", index=index, error=str(e))
+
+        for start in range(0, len(frames), self.batch_size):
+            pixels = torch.from_numpy(self.preprocess(frames[start:start + self.batch_size]))
+            with self._infer_lock, torch.inference_mode():
+                features = model(pixel_values=pixels).pooler_output
+            for index, row in zip(indices[start:start + self.batch_size], features.float().numpy()):
+                embeddings[index] = row.tolist()
+        return embeddings
+
+    def _load_text(self):
+        if self._text_model is not None:
+            return self._tokenizer, self._text_model
+        with self._load_lock:
+            if self._text_model is None:
+                from transformers import AutoTokenizer, SiglipTextModel
+
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self._text_model = SiglipTextModel.from_pretrained(self.model_name).eval()
+                logger.info("Loaded local SigLIP text model", model=self.model_name)
+        return self._tokenizer, self._text_model
+
+    def embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Embed text queries into the same space as the image embeddings.
+
+        Args:
+            texts: Query strings
+
+        Returns:
+            List[List[float]]: One embedding per text
+        """
+        import torch
+
+        tokenizer, model = self._load_text()
+        # SigLIP was trained on max_length padding; shorter padding shifts the embeddings
+        inputs = tokenizer(list(texts), padding="max_length", truncation=True, return_tensors="pt")
+        with self._infer_lock, torch.inference_mode():
+            features = model(input_ids=inputs["input_ids"]).pooler_output
+        return features.float().numpy().tolist()
+
+
+class FailoverImageEmbedder:
+    """Tries backends in order, skipping ones that recently failed."""
+
+    def __init__(self, backends: Sequence[ImageEmbeddingBackend], cooldown: float = IMAGE_EMBEDDING_FAILOVER_COOLDOWN):
+        """
+        Initialize the embedder.
+
+        Args:
+            backends: Backends in order of preference
+            cooldown: Seconds a failed backend is skipped before being tried again
+        """
+        if not backends:
+            raise ValueError("At least one image embedding backend is required")
+        self.backends = list(backends)
+        self.cooldown = cooldown
+        self._down_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"FailoverImageEmbedder({' -> '.join(backend.name for backend in self.backends)})"
+
+    def _usable(self, backend: ImageEmbeddingBackend) -> bool:
+        with self._lock:
+            return self._down_until.get(backend.name, 0.0) <= time.monotonic()
+
+    def _mark_down(self, backend: ImageEmbeddingBackend, error: str) -> None:
+        with self._lock:
+            self._down_until[backend.name] = time.monotonic() + self.cooldown
+        logger.warning("Image embedding backend failed, failing over", backend=backend.name,
+                       cooldown_s=self.cooldown, error=error)
+
+    def embed_images(self, images: Sequence[ImageInput]) -> List[Optional[List[float]]]:
+        """
+        Embed images with the first healthy backend, retrying leftovers on the next.
+
+        Args:
+            images: File paths, encoded image bytes or decoded RGB frames
+
+        Returns:
+            List[Optional[List[float]]]: One embedding per image, None where every backend failed
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(images)
+        pending = list(range(len(images)))
+        candidates = [b for b in self.backends if b.is_available() and self._usable(b)]
+        if not candidates:
+            # Everything is cooling down; trying beats returning nothing
+            candidates = [b for b in self.backends if b.is_available()]
+
+        for backend in candidates:
+            if not pending:
+                break
+            try:
+                results = backend.embed_images([images[i] for i in pending])
+            except BACKEND_FAILURES as e:
+                self._mark_down(backend, str(e))
+                continue
+            except Exception as e:
+                # Something about these images, not the backend: try the next one, no cooldown
+                logger.warning("Image embedding backend could not embed images", backend=backend.name,
+                               images=len(pending), error=str(e))
+                continue
+            for index, embedding in zip(pending, results):
+                embeddings[index] = embedding
+            pending = [i for i in pending if embeddings[i] is None]
+
+        if pending:
+            logger.error("No backend could embed some images", failed=len(pending), total=len(images))
+        return embeddings
+
+
+_BACKEND_FACTORIES: Dict[str, Callable[[], ImageEmbeddingBackend]] = {
+    "remote": RemoteSigLIPBackend,
+    "local": LocalSigLIPBackend,
+}
+_backends: Dict[str, ImageEmbeddingBackend] = {}
+_embedders: Dict[Tuple[str, ...], FailoverImageEmbedder] = {}
+_registry_lock = threading.Lock()
+
+
+def register_image_embedding_backend(name: str, factory: Callable[[], ImageEmbeddingBackend]) -> None:
+    """
+    Make a backend selectable by name.
+
+    Args:
+        name: Name used in IMAGE_EMBEDDING_BACKENDS
+        factory: Zero-argument callable creating the backend
+    """
+    with _registry_lock:
+        _BACKEND_FACTORIES[name] = factory
+        _backends.pop(name, None)
+        _embedders.clear()
+
+
+def get_image_embedding_backend(name: str) -> ImageEmbeddingBackend:
+    """Shared backend instance by name (local models are loaded once per process)."""
+    with _registry_lock:
+        if name not in _BACKEND_FACTORIES:
+            raise ValueError(f"Unknown image embedding backend: {name}. Available: {', '.join(_BACKEND_FACTORIES)}")
+        if name not in _backends:
+            _backends[name] = _BACKEND_FACTORIES[name]()
+        return _backends[name]
+
+
+def backend_names(backends: Optional[Union[str, Sequence[str]]] = None) -> Tuple[str, ...]:
+    """
+    Parse a backend selection.
+
+    Args:
+        backends: Backend names as a list or comma-separated string
+                  (default: IMAGE_EMBEDDING_BACKENDS)
+
+    Returns:
+        Tuple[str, ...]: Backend names in order of preference
+    """
+    if backends is None:
+        backends = IMAGE_EMBEDDING_BACKENDS
+    if isinstance(backends, str):
+        backends = backends.split(",")
+    return tuple(name.strip() for name in backends if name.strip())
+
+
+def get_image_embedder(backends: Optional[Union[str, Sequence[str]]] = None) -> FailoverImageEmbedder:
+    """
+    Failover embedder over the named backends.
+
+    Args:
+        backends: Backend names in order of preference, as a list or comma-separated
+                  string (default: IMAGE_EMBEDDING_BACKENDS)
+
+    Returns:
+        FailoverImageEmbedder: Shared embedder for that backend order
+    """
+    names = backend_names(backends)
+    instances = [get_image_embedding_backend(name) for name in names]
+    with _registry_lock:
+        if names not in _embedders:
+            _embedders[names] = FailoverImageEmbedder(instances)
+        return _embedders[names]
@@ -7,7 +7,7 @@ Contains all Pydantic models used for data validation and JSON serialization.
 import uuid
 import datetime
 from typing import Any, Dict, List, Optional, Tuple, Union
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 # ===== Video Metadata Models =====
 
@@ -294,3 +294,5 @@ class VideoIngestOutput(BaseModel):
     camera: CameraDetails
     thumbnails: List[str] = Field(default_factory=list)
     analysis: AnalysisDetails
+    # Cached encodings shared by file, database and API output (see serialization.py)
+    _serialized: Any = PrivateAttr(default=None)
@@ -2,18 +2,40 @@
 Output handling for the video ingest tool.
 
 Contains functions for saving data to JSON and potentially other formats in the future.
+
+Run results are streamed by RunOutputWriter: every finished file is appended
+to ``<summary>.jsonl`` as one compact JSON line, alongside an index
+(``<summary>.index.jsonl``) with one small entry per processed, skipped or
+failed file and the byte offset of its result. Both files are flushed after
+every line and fsynced periodically, so a crash loses at most the last few
+entries and memory use does not grow with the size of the run. Read them
+back lazily with iter_run_results / iter_run_index. Given a RunCatalog
+(run_catalog.py), the writer also records every entry there for indexed
+queries across runs.
 """
 
 import os
 import json
 import shutil
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Union
 from pydantic import BaseModel
 
+from .config.logging import flush_logging
+from .serialization import dumps, loads, serialized
+
+# fsync the run output after this many entries or seconds, whichever comes first
+FSYNC_EVERY = int(os.getenv("RUN_OUTPUT_FSYNC_EVERY", "20"))
+FSYNC_INTERVAL = float(os.getenv("RUN_OUTPUT_FSYNC_INTERVAL", "5"))
+
 def save_to_json(data: Any, filename: str, logger=None) -> None:
     """
     Save data to JSON file.
     
+    Pydantic models are written compactly from their cached serialization
+    (see serialization.py); other data is written indented.
+    
     Args:
         data: Data to save (can be a Pydantic model or dictionary)
         filename: Output filename
@@ -24,45 +46,231 @@ def save_to_json(data: Any, filename: str, logger=None) -> None:
     
     # Handle Pydantic models
     if isinstance(data, BaseModel):
-        data = data.model_dump()
-    elif isinstance(data, list) and all(isinstance(item, BaseModel) for item in data):
-        data = [item.model_dump() for item in data]
+        encoded = serialized(data).json
+    elif isinstance(data, list) and data and all(isinstance(item, BaseModel) for item in data):
+        encoded = b"[" + b",".join(serialized(item).json for item in data) + b"]"
+    else:
+        encoded = json.dumps(data, indent=2, default=str).encode()
     
     # Create directory if it doesn't exist
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    with open(filename, 'wb') as f:
+        f.write(encoded)
     
     if logger:
         logger.info("Data saved to JSON", filename=filename)
 
-def save_run_outputs(processed_files: List[Any], run_dir: str, summary_filename: str, json_dir: str,
-                    log_file: str, logger=None) -> Dict[str, str]:
+class RunOutputWriter:
+    """
+    Streams the results of a run to JSON Lines as files finish.
+    
+    Thread-safe; use as a context manager or call close() at the end of the run.
     """
-    Save all outputs from a processing run.
+    
+    def __init__(self, run_dir: str, summary_filename: str, logger=None,
+                 fsync_every: int = FSYNC_EVERY, fsync_interval: float = FSYNC_INTERVAL,
+                 catalog=None):
+        """
+        Args:
+            run_dir: Directory for this run (files go into its json/ directory)
+            summary_filename: Base name for the run summary (any extension is replaced)
+            logger: Logger instance
+            fsync_every: Entries between fsyncs
+            fsync_interval: Seconds between fsyncs
+            catalog: Optional RunCatalog to record every entry in (under the run directory's name)
+        """
+        json_dir = os.path.join(run_dir, "json")
+        os.makedirs(json_dir, exist_ok=True)
+        base = os.path.splitext(summary_filename)[0]
+        self.results_path = os.path.join(json_dir, f"{base}.jsonl")
+        self.index_path = os.path.join(json_dir, f"{base}.index.jsonl")
+        self.logger = logger
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self.counts = {"processed": 0, "skipped": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._results = open(self.results_path, "ab")
+        self._index = open(self.index_path, "ab")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.closed = False
+        self.catalog = catalog
+        self.run_id = os.path.basename(os.path.normpath(run_dir))
+    
+    def add_result(self, video: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Append a processed file's result and index it.
+        
+        Args:
+            video: The VideoIngestOutput (or an equivalent dictionary)
+            
+        Returns:
+            Dict[str, Any]: The index entry, including the result's byte offset and length
+        """
+        if isinstance(video, BaseModel):
+            line = serialized(video).json + b"\n"
+            summary = video.analysis.ai_analysis.summary if video.analysis.ai_analysis else None
+            category = summary.content_category if summary else None
+            processed_at = video.file_info.processed_at.isoformat()
+            entry = {
+                "status": "processed",
+                "id": video.id,
+                "file_path": video.file_info.file_path,
+                "file_name": video.file_info.file_name,
+                "checksum": video.file_info.file_checksum,
+                "size_bytes": video.file_info.file_size_bytes,
+                "duration_seconds": video.video.duration_seconds,
+            }
+        else:
+            line = dumps(video) + b"\n"
+            file_info = video.get('file_info') or {}
+            ai_analysis = (video.get('analysis') or {}).get('ai_analysis') or {}
+            category = (ai_analysis.get('summary') or {}).get('content_category')
+            processed_at = file_info.get('processed_at')
+            processed_at = processed_at.isoformat() if hasattr(processed_at, 'isoformat') else processed_at
+            entry = {
+                "status": "processed",
+                "id": video.get('id'),
+                "file_path": file_info.get('file_path'),
+                "file_name": file_info.get('file_name'),
+                "checksum": file_info.get('file_checksum'),
+                "size_bytes": file_info.get('file_size_bytes'),
+                "duration_seconds": (video.get('video') or {}).get('duration_seconds'),
+            }
+        with self._lock:
+            entry["offset"] = self._results.tell()
+            entry["length"] = len(line)
+            self._results.write(line)
+            self._results.flush()
+            self._append_index(entry)
+        self._record(entry, line[:-1], category, processed_at)
+        return entry
+    
+    def add_skipped(self, file_path: str, reason: Optional[str] = None, **details: Any) -> None:
+        """Index a file that was skipped (e.g. a duplicate already in the catalog)."""
+        entry = {"status": "skipped", "file_path": file_path, "reason": reason, **details}
+        with self._lock:
+            self._append_index(entry)
+        self._record(entry)
+    
+    def add_failed(self, file_path: str, error: str) -> None:
+        """Index a file that failed to process."""
+        entry = {"status": "failed", "file_path": file_path, "error": error}
+        with self._lock:
+            self._append_index(entry)
+        self._record(entry)
+    
+    def _record(self, entry: Dict[str, Any], doc: Optional[bytes] = None, category: Optional[str] = None,
+                processed_at: Optional[str] = None) -> None:
+        """Record an entry in the catalog; the run files stay authoritative if that fails."""
+        if self.catalog is None:
+            return
+        try:
+            self.catalog.record(self.run_id, entry, doc, category=category, processed_at=processed_at)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning("Failed to record entry in run catalog", file_path=entry.get("file_path"),
+                                    error=str(e))
+    
+    def _append_index(self, entry: Dict[str, Any]) -> None:
+        self._index.write(dumps(entry) + b"\n")
+        self._index.flush()
+        self.counts[entry["status"]] += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._sync()
+    
+    def _sync(self) -> None:
+        # Results first, so a synced index entry never points past the synced results
+        os.fsync(self._results.fileno())
+        os.fsync(self._index.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def close(self) -> Dict[str, str]:
+        """
+        Sync and close the output files.
+        
+        Returns:
+            Dict[str, str]: Paths of the results and index files
+        """
+        with self._lock:
+            if not self.closed:
+                self._sync()
+                self._results.close()
+                self._index.close()
+                self.closed = True
+        if self.logger:
+            self.logger.info("Run output written", results=self.results_path, index=self.index_path, **self.counts)
+        return {'run_summary': self.results_path, 'run_index': self.index_path}
+    
+    def __enter__(self) -> "RunOutputWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def _iter_jsonl(path: str) -> Iterator[bytes]:
+    """Complete lines of a JSON Lines file (a torn last line from a crash is dropped)."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.endswith(b"\n"):
+                yield line
+
+def iter_run_results(path: str, as_model: bool = False) -> Iterator[Any]:
+    """
+    Lazily iterate over the results of a run.
     
     Args:
-        processed_files: List of processed video data
-        run_dir: Directory for this run
-        run_timestamp: Timestamp string for this run
-        json_dir: Global JSON output directory
-        log_file: Path to log file
-        logger: Logger instance
+        path: The run's results file (``<summary>.jsonl``)
+        as_model: Yield VideoIngestOutput models instead of dictionaries
         
-    Returns:
-        Dict[str, str]: Paths to key output files
+    Yields:
+        One result per processed file, in the order they finished
+    """
+    if as_model:
+        from .models import VideoIngestOutput
+        for line in _iter_jsonl(path):
+            yield VideoIngestOutput.model_validate_json(line)
+    else:
+        for line in _iter_jsonl(path):
+            yield loads(line)
+
+def iter_run_index(path: str, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily iterate over a run's index entries.
+    
+    Args:
+        path: The run's index file (``<summary>.index.jsonl``)
+        status: Only yield entries with this status (processed, skipped or failed)
     """
-    # Save summary JSON to run-specific directory with the provided filename
-    run_summary_path = os.path.join(run_dir, "json", summary_filename)
-    save_to_json(processed_files, run_summary_path, logger)
+    for line in _iter_jsonl(path):
+        entry = loads(line)
+        if status is None or entry.get("status") == status:
+            yield entry
+
+def load_run_result(path: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Read one result directly using the offset recorded in its index entry.
     
-    # Also save to global JSON directory with same filename
-    global_summary_path = os.path.join(json_dir, summary_filename)
-    save_to_json(processed_files, global_summary_path, logger)
+    Args:
+        path: The run's results file
+        entry: Index entry of a processed file
+    """
+    with open(path, "rb") as f:
+        f.seek(entry["offset"])
+        return loads(f.read(entry["length"]))
+
+def copy_run_log(run_dir: str, log_file: str, logger=None) -> str:
+    """
+    Copy the log file into the run directory (after the log queue is written out).
     
-    # Create a copy of the log file in the run directory
+    Returns:
+        str: Path of the copy
+    """
     run_log_file = os.path.join(run_dir, "ingestor.log")
+    flush_logging()
     try:
         shutil.copy2(log_file, run_log_file)
         if logger:
@@ -70,12 +278,7 @@ def save_run_outputs(processed_files: List[Any], run_dir: str, summary_filename:
     except Exception as e:
         if logger:
             logger.error("Failed to copy log file to run directory", error=str(e))
-    
-    return {
-        'run_summary': run_summary_path,
-        'global_summary': global_summary_path,
-        'run_log': run_log_file
-    }
+    return run_log_file
 
 # Placeholder for future database output handler
 # This can be expanded later to save data to a database
@@ -4,7 +4,9 @@ Pipeline package for the video ingest tool.
 Re-exports core pipeline components.
 """
 
-from .base import ProcessingPipeline, ProcessingStep
+from .base import PipelineHook, ProcessingPipeline, ProcessingStep
+from .metrics import RunMetrics
+from .profiling import PROFILE_MODES, StepProfiler
 from .registry import (
     register_step,
     get_default_pipeline,
@@ -15,8 +17,12 @@ from .registry import (
 )
 
 __all__ = [
+    'PipelineHook',
     'ProcessingPipeline',
     'ProcessingStep',
+    'RunMetrics',
+    'StepProfiler',
+    'PROFILE_MODES',
     'register_step',
     'get_default_pipeline',
     'get_pipeline',
@@ -5,17 +5,45 @@ Defines the core pipeline classes for processing steps management.
 """
 
 from typing import List, Dict, Any, Callable, Optional, Union
+import importlib
 import inspect
 import structlog
 
+from .metrics import RunMetrics, measure, sample
+
+class PipelineHook:
+    """
+    Receives notifications around every step a pipeline executes.
+    
+    Subclass and override what you need; pass instances to execute_pipeline
+    as ``hooks``. Both methods run on the thread executing the step, and
+    exceptions they raise are logged without affecting the step.
+    """
+    
+    def before_step(self, step_name: str, file_path: Optional[str]) -> None:
+        """Called right before a step runs."""
+    
+    def after_step(self, step_name: str, file_path: Optional[str], error: Optional[str] = None) -> None:
+        """Called right after a step finished, with the error message if it raised."""
+
 class ProcessingStep:
     """
     Represents a single step in the video processing pipeline.
     
     Each step has a name, function to execute, and can be enabled/disabled.
+    A step can also be declared with only the module that implements it; the
+    module (and whatever heavy libraries it imports) is loaded the first time
+    the step runs.
     """
     
-    def __init__(self, name: str, func: Callable, enabled: bool = True, description: str = ""):
+    def __init__(
+        self,
+        name: str,
+        func: Optional[Callable] = None,
+        enabled: bool = True,
+        description: str = "",
+        module: Optional[str] = None
+    ):
         """
         Initialize a processing step.
         
@@ -24,14 +52,41 @@ class ProcessingStep:
             func: Function to execute for this step
             enabled: Whether this step is enabled by default
             description: Description of what this step does
+            module: Dotted path of the module that registers func (for steps
+                declared before their implementation is imported)
         """
+        if func is None and module is None:
+            raise ValueError(f"Step '{name}' needs a function or the module that defines it")
         self.name = name
-        self.func = func
         self.enabled = enabled
         self.description = description
+        self.module = module
+        self._func: Optional[Callable] = None
+        self.param_names: set = set()
+        if func is not None:
+            self.bind(func)
+    
+    def bind(self, func: Callable) -> None:
+        """Attach the function that implements this step."""
+        self._func = func
         # Store the parameter names this function accepts
         self.param_names = set(inspect.signature(func).parameters.keys())
     
+    @property
+    def loaded(self) -> bool:
+        """Whether the implementation has been imported."""
+        return self._func is not None
+    
+    @property
+    def func(self) -> Callable:
+        """The step function, importing its module on first use."""
+        if self._func is None:
+            # Importing the module runs its @register_step, which binds the function
+            importlib.import_module(self.module)
+            if self._func is None:
+                raise RuntimeError(f"Module {self.module} did not register step '{self.name}'")
+        return self._func
+    
     def execute(self, *args, **kwargs):
         """
         Execute this step if it's enabled.
@@ -46,10 +101,12 @@ class ProcessingStep:
         if not self.enabled:
             return None
         
+        func = self.func
+        
         # Filter kwargs to only include those the function accepts
         filtered_kwargs = {k: v for k, v in kwargs.items() if k in self.param_names}
         
-        return self.func(*args, **filtered_kwargs)
+        return func(*args, **filtered_kwargs)
     
     def __repr__(self) -> str:
         return f"<ProcessingStep name={self.name} enabled={self.enabled}>"
@@ -188,6 +245,11 @@ class ProcessingPipeline:
         """
         Execute all enabled steps in the pipeline.
         
+        Every executed step is measured (wall time, CPU time, bytes read and
+        written, RSS delta); pass a RunMetrics as ``metrics`` to collect the
+        measurements for the run, and a list of PipelineHook as ``hooks`` to
+        be notified around each step (e.g. a StepProfiler).
+        
         Args:
             initial_data: Initial data to pass to the first step
             **kwargs: Additional keyword arguments to pass to steps that accept them
@@ -197,8 +259,11 @@ class ProcessingPipeline:
         """
         result = initial_data.copy()
         
-        # Extract step_callback if provided
+        # Extract step_callback, metrics collector and hooks if provided
         step_callback = kwargs.pop('step_callback', None)
+        metrics = kwargs.pop('metrics', None)
+        hooks = kwargs.pop('hooks', None) or []
+        file_path = result.get('file_path')
         
         for step in self.steps:
             if not step.enabled:
@@ -214,10 +279,16 @@ class ProcessingPipeline:
                 except Exception as e:
                     self.logger.error(f"Error in step callback: {str(e)}")
             
+            self._notify_hooks(hooks, 'before_step', step.name, file_path)
+            before = sample()
+            measured = False
             try:
                 # Execute the step with the current result and kwargs
                 # The step itself will filter kwargs to only those it accepts
                 step_result = step.execute(result, **kwargs)
+                self._record_step(step, before, file_path, metrics)
+                measured = True
+                self._notify_hooks(hooks, 'after_step', step.name, file_path)
                 
                 # If the step returns None, we continue with the current result
                 # If it returns a dict, we update our result with it
@@ -244,8 +315,36 @@ class ProcessingPipeline:
             except Exception as e:
                 self.logger.error(f"Error in step {step.name}: {str(e)}")
                 result[f"{step.name}_error"] = str(e)
+                if not measured:
+                    self._record_step(step, before, file_path, metrics, error=str(e))
+                    self._notify_hooks(hooks, 'after_step', step.name, file_path, str(e))
         
         return result
+    
+    def _record_step(
+        self,
+        step: ProcessingStep,
+        before: Dict[str, float],
+        file_path: Optional[str],
+        metrics: Optional[RunMetrics],
+        error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Measure a finished step, log it and add it to the run's metrics."""
+        usage = measure(before)
+        self.logger.info(f"Finished step: {step.name}", wall_s=round(usage['wall_s'], 3),
+                         cpu_s=round(usage['cpu_s'], 3), read_bytes=usage['read_bytes'],
+                         write_bytes=usage['write_bytes'], rss_delta=usage['rss_delta'])
+        if metrics is not None:
+            metrics.record(file_path or "<unknown>", step.name, usage, error=error)
+        return usage
+    
+    def _notify_hooks(self, hooks: List[PipelineHook], event: str, *args) -> None:
+        """Call ``event`` on every hook; a failing hook never fails the step."""
+        for hook in hooks:
+            try:
+                getattr(hook, event)(*args)
+            except Exception as e:
+                self.logger.error(f"Error in pipeline hook {type(hook).__name__}.{event}: {str(e)}")
         
     # Alias for execute_pipeline to maintain API compatibility
     execute = execute_pipeline 
\ No newline at end of file
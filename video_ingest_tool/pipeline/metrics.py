@@ -0,0 +1,201 @@
+"""
+Per-step resource instrumentation for the video ingest pipeline.
+
+Samples wall time, CPU time, bytes read/written and resident memory around
+every step a pipeline executes, collects the samples per file for a run, and
+aggregates them into per-step percentiles written to
+``output/runs/<run>/metrics.json``.
+
+Every counter is process-wide, so work a step hands to helper threads
+(the segment analysis pool, the segment proxy encoder) and to subprocesses
+is included. The flip side is that the numbers are only exact per step when
+one file is processed at a time (``ait ingest``, or ``ait watch`` with one
+worker); with concurrent workers each step also absorbs what the other
+workers did while it ran.
+
+Notes on what the numbers mean:
+    - cpu_s is the CPU time of the process plus that of subprocesses
+      (ffmpeg, exiftool) that finished during the step. A subprocess that
+      outlives a step is charged to whichever step was running when it ended.
+    - read_bytes/write_bytes are the bytes the process moved through
+      read/write syscalls (Linux /proc/self/io, so page-cache hits count).
+      Elsewhere they fall back to block I/O from getrusage. Subprocess I/O
+      is not included (the kernel does not report it to the parent).
+    - rss_delta is the change in the process's resident set size.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PROC_IO = "/proc/self/io" if os.path.exists("/proc/self/io") else None
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+METRIC_FIELDS = ["wall_s", "cpu_s", "read_bytes", "write_bytes", "rss_delta"]
+
+
+def _io_bytes() -> List[int]:
+    """Bytes read and written so far by this process."""
+    if _PROC_IO:
+        try:
+            with open(_PROC_IO) as f:
+                counters = dict(line.split(":", 1) for line in f if ":" in line)
+            return [int(counters["rchar"]), int(counters["wchar"])]
+        except (OSError, KeyError, ValueError):
+            pass
+    if resource:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return [usage.ru_inblock * 512, usage.ru_oublock * 512]
+    return [0, 0]
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of the process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        if resource:
+            # ru_maxrss is the peak (KiB on Linux, bytes on macOS); the best available without /proc
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if os.uname().sysname == "Darwin" else peak * 1024
+        return 0
+
+
+def _children_cpu() -> float:
+    if not resource:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def sample() -> Dict[str, float]:
+    """Take a resource snapshot to diff against after a step."""
+    read_bytes, write_bytes = _io_bytes()
+    return {
+        "wall": time.perf_counter(),
+        "cpu": time.process_time() + _children_cpu(),
+        "read": read_bytes,
+        "write": write_bytes,
+        "rss": _rss_bytes(),
+    }
+
+
+def measure(before: Dict[str, float], after: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Resource usage between two snapshots (``after`` defaults to now)."""
+    after = after or sample()
+    return {
+        "wall_s": round(after["wall"] - before["wall"], 6),
+        "cpu_s": round(after["cpu"] - before["cpu"], 6),
+        "read_bytes": int(after["read"] - before["read"]),
+        "write_bytes": int(after["write"] - before["write"]),
+        "rss_delta": int(after["rss"] - before["rss"]),
+        "rss": int(after["rss"]),
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class RunMetrics:
+    """
+    Collects step measurements for every file in a run.
+
+    Thread-safe, so one instance can be shared by concurrent workers.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, on_record: Optional[Callable[..., None]] = None):
+        """
+        Args:
+            run_id: Identifier of the run (the run directory name)
+            on_record: Called as on_record(file_path, step, metrics, error) for
+                every measurement, e.g. to feed live server metrics
+        """
+        self.run_id = run_id
+        self.on_record = on_record
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._files: Dict[str, List[Dict[str, Any]]] = {}
+
+    def record(self, file_path: str, step: str, metrics: Dict[str, Any], error: Optional[str] = None) -> None:
+        """Add the measurement of one step for one file."""
+        entry = {"step": step, **metrics}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self._files.setdefault(file_path, []).append(entry)
+        if self.on_record:
+            self.on_record(file_path, step, metrics, error)
+
+    def file_metrics(self, file_path: str) -> List[Dict[str, Any]]:
+        """Measurements recorded for one file, in execution order."""
+        with self._lock:
+            return list(self._files.get(file_path, []))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate per step across files.
+
+        Returns:
+            {step: {"count", "errors", "<field>_p50", "<field>_p95", "<field>_total",
+                    "rss_peak", "read_mb_per_s"}}
+            in first-execution order.
+        """
+        with self._lock:
+            entries = [entry for steps in self._files.values() for entry in steps]
+        by_step: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            by_step.setdefault(entry["step"], []).append(entry)
+
+        summary: Dict[str, Dict[str, Any]] = {}
+        for step, rows in by_step.items():
+            stats: Dict[str, Any] = {"count": len(rows), "errors": sum(1 for r in rows if r.get("error"))}
+            for field in METRIC_FIELDS:
+                values = [r[field] for r in rows]
+                stats[f"{field}_p50"] = round(percentile(values, 50), 6)
+                stats[f"{field}_p95"] = round(percentile(values, 95), 6)
+                stats[f"{field}_total"] = round(sum(values), 6)
+            stats["rss_peak"] = max(r["rss"] for r in rows)
+            # Throughput over all files: bytes the step read per second it ran
+            wall = stats["wall_s_total"]
+            stats["read_mb_per_s"] = round(stats["read_bytes_total"] / wall / 1e6, 2) if wall else None
+            summary[step] = stats
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Everything recorded in this run, as written to metrics.json."""
+        with self._lock:
+            files = {path: list(steps) for path, steps in self._files.items()}
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "duration_s": round(time.time() - self.started_at, 3),
+            "files": files,
+            "steps": self.summary(),
+        }
+
+    def write(self, run_dir: str) -> str:
+        """
+        Write ``metrics.json`` into the run directory.
+
+        Returns:
+            str: Path of the written file
+        """
+        path = os.path.join(run_dir, "metrics.json")
+        os.makedirs(run_dir, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
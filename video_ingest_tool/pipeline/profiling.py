@@ -0,0 +1,297 @@
+"""
+On-demand profiling of pipeline steps.
+
+StepProfiler is a pipeline hook that profiles selected steps (or all of
+them) while a run executes and writes the results into
+``<run_dir>/profile/``:
+
+    - ``wall`` and ``cpu`` modes sample the stack of the thread running a
+      step every few milliseconds. Each sample is weighted by the wall time
+      (or the thread's CPU time) elapsed since the previous one, so idle
+      waits on subprocesses and network calls show up in ``wall`` and
+      disappear in ``cpu``. Stacks are written per step as
+      ``<step>.folded`` in the folded format read by flamegraph.pl,
+      speedscope and inferno (weights in microseconds), plus ``run.folded``
+      with every profiled step under a ``step:<name>`` root.
+    - ``memory`` mode traces allocations with tracemalloc and diffs a
+      snapshot before and after each step. Memory the step allocated and
+      still held when it finished is written as ``<step>.alloc.folded``
+      (weights in bytes) and ``<step>.top.txt``; the snapshot of the file
+      where the step retained the most is kept as ``<step>.snapshot``
+      (load it with ``tracemalloc.Snapshot.load``). tracemalloc is
+      process-wide, so per-step numbers are only exact when one file is
+      processed at a time.
+
+``profile.json`` summarises what was collected per step.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from .base import PipelineHook, ProcessingStep
+
+PROFILE_MODES = ("cpu", "wall", "memory")
+
+# Default sampling interval; sys._current_frames() costs roughly 10-50 µs per call
+DEFAULT_INTERVAL = 0.005
+TRACEMALLOC_FRAMES = 30
+TOP_ALLOCATIONS = 40
+
+# Frames above this belong to the pipeline, not the step
+_STEP_ENTRY = ProcessingStep.execute.__code__
+
+
+def _thread_cpu_clock(thread_id: int) -> Optional[int]:
+    """The CPU-time clock of a thread, where the platform exposes one."""
+    try:
+        return time.pthread_getcpuclockid(thread_id)
+    except (AttributeError, OSError):
+        return None
+
+
+class StepProfiler(PipelineHook):
+    """
+    Profiles pipeline steps for a run.
+
+    Pass it to process_video_file (or execute_pipeline) in ``hooks``; one
+    instance can be shared by concurrent workers. Call write(run_dir) when
+    the run is over.
+    """
+
+    def __init__(
+        self,
+        mode: str = "wall",
+        steps: Optional[List[str]] = None,
+        interval: float = DEFAULT_INTERVAL,
+        logger=None
+    ):
+        """
+        Args:
+            mode: One of PROFILE_MODES
+            steps: Names of the steps to profile (None or empty profiles every step)
+            interval: Seconds between stack samples (cpu and wall modes)
+            logger: Optional logger
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}' (choose from {', '.join(PROFILE_MODES)})")
+        self.logger = logger or structlog.get_logger(__name__)
+        if mode == "cpu" and _thread_cpu_clock(threading.get_ident()) is None:
+            self.logger.warning("Per-thread CPU clocks are not available on this platform; profiling wall time")
+            mode = "wall"
+        self.mode = mode
+        self.steps = set(steps or [])
+        self.interval = interval
+        self._lock = threading.Lock()
+        # thread id -> state of the step that thread is running
+        self._active: Dict[int, Dict[str, Any]] = {}
+        self._stacks: Dict[str, Counter] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._snapshots: Dict[str, Any] = {}
+        self._code_labels: Dict[Any, str] = {}
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_tracemalloc = False
+        if mode == "memory" and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+
+    def selected(self, step_name: str) -> bool:
+        """Whether a step is profiled."""
+        return not self.steps or step_name in self.steps
+
+    def before_step(self, step_name: str, file_path: Optional[str]) -> None:
+        if not self.selected(step_name):
+            return
+        thread_id = threading.get_ident()
+        state: Dict[str, Any] = {"step": step_name}
+        if self.mode == "memory":
+            state["snapshot"] = self._snapshot()
+            tracemalloc.reset_peak()
+            state["traced"] = tracemalloc.get_traced_memory()[0]
+        elif self.mode == "cpu":
+            state["clock"] = _thread_cpu_clock(thread_id)
+            state["cpu"] = time.clock_gettime(state["clock"])
+        # Started last so the step's time excludes taking the snapshot
+        state["wall"] = time.perf_counter()
+        with self._lock:
+            self._active[thread_id] = state
+            if self.mode != "memory" and self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name="step-profiler", daemon=True)
+                self._sampler.start()
+
+    def after_step(self, step_name: str, file_path: Optional[str], error: Optional[str] = None) -> None:
+        with self._lock:
+            state = self._active.pop(threading.get_ident(), None)
+            if state is None:
+                return
+            stats = self._stats.setdefault(step_name, {"files": 0, "errors": 0, "wall_s": 0.0})
+            stats["files"] += 1
+            stats["errors"] += 1 if error else 0
+            stats["wall_s"] += time.perf_counter() - state["wall"]
+        if self.mode == "memory":
+            self._record_allocations(step_name, file_path, state)
+
+    def stop(self) -> None:
+        """Stop sampling and allocation tracing."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def write(self, run_dir: str) -> str:
+        """
+        Stop profiling and write the collected profiles into ``<run_dir>/profile``.
+
+        Returns:
+            str: The profile directory
+        """
+        self.stop()
+        profile_dir = os.path.join(run_dir, "profile")
+        os.makedirs(profile_dir, exist_ok=True)
+        suffix = ".alloc.folded" if self.mode == "memory" else ".folded"
+
+        with self._lock:
+            stacks = {step: Counter(counter) for step, counter in self._stacks.items()}
+        run_stacks: Counter = Counter()
+        summary: Dict[str, Any] = {}
+        for step, stats in self._stats.items():
+            counter = stacks.get(step, Counter())
+            entry = {**stats, "wall_s": round(stats["wall_s"], 6), "stacks": len(counter),
+                     "weight_total": sum(counter.values())}
+            if counter:
+                entry["output"] = f"{step}{suffix}"
+                self._write_folded(os.path.join(profile_dir, entry["output"]), counter)
+                run_stacks.update({f"step:{step};{stack}": weight for stack, weight in counter.items()})
+            if self.mode == "memory":
+                entry["top"] = f"{step}.top.txt"
+                self._write_top(os.path.join(profile_dir, entry["top"]), counter)
+                if step in self._snapshots:
+                    entry["snapshot"] = f"{step}.snapshot"
+                    entry["snapshot_file"] = self._snapshots[step]["file_path"]
+                    self._snapshots[step]["snapshot"].dump(os.path.join(profile_dir, entry["snapshot"]))
+            summary[step] = entry
+        if run_stacks:
+            self._write_folded(os.path.join(profile_dir, f"run{suffix}"), run_stacks)
+
+        with open(os.path.join(profile_dir, "profile.json"), "w") as f:
+            json.dump({
+                "mode": self.mode,
+                "unit": "bytes" if self.mode == "memory" else "microseconds",
+                "interval_s": None if self.mode == "memory" else self.interval,
+                "steps_selected": sorted(self.steps) or "all",
+                "steps": summary,
+            }, f, indent=2)
+        self.logger.info("Wrote step profiles", profile_dir=profile_dir, mode=self.mode, steps=len(summary))
+        return profile_dir
+
+    def _sample_loop(self) -> None:
+        """Sample the stacks of threads that are running a profiled step."""
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, state in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    if self.mode == "cpu":
+                        now = time.clock_gettime(state["clock"])
+                        weight, state["cpu"] = now - state["cpu"], now
+                    else:
+                        now = time.perf_counter()
+                        weight = now - state.get("sampled", state["wall"])
+                        state["sampled"] = now
+                    weight_us = int(weight * 1e6)
+                    stack = self._fold(frame) if weight_us > 0 else ""
+                    if stack:
+                        counter = self._stacks.setdefault(state["step"], Counter())
+                        counter[stack] += weight_us
+            del frames
+
+    def _fold(self, frame) -> str:
+        """
+        Collapse a stack into 'outer;...;inner', starting below ProcessingStep.execute.
+
+        Returns an empty string when the thread is not inside the step (e.g.
+        the pipeline is still recording it before after_step runs).
+        """
+        labels = []
+        while frame is not None and frame.f_code is not _STEP_ENTRY:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        if frame is None:
+            return ""
+        return ";".join(reversed(labels))
+
+    def _label(self, code) -> str:
+        label = self._code_labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+            self._code_labels[code] = label
+        return label
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+
+    def _record_allocations(self, step_name: str, file_path: Optional[str], state: Dict[str, Any]) -> None:
+        """Attribute memory allocated during a step and still held to its allocation stacks."""
+        after = self._snapshot()
+        peak = tracemalloc.get_traced_memory()[1] - state["traced"]
+        retained = 0
+        counter = Counter()
+        for diff in after.compare_to(state["snapshot"], "traceback"):
+            if diff.size_diff > 0:
+                stack = ";".join(f"{_short_path(f.filename)}:{f.lineno}".replace(";", ":") for f in diff.traceback)
+                counter[stack] += diff.size_diff
+                retained += diff.size_diff
+        with self._lock:
+            self._stacks.setdefault(step_name, Counter()).update(counter)
+            stats = self._stats[step_name]
+            stats["peak_bytes_max"] = max(stats.get("peak_bytes_max", 0), peak)
+            stats["retained_bytes_max"] = max(stats.get("retained_bytes_max", 0), retained)
+            best = self._snapshots.get(step_name)
+            if best is None or retained > best["retained"]:
+                self._snapshots[step_name] = {"retained": retained, "file_path": file_path, "snapshot": after}
+
+    @staticmethod
+    def _write_folded(path: str, counter: Counter) -> None:
+        with open(path, "w") as f:
+            for stack, weight in sorted(counter.items()):
+                if stack and weight > 0:
+                    f.write(f"{stack} {weight}\n")
+
+    @staticmethod
+    def _write_top(path: str, counter: Counter) -> None:
+        """Retained bytes per allocating line (the innermost frame of each stack)."""
+        by_line: Counter = Counter()
+        for stack, size in counter.items():
+            by_line[stack.rsplit(";", 1)[-1]] += size
+        total = sum(by_line.values())
+        with open(path, "w") as f:
+            f.write(f"Retained after step: {total / 1e6:.2f} MB\n\n")
+            for line, size in by_line.most_common(TOP_ALLOCATIONS):
+                f.write(f"{size / 1e6:10.3f} MB  {line}\n")
+
+
+_PATH_PREFIXES = sorted({os.path.join(os.path.abspath(p), "") for p in sys.path if p}, key=len, reverse=True)
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the sys.path entry it was imported from."""
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
@@ -78,9 +78,14 @@ def register_step(name: str, enabled: bool = True, description: str = "", pipeli
             pipeline = ProcessingPipeline(logger=logger)
             register_pipeline(pipeline_name, pipeline)
             
-        # Create and add the step
-        step = ProcessingStep(name, func, enabled, description)
-        pipeline.add_step(step)
+        # A declared step keeps its place and current enabled state; just attach the function
+        step = pipeline.get_step(name)
+        if step is not None and not step.loaded:
+            step.bind(func)
+        else:
+            # Create and add the step
+            step = ProcessingStep(name, func, enabled, description)
+            pipeline.add_step(step)
         
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -89,6 +94,33 @@ def register_step(name: str, enabled: bool = True, description: str = "", pipeli
         return wrapper
     return decorator
 
+def declare_step(
+    name: str,
+    module: str,
+    enabled: bool = True,
+    description: str = "",
+    pipeline_name: str = "default"
+) -> None:
+    """
+    Add a step to a pipeline without importing its implementation.
+    
+    The module is imported the first time the step executes; its
+    @register_step decorator then binds the function to this step.
+    
+    Args:
+        name: Name of the step (must match the module's @register_step name)
+        module: Dotted path of the module that implements the step
+        enabled: Whether this step is enabled by default
+        description: Description of what this step does
+        pipeline_name: Name of the pipeline to add the step to
+    """
+    pipeline = get_pipeline(pipeline_name)
+    if pipeline is None:
+        pipeline = ProcessingPipeline(logger=logger)
+        register_pipeline(pipeline_name, pipeline)
+    if pipeline.get_step(name) is None:
+        pipeline.add_step(ProcessingStep(name, enabled=enabled, description=description, module=module))
+
 def get_all_steps(pipeline_name: str = "default") -> List[Dict[str, Any]]:
     """
     Get information about all registered steps in a pipeline.
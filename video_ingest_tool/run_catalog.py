@@ -0,0 +1,207 @@
+"""
+Local SQLite catalog of ingest run results.
+
+Every file an ingest run finishes is recorded here by RunOutputWriter (see
+output.py) as it completes, so recent or filtered results can be served with
+one indexed query instead of listing run directories and parsing every JSON
+file. The full result is kept as JSON text and returned as-is, so callers
+can embed it in a response without parsing it.
+
+Layout (catalog.db next to output/runs, or RUN_CATALOG_PATH):
+
+    results    one row per file and run: status (processed, skipped or
+               failed), clip ID, path, checksum, processed time, content
+               category, duration, size, the full result (doc, JSON) and
+               the run index entry (entry, JSON)
+
+Indexed by run, checksum, processed time, category and status. Other fields
+can be filtered ad hoc with SQLite's JSON functions on doc.
+"""
+
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from .serialization import dumps, loads
+
+logger = structlog.get_logger(__name__)
+
+_PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_CATALOG_PATH = os.getenv("RUN_CATALOG_PATH", os.path.join(_PACKAGE_PARENT, "output", "catalog.db"))
+
+# Columns the query methods filter on; everything else stays inside doc
+FILTER_COLUMNS = ("run_id", "status", "checksum", "category", "clip_id", "file_name")
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 1000
+
+
+class RunCatalog:
+    """SQLite store of run results, safe to share between threads."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open the catalog, creating it if needed.
+
+        Args:
+            path: Database file (default: RUN_CATALOG_PATH)
+        """
+        self.path = path or RUN_CATALOG_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                clip_id TEXT,
+                file_path TEXT NOT NULL,
+                file_name TEXT,
+                checksum TEXT,
+                processed_at TEXT,
+                category TEXT,
+                duration_seconds REAL,
+                size_bytes INTEGER,
+                doc TEXT CHECK (doc IS NULL OR json_valid(doc)),
+                entry TEXT CHECK (json_valid(entry)),
+                recorded_at REAL NOT NULL,
+                UNIQUE (run_id, file_path)
+            );
+            -- Queries filter on status (processed by default), so it is part of every index
+            CREATE INDEX IF NOT EXISTS results_run ON results (run_id, status, processed_at);
+            CREATE INDEX IF NOT EXISTS results_checksum ON results (checksum, status, processed_at);
+            CREATE INDEX IF NOT EXISTS results_category ON results (category, status, processed_at);
+            CREATE INDEX IF NOT EXISTS results_status ON results (status, processed_at);
+            CREATE INDEX IF NOT EXISTS results_processed ON results (processed_at);
+        """)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def record(self, run_id: str, entry: Dict[str, Any], doc: Optional[bytes] = None,
+               category: Optional[str] = None, processed_at: Optional[str] = None) -> None:
+        """
+        Record one file of a run (replacing an earlier record of it in the same run).
+
+        Args:
+            run_id: The run (its directory name)
+            entry: The run index entry (status, file_path and, for processed files,
+                id, file_name, checksum, size_bytes, duration_seconds)
+            doc: The full result as JSON bytes (processed files)
+            category: Content category from the AI analysis
+            processed_at: ISO timestamp of when the file was processed (default: now)
+        """
+        processed_at = processed_at or datetime.datetime.now().isoformat()
+        with self._lock:
+            self._db.execute(
+                """INSERT OR REPLACE INTO results (run_id, status, clip_id, file_path, file_name, checksum,
+                       processed_at, category, duration_seconds, size_bytes, doc, entry, recorded_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (run_id, entry["status"], entry.get("id"), entry["file_path"],
+                 entry.get("file_name") or os.path.basename(entry["file_path"]), entry.get("checksum"),
+                 processed_at, category, entry.get("duration_seconds"), entry.get("size_bytes"),
+                 doc.decode() if doc is not None else None, dumps(entry).decode(), time.time())
+            )
+
+    def query_docs(self, limit: int = DEFAULT_LIMIT, offset: int = 0, since: Optional[str] = None,
+                   **filters: Any) -> List[str]:
+        """
+        Full results (JSON text, unparsed) of processed files, newest first.
+
+        Args:
+            limit: Maximum number of results (capped at MAX_LIMIT)
+            offset: Results to skip
+            since: Only results processed at or after this ISO timestamp
+            **filters: Equality filters on FILTER_COLUMNS (run_id, checksum, category, ...)
+        """
+        where, params = self._where({"status": "processed", **filters}, since)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT doc FROM results {where} ORDER BY processed_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [min(max(limit, 1), MAX_LIMIT), max(offset, 0)]
+            ).fetchall()
+        return [row[0] for row in rows if row[0] is not None]
+
+    def query_entries(self, limit: int = DEFAULT_LIMIT, offset: int = 0, since: Optional[str] = None,
+                      **filters: Any) -> List[Dict[str, Any]]:
+        """Index entries (any status) with their run, category and processed time, newest first."""
+        where, params = self._where(filters, since)
+        with self._lock:
+            rows = self._db.execute(
+                f"""SELECT run_id, processed_at, category, entry FROM results {where}
+                    ORDER BY processed_at DESC, id DESC LIMIT ? OFFSET ?""",
+                params + [min(max(limit, 1), MAX_LIMIT), max(offset, 0)]
+            ).fetchall()
+        return [{**loads(entry), "run_id": run_id, "processed_at": processed_at, "category": category}
+                for run_id, processed_at, category, entry in rows]
+
+    def count(self, since: Optional[str] = None, **filters: Any) -> int:
+        """Number of records matching the filters (any status unless given)."""
+        where, params = self._where(filters, since)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM results {where}", params).fetchone()[0]
+
+    def runs(self, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """Recent runs with their per-status counts, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                """SELECT run_id, MIN(processed_at), MAX(processed_at),
+                          SUM(status = 'processed'), SUM(status = 'skipped'), SUM(status = 'failed')
+                   FROM results GROUP BY run_id ORDER BY MAX(processed_at) DESC LIMIT ?""",
+                (min(max(limit, 1), MAX_LIMIT),)
+            ).fetchall()
+        return [{"run_id": run_id, "first_processed_at": first, "last_processed_at": last,
+                 "processed": processed, "skipped": skipped, "failed": failed}
+                for run_id, first, last, processed, skipped, failed in rows]
+
+    @staticmethod
+    def _where(filters: Dict[str, Any], since: Optional[str]) -> tuple:
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter on '{column}' (choose from {', '.join(FILTER_COLUMNS)})")
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("processed_at >= ?")
+            params.append(since)
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def docs_to_json(docs: List[str], **fields: Any) -> bytes:
+    """
+    A JSON object with ``results`` set to the given JSON documents, without parsing them.
+
+    Args:
+        docs: JSON texts as returned by RunCatalog.query_docs
+        **fields: Other top-level fields (encoded normally)
+    """
+    head = dumps(fields)
+    body = b'"results":[' + ",".join(docs).encode() + b"]"
+    return b"{" + body + (b"," + head[1:] if len(head) > 2 else b"}")
+
+
+_catalog: Optional[RunCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_run_catalog() -> Optional[RunCatalog]:
+    """The process-wide catalog at RUN_CATALOG_PATH, or None if it cannot be opened."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            try:
+                _catalog = RunCatalog()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Run catalog unavailable", path=RUN_CATALOG_PATH, error=str(e))
+                return None
+        return _catalog
@@ -2,16 +2,27 @@
 Search utilities for video catalog using hybrid search.
 
 Provides functions for semantic search, full-text search, and hybrid search
-combining both approaches using Reciprocal Rank Fusion (RRF).
+combining both approaches using Reciprocal Rank Fusion (RRF). Hybrid search
+runs inside the `hybrid_search_clips` SQL function; fused search runs the
+individual retrievers concurrently and fuses their rankings client-side, so
+thumbnail, transcript and local-index rankings can be combined without a
+migration.
 """
 
 import os
-from typing import List, Dict, Any, Optional, Tuple, Literal
+import re
+import json
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Literal, get_args
+import numpy as np
 import structlog
 
 from .auth import AuthManager
 from .embeddings import generate_embeddings
+from .vector_index import similar_graph_enabled
 from .search_config import get_search_params
+from .field_profiles import FieldProfile, clip_select, profile_columns, rpc_select, apply_profile, validate_profile
 
 logger = structlog.get_logger(__name__)
 
@@ -32,17 +43,147 @@ def prepare_search_embeddings(query: str) -> Tuple[str, str]:
     
     return summary_content, keyword_content
 
-SearchType = Literal["semantic", "fulltext", "hybrid", "transcripts", "similar"]
+SearchType = Literal["semantic", "fulltext", "hybrid", "transcripts", "similar", "fused"]
 SortField = Literal["processed_at", "file_name", "duration_seconds", "created_at"]
 SortOrder = Literal["ascending", "descending"]
+CountMethod = Literal["exact", "estimated", "planned"]
+
+# Retrievers fused search can combine, and the search parameter holding each one's weight
+RETRIEVER_WEIGHTS: Dict[str, str] = {
+    "fulltext": "fulltext_weight",
+    "summary": "summary_weight",
+    "keyword": "keyword_weight",
+    "thumbnail": "thumbnail_weight",
+    "transcript": "transcript_weight",
+}
+_TEXT_RETRIEVERS = ("fulltext", "transcript")
+_VECTOR_RETRIEVERS = ("summary", "keyword", "thumbnail")
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, Sequence[str]],
+    weights: Dict[str, float],
+    k: float = 50
+) -> List[Tuple[str, float, Dict[str, int]]]:
+    """
+    Fuse ranked ID lists with weighted Reciprocal Rank Fusion.
+    
+    Each list contributes weight / (k + rank) to every ID it contains (ranks
+    start at 1), which is the formula hybrid_search_clips uses in SQL. Scores
+    are computed as one (ids x retrievers) NumPy matrix.
+    
+    Args:
+        rankings: Retriever name -> IDs, best first
+        weights: Retriever name -> weight (missing names weigh 0)
+        k: RRF constant; larger values flatten the rank differences
+        
+    Returns:
+        (id, fused score, retriever -> rank) tuples, best first
+    """
+    names = list(rankings)
+    ids = list(dict.fromkeys(clip_id for name in names for clip_id in rankings[name]))
+    if not ids:
+        return []
+    position = {clip_id: i for i, clip_id in enumerate(ids)}
+    
+    ranks = np.zeros((len(ids), len(names)), dtype=np.float64)  # 0 = not returned by that retriever
+    for column, name in enumerate(names):
+        ranked = list(dict.fromkeys(rankings[name]))
+        ranks[[position[clip_id] for clip_id in ranked], column] = np.arange(1, len(ranked) + 1)
+    
+    weight = np.array([weights.get(name, 0.0) for name in names], dtype=np.float64)
+    contributions = np.where(ranks > 0, weight / (k + ranks), 0.0)
+    scores = contributions.sum(axis=1)
+    order = np.argsort(-scores, kind="stable")
+    
+    return [
+        (ids[i], float(scores[i]), {name: int(ranks[i, column]) for column, name in enumerate(names) if ranks[i, column]})
+        for i in order
+    ]
+
+_COLUMN_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def validate_columns(columns: List[str]) -> List[str]:
+    """
+    Validate a column projection so it can be passed to PostgREST safely.
+    
+    Args:
+        columns: Column names
+        
+    Returns:
+        The column names, de-duplicated in order
+        
+    Raises:
+        ValueError: If a name is not a plain identifier
+    """
+    invalid = [c for c in columns if not _COLUMN_NAME_RE.match(c)]
+    if invalid:
+        raise ValueError(f"Invalid field name(s): {', '.join(invalid)}")
+    return list(dict.fromkeys(columns))
+
+def encode_cursor(sort_by: str, sort_order: str, row: Dict[str, Any]) -> str:
+    """Build an opaque cursor pointing just past `row` in the given ordering."""
+    payload = {"s": sort_by, "o": sort_order, "v": row.get(sort_by), "id": row["id"]}
+    return base64.urlsafe_b64encode(json.dumps(payload, default=str).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed or was issued for a different ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict) or "id" not in payload:
+            raise ValueError
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if payload.get("s") != sort_by or payload.get("o") != sort_order:
+        raise ValueError("Cursor does not match the requested sort order")
+    return payload
+
+def _quote_filter_value(value: Any) -> str:
+    """Quote a value for use inside a PostgREST logic tree (or/and)."""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+def _keyset_filter(sort_by: str, descending: bool, value: Any, last_id: str) -> str:
+    """
+    Build the PostgREST `or` filter selecting rows after (value, last_id).
+    
+    Postgres sorts NULLs first for DESC and last for ASC, so rows with a NULL
+    sort key are handled explicitly to keep pages gap-free.
+    """
+    op = "lt" if descending else "gt"
+    id_after = f"id.{op}.{_quote_filter_value(last_id)}"
+    if value is None:
+        null_tail = f"and({sort_by}.is.null,{id_after})"
+        return f"{null_tail},{sort_by}.not.is.null" if descending else null_tail
+    quoted = _quote_filter_value(value)
+    conditions = [f"{sort_by}.{op}.{quoted}", f"and({sort_by}.eq.{quoted},{id_after})"]
+    if not descending:
+        conditions.append(f"{sort_by}.is.null")
+    return ",".join(conditions)
 
 class VideoSearcher:
     """
     Video search utility class for performing various types of searches.
+    
+    With local=True, semantic and hybrid searches and find_similar rank
+    candidates against the on-disk vector index mirror (see vector_index.py)
+    instead of calling the pgvector RPCs, and full-text and transcript
+    searches use the local FTS5 index (see text_index.py). Query embeddings
+    are still generated remotely.
+    
+    search_type="fused" fuses several retrievers client-side (see
+    reciprocal_rank_fusion); with local=True each retriever uses the local
+    indexes when they exist.
     """
     
-    def __init__(self):
+    def __init__(self, local: bool = False):
         self.auth_manager = AuthManager()
+        self.local = local
     
     def _get_authenticated_client(self):
         """Get authenticated Supabase client."""
@@ -64,7 +205,9 @@ class VideoSearcher:
         search_type: SearchType = "hybrid",
         match_count: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-        weights: Optional[Dict[str, float]] = None
+        weights: Optional[Dict[str, float]] = None,
+        profile: Optional[FieldProfile] = None,
+        retrievers: Optional[Sequence[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform search across video catalog.
@@ -74,13 +217,17 @@ class VideoSearcher:
             search_type: Type of search to perform
             match_count: Number of results to return
             filters: Optional filters (camera_make, content_category, etc.)
-            weights: Optional search weights for hybrid search
+            weights: Optional search weights for hybrid and fused search
+            profile: Field profile limiting the returned columns (all columns if None)
+            retrievers: Retrievers to fuse for search_type="fused" (see RETRIEVER_WEIGHTS;
+                default all with a positive weight)
             
         Returns:
             List of matching video clips with metadata
         """
         # Get search parameters from centralized config, with optional overrides
         search_params = get_search_params(weights)
+        validate_profile(profile)
         
         client = self._get_authenticated_client()
         user_id = self._get_current_user_id()
@@ -91,14 +238,24 @@ class VideoSearcher:
             logger.warning(f"Requested match count {match_count} exceeds maximum {max_count}, limiting results")
             match_count = max_count
         
-        if search_type == "semantic":
-            return self._semantic_search(client, user_id, query, match_count, search_params)
+        if self.local and search_type == "semantic":
+            return self._local_semantic_search(user_id, query, match_count, search_params, profile)
+        elif self.local and search_type == "hybrid":
+            return self._local_hybrid_search(client, user_id, query, match_count, search_params, profile)
+        elif self.local and search_type == "fulltext":
+            return self._local_fulltext_search(user_id, query, match_count, profile)
+        elif self.local and search_type == "transcripts":
+            return self._local_transcript_search(user_id, query, match_count, profile)
+        elif search_type == "semantic":
+            return self._semantic_search(client, user_id, query, match_count, search_params, profile)
         elif search_type == "fulltext":
-            return self._fulltext_search(client, user_id, query, match_count)
+            return self._fulltext_search(client, user_id, query, match_count, profile)
         elif search_type == "hybrid":
-            return self._hybrid_search(client, user_id, query, match_count, search_params)
+            return self._hybrid_search(client, user_id, query, match_count, search_params, profile)
         elif search_type == "transcripts":
-            return self._transcript_search(client, user_id, query, match_count)
+            return self._transcript_search(client, user_id, query, match_count, profile)
+        elif search_type == "fused":
+            return self._fused_search(client, user_id, query, match_count, search_params, profile, retrievers)
         else:
             raise ValueError(f"Unsupported search type: {search_type}")
     
@@ -106,7 +263,8 @@ class VideoSearcher:
         self,
         clip_id: str,
         match_count: int = 5,
-        similarity_threshold: Optional[float] = None
+        similarity_threshold: Optional[float] = None,
+        profile: Optional[FieldProfile] = None
     ) -> List[Dict[str, Any]]:
         """
         Find clips similar to a given clip.
@@ -115,6 +273,7 @@ class VideoSearcher:
             clip_id: ID of the source clip
             match_count: Number of similar clips to return
             similarity_threshold: Minimum similarity score (optional)
+            profile: Field profile limiting the returned columns (all columns if None)
             
         Returns:
             List of similar clips
@@ -130,15 +289,20 @@ class VideoSearcher:
         client = self._get_authenticated_client()
         user_id = self._get_current_user_id()
         
+        if self.local:
+            return self._local_find_similar(user_id, clip_id, match_count, threshold, profile)
+        if similar_graph_enabled(user_id):
+            results = self._graph_find_similar(user_id, clip_id, match_count, threshold, profile)
+            if results is not None:
+                return results
+        
         try:
-            result = client.rpc('find_similar_clips', {
+            return self._call_search_rpc(client, 'find_similar_clips', {
                 'source_clip_id': clip_id,
                 'user_id_filter': user_id,
                 'match_count': match_count,
                 'similarity_threshold': threshold
-            }).execute()
-            
-            return result.data if result.data else []
+            }, profile)
             
         except Exception as e:
             logger.error(f"Similar search failed: {str(e)}")
@@ -150,7 +314,10 @@ class VideoSearcher:
         sort_order: SortOrder = "descending",
         limit: int = 20,
         offset: int = 0,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        profile: Optional[FieldProfile] = None
     ) -> List[Dict[str, Any]]:
         """
         List videos from the catalog with sorting and filtering.
@@ -159,21 +326,87 @@ class VideoSearcher:
             sort_by: Field to sort by (e.g., 'processed_at', 'file_name').
             sort_order: 'ascending' or 'descending'.
             limit: Number of videos to return.
-            offset: Offset for pagination.
+            offset: Offset for pagination (ignored when cursor is given).
             filters: Dictionary of filters to apply. 
                      Supported filters:
                         'date_start': ISO format string for processed_at >= value
                         'date_end': ISO format string for processed_at <= value
+            cursor: Cursor from a previous list_videos_page call.
+            columns: Columns to return (all columns if None).
+            profile: Named field profile, used when columns is not given.
 
         Returns:
             List of video objects.
         """
+        return self.list_videos_page(
+            sort_by=sort_by,
+            sort_order=sort_order,
+            limit=limit,
+            offset=offset,
+            filters=filters,
+            cursor=cursor,
+            columns=columns,
+            profile=profile
+        )["results"]
+
+    def list_videos_page(
+        self,
+        sort_by: SortField = "processed_at",
+        sort_order: SortOrder = "descending",
+        limit: int = 20,
+        offset: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        count: Optional[CountMethod] = None,
+        columns: Optional[List[str]] = None,
+        profile: Optional[FieldProfile] = None
+    ) -> Dict[str, Any]:
+        """
+        List one page of videos using keyset pagination.
+
+        Rows are ordered by (sort_by, id) and a cursor resumes strictly after the
+        last row of the previous page, so every page costs the same index range
+        scan no matter how deep it is. `offset` is still honoured for callers that
+        don't pass a cursor.
+
+        Args:
+            sort_by: Field to sort by.
+            sort_order: 'ascending' or 'descending'.
+            limit: Number of videos to return.
+            offset: Offset for the first page when no cursor is given.
+            filters: Same filters as list_videos.
+            cursor: Opaque cursor returned as next_cursor by the previous page.
+            count: 'exact', 'estimated' or 'planned' to include a total, None to skip counting.
+            columns: Columns to return (all columns if None). 'id' and sort_by are always included.
+            profile: Named field profile ('grid', 'detail', 'export'), used when columns is not given.
+
+        Returns:
+            Dict with results, next_cursor, has_more, total and count_type.
+
+        Raises:
+            ValueError: On an unknown sort field, count method, profile, column name or invalid cursor.
+        """
+        if sort_by not in get_args(SortField):
+            raise ValueError(f"Invalid sort field: {sort_by}")
+        if sort_order not in get_args(SortOrder):
+            raise ValueError(f"Invalid sort order: {sort_order}")
+        if count is not None and count not in get_args(CountMethod):
+            raise ValueError(f"Invalid count method: {count}")
+        
+        position = decode_cursor(cursor, sort_by, sort_order) if cursor else None
+        if not columns:
+            columns = profile_columns(profile)
+        projection = "*"
+        if columns:
+            projection = ",".join(validate_columns(["id", sort_by] + list(columns)))
+
         client = self._get_authenticated_client()
         user_id = self._get_current_user_id()
         filters = filters or {}
+        is_descending = sort_order == "descending"
 
         try:
-            query = client.from_("clips").select("*", count="exact").eq("user_id", user_id)
+            query = client.from_("clips").select(projection, count=count).eq("user_id", user_id)
 
             # Apply filters
             if "date_start" in filters:
@@ -185,24 +418,354 @@ class VideoSearcher:
             # if "content_category" in filters:
             #     query = query.eq("content_category", filters["content_category"])
 
-            is_descending = sort_order == "descending"
-            query = query.order(sort_by, desc=is_descending).limit(limit).offset(offset)
+            if position:
+                query = query.or_(_keyset_filter(sort_by, is_descending, position.get("v"), position["id"]))
+
+            # id breaks ties so the ordering (and therefore the cursor) is total
+            query = query.order(sort_by, desc=is_descending).order("id", desc=is_descending)
+            # Fetch one extra row to know whether another page exists
+            query = query.limit(limit + 1)
+            if not position and offset:
+                query = query.offset(offset)
             
             result = query.execute()
-            return result.data if result.data else []
+            rows = result.data or []
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            # The cursor is built from the untrimmed last row
+            next_cursor = encode_cursor(sort_by, sort_order, rows[-1]) if has_more and rows else None
+
+            return {
+                "results": apply_profile(rows, profile),
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "total": result.count if count else None,
+                "count_type": count
+            }
 
         except Exception as e:
             logger.error("Failed to list videos", error=str(e), sort_by=sort_by, sort_order=sort_order, filters=filters)
             # Optionally, re-raise or return an empty list based on desired error handling
             raise
     
+    def _local_index(self, user_id: str):
+        """The user's local vector index mirror."""
+        from .vector_index import LocalVectorIndex, get_local_index
+        if not LocalVectorIndex.exists(user_id):
+            raise ValueError("No local vector index found. Run 'ait index sync' first.")
+        return get_local_index(user_id)
+    
+    def _local_text_index(self, user_id: str):
+        """The user's local full-text index."""
+        from .text_index import LocalTextIndex, get_text_index
+        if not LocalTextIndex.exists(user_id):
+            raise ValueError("No local text index found. Run 'ait index sync' first.")
+        return get_text_index(user_id)
+    
+    def _local_fulltext_search(
+        self,
+        user_id: str,
+        query: str,
+        match_count: int,
+        profile: Optional[FieldProfile] = None
+    ) -> List[Dict[str, Any]]:
+        """BM25 full-text search against the local FTS5 index, with snippets."""
+        results = self._local_text_index(user_id).search_clips(query, match_count)
+        logger.info("Performed local full-text search", limit=match_count, query=query, results=len(results))
+        return apply_profile(results, profile)
+    
+    def _local_transcript_search(
+        self,
+        user_id: str,
+        query: str,
+        match_count: int,
+        profile: Optional[FieldProfile] = None
+    ) -> List[Dict[str, Any]]:
+        """Transcript search against the local FTS5 index, with the matching segments of each clip."""
+        results = self._local_text_index(user_id).search_transcripts(query, match_count)
+        logger.info("Performed local transcript search", limit=match_count, query=query, results=len(results))
+        return apply_profile(results, profile)
+    
+    def _local_rows(self, index, scored: List[Tuple[str, Dict[str, Any]]], profile: Optional[FieldProfile]) -> List[Dict[str, Any]]:
+        """Join (clip_id, score columns) pairs with the mirrored clip rows."""
+        rows = index.clip_rows([clip_id for clip_id, _ in scored])
+        results = [{**rows.get(clip_id, {"id": clip_id}), **scores} for clip_id, scores in scored]
+        return apply_profile(results, profile)
+    
+    def _local_semantic_search(
+        self,
+        user_id: str,
+        query: str,
+        match_count: int,
+        search_params: Dict[str, Any],
+        profile: Optional[FieldProfile] = None
+    ) -> List[Dict[str, Any]]:
+        """Semantic search against the local index, scored like semantic_search_clips."""
+        index = self._local_index(user_id)
+        summary_content, keyword_content = prepare_search_embeddings(query)
+        query_summary_embedding, query_keyword_embedding = generate_embeddings(summary_content, keyword_content)
+        
+        candidates = min(match_count * 2, 50)
+        summary_hits = index.search('summary', query_summary_embedding, candidates)
+        keyword_similarity = dict(index.search('keyword', query_keyword_embedding, candidates))
+        summary_weight = search_params.get('summary_weight', 1.0)
+        keyword_weight = search_params.get('keyword_weight', 0.8)
+        threshold = search_params.get('similarity_threshold', 0.4)
+        
+        scored = []
+        for clip_id, summary_similarity in summary_hits:
+            if summary_similarity < threshold:
+                continue
+            keyword_sim = keyword_similarity.get(clip_id, 0.0)
+            scored.append((clip_id, {
+                'summary_similarity': summary_similarity,
+                'keyword_similarity': keyword_sim,
+                'combined_similarity': summary_similarity * summary_weight + keyword_sim * keyword_weight
+            }))
+        scored.sort(key=lambda item: item[1]['combined_similarity'], reverse=True)
+        
+        logger.info("Performed local semantic search", limit=match_count, query=query, candidates=len(summary_hits))
+        return self._local_rows(index, scored[:match_count], profile)
+    
+    def _local_hybrid_search(
+        self,
+        client,
+        user_id: str,
+        query: str,
+        match_count: int,
+        search_params: Dict[str, Any],
+        profile: Optional[FieldProfile] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Hybrid search with local vector ranks, fused like hybrid_search_clips.
+        
+        The full-text ranks come from the local FTS5 index when it exists,
+        otherwise from fulltext_search_clips; if that call fails (e.g. offline)
+        the results are semantic only.
+        """
+        self._local_index(user_id)
+        return self._fused_search(client, user_id, query, match_count, search_params, profile,
+                                  retrievers=["fulltext", "summary", "keyword"])
+    
+    def _fused_search(
+        self,
+        client,
+        user_id: str,
+        query: str,
+        match_count: int,
+        search_params: Dict[str, Any],
+        profile: Optional[FieldProfile] = None,
+        retrievers: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run retrievers concurrently and fuse their rankings with weighted RRF.
+        
+        Each retriever returns up to 2 x match_count candidates (at most 50).
+        Retrievers run in parallel, so latency is that of the slowest one;
+        one that fails is logged and left out of the fusion. Without a local
+        vector index the summary ranking comes from semantic_search_clips and
+        the keyword retriever is skipped: that RPC only returns the summary
+        ranking's top candidates, so its keyword order is a re-ranking of
+        them, not an independent retriever. Thumbnail ranking (which needs
+        the local index and the opted-in local SigLIP backend) is skipped too.
+        """
+        from .vector_index import LocalVectorIndex
+        from .text_index import LocalTextIndex
+        
+        unknown = [name for name in retrievers or [] if name not in RETRIEVER_WEIGHTS]
+        if unknown:
+            raise ValueError(f"Unknown retriever(s): {', '.join(unknown)}. Must be one of: {', '.join(RETRIEVER_WEIGHTS)}")
+        weights = {name: float(search_params.get(param, 0.0)) for name, param in RETRIEVER_WEIGHTS.items()}
+        names = [name for name in (retrievers or RETRIEVER_WEIGHTS) if weights[name] > 0]
+        
+        local_vectors = self.local and LocalVectorIndex.exists(user_id)
+        local_text = self.local and LocalTextIndex.exists(user_id)
+        if "thumbnail" in names and not (local_vectors and self._thumbnail_text_backend()):
+            logger.info("Skipping thumbnail retriever: needs the local vector index and the local SigLIP backend "
+                        "in IMAGE_EMBEDDING_BACKENDS")
+            names.remove("thumbnail")
+        if "keyword" in names and not local_vectors:
+            logger.info("Skipping keyword retriever: semantic_search_clips only ranks the summary candidates")
+            names.remove("keyword")
+        if not names:
+            return []
+        
+        candidates = min(match_count * 2, 50)
+        threshold = search_params.get('similarity_threshold', 0.4)
+        
+        with ThreadPoolExecutor(max_workers=len(names) + 2, thread_name_prefix="retriever") as pool:
+            embeddings = None
+            if {"summary", "keyword"} & set(names):
+                embeddings = pool.submit(generate_embeddings, *prepare_search_embeddings(query))
+            semantic = None
+            if "summary" in names and not local_vectors:
+                semantic = pool.submit(lambda: self._call_search_rpc(client, 'semantic_search_clips', {
+                    'p_query_summary_embedding': embeddings.result()[0],
+                    'p_query_keyword_embedding': embeddings.result()[1],
+                    'p_user_id_filter': user_id,
+                    'p_match_count': candidates,
+                    'p_summary_weight': 1.0,
+                    'p_keyword_weight': 0.0,
+                    'p_similarity_threshold': threshold
+                }, profile))
+            
+            def fulltext():
+                if local_text:
+                    rows = self._local_text_index(user_id).search_clips(query, candidates)
+                else:
+                    rows = self._fulltext_search(client, user_id, query, candidates, profile)
+                return [(row['id'], row.get('fts_rank'), row) for row in rows]
+            
+            def transcript():
+                if local_text:
+                    rows = self._local_text_index(user_id).search_transcripts(query, candidates)
+                else:
+                    rows = self._transcript_search(client, user_id, query, candidates, profile)
+                return [(row['clip_id'], row.get('fts_rank'), {**row, 'id': row['clip_id']}) for row in rows]
+            
+            def vector(field: str):
+                if local_vectors:
+                    if field == "thumbnail":
+                        embedding = self._thumbnail_text_backend().embed_texts([query])[0]
+                        return [(clip_id, score, None) for clip_id, score in
+                                self._local_index(user_id).search(field, embedding, candidates)]
+                    embedding = embeddings.result()[0 if field == "summary" else 1]
+                    return [(clip_id, score, None) for clip_id, score in
+                            self._local_index(user_id).search(field, embedding, candidates) if score >= threshold]
+                column = f"{field}_similarity"
+                rows = sorted((row for row in semantic.result() if (row.get(column) or 0.0) >= threshold),
+                              key=lambda row: row.get(column) or 0.0, reverse=True)
+                return [(row['id'], row.get(column), row) for row in rows]
+            
+            jobs = {"fulltext": fulltext, "transcript": transcript}
+            futures = {name: pool.submit(jobs[name]) if name in jobs else pool.submit(vector, name) for name in names}
+            hits: Dict[str, List[Tuple[str, Optional[float], Optional[Dict[str, Any]]]]] = {}
+            for name, future in futures.items():
+                try:
+                    hits[name] = future.result()
+                except Exception as e:
+                    logger.warning("Retriever failed, fusing without it", retriever=name, error=str(e))
+        
+        fused = reciprocal_rank_fusion(
+            {name: [clip_id for clip_id, _, _ in found] for name, found in hits.items()},
+            weights,
+            k=float(search_params.get('rrf_k', 50))
+        )[:match_count]
+        
+        # Display rows: prefer ones a retriever already returned, then the local mirror, then the clips table
+        rows: Dict[str, Dict[str, Any]] = {}
+        for name in ("fulltext", "transcript", "summary", "keyword"):
+            for clip_id, _, row in hits.get(name, []):
+                if row is not None:
+                    rows.setdefault(clip_id, row)
+        missing = [clip_id for clip_id, _, _ in fused if clip_id not in rows]
+        if missing and local_vectors:
+            rows.update(self._local_index(user_id).clip_rows(missing))
+            missing = [clip_id for clip_id in missing if clip_id not in rows]
+        if missing:
+            try:
+                result = client.from_("clips").select(clip_select(profile)).in_("id", missing).execute()
+                rows.update({row['id']: row for row in result.data or []})
+            except Exception as e:
+                logger.warning("Could not fetch rows for fused results", missing=len(missing), error=str(e))
+        
+        summary_similarity = {clip_id: score for clip_id, score, _ in hits.get("summary", [])}
+        results = []
+        for clip_id, score, ranks in fused:
+            textual = any(name in ranks for name in _TEXT_RETRIEVERS)
+            visual = any(name in ranks for name in _VECTOR_RETRIEVERS)
+            results.append({
+                **rows.get(clip_id, {"id": clip_id}),
+                'similarity_score': summary_similarity.get(clip_id) or 0.0,
+                'search_rank': score,
+                'match_type': 'hybrid' if textual and visual else 'fulltext' if textual else 'semantic',
+                'retriever_ranks': ranks
+            })
+        
+        logger.info("Performed fused search", limit=match_count, query=query,
+                    retrievers={name: len(found) for name, found in hits.items()}, local=self.local)
+        return apply_profile(results, profile)
+    
+    def _thumbnail_text_backend(self):
+        """
+        Local SigLIP backend for embedding text queries against thumbnails, or None.
+        
+        Only used when "local" is in IMAGE_EMBEDDING_BACKENDS: thumbnails embedded
+        by the remote server are only comparable with the local text tower when
+        both run the same checkpoint, which opting in to the local backend asserts.
+        """
+        from .image_embedding_backends import backend_names, get_image_embedding_backend
+        if "local" not in backend_names():
+            return None
+        backend = get_image_embedding_backend("local")
+        return backend if backend.is_available() else None
+    
+    def _local_find_similar(
+        self,
+        user_id: str,
+        clip_id: str,
+        match_count: int,
+        threshold: float,
+        profile: Optional[FieldProfile] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        find_similar_clips against the local index.
+        
+        Reads the clip's precomputed neighbour list when the graph covers the
+        request, otherwise scans the summary vectors.
+        """
+        results = self._graph_find_similar(user_id, clip_id, match_count, threshold, profile)
+        if results is not None:
+            return results
+        index = self._local_index(user_id)
+        source = index.clip_vector('summary', clip_id)
+        if source is None:
+            raise ValueError(f"Clip not found in local index: {clip_id}")
+        hits = [(other, {'similarity_score': score})
+                for other, score in index.search('summary', source, match_count, exclude=[clip_id])
+                if score >= threshold]
+        return self._local_rows(index, hits, profile)
+    
+    def _graph_find_similar(
+        self,
+        user_id: str,
+        clip_id: str,
+        match_count: int,
+        threshold: float,
+        profile: Optional[FieldProfile] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Similar clips from the precomputed neighbour graph, or None if it can't answer."""
+        index = self._local_index(user_id)
+        neighbors = index.neighbors(clip_id, match_count)
+        if neighbors is None:
+            return None
+        hits = [(other, {'similarity_score': score}) for other, score in neighbors if score >= threshold]
+        return self._local_rows(index, hits, profile)
+    
+    def _call_search_rpc(
+        self,
+        client,
+        rpc_name: str,
+        rpc_params: Dict[str, Any],
+        profile: Optional[FieldProfile] = None
+    ) -> List[Dict[str, Any]]:
+        """Call a search RPC, selecting only the profile's columns from its result."""
+        request = client.rpc(rpc_name, rpc_params)
+        select = rpc_select(rpc_name, profile)
+        if select:
+            request = request.select(select)
+        result = request.execute()
+        return apply_profile(result.data or [], profile)
+    
     def _semantic_search(
         self,
         client,
         user_id: str,
         query: str,
         match_count: int,
-        search_params: Dict[str, Any]
+        search_params: Dict[str, Any],
+        profile: Optional[FieldProfile] = None
     ) -> List[Dict[str, Any]]:
         """Perform semantic search using vector embeddings."""
         summary_content, keyword_content = prepare_search_embeddings(query)
@@ -229,9 +792,7 @@ class VideoSearcher:
                         search_type="semantic",
                         weights={k: v for k, v in search_params.items() if k in ['summary_weight', 'keyword_weight', 'similarity_threshold']})
             
-            result = client.rpc('semantic_search_clips', rpc_params).execute()
-            
-            return result.data if result.data else []
+            return self._call_search_rpc(client, 'semantic_search_clips', rpc_params, profile)
             
         except Exception as e:
             logger.error(f"Semantic search failed: {str(e)}")
@@ -242,17 +803,16 @@ class VideoSearcher:
         client,
         user_id: str,
         query: str,
-        match_count: int
+        match_count: int,
+        profile: Optional[FieldProfile] = None
     ) -> List[Dict[str, Any]]:
         """Perform full-text search."""
         try:
-            result = client.rpc('fulltext_search_clips', {
+            return self._call_search_rpc(client, 'fulltext_search_clips', {
                 'p_query_text': query,
                 'p_user_id_filter': user_id,
                 'p_match_count': match_count
-            }).execute()
-            
-            return result.data if result.data else []
+            }, profile)
             
         except Exception as e:
             logger.error(f"Full-text search failed: {str(e)}")
@@ -264,7 +824,8 @@ class VideoSearcher:
         user_id: str,
         query: str,
         match_count: int,
-        search_params: Dict[str, Any]
+        search_params: Dict[str, Any],
+        profile: Optional[FieldProfile] = None
     ) -> List[Dict[str, Any]]:
         """Perform hybrid search combining full-text and semantic search."""
         summary_content, keyword_content = prepare_search_embeddings(query)
@@ -296,9 +857,7 @@ class VideoSearcher:
                                  if k in ['fulltext_weight', 'summary_weight', 'keyword_weight', 
                                          'rrf_k', 'similarity_threshold']})
             
-            result = client.rpc('hybrid_search_clips', rpc_params).execute()
-
-            return result.data if result.data else []
+            return self._call_search_rpc(client, 'hybrid_search_clips', rpc_params, profile)
             
         except Exception as e:
             logger.error(f"Hybrid search failed: {str(e)}")
@@ -309,18 +868,17 @@ class VideoSearcher:
         client,
         user_id: str,
         query: str,
-        match_count: int
+        match_count: int,
+        profile: Optional[FieldProfile] = None
     ) -> List[Dict[str, Any]]:
         """Perform search specifically on transcripts."""
         try:
-            result = client.rpc('search_transcripts', {
+            return self._call_search_rpc(client, 'search_transcripts', {
                 'query_text': query,
                 'user_id_filter': user_id,
                 'match_count': match_count,
                 'min_content_length': 50
-            }).execute()
-            
-            return result.data if result.data else []
+            }, profile)
             
         except Exception as e:
             logger.error(f"Transcript search failed: {str(e)}")
@@ -378,12 +936,14 @@ def format_search_results(
                 'keyword_similarity': result.get('keyword_similarity'),
                 'combined_similarity': result.get('combined_similarity')
             })
-        elif search_type == "hybrid" and show_scores:
+        elif search_type in ("hybrid", "fused") and show_scores:
             formatted.update({
                 'similarity_score': result.get('similarity_score'),
                 'search_rank': result.get('search_rank'),
                 'match_type': result.get('match_type')
             })
+            if 'retriever_ranks' in result:
+                formatted['retriever_ranks'] = result['retriever_ranks']
         elif search_type == "fulltext" and show_scores:
             formatted.update({
                 'fts_rank': result.get('fts_rank')
@@ -395,6 +955,13 @@ def format_search_results(
                 'transcript_preview': result.get('transcript_preview'),
                 'fts_rank': result.get('fts_rank') if show_scores else None
             })
+            # Segment-level hits are only available from the local text index
+            if 'matching_segments' in result:
+                formatted['matching_segments'] = result['matching_segments']
+        
+        # Local full-text results carry a highlighted excerpt
+        if search_type in ("fulltext", "transcripts") and result.get('snippet'):
+            formatted['snippet'] = result['snippet']
         elif search_type == "similar" and show_scores:
             formatted.update({
                 'similarity_score': result.get('similarity_score')
@@ -18,6 +18,8 @@ DEFAULT_SEARCH_PARAMS = {
     'fulltext_weight': 2.5,        # Weight for full-text search in hybrid search
     'summary_weight': 1.0,         # Weight for summary embeddings in hybrid/semantic search
     'keyword_weight': 0.8,         # Weight for keyword embeddings in hybrid/semantic search
+    'thumbnail_weight': 0.6,       # Weight for thumbnail image embeddings in fused search
+    'transcript_weight': 1.5,      # Weight for transcript full-text hits in fused search
     'rrf_k': 50,                   # Reciprocal Rank Fusion constant
     'similarity_threshold': 0.4,   # Minimum similarity threshold for semantic matches
     
@@ -58,6 +60,8 @@ def _load_env_params() -> Dict[str, Any]:
         'SEARCH_FULLTEXT_WEIGHT': ('fulltext_weight', float),
         'SEARCH_SUMMARY_WEIGHT': ('summary_weight', float),
         'SEARCH_KEYWORD_WEIGHT': ('keyword_weight', float),
+        'SEARCH_THUMBNAIL_WEIGHT': ('thumbnail_weight', float),
+        'SEARCH_TRANSCRIPT_WEIGHT': ('transcript_weight', float),
         'SEARCH_RRF_K': ('rrf_k', int),
         'SEARCH_SIMILARITY_THRESHOLD': ('similarity_threshold', float),
         'SEARCH_SIMILAR_THRESHOLD': ('similar_threshold', float),
@@ -0,0 +1,104 @@
+"""
+Serialization of pipeline output models.
+
+A VideoIngestOutput is serialized at most once per form and the result is
+shared by everything that needs it: the per-file JSON, the run's JSONL
+output, the database payloads and the API. SerializedOutput holds
+
+    - ``json``: compact JSON bytes from pydantic-core's Rust encoder
+      (model_dump_json), used for file output;
+    - ``data``: a JSON-compatible dict (model_dump(mode="json")), used for
+      database payloads and API responses. Dates are already ISO strings,
+      so no ``default=str`` fallback is needed downstream.
+
+The model_creation step stores it in the pipeline data as ``serialized``
+and on the model itself, so callers that only get the model back from
+process_video_file reuse the same encodings through serialized(model).
+Models are treated as final once serialized; call serialized(model,
+refresh=True) after changing one.
+
+dumps/loads encode plain Python data with orjson when it is installed and
+fall back to the json module.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class SerializedOutput:
+    """Lazily computed, cached encodings of one model."""
+
+    def __init__(self, model: BaseModel):
+        """
+        Args:
+            model: The model to serialize (not copied; it must not change afterwards)
+        """
+        self.model = model
+        self._json: Optional[bytes] = None
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def json(self) -> bytes:
+        """Compact JSON encoding of the model."""
+        if self._json is None:
+            self._json = self.model.model_dump_json().encode()
+        return self._json
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """JSON-compatible dict of the model (do not mutate; it is shared)."""
+        if self._data is None:
+            self._data = self.model.model_dump(mode="json")
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"<SerializedOutput {type(self.model).__name__} json={self._json is not None} data={self._data is not None}>"
+
+
+def serialized(model: BaseModel, refresh: bool = False) -> SerializedOutput:
+    """
+    The cached serialization of a model.
+
+    Models that declare a ``_serialized`` private attribute (VideoIngestOutput)
+    keep it there; others get a fresh, uncached SerializedOutput.
+
+    Args:
+        model: Model to serialize
+        refresh: Discard the cached encodings (after the model was modified)
+    """
+    private = model.__pydantic_private__ or {}
+    if '_serialized' not in private:
+        return SerializedOutput(model)
+    cached = private['_serialized']
+    # model_copy() shares private attributes, so check the cache belongs to this instance
+    if refresh or cached is None or cached.model is not model:
+        cached = SerializedOutput(model)
+        model._serialized = cached
+    return cached
+
+
+def dumps(data: Any) -> bytes:
+    """Compact JSON bytes for plain Python data (non-JSON types become strings)."""
+    if isinstance(data, BaseModel):
+        return serialized(data).json
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the json module handles them
+            pass
+    return json.dumps(data, separators=(",", ":"), default=str).encode()
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,207 @@
+"""
+Single-flight request coalescing with a short-lived memo.
+
+When several panels ask for the same clip at the same moment, only the first
+caller runs the lookup; everyone else waits for that result instead of issuing
+an identical Supabase query. Successful results are then kept for a few
+seconds so a burst of grid renders is served from memory. Failures are never
+cached.
+
+Both thread-based (Flask) and asyncio (Quart) callers share one cache, so
+invalidating it after an ingest clears results for either server.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_TTL_SECONDS = 10.0
+DEFAULT_MAX_ENTRIES = 2048
+
+
+class SingleFlightCache:
+    """Coalesces identical in-flight lookups and memoizes results for a short TTL."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a successful result stays fresh
+            max_entries: Maximum memoized results before the oldest are evicted
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._async_inflight: Dict[Hashable, "asyncio.Task"] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a fresh entry. Caller must hold the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any, generation: int) -> None:
+        """Memoize a result unless the cache was invalidated while it loaded."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def peek(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a fresh memoized entry without loading."""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+            return found, value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Memoize a value obtained outside get_or_load (e.g. from a batch query)."""
+        with self._lock:
+            generation = self._generation
+        self._store(key, value, generation)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return a memoized value or run loader once for all concurrent callers.
+
+        Args:
+            key: Cache key identifying the lookup
+            loader: Zero-argument callable producing the value
+
+        Returns:
+            Any: The loaded or memoized value
+
+        Raises:
+            Exception: Whatever loader raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+                generation = self._generation
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._store(key, value, generation)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of get_or_load for callers on a single event loop.
+
+        Args:
+            key: Cache key identifying the lookup
+            loader: Zero-argument coroutine function producing the value
+
+        Returns:
+            Any: The loaded or memoized value
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            task = self._async_inflight.get(key)
+            if task is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                generation = self._generation
+
+                async def run():
+                    try:
+                        result = await loader()
+                        self._store(key, result, generation)
+                        return result
+                    finally:
+                        with self._lock:
+                            self._async_inflight.pop(key, None)
+
+                task = asyncio.ensure_future(run())
+                self._async_inflight[key] = task
+
+        # Shield so one cancelled request doesn't cancel the lookup for everyone else
+        return await asyncio.shield(task)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Drop memoized results.
+
+        Lookups already in flight still complete for their waiters but are not
+        memoized when a full invalidation happened while they ran.
+
+        Args:
+            predicate: Only drop keys for which this returns True (all keys if None)
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            if predicate is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._generation += 1
+            else:
+                doomed = [key for key in self._entries if predicate(key)]
+                for key in doomed:
+                    del self._entries[key]
+                removed = len(doomed)
+        if removed:
+            logger.debug("Invalidated lookup cache", removed=removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/coalesce counters and current size."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "ttl_seconds": self.ttl,
+            }
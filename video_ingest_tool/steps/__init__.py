@@ -1,59 +1,88 @@
 """
 Pipeline steps for the video ingest tool.
 
-Re-exports all pipeline steps from the steps directory.
+Declares every pipeline step (name, default state, description) without
+importing the step modules, so commands that only list or configure steps
+don't pay for torch, OpenCV or the Gemini SDK. A step's module is imported
+the first time the step runs; the step functions are re-exported lazily.
 """
 
-from .extraction import (
-    extract_mediainfo_step, extract_ffprobe_step, extract_exiftool_step,
-    extract_extended_exif_step, extract_codec_step, extract_hdr_step,
-    extract_audio_step, extract_subtitle_step
-)
-from .analysis import (
-    generate_thumbnails_step, analyze_exposure_step, detect_focal_length_step,
-    ai_video_analysis_step, ai_thumbnail_selection_step
-)
-from .processing import (
-    generate_checksum_step, check_duplicate_step, video_compression_step, consolidate_metadata_step
-)
-from .storage import (
-    create_model_step, database_storage_step, generate_embeddings_step,
-    upload_thumbnails_step
-)
+from importlib import import_module
 
-__all__ = [
+from ..pipeline.registry import declare_step
+
+# (step name, module under this package, enabled by default, description), in pipeline order
+STEP_DECLARATIONS = [
     # Extraction steps
-    'extract_mediainfo_step',
-    'extract_ffprobe_step',
-    'extract_exiftool_step',
-    'extract_extended_exif_step',
-    'extract_codec_step',
-    'extract_hdr_step',
-    'extract_audio_step',
-    'extract_subtitle_step',
+    ("mediainfo_extraction", "extraction.mediainfo", True, "Extract metadata using MediaInfo"),
+    ("ffprobe_extraction", "extraction.ffprobe", True, "Extract metadata using FFprobe/PyAV"),
+    ("exiftool_extraction", "extraction.exiftool", True, "Extract EXIF metadata"),
+    ("extended_exif_extraction", "extraction.extended_exif", True, "Extract extended EXIF metadata"),
+    ("codec_extraction", "extraction.codec", True, "Extract detailed codec parameters"),
+    ("hdr_extraction", "extraction.hdr", True, "Extract HDR metadata"),
+    ("audio_extraction", "extraction.audio_tracks", True, "Extract audio track information"),
+    ("subtitle_extraction", "extraction.subtitle_tracks", True, "Extract subtitle track information"),
     
     # Analysis steps
-    'generate_thumbnails_step',
-    'analyze_exposure_step',
-    'detect_focal_length_step',
-    'ai_video_analysis_step',
-    'ai_thumbnail_selection_step',
+    ("thumbnail_generation", "analysis.thumbnails", True, "Generate thumbnails from video"),
+    ("exposure_analysis", "analysis.exposure", True, "Analyze exposure in thumbnails"),
+    ("ai_focal_length", "analysis.focal_length", True, "Detect focal length using AI when EXIF data is not available"),
+    ("ai_video_analysis", "analysis.video_analysis", False, "Comprehensive video analysis using Gemini Flash 2.5 AI"),
+    ("ai_thumbnail_selection", "analysis.ai_thumbnail_selection", True, "Extract AI-selected thumbnails based on analysis"),
     
     # Processing steps
-    'generate_checksum_step',
-    'check_duplicate_step',
-    'video_compression_step',
-    'consolidate_metadata_step',
+    ("checksum_generation", "processing.checksum", True, "Calculate file checksum for deduplication"),
+    ("duplicate_check", "processing.duplicate_check", True, "Check database for existing files with same checksum"),
+    ("metadata_consolidation", "processing.metadata_consolidation", True, "Consolidate metadata from all sources"),
+    ("video_compression", "processing.compression", False, "Compress video using ffmpeg and store compressed path"),
     
     # Storage steps
-    'create_model_step',
-    'database_storage_step',
-    'generate_embeddings_step',
-    'upload_thumbnails_step'
+    ("model_creation", "storage.model_creation", True, "Create Pydantic model from processed data"),
+    ("database_storage", "storage.database_storage", True, "Store video metadata and analysis in Supabase database"),
+    ("generate_embeddings", "storage.embeddings", True, "Generate vector embeddings for semantic search"),
+    ("thumbnail_upload", "storage.thumbnail_upload", True, "Upload thumbnails to Supabase storage"),
 ]
 
-from typing import Dict, Any
+for _name, _module, _enabled, _description in STEP_DECLARATIONS:
+    declare_step(_name, f"{__name__}.{_module}", enabled=_enabled, description=_description)
+
+# Step function -> subpackage that re-exports it
+_STEP_FUNCTIONS = {
+    'extract_mediainfo_step': 'extraction',
+    'extract_ffprobe_step': 'extraction',
+    'extract_exiftool_step': 'extraction',
+    'extract_extended_exif_step': 'extraction',
+    'extract_codec_step': 'extraction',
+    'extract_hdr_step': 'extraction',
+    'extract_audio_step': 'extraction',
+    'extract_subtitle_step': 'extraction',
+    'generate_thumbnails_step': 'analysis',
+    'analyze_exposure_step': 'analysis',
+    'detect_focal_length_step': 'analysis',
+    'ai_video_analysis_step': 'analysis',
+    'ai_thumbnail_selection_step': 'analysis',
+    'generate_checksum_step': 'processing',
+    'check_duplicate_step': 'processing',
+    'video_compression_step': 'processing',
+    'consolidate_metadata_step': 'processing',
+    'create_model_step': 'storage',
+    'database_storage_step': 'storage',
+    'generate_embeddings_step': 'storage',
+    'upload_thumbnails_step': 'storage',
+}
+
+def __getattr__(name: str):
+    """Import a step function's module on first access."""
+    if name in _STEP_FUNCTIONS:
+        return getattr(import_module(f".{_STEP_FUNCTIONS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = list(_STEP_FUNCTIONS) + ['process_video_file', 'reorder_pipeline_steps', 'STEP_DECLARATIONS']
+
+from typing import Dict, Any, List, Optional
 from ..models import VideoIngestOutput
+from ..pipeline.base import PipelineHook
+from ..pipeline.metrics import RunMetrics
 from ..pipeline.registry import get_default_pipeline
 from ..config import DEFAULT_COMPRESSION_CONFIG
 
@@ -94,7 +123,9 @@ def reorder_pipeline_steps():
 def process_video_file(file_path: str, thumbnails_dir: str, logger=None, config: Dict[str, bool] = None, 
                        compression_fps: int = DEFAULT_COMPRESSION_CONFIG['fps'], 
                        compression_bitrate: str = DEFAULT_COMPRESSION_CONFIG['video_bitrate'], 
-                       force_reprocess: bool = False, step_callback=None) -> VideoIngestOutput:
+                       force_reprocess: bool = False, step_callback=None,
+                       metrics: Optional[RunMetrics] = None,
+                       hooks: Optional[List[PipelineHook]] = None) -> VideoIngestOutput:
     """
     Process a video file using the pipeline.
     
@@ -110,6 +141,8 @@ def process_video_file(file_path: str, thumbnails_dir: str, logger=None, config:
         compression_bitrate: Bitrate for compressed video
         force_reprocess: If True, force reprocessing even if duplicate
         step_callback: Optional callback function after each step
+        metrics: Optional run collector that receives each step's timing and resource usage
+        hooks: Optional pipeline hooks notified around each step (e.g. a StepProfiler)
         
     Returns:
         VideoIngestOutput: Pydantic model with all video metadata and analysis
@@ -133,7 +166,7 @@ def process_video_file(file_path: str, thumbnails_dir: str, logger=None, config:
     }
     
     # Execute the pipeline, passing force_reprocess and thumbnails_dir as keyword arguments
-    result = pipeline.execute(data, logger=logger, step_callback=step_callback, 
+    result = pipeline.execute(data, logger=logger, step_callback=step_callback, metrics=metrics, hooks=hooks,
                             force_reprocess=force_reprocess, thumbnails_dir=thumbnails_dir)
     
     # The model_creation step should have added a 'model' key with the VideoIngestOutput
@@ -1,19 +1,23 @@
 """
 Analysis steps for the video ingest pipeline.
 
-Re-exports analysis steps from the analysis step modules.
+Lazily re-exports analysis steps from the analysis step modules.
 """
 
-from .thumbnails import generate_thumbnails_step
-from .exposure import analyze_exposure_step
-from .focal_length import detect_focal_length_step
-from .video_analysis import ai_video_analysis_step
-from .ai_thumbnail_selection import ai_thumbnail_selection_step
+from importlib import import_module
 
-__all__ = [
-    'generate_thumbnails_step',
-    'analyze_exposure_step',
-    'detect_focal_length_step',
-    'ai_video_analysis_step',
-    'ai_thumbnail_selection_step',
-]
+_STEP_MODULES = {
+    'generate_thumbnails_step': 'thumbnails',
+    'analyze_exposure_step': 'exposure',
+    'detect_focal_length_step': 'focal_length',
+    'ai_video_analysis_step': 'video_analysis',
+    'ai_thumbnail_selection_step': 'ai_thumbnail_selection',
+}
+
+def __getattr__(name: str):
+    """Import a step's module on first access."""
+    if name in _STEP_MODULES:
+        return getattr(import_module(f".{_STEP_MODULES[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = list(_STEP_MODULES)
@@ -1,25 +1,26 @@
 """
 Extraction steps for the video ingest pipeline.
 
-Re-exports extraction steps from the extraction step modules.
+Lazily re-exports extraction steps from the extraction step modules.
 """
 
-from .mediainfo import extract_mediainfo_step
-from .ffprobe import extract_ffprobe_step
-from .exiftool import extract_exiftool_step
-from .extended_exif import extract_extended_exif_step
-from .codec import extract_codec_step
-from .hdr import extract_hdr_step
-from .audio_tracks import extract_audio_step
-from .subtitle_tracks import extract_subtitle_step
+from importlib import import_module
 
-__all__ = [
-    'extract_mediainfo_step',
-    'extract_ffprobe_step',
-    'extract_exiftool_step',
-    'extract_extended_exif_step',
-    'extract_codec_step',
-    'extract_hdr_step',
-    'extract_audio_step',
-    'extract_subtitle_step',
-]
+_STEP_MODULES = {
+    'extract_mediainfo_step': 'mediainfo',
+    'extract_ffprobe_step': 'ffprobe',
+    'extract_exiftool_step': 'exiftool',
+    'extract_extended_exif_step': 'extended_exif',
+    'extract_codec_step': 'codec',
+    'extract_hdr_step': 'hdr',
+    'extract_audio_step': 'audio_tracks',
+    'extract_subtitle_step': 'subtitle_tracks',
+}
+
+def __getattr__(name: str):
+    """Import a step's module on first access."""
+    if name in _STEP_MODULES:
+        return getattr(import_module(f".{_STEP_MODULES[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = list(_STEP_MODULES)
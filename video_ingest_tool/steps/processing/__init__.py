@@ -1,15 +1,22 @@
 """
 Processing steps for the video ingest pipeline.
 
-Re-exports processing steps from the processing step modules.
+Lazily re-exports processing steps from the processing step modules.
 """
 
-from .checksum import generate_checksum_step
-from .duplicate_check import check_duplicate_step
-from .metadata_consolidation import consolidate_metadata_step
+from importlib import import_module
 
-__all__ = [
-    'generate_checksum_step',
-    'check_duplicate_step',
-    'consolidate_metadata_step',
-]
+_STEP_MODULES = {
+    'generate_checksum_step': 'checksum',
+    'check_duplicate_step': 'duplicate_check',
+    'consolidate_metadata_step': 'metadata_consolidation',
+    'video_compression_step': 'compression',
+}
+
+def __getattr__(name: str):
+    """Import a step's module on first access."""
+    if name in _STEP_MODULES:
+        return getattr(import_module(f".{_STEP_MODULES[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = list(_STEP_MODULES)
@@ -5,14 +5,19 @@ This package contains steps for model creation, database storage,
 vector embedding generation, and thumbnail uploads for video metadata.
 """
 
-from .model_creation import create_model_step
-from .database_storage import database_storage_step
-from .embeddings import generate_embeddings_step
-from .thumbnail_upload import upload_thumbnails_step
+from importlib import import_module
 
-__all__ = [
-    'create_model_step',
-    'database_storage_step',
-    'generate_embeddings_step',
-    'upload_thumbnails_step'
-]
+_STEP_MODULES = {
+    'create_model_step': 'model_creation',
+    'database_storage_step': 'database_storage',
+    'generate_embeddings_step': 'embeddings',
+    'upload_thumbnails_step': 'thumbnail_upload',
+}
+
+def __getattr__(name: str):
+    """Import a step's module on first access."""
+    if name in _STEP_MODULES:
+        return getattr(import_module(f".{_STEP_MODULES[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = list(_STEP_MODULES)
@@ -2,7 +2,9 @@
 Generate vector embeddings for semantic search.
 
 This module handles the generation and storage of vector embeddings
-for video metadata to enable semantic search functionality.
+for video metadata to enable semantic search functionality. Inputs whose
+content hash matches the one stored with the clip's vectors are not
+embedded again.
 """
 
 from typing import Any, Dict, List, Optional
@@ -19,15 +21,21 @@ def generate_embeddings_step(data: Dict[str, Any], logger=None) -> Dict[str, Any
     Generate and store vector embeddings for semantic search.
     
     Args:
-        data: Pipeline data containing the output model, clip_id, and ai_thumbnail_metadata
+        data: Pipeline data containing the output model, clip_id, and ai_thumbnail_metadata.
+              'image_embedding_backends' optionally overrides IMAGE_EMBEDDING_BACKENDS;
+              'force_reembed' embeds every input even if its content hash is unchanged.
         logger: Optional logger
         
     Returns:
         Dict with embedding generation results
     """
     from ...auth import AuthManager
-    from ...embeddings import prepare_embedding_content, generate_embeddings, store_embeddings
-    from ...embeddings_image import batch_generate_thumbnail_embeddings, generate_thumbnail_embedding
+    from ...embeddings import (
+        prepare_embedding_content, embed_texts, store_embeddings, embedding_input_hashes,
+        get_stored_embeddings, stored_content_hashes, changed_embedding_inputs
+    )
+    from ...embeddings_image import batch_generate_thumbnail_embeddings
+    from ...image_embedding_backends import get_image_embedder
     
     # Check authentication
     auth_manager = AuthManager()
@@ -66,26 +74,54 @@ def generate_embeddings_step(data: Dict[str, Any], logger=None) -> Dict[str, Any
         if logger:
             logger.info(f"Prepared embedding content - Summary: {metadata['summary_tokens']} tokens, Keywords: {metadata['keyword_tokens']} tokens")
         
-        # Generate embeddings
-        summary_embedding, keyword_embedding = generate_embeddings(
-            summary_content, keyword_content, logger
-        )
+        # Diff the inputs against the hashes stored with the clip's vectors
+        ai_thumbnail_metadata = data.get('ai_thumbnail_metadata', [])
+        thumbnail_paths = {
+            int(thumbnail['rank']): thumbnail['path'] for thumbnail in ai_thumbnail_metadata
+            if thumbnail.get('path') and thumbnail.get('description') and thumbnail.get('rank') is not None
+        }
+        content_hashes = embedding_input_hashes(summary_content, keyword_content, thumbnail_paths)
+        stored_row = get_stored_embeddings(auth_manager.get_authenticated_client(), clip_id)
+        previous_hashes = {} if data.get('force_reembed') else stored_content_hashes(stored_row)
+        changed = set(changed_embedding_inputs(content_hashes, previous_hashes))
+        # Thumbnails whose file could not be hashed are always re-embedded
+        changed |= {f"thumbnail_{rank}" for rank in thumbnail_paths if f"thumbnail_{rank}" not in content_hashes}
+        
+        if logger:
+            logger.info(f"Embedding inputs changed: {', '.join(sorted(changed)) or 'none'} "
+                        f"({len(content_hashes) - len(changed & set(content_hashes))} unchanged)")
+        
+        # Generate text embeddings for changed inputs in one request
+        texts = {key: content for key, content in (("summary", summary_content), ("keyword", keyword_content))
+                 if key in changed}
+        text_embeddings = dict(zip(texts, embed_texts(list(texts.values()))))
+        summary_embedding = text_embeddings.get("summary")
+        keyword_embedding = text_embeddings.get("keyword")
         
         # Process AI thumbnail embeddings if available
-        ai_thumbnail_metadata = data.get('ai_thumbnail_metadata', [])
         thumbnail_embeddings = {}
         thumbnail_descriptions = {}
         thumbnail_reasons = {}
         
         if ai_thumbnail_metadata:
-            if logger:
-                logger.info(f"Processing embeddings for {len(ai_thumbnail_metadata)} AI thumbnails")
-                
-            # Generate embeddings for all thumbnails
-            thumbnail_embeddings = batch_generate_thumbnail_embeddings(
-                ai_thumbnail_metadata,
-                logger=logger
-            )
+            changed_thumbnails = [
+                thumbnail for thumbnail in ai_thumbnail_metadata
+                if thumbnail.get('rank') is not None and f"thumbnail_{int(thumbnail['rank'])}" in changed
+            ]
+            if changed_thumbnails:
+                if logger:
+                    logger.info(f"Processing embeddings for {len(changed_thumbnails)} of {len(ai_thumbnail_metadata)} AI thumbnails")
+                    
+                # Generate embeddings for changed thumbnails, failing over between backends
+                thumbnail_embeddings = batch_generate_thumbnail_embeddings(
+                    changed_thumbnails,
+                    logger=logger,
+                    client=get_image_embedder(data.get('image_embedding_backends'))
+                )
+            # Thumbnails that failed to embed are not recorded, so the next run retries them
+            for rank, embedding in thumbnail_embeddings.items():
+                if embedding is None:
+                    content_hashes.pop(f"thumbnail_{int(rank)}", None)
             
             # Extract descriptions and reasons
             for thumbnail in ai_thumbnail_metadata:
@@ -111,7 +147,9 @@ def generate_embeddings_step(data: Dict[str, Any], logger=None) -> Dict[str, Any
             thumbnail_embeddings=thumbnail_embeddings,
             thumbnail_descriptions=thumbnail_descriptions,
             thumbnail_reasons=thumbnail_reasons,
-            logger=logger
+            logger=logger,
+            content_hashes=content_hashes,
+            stored_row=stored_row
         )
         
         if logger:
@@ -125,6 +163,8 @@ def generate_embeddings_step(data: Dict[str, Any], logger=None) -> Dict[str, Any
             'summary_tokens': metadata['summary_tokens'],
             'keyword_tokens': metadata['keyword_tokens'],
             'thumbnail_embeddings_count': len(thumbnail_embeddings),
+            'embedded_inputs': sorted(changed),
+            'unchanged_inputs': sorted(set(content_hashes) - changed),
             'truncation_applied': metadata['summary_truncation'] != 'none' or metadata['keyword_truncation'] != 'none'
         }
         
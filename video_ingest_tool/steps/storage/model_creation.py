@@ -22,6 +22,7 @@ from ...models import (
     Entities, PersonDetail, Location, ObjectOfInterest, Activity, ContentWarning
 )
 from ...utils import calculate_aspect_ratio_str
+from ...serialization import serialized
 
 @register_step(
     name="model_creation", 
@@ -452,5 +453,7 @@ def create_model_step(data: Dict[str, Any], logger=None) -> Dict[str, Any]:
     )
     
     return {
-        'model': output
+        'model': output,
+        # Encoded lazily, once, by whichever output needs it first
+        'serialized': serialized(output)
     } 
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+Async Supabase access for the ASGI API server.
+
+Talks to PostgREST and Storage directly over a pooled httpx.AsyncClient so
+request handlers can await several queries at once without holding a thread
+per request. Only the read paths the API server needs are covered; writes and
+auth flows keep using the synchronous supabase-py client.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import structlog
+
+from .supabase_config import SUPABASE_URL, SUPABASE_ANON_KEY
+from .telemetry import async_supabase_event_hooks
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_TIMEOUT = 30.0
+
+PUBLIC_STORAGE_MARKER = '/storage/v1/object/public/'
+
+
+def split_storage_url(url: str) -> Tuple[str, str]:
+    """
+    Split a public storage URL into bucket and object path.
+
+    Args:
+        url: URL of the form https://{project}.supabase.co/storage/v1/object/public/{bucket}/{path}
+
+    Returns:
+        Tuple[str, str]: (bucket, path)
+
+    Raises:
+        ValueError: If the URL is not a public storage URL
+    """
+    parts = url.rstrip('?').split(PUBLIC_STORAGE_MARKER)
+    if len(parts) != 2:
+        raise ValueError("Invalid thumbnail URL format")
+    bucket, *path_parts = parts[1].split('/', 1)
+    return bucket, path_parts[0] if path_parts else ""
+
+
+class AsyncSupabaseClient:
+    """Pooled async client for Supabase PostgREST and Storage reads."""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        anon_key: Optional[str] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        timeout: float = DEFAULT_TIMEOUT
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            url: Supabase project URL (defaults to SUPABASE_URL)
+            anon_key: Anon key (defaults to SUPABASE_ANON_KEY)
+            max_connections: Upper bound on open connections in the pool
+            max_keepalive: Idle connections kept alive for reuse
+            timeout: Per-request timeout in seconds
+        """
+        self.url = (url or SUPABASE_URL or "").rstrip('/')
+        self.anon_key = anon_key or SUPABASE_ANON_KEY
+        if not self.url:
+            raise ValueError("SUPABASE_URL environment variable not set")
+        if not self.anon_key:
+            raise ValueError("SUPABASE_ANON_KEY environment variable not set")
+
+        self._client = httpx.AsyncClient(
+            base_url=self.url,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive
+            ),
+            timeout=timeout,
+            event_hooks=async_supabase_event_hooks()
+        )
+
+    def _headers(self, access_token: Optional[str]) -> Dict[str, str]:
+        return {
+            'apikey': self.anon_key,
+            'Authorization': f"Bearer {access_token or self.anon_key}",
+        }
+
+    def _check(self, response: httpx.Response) -> None:
+        """Raise the same error types the synchronous code paths surface."""
+        if response.status_code == 401:
+            raise ValueError(f"Authentication required: {response.text}")
+        response.raise_for_status()
+
+    async def select(
+        self,
+        table: str,
+        access_token: Optional[str],
+        columns: str = '*',
+        filters: Optional[Dict[str, Any]] = None,
+        order: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Select rows from a table.
+
+        Args:
+            table: Table name
+            access_token: User access token for row level security
+            columns: PostgREST column list
+            filters: Column -> value equality filters (list values become IN filters)
+            order: PostgREST order expression, e.g. 'created_at.desc'
+            limit: Maximum number of rows
+
+        Returns:
+            List[Dict[str, Any]]: Matching rows
+        """
+        params: List[Tuple[str, str]] = [('select', columns)]
+        for column, value in (filters or {}).items():
+            if isinstance(value, (list, tuple)):
+                quoted = ','.join(f'"{v}"' for v in value)
+                params.append((column, f"in.({quoted})"))
+            else:
+                params.append((column, f"eq.{value}"))
+        if order:
+            params.append(('order', order))
+        if limit is not None:
+            params.append(('limit', str(limit)))
+
+        response = await self._client.get(
+            f"/rest/v1/{table}", params=params, headers=self._headers(access_token)
+        )
+        self._check(response)
+        return response.json()
+
+    async def select_one(
+        self,
+        table: str,
+        access_token: Optional[str],
+        columns: str = '*',
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Select the first matching row, or None."""
+        rows = await self.select(table, access_token, columns=columns, filters=filters, limit=1)
+        return rows[0] if rows else None
+
+    async def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        access_token: Optional[str]
+    ) -> Any:
+        """
+        Call a Postgres function through PostgREST.
+
+        Args:
+            function: Function name
+            params: Named function arguments
+            access_token: User access token
+
+        Returns:
+            Any: Decoded JSON result
+        """
+        response = await self._client.post(
+            f"/rest/v1/rpc/{function}", json=params, headers=self._headers(access_token)
+        )
+        self._check(response)
+        return response.json()
+
+    async def open_object(
+        self,
+        bucket: str,
+        path: str,
+        access_token: Optional[str]
+    ) -> httpx.Response:
+        """
+        Open a streaming download of a storage object.
+
+        The caller owns the returned response and must close it (aclose())
+        once the body has been consumed.
+
+        Args:
+            bucket: Storage bucket
+            path: Object path inside the bucket
+            access_token: User access token
+
+        Returns:
+            httpx.Response: Response with an unread body
+
+        Raises:
+            FileNotFoundError: If the object does not exist
+        """
+        request = self._client.build_request(
+            'GET',
+            f"/storage/v1/object/{bucket}/{path}",
+            headers=self._headers(access_token)
+        )
+        response = await self._client.send(request, stream=True)
+        if response.status_code >= 400:
+            await response.aread()
+            await response.aclose()
+            # Storage reports missing objects as 400 with a not_found body
+            if response.status_code in (400, 404):
+                raise FileNotFoundError(f"{bucket}/{path}")
+            self._check(response)
+        return response
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
@@ -3,7 +3,10 @@ Supabase configuration and client management for AI Ingesting Tool.
 """
 
 import os
+import atexit
+import threading
 from typing import Optional
+import httpx
 from supabase import create_client, Client
 from supabase.client import ClientOptions
 import structlog
@@ -19,6 +22,36 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+# One instrumented HTTP client shared by every Supabase client in the process
+_httpx_client: Optional[httpx.Client] = None
+_httpx_client_lock = threading.Lock()
+
+def _shared_httpx_client(timeout) -> httpx.Client:
+    """
+    The process-wide httpx client with the telemetry hooks.
+    
+    Supabase clients are created per request and per user, so a client per
+    call would leave an open connection pool behind each time. Requests carry
+    their own URL and auth headers, so one pool serves all of them.
+    """
+    global _httpx_client
+    with _httpx_client_lock:
+        if _httpx_client is None or _httpx_client.is_closed:
+            from .telemetry import supabase_event_hooks
+            _httpx_client = httpx.Client(
+                timeout=timeout,
+                follow_redirects=True,
+                event_hooks=supabase_event_hooks()
+            )
+        return _httpx_client
+
+def _close_httpx_client() -> None:
+    with _httpx_client_lock:
+        if _httpx_client is not None:
+            _httpx_client.close()
+
+atexit.register(_close_httpx_client)
+
 def get_supabase_client(use_service_role: bool = False) -> Client:
     """
     Get Supabase client instance.
@@ -46,6 +79,11 @@ def get_supabase_client(use_service_role: bool = False) -> Client:
         persist_session=True
     )
     
+    # Time every PostgREST/Storage/Auth call for the API servers' /metrics
+    # (supabase-py versions that accept a shared httpx client)
+    if 'httpx_client' in getattr(ClientOptions, '__dataclass_fields__', {}):
+        options.httpx_client = _shared_httpx_client(options.postgrest_client_timeout)
+    
     client = create_client(SUPABASE_URL, key, options)
     return client
 def verify_connection() -> bool:
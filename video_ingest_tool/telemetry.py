@@ -0,0 +1,351 @@
+"""
+Prometheus metrics for the API servers.
+
+A small thread-safe registry of counters, gauges and histograms rendered in
+the Prometheus text exposition format (version 0.0.4) by ``render()``, so
+``/metrics`` works without the prometheus_client package. Both API servers
+share the metrics defined here:
+
+    - HTTP request latency per route template, method and status
+    - Supabase call latency per service (rest, storage, auth) and target
+      table/RPC/bucket, timed by httpx event hooks on the clients
+    - ingest files and bytes (totals and current rate), pipeline step
+      durations, ingest queue depth and active workers
+    - cache hit ratios, read from registered caches at scrape time
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latencies: 5 ms .. 30 s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Pipeline steps range from milliseconds (checksum of a proxy) to many minutes (AI analysis)
+STEP_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Shared label handling for the metric types."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        if not self.labelnames and self.kind in ("counter", "gauge"):
+            # Unlabelled series are exported as 0 before the first update
+            self._values[()] = 0.0
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"
+                                for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"
+                                for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1])) for key, state in self._values.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+# (name, type, help, [(labels, value)]) produced at scrape time
+CollectedMetric = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+class Registry:
+    """Metrics plus callbacks that report current state when scraped."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[CollectedMetric]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[CollectedMetric]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """The whole registry in Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        # Merge samples from several collectors under one HELP/TYPE header per name
+        collected: Dict[str, Tuple[str, str, List[Tuple[Dict[str, str], float]]]] = {}
+        for collector in collectors:
+            try:
+                for name, kind, documentation, samples in collector():
+                    collected.setdefault(name, (kind, documentation, []))[2].extend(samples)
+            except Exception:
+                # A broken collector must not take down the scrape
+                continue
+        for name, (kind, documentation, samples) in collected.items():
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "ait_http_request_duration_seconds", "API request latency by route template.",
+    ["route", "method", "status"]))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "ait_http_requests_in_flight", "API requests currently being served."))
+SUPABASE_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "ait_supabase_request_duration_seconds", "Supabase HTTP call latency.",
+    ["service", "target", "method"]))
+SUPABASE_ERRORS = REGISTRY.register(Counter(
+    "ait_supabase_errors_total", "Supabase calls that returned an error status.",
+    ["service", "target"]))
+INGEST_FILES = REGISTRY.register(Counter(
+    "ait_ingest_files_total", "Files finished by API ingest jobs.", ["status"]))
+INGEST_BYTES = REGISTRY.register(Counter(
+    "ait_ingest_bytes_total", "Source bytes of files processed by API ingest jobs."))
+INGEST_FILES_RATE = REGISTRY.register(Gauge(
+    "ait_ingest_files_per_second", "Files per second of the current (or last) ingest job."))
+INGEST_BYTES_RATE = REGISTRY.register(Gauge(
+    "ait_ingest_bytes_per_second", "Source bytes per second of the current (or last) ingest job."))
+INGEST_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "ait_ingest_queue_depth", "Files waiting to be processed in the current ingest job."))
+INGEST_ACTIVE_WORKERS = REGISTRY.register(Gauge(
+    "ait_ingest_active_workers", "Workers currently processing files."))
+STEP_SECONDS = REGISTRY.register(Histogram(
+    "ait_pipeline_step_duration_seconds", "Wall time of pipeline steps per file.",
+    ["step"], buckets=STEP_BUCKETS))
+STEP_ERRORS = REGISTRY.register(Counter(
+    "ait_pipeline_step_errors_total", "Pipeline steps that raised.", ["step"]))
+
+
+def render() -> str:
+    """Everything in the default registry, for the /metrics endpoint."""
+    return REGISTRY.render()
+
+
+def observe_step(file_path: str, step: str, metrics: Dict[str, Any], error: Optional[str] = None) -> None:
+    """RunMetrics listener feeding step durations into the step histogram."""
+    STEP_SECONDS.observe(metrics["wall_s"], step=step)
+    if error:
+        STEP_ERRORS.inc(step=step)
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """
+    Report a cache's counters at scrape time.
+
+    Args:
+        name: Value of the ``cache`` label
+        cache: Object with a ``stats()`` method returning hits/misses (and optionally coalesced/entries)
+    """
+    def collect() -> Iterable[CollectedMetric]:
+        stats = cache.stats()
+        labels = {"cache": name}
+        hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+        yield ("ait_cache_hits_total", "counter", "Cache lookups served from memory.", [(labels, hits)])
+        yield ("ait_cache_misses_total", "counter", "Cache lookups that had to load.", [(labels, misses)])
+        if "coalesced" in stats:
+            yield ("ait_cache_coalesced_total", "counter", "Lookups that waited on an identical in-flight load.",
+                   [(labels, stats["coalesced"])])
+        if "entries" in stats:
+            yield ("ait_cache_entries", "gauge", "Entries currently held.", [(labels, stats["entries"])])
+        yield ("ait_cache_hit_ratio", "gauge", "Hits over all lookups since start.",
+               [(labels, hits / (hits + misses) if hits + misses else 0.0)])
+
+    REGISTRY.register_collector(collect)
+
+
+class IngestThroughput:
+    """Tracks one ingest job's progress and publishes its rates and queue depth."""
+
+    def __init__(self, total_files: int, workers: int = 1):
+        self.started = time.monotonic()
+        self.total_files = total_files
+        self.done = 0
+        self.bytes = 0
+        self.workers = workers
+        # One ingest job runs at a time, so the job owns these gauges outright
+        INGEST_QUEUE_DEPTH.set(total_files)
+        INGEST_ACTIVE_WORKERS.set(workers)
+        INGEST_FILES_RATE.set(0)
+        INGEST_BYTES_RATE.set(0)
+
+    def file_done(self, status: str, size_bytes: int = 0) -> None:
+        """Count a finished file (status: processed, skipped or failed)."""
+        self.done += 1
+        self.bytes += size_bytes
+        INGEST_FILES.inc(status=status)
+        if size_bytes:
+            INGEST_BYTES.inc(size_bytes)
+        INGEST_QUEUE_DEPTH.set(max(0, self.total_files - self.done))
+        elapsed = time.monotonic() - self.started
+        if elapsed > 0:
+            INGEST_FILES_RATE.set(self.done / elapsed)
+            INGEST_BYTES_RATE.set(self.bytes / elapsed)
+
+    def finish(self) -> None:
+        """Release the job's workers; the rates keep the job's final values."""
+        INGEST_QUEUE_DEPTH.set(0)
+        INGEST_ACTIVE_WORKERS.set(0)
+
+
+def _supabase_target(url: Any) -> Tuple[str, str]:
+    """(service, target) for a Supabase URL, keeping label cardinality bounded."""
+    parts = [p for p in urlsplit(str(url)).path.split("/") if p]
+    # /rest/v1/<table>, /rest/v1/rpc/<fn>, /storage/v1/object/<kind>/<bucket>/..., /auth/v1/<action>
+    service = parts[0] if parts else "unknown"
+    rest = parts[2:]
+    if service == "rest":
+        target = "rpc/" + rest[1] if rest[:1] == ["rpc"] and len(rest) > 1 else (rest[0] if rest else "")
+    elif service == "storage":
+        if rest[:1] == ["object"]:
+            rest = rest[1:]
+            if rest and rest[0] in ("public", "sign", "authenticated", "info", "list", "move", "copy"):
+                rest = rest[1:]
+        target = rest[0] if rest else ""
+    else:
+        target = rest[0] if rest else ""
+    return service, target
+
+
+def _observe_supabase(request: Any, status: Optional[int]) -> None:
+    started = request.extensions.get("ait_started")
+    if started is None:
+        return
+    service, target = _supabase_target(request.url)
+    SUPABASE_REQUEST_SECONDS.observe(time.perf_counter() - started, service=service, target=target,
+                                     method=request.method)
+    if status is None or status >= 400:
+        SUPABASE_ERRORS.inc(service=service, target=target)
+
+
+def supabase_event_hooks() -> Dict[str, List[Callable]]:
+    """httpx event hooks timing synchronous Supabase calls."""
+    def on_request(request):
+        request.extensions["ait_started"] = time.perf_counter()
+
+    def on_response(response):
+        _observe_supabase(response.request, response.status_code)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def async_supabase_event_hooks() -> Dict[str, List[Callable]]:
+    """httpx event hooks timing Supabase calls made with an AsyncClient."""
+    async def on_request(request):
+        request.extensions["ait_started"] = time.perf_counter()
+
+    async def on_response(response):
+        _observe_supabase(response.request, response.status_code)
+
+    return {"request": [on_request], "response": [on_response]}
@@ -0,0 +1,533 @@
+"""
+Local SQLite FTS5 mirror of clip text and transcript segments.
+
+Full-text and transcript searches normally call the `fulltext_search_clips`
+and `search_transcripts` RPCs, and transcript search can only say which clip
+matched, not where. This module keeps a per-user FTS5 index next to the
+vector mirror (see vector_index.py) so keyword searches answer locally with
+BM25 ranking, highlighted snippets and the transcript segments that matched,
+each with its start time.
+
+Layout (text.db in the user's LOCAL_INDEX_DIR directory):
+
+    clips          clip ID, display row (grid profile + transcript preview), version
+    clip_fts       FTS5 over file name, summary, tags, searchable_content, transcript
+    segments       one row per transcript segment: clip, position, start time, speaker
+    segment_fts    FTS5 over segment text, rowid = segments.id
+
+The index is updated by `store_video_in_database` (when the mirror exists)
+and by `ait index sync`.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+
+from .utils import parse_timestamp
+from .vector_index import LOCAL_INDEX_AUTO_SYNC, LOCAL_INDEX_DIR
+
+logger = structlog.get_logger(__name__)
+
+FTS_TOKENIZER = "porter unicode61 remove_diacritics 2"
+
+# Indexed clip columns and their BM25 weights
+CLIP_TEXT_COLUMNS: Dict[str, float] = {
+    "file_name": 4.0,
+    "content_summary": 3.0,
+    "content_tags": 3.0,
+    "searchable_content": 1.0,
+    "full_transcript": 1.0,
+}
+# Clip fields kept for display next to the text (grid profile plus transcript columns)
+CLIP_ROW_COLUMNS = [
+    "id", "file_name", "local_path", "duration_seconds",
+    "content_summary", "content_tags", "content_category",
+    "camera_make", "camera_model", "processed_at",
+    "thumbnail_url", "all_thumbnail_urls", "transcript_preview",
+]
+# Column used to tell whether a clip changed since the last sync
+TEXT_VERSION_COLUMN = "updated_at"
+
+SNIPPET_TOKENS = 16
+SEGMENTS_PER_CLIP = 3
+
+_QUERY_TOKEN_RE = re.compile(r'-?"[^"]*"?|\S+')
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _phrase(text: str) -> Optional[str]:
+    """Quote the words of a term as one FTS5 phrase (None if it has no words)."""
+    words = _WORD_RE.findall(text)
+    return '"' + " ".join(words) + '"' if words else None
+
+
+def websearch_to_fts5(query: str) -> Optional[str]:
+    """
+    Translate web-search syntax into an FTS5 MATCH expression.
+
+    Mirrors Postgres' websearch_to_tsquery, which the search RPCs use: words
+    are ANDed, "quoted text" is a phrase, `or` between terms is a
+    disjunction and a leading `-` excludes a term. Punctuation never reaches
+    FTS5 as syntax, so arbitrary user input can't raise a parse error.
+
+    Returns:
+        The MATCH expression, or None if the query has no searchable words
+    """
+    groups: List[List[str]] = []
+    excluded: List[str] = []
+    pending_or = False
+    for token in _QUERY_TOKEN_RE.findall(query):
+        if token.lower() == "or":
+            pending_or = bool(groups)
+            continue
+        negate = token.startswith("-") and len(token) > 1
+        phrase = _phrase(token[1:] if negate else token)
+        if phrase is None:
+            continue
+        if negate:
+            excluded.append(phrase)
+        elif pending_or:
+            groups[-1].append(phrase)
+        else:
+            groups.append([phrase])
+        pending_or = False
+    if not groups:
+        return None
+    expression = " AND ".join(
+        group[0] if len(group) == 1 else "(" + " OR ".join(group) + ")" for group in groups
+    )
+    if excluded:
+        expression = f"({expression}) NOT ({' OR '.join(excluded)})"
+    return expression
+
+
+def transcript_segments(ai_analysis: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Transcript segments from an ai_analysis dict (as stored in the analysis table)."""
+    transcript = ((ai_analysis or {}).get("audio_analysis") or {}).get("transcript") or {}
+    return [segment for segment in transcript.get("segments") or [] if segment and segment.get("text")]
+
+
+class LocalTextIndex:
+    """Per-user FTS5 index of clip text and transcript segments."""
+
+    def __init__(self, user_id: str, directory: Optional[Path] = None):
+        """
+        Open the text index for a user, creating it if needed.
+
+        Args:
+            user_id: Owner of the indexed clips
+            directory: Root directory (default: LOCAL_INDEX_DIR)
+        """
+        self.user_id = user_id
+        self.directory = Path(directory or LOCAL_INDEX_DIR) / user_id
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.directory / "text.db", check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS clips (
+                doc INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                row TEXT,
+                transcript_length INTEGER NOT NULL DEFAULT 0,
+                version TEXT,
+                indexed_at REAL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS clip_fts USING fts5(
+                {", ".join(CLIP_TEXT_COLUMNS)}, tokenize = '{FTS_TOKENIZER}'
+            );
+            CREATE TABLE IF NOT EXISTS segments (
+                id INTEGER PRIMARY KEY,
+                clip_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                start_seconds REAL,
+                timestamp TEXT,
+                speaker TEXT
+            );
+            CREATE INDEX IF NOT EXISTS segments_clip ON segments (clip_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS segment_fts USING fts5(
+                text, tokenize = '{FTS_TOKENIZER}'
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._bm25_weights = ", ".join(str(weight) for weight in CLIP_TEXT_COLUMNS.values())
+
+    @staticmethod
+    def exists(user_id: str, directory: Optional[Path] = None) -> bool:
+        """Whether a text index was created for this user."""
+        return (Path(directory or LOCAL_INDEX_DIR) / user_id / "text.db").exists()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def upsert_clip(
+        self,
+        clip_row: Dict[str, Any],
+        segments: Optional[Sequence[Dict[str, Any]]] = None,
+        version: Optional[str] = None
+    ) -> None:
+        """
+        Index (or re-index) one clip's text and transcript segments.
+
+        Args:
+            clip_row: Clip fields; must include 'id'. Text columns missing from
+                the row are indexed as empty.
+            segments: Transcript segments with 'text' and optional 'timestamp'/'speaker'
+            version: Value of TEXT_VERSION_COLUMN for the indexed clip
+        """
+        clip_id = clip_row["id"]
+        tags = clip_row.get("content_tags") or []
+        text = {
+            **{column: clip_row.get(column) or "" for column in CLIP_TEXT_COLUMNS},
+            "content_tags": " ".join(tags) if isinstance(tags, list) else str(tags),
+        }
+        display = {column: clip_row[column] for column in CLIP_ROW_COLUMNS if column in clip_row}
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._drop([clip_id])
+                cursor = self._db.execute(
+                    "INSERT INTO clips (id, row, transcript_length, version, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                    (clip_id, json.dumps(display, default=str), len(text["full_transcript"]), version, time.time())
+                )
+                self._db.execute(
+                    f"INSERT INTO clip_fts (rowid, {', '.join(text)}) VALUES (?{', ?' * len(text)})",
+                    (cursor.lastrowid, *text.values())
+                )
+                for seq, segment in enumerate(segments or []):
+                    cursor = self._db.execute(
+                        "INSERT INTO segments (clip_id, seq, start_seconds, timestamp, speaker) VALUES (?, ?, ?, ?, ?)",
+                        (clip_id, seq, parse_timestamp(segment.get("timestamp")),
+                         segment.get("timestamp"), segment.get("speaker"))
+                    )
+                    self._db.execute("INSERT INTO segment_fts (rowid, text) VALUES (?, ?)",
+                                     (cursor.lastrowid, segment["text"]))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def delete_clips(self, clip_ids: Sequence[str]) -> None:
+        """Remove clips and their segments from the index."""
+        if not clip_ids:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._drop(clip_ids)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _drop(self, clip_ids: Sequence[str]) -> None:
+        for chunk in _chunks(list(clip_ids), 500):
+            marks = ",".join("?" * len(chunk))
+            self._db.execute(
+                f"DELETE FROM clip_fts WHERE rowid IN (SELECT doc FROM clips WHERE id IN ({marks}))", chunk
+            )
+            self._db.execute(
+                f"DELETE FROM segment_fts WHERE rowid IN (SELECT id FROM segments WHERE clip_id IN ({marks}))", chunk
+            )
+            self._db.execute(f"DELETE FROM segments WHERE clip_id IN ({marks})", chunk)
+            self._db.execute(f"DELETE FROM clips WHERE id IN ({marks})", chunk)
+
+    def versions(self) -> Dict[str, Optional[str]]:
+        """Clip ID -> version for every indexed clip."""
+        with self._lock:
+            return dict(self._db.execute("SELECT id, version FROM clips").fetchall())
+
+    def search_clips(
+        self,
+        query: str,
+        limit: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        min_transcript_length: int = 0,
+        with_transcript: bool = False,
+        snippet_markers: Tuple[str, str] = ("**", "**")
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked clip search.
+
+        Args:
+            query: Web-search style query (see websearch_to_fts5)
+            limit: Maximum number of clips
+            columns: Restrict matching to these CLIP_TEXT_COLUMNS (all if None)
+            min_transcript_length: Skip clips whose transcript is shorter
+            with_transcript: Include the indexed transcript as `full_transcript`
+            snippet_markers: Strings placed around matched terms in the snippet
+
+        Returns:
+            Display rows with `fts_rank` (higher is better) and `snippet`, best first
+        """
+        expression = websearch_to_fts5(query)
+        if expression is None:
+            return []
+        if columns:
+            expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+        start, end = snippet_markers
+        with self._lock:
+            found = self._db.execute(
+                f"""
+                SELECT c.id, c.row, bm25(clip_fts, {self._bm25_weights}) AS score,
+                       snippet(clip_fts, -1, ?, ?, '…', {SNIPPET_TOKENS}),
+                       {"clip_fts.full_transcript" if with_transcript else "NULL"}
+                FROM clip_fts JOIN clips c ON c.doc = clip_fts.rowid
+                WHERE clip_fts MATCH ? AND c.transcript_length >= ?
+                ORDER BY score LIMIT ?
+                """,
+                (start, end, expression, min_transcript_length, limit)
+            ).fetchall()
+        results = []
+        for clip_id, row, score, snippet, transcript in found:
+            result = {**json.loads(row), "id": clip_id, "fts_rank": -score, "snippet": snippet}
+            if with_transcript:
+                result["full_transcript"] = transcript
+            results.append(result)
+        return results
+
+    def search_segments(
+        self,
+        query: str,
+        limit: int = 20,
+        clip_ids: Optional[Sequence[str]] = None,
+        per_clip: Optional[int] = None,
+        snippet_markers: Tuple[str, str] = ("**", "**")
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked transcript segment search.
+
+        Args:
+            query: Web-search style query
+            limit: Maximum number of segments (ignored when clip_ids is given)
+            clip_ids: Only search these clips' segments
+            per_clip: Keep at most this many segments per clip
+            snippet_markers: Strings placed around matched terms in the snippet
+
+        Returns:
+            Segment hits (clip_id, seq, start_seconds, timestamp, speaker, text,
+            snippet, fts_rank), best first
+        """
+        expression = websearch_to_fts5(query)
+        if expression is None:
+            return []
+        start, end = snippet_markers
+        sql = f"""
+            SELECT s.clip_id, s.seq, s.start_seconds, s.timestamp, s.speaker, segment_fts.text,
+                   snippet(segment_fts, 0, ?, ?, '…', {SNIPPET_TOKENS}), bm25(segment_fts) AS score
+            FROM segment_fts JOIN segments s ON s.id = segment_fts.rowid
+            WHERE segment_fts MATCH ?
+        """
+        params: List[Any] = [start, end, expression]
+        if clip_ids is not None:
+            if not clip_ids:
+                return []
+            sql += f" AND s.clip_id IN ({','.join('?' * len(clip_ids))}) ORDER BY score"
+            params.extend(clip_ids)
+        else:
+            sql += " ORDER BY score LIMIT ?"
+            params.append(limit * (per_clip and 4 or 1))
+        with self._lock:
+            found = self._db.execute(sql, params).fetchall()
+
+        hits: List[Dict[str, Any]] = []
+        kept: Dict[str, int] = {}
+        for clip_id, seq, start_seconds, timestamp, speaker, text, snippet, score in found:
+            if per_clip and kept.get(clip_id, 0) >= per_clip:
+                continue
+            kept[clip_id] = kept.get(clip_id, 0) + 1
+            hits.append({
+                "clip_id": clip_id, "seq": seq, "start_seconds": start_seconds, "timestamp": timestamp,
+                "speaker": speaker, "text": text, "snippet": snippet, "fts_rank": -score,
+            })
+        return hits if clip_ids is not None else hits[:limit]
+
+    def search_transcripts(
+        self,
+        query: str,
+        limit: int = 10,
+        min_content_length: int = 50,
+        segments_per_clip: int = SEGMENTS_PER_CLIP
+    ) -> List[Dict[str, Any]]:
+        """
+        Transcript search shaped like the `search_transcripts` RPC, plus the
+        best matching segments of each clip under `matching_segments`.
+        """
+        clips = self.search_clips(query, limit, columns=["full_transcript"],
+                                  min_transcript_length=min_content_length, with_transcript=True)
+        segments = self.search_segments(query, clip_ids=[clip["id"] for clip in clips], per_clip=segments_per_clip)
+        by_clip: Dict[str, List[Dict[str, Any]]] = {}
+        for hit in segments:
+            by_clip.setdefault(hit["clip_id"], []).append(hit)
+        results = []
+        for clip in clips:
+            full_text = clip.pop("full_transcript")
+            results.append({**clip, "clip_id": clip["id"], "full_text": full_text,
+                            "matching_segments": by_clip.get(clip["id"], [])})
+        return results
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            found = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return found[0] if found else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def optimize(self) -> None:
+        """Merge the FTS5 b-tree segments left behind by incremental updates."""
+        with self._lock:
+            self._db.execute("INSERT INTO clip_fts (clip_fts) VALUES ('optimize')")
+            self._db.execute("INSERT INTO segment_fts (segment_fts) VALUES ('optimize')")
+
+    def stats(self) -> Dict[str, Any]:
+        """Clip and segment counts plus sync metadata."""
+        with self._lock:
+            clips = self._db.execute("SELECT COUNT(*) FROM clips").fetchone()[0]
+            transcribed = self._db.execute("SELECT COUNT(*) FROM clips WHERE transcript_length > 0").fetchone()[0]
+            segments = self._db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        return {
+            "directory": str(self.directory),
+            "clips": clips,
+            "transcribed_clips": transcribed,
+            "segments": segments,
+            "last_sync": self.get_meta("last_sync"),
+        }
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+_indexes: Dict[str, LocalTextIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_text_index(user_id: str) -> LocalTextIndex:
+    """Shared LocalTextIndex per user for this process."""
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is None:
+            index = _indexes[user_id] = LocalTextIndex(user_id)
+        return index
+
+
+def text_index_enabled(user_id: str) -> bool:
+    """Whether database storage should keep this user's text index current."""
+    if LOCAL_INDEX_AUTO_SYNC in ("0", "false", "off"):
+        return False
+    if LOCAL_INDEX_AUTO_SYNC in ("1", "true", "on"):
+        return True
+    return LocalTextIndex.exists(user_id)
+
+
+def mirror_clip_text(
+    user_id: str,
+    clip_row: Dict[str, Any],
+    ai_analysis: Optional[Dict[str, Any]] = None,
+    version: Optional[str] = None,
+    logger=None
+) -> bool:
+    """
+    Copy one freshly stored clip into the user's text index.
+
+    Args:
+        user_id: Owner of the clip
+        clip_row: Stored clip fields including 'id'
+        ai_analysis: The clip's ai_analysis dict, for transcript segments
+        version: Value of TEXT_VERSION_COLUMN after the write, if known
+        logger: Optional logger
+
+    Returns:
+        bool: True if the index was updated
+    """
+    try:
+        get_text_index(user_id).upsert_clip(clip_row, transcript_segments(ai_analysis), version=version)
+        return True
+    except Exception as e:
+        if logger:
+            logger.warning(f"Failed to update local text index for clip {clip_row.get('id')}: {str(e)}")
+        return False
+
+
+def sync_text_index(
+    client,
+    user_id: str,
+    full: bool = False,
+    page_size: int = 1000,
+    batch_size: int = 100,
+    progress=None
+) -> Dict[str, Any]:
+    """
+    Bring the local text index in line with the user's clips.
+
+    Only clips whose TEXT_VERSION_COLUMN changed are downloaded; clips that
+    disappeared remotely are removed.
+
+    Args:
+        client: Authenticated Supabase client
+        user_id: User whose clips to index
+        full: Re-download every clip
+        page_size: Rows per page when listing remote versions
+        batch_size: Clips per download
+        progress: Optional callback(done, total)
+
+    Returns:
+        Dict with counts of fetched and removed clips
+    """
+    index = get_text_index(user_id)
+    started = time.time()
+
+    remote: Dict[str, Optional[str]] = {}
+    last_id = None
+    while True:
+        query = client.table('clips').select(f"id,{TEXT_VERSION_COLUMN}").eq('user_id', user_id)
+        if last_id:
+            query = query.gt('id', last_id)
+        page = query.order('id').limit(page_size).execute().data or []
+        for row in page:
+            remote[row['id']] = row.get(TEXT_VERSION_COLUMN)
+        if len(page) < page_size:
+            break
+        last_id = page[-1]['id']
+
+    local = index.versions()
+    changed = [clip_id for clip_id, version in remote.items()
+               if full or clip_id not in local or local[clip_id] != version]
+    removed = [clip_id for clip_id in local if clip_id not in remote]
+
+    columns = list(dict.fromkeys(CLIP_ROW_COLUMNS + list(CLIP_TEXT_COLUMNS) + [TEXT_VERSION_COLUMN]))
+    select = f"{','.join(columns)},analysis(ai_analysis)"
+    for done, batch in enumerate(_chunks(changed, batch_size)):
+        rows = client.table('clips').select(select).in_('id', batch).execute().data or []
+        for row in rows:
+            analysis = row.pop('analysis', None) or []
+            if isinstance(analysis, dict):
+                analysis = [analysis]
+            ai_analysis = next((a.get('ai_analysis') for a in analysis if a.get('ai_analysis')), None)
+            index.upsert_clip(row, transcript_segments(ai_analysis), version=row.get(TEXT_VERSION_COLUMN))
+        if progress:
+            progress(min((done + 1) * batch_size, len(changed)), len(changed))
+
+    index.delete_clips(removed)
+    if changed or removed:
+        index.optimize()
+    index.set_meta("last_sync", time.strftime("%Y-%m-%dT%H:%M:%S%z"))
+
+    result = {
+        "remote_clips": len(remote),
+        "fetched": len(changed),
+        "removed": len(removed),
+        "seconds": round(time.time() - started, 2),
+    }
+    logger.info("Synced local text index", **result)
+    return result
@@ -5,12 +5,16 @@ Contains helper functions for checksum calculation, parsing dates, etc.
 """
 
 import os
+import re
 import math
 import hashlib
 import datetime
-from typing import Optional, Union
+from typing import Any, Optional, Union
 from dateutil import parser as dateutil_parser
 
+_TIMESTAMP_UNITS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(h|ms|m|s)", re.IGNORECASE)
+_CLOCK_RE = re.compile(r"^(?:(\d+):)?(\d+):(\d+(?:\.\d+)?)$")
+
 def calculate_checksum(file_path: str, block_size: int = 65536) -> str:
     """
     Calculate MD5 checksum of a file.
@@ -63,6 +67,35 @@ def parse_datetime_string(date_str: Optional[str]) -> Optional[datetime.datetime
     except (ValueError, TypeError):
         return None
 
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Convert a transcript timestamp to seconds.
+
+    Accepts the analysis format ("5s600ms", "1m5s", "1h2m"), clock times
+    ("01:05", "00:01:05.6") and plain numbers.
+
+    Returns:
+        Seconds, or None if the value isn't a recognisable timestamp
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    clock = _CLOCK_RE.match(text)
+    if clock:
+        hours, minutes, seconds = clock.groups()
+        return int(hours or 0) * 3600 + int(minutes) * 60 + float(seconds)
+    parts = _TIMESTAMP_UNITS_RE.findall(text)
+    if not parts or _TIMESTAMP_UNITS_RE.sub("", text).strip():
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(number) * scale[unit.lower()] for number, unit in parts)
+
 def calculate_aspect_ratio_str(width: Optional[int], height: Optional[int]) -> Optional[str]:
     """Calculate aspect ratio as a string (e.g., '16:9')."""
     if not width or not height or width <= 0 or height <= 0:
@@ -184,26 +217,3 @@ def categorize_focal_length(focal_length: Optional[Union[str, int, float]], rang
         return None
     except (ValueError, TypeError):
         return None
-
-
-def get_json_files(directory: str) -> list:
-    """
-    Recursively find all JSON files in a directory.
-    
-    Args:
-        directory: Path to the directory to search
-        
-    Returns:
-        list: List of paths to JSON files
-    """
-    json_files = []
-    
-    if not os.path.exists(directory) or not os.path.isdir(directory):
-        return json_files
-        
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.lower().endswith('.json'):
-                json_files.append(os.path.join(root, file))
-                
-    return json_files
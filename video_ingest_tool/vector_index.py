@@ -0,0 +1,1310 @@
+"""
+Local mirror of the `vectors` table with an IVF index for offline vector search.
+
+Semantic, hybrid and similar searches normally run as Supabase RPCs, so every
+query pays a network round trip plus pgvector's scan time. This module keeps a
+per-user copy of the summary, keyword and thumbnail embeddings on disk and
+answers top-k inner-product queries locally.
+
+Layout (one directory per user under LOCAL_INDEX_DIR):
+
+    mirror.db            SQLite: clip rows (grid profile), row -> clip mapping, sync metadata
+    <field>.f16          float16 vectors, memory-mapped, shape (capacity, dim)
+    <field>.alive        uint8 flag per row (0 once a clip's vectors are replaced)
+    <field>.lists        int32 IVF list of each row
+    <field>.ivf.npz      IVF centroids and list offsets
+    <field>.json         manifest (dim, count, capacity, generation, quantization)
+    <field>.bin          optional sign bits per vector (binary quantization)
+    <field>.i8/.scale    optional int8 codes and per-vector scales (int8 quantization)
+
+A rebuild clusters the live vectors with spherical k-means and rewrites the
+matrix so every IVF list is one contiguous row range. A query scores the
+centroids, reads the `nprobe` best lists as contiguous slices, and adds any
+rows appended since the last rebuild whose nearest centroid is among them.
+With quantization enabled, those rows are first scored on their compact
+codes (Hamming distance for binary, int8 dot products for int8) and only
+the best LOCAL_INDEX_RERANK candidates are re-scored exactly from float16.
+Appends are incremental: new rows go to the end of the matrix and are
+assigned to their nearest centroid, and replaced rows are only flagged dead
+until the next rebuild compacts them.
+
+The mirror also holds a k-nearest-neighbour graph over the summary vectors
+(the vectors find_similar_clips compares), so "find similar" is one
+primary-key read. The graph is built with blocked matrix multiplies and
+patched incrementally: a new or changed clip is scored once against the
+corpus, its own list is written, and only lists it enters or leaves are
+touched.
+
+The mirror is kept current by `store_embeddings` (when the mirror exists)
+and by `ait index sync`.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+LOCAL_INDEX_DIR = Path(os.getenv("LOCAL_INDEX_DIR", str(Path.home() / ".video_ingest_index")))
+# "auto": maintain the mirror from store_embeddings only once `ait index sync` created it
+LOCAL_INDEX_AUTO_SYNC = os.getenv("LOCAL_INDEX_AUTO_SYNC", "auto")
+LOCAL_INDEX_NPROBE = int(os.getenv("LOCAL_INDEX_NPROBE", "12"))
+# Compact codes for candidate retrieval: "none", "binary" or "int8"; unset keeps
+# whatever each field was last built with (see `ait index quantize`)
+LOCAL_INDEX_QUANTIZATION = os.getenv("LOCAL_INDEX_QUANTIZATION") or None
+# Candidates re-scored with the float16 vectors after a quantized scan
+LOCAL_INDEX_RERANK = int(os.getenv("LOCAL_INDEX_RERANK", "200"))
+QUANTIZATION_MODES = ("none", "binary", "int8")
+
+IVF_MIN_VECTORS = 20_000       # Below this a brute-force scan is already fast enough
+IVF_MAX_LISTS = 8192
+IVF_LISTS_PER_SQRT = 4         # nlist = 4 * sqrt(n): small lists keep each probe's float16 scan short
+REBUILD_TAIL_FRACTION = 0.2    # Rebuild once this share of rows was appended or replaced since the last one
+SCAN_CHUNK_ROWS = 65_536
+
+# Neighbours kept per clip in the similarity graph (0 disables the graph)
+KNN_NEIGHBORS = int(os.getenv("LOCAL_KNN_NEIGHBORS", "20"))
+KNN_FIELD = "summary"
+KNN_QUERY_BLOCK = 1024         # Query rows per matrix multiply when building the graph
+KNN_SCORE_BUDGET = 16_000_000  # Max query x corpus scores held in memory per block
+KNN_FLOOR_TOLERANCE = 1e-4     # Batched and single-vector products differ in the last bits
+# "auto": find_similar reads the graph whenever one exists, even without --local
+LOCAL_KNN_SIMILAR = os.getenv("LOCAL_KNN_SIMILAR", "auto")
+
+# Set bits in each byte value; Hamming distances are table lookups on XORed codes
+# (np.bitwise_count needs NumPy 2)
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+# vectors table columns mirrored per field, keyed by slot (thumbnail rank, 0 for single vectors)
+VECTOR_COLUMNS: Dict[str, Dict[int, str]] = {
+    "summary": {0: "summary_embedding"},
+    "keyword": {0: "keyword_embedding"},
+    "thumbnail": {
+        1: "thumbnail_1_embedding",
+        2: "thumbnail_2_embedding",
+        3: "thumbnail_3_embedding",
+    },
+}
+# Column used to tell whether a clip's vectors changed since the last sync
+# (store_embeddings stamps it whenever it rewrites any vector of a row)
+VECTOR_VERSION_COLUMN = "created_at"
+
+
+def parse_vector(value: Any) -> Optional[np.ndarray]:
+    """Parse a pgvector value (list or '[1,2,...]' string) into a float32 array."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = json.loads(value)
+    array = np.asarray(value, dtype=np.float32)
+    return array if array.size else None
+
+
+def vectors_from_row(row: Dict[str, Any]) -> Dict[str, Dict[int, np.ndarray]]:
+    """Extract the mirrored embeddings from a `vectors` row (or store_embeddings payload)."""
+    result: Dict[str, Dict[int, np.ndarray]] = {}
+    for field, columns in VECTOR_COLUMNS.items():
+        slots = {}
+        for slot, column in columns.items():
+            vector = parse_vector(row.get(column))
+            if vector is not None:
+                slots[slot] = vector
+        if slots:
+            result[field] = slots
+    return result
+
+
+class VectorField:
+    """Memory-mapped float16 matrix of one embedding kind with an IVF index."""
+
+    def __init__(self, directory: Path, name: str, quantization: Optional[str] = None):
+        """
+        Open (or prepare to create) a field.
+
+        Args:
+            directory: Index directory
+            name: Field name; used as the file prefix
+            quantization: 'none', 'binary' or 'int8'; existing vectors are encoded
+                when it differs from the stored setting (None keeps the stored one)
+        """
+        if quantization is not None and quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Invalid quantization: {quantization}. Must be one of: {', '.join(QUANTIZATION_MODES)}")
+        self.directory = directory
+        self.name = name
+        self._lock = threading.RLock()
+        self._manifest_mtime: Optional[int] = None
+        self.dim = 0
+        self.count = 0
+        self.capacity = 0
+        self.generation = 0
+        self.quantization = quantization or "none"
+        self.vectors: Optional[np.memmap] = None
+        self.alive: Optional[np.memmap] = None
+        self.lists: Optional[np.memmap] = None
+        self.codes: Optional[np.memmap] = None
+        self.scales: Optional[np.memmap] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        self._refresh()
+        if quantization is not None and quantization != self.quantization:
+            self.set_quantization(quantization)
+
+    def _path(self, suffix: str) -> Path:
+        return self.directory / f"{self.name}{suffix}"
+
+    @property
+    def indexed(self) -> int:
+        """Rows covered by the contiguous IVF lists; rows after this are the unclustered tail."""
+        return int(self.offsets[-1]) if self.offsets is not None else 0
+
+    def _refresh(self) -> None:
+        """Pick up changes another process (or a rebuild) made to the files."""
+        try:
+            mtime = self._path(".json").stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+        manifest = json.loads(self._path(".json").read_text())
+        quantization = manifest.get("quantization", "none")
+        remap = (manifest["generation"] != self.generation or manifest["capacity"] != self.capacity
+                 or quantization != self.quantization)
+        self.quantization = quantization
+        self.dim = manifest["dim"]
+        self.count = manifest["count"]
+        self._manifest_mtime = mtime
+        if remap or self.vectors is None:
+            self.generation = manifest["generation"]
+            self.capacity = manifest["capacity"]
+            self._map()
+
+    def _map(self) -> None:
+        self.vectors = np.memmap(self._path(".f16"), dtype=np.float16, mode="r+", shape=(self.capacity, self.dim))
+        self.alive = np.memmap(self._path(".alive"), dtype=np.uint8, mode="r+", shape=(self.capacity,))
+        self.lists = np.memmap(self._path(".lists"), dtype=np.int32, mode="r+", shape=(self.capacity,))
+        self.codes = self.scales = None
+        if self.quantization == "binary":
+            self.codes = np.memmap(self._path(".bin"), dtype=np.uint8, mode="r+", shape=(self.capacity, self._code_width()))
+        elif self.quantization == "int8":
+            self.codes = np.memmap(self._path(".i8"), dtype=np.int8, mode="r+", shape=(self.capacity, self.dim))
+            self.scales = np.memmap(self._path(".scale"), dtype=np.float32, mode="r+", shape=(self.capacity,))
+        ivf_path = self._path(".ivf.npz")
+        if ivf_path.exists():
+            with np.load(ivf_path) as ivf:
+                self.centroids = ivf["centroids"]
+                self.offsets = ivf["offsets"]
+        else:
+            self.centroids = None
+            self.offsets = None
+
+    def _save_manifest(self) -> None:
+        manifest = {"dim": self.dim, "count": self.count, "capacity": self.capacity,
+                    "generation": self.generation, "quantization": self.quantization, "updated_at": time.time()}
+        tmp = self._path(".json.tmp")
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, self._path(".json"))
+        self._manifest_mtime = self._path(".json").stat().st_mtime_ns
+
+    def _ensure_capacity(self, needed: int, dim: int) -> None:
+        if self.vectors is not None and needed <= self.capacity:
+            return
+        if self.dim and dim != self.dim:
+            raise ValueError(f"Vector dimension {dim} does not match index '{self.name}' ({self.dim})")
+        capacity = max(1024, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        self.dim = dim
+        for suffix, itemsize in self._file_layout():
+            path = self._path(suffix)
+            with open(path, "ab") as f:
+                f.truncate(capacity * itemsize)
+        self.capacity = capacity
+        self._map()
+
+    def _code_width(self) -> int:
+        return (self.dim + 7) // 8
+
+    def _file_layout(self, quantization: Optional[str] = None) -> List[Tuple[str, int]]:
+        """(suffix, bytes per row) of every per-row file for a quantization mode."""
+        layout = [(".f16", 2 * self.dim), (".alive", 1), (".lists", 4)]
+        mode = quantization or self.quantization
+        if mode == "binary":
+            layout.append((".bin", self._code_width()))
+        elif mode == "int8":
+            layout += [(".i8", self.dim), (".scale", 4)]
+        return layout
+
+    @staticmethod
+    def encode(vectors: np.ndarray, quantization: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Quantize float vectors.
+
+        Returns:
+            Tuple of (codes, scales): packed sign bits and None for 'binary',
+            int8 codes and per-vector float32 scales for 'int8'
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if quantization == "binary":
+            return np.packbits(vectors > 0, axis=1), None
+        scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def _write_codes(self, start: int, vectors: np.ndarray) -> None:
+        if self.quantization == "none":
+            return
+        codes, scales = self.encode(vectors, self.quantization)
+        self.codes[start:start + len(codes)] = codes
+        if scales is not None:
+            self.scales[start:start + len(scales)] = scales
+
+    def set_quantization(self, quantization: str) -> None:
+        """
+        Switch the compact code format, encoding every stored vector.
+
+        Args:
+            quantization: 'none', 'binary' or 'int8'
+        """
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Invalid quantization: {quantization}. Must be one of: {', '.join(QUANTIZATION_MODES)}")
+        with self._lock:
+            self._refresh()
+            if quantization == self.quantization:
+                return
+            if self.vectors is None:
+                # Nothing stored yet; the first append creates the files
+                self.quantization = quantization
+                return
+            if quantization != "none":
+                for suffix, itemsize in self._file_layout(quantization)[3:]:
+                    with open(self._path(suffix), "wb") as f:
+                        f.truncate(self.capacity * itemsize)
+            self.quantization = quantization
+            self._map()
+            for s in range(0, self.count, SCAN_CHUNK_ROWS):
+                e = min(self.count, s + SCAN_CHUNK_ROWS)
+                self._write_codes(s, np.asarray(self.vectors[s:e], dtype=np.float32))
+            self._flush()
+            self._save_manifest()
+            logger.info("Quantized local vector index", field=self.name, quantization=quantization, vectors=self.count)
+
+    def _flush(self) -> None:
+        for mm in (self.vectors, self.alive, self.lists, self.codes, self.scales):
+            if mm is not None:
+                mm.flush()
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """Bytes per stored representation for the rows in use."""
+        return {suffix: self.count * itemsize for suffix, itemsize in self._file_layout()}
+
+    def append(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Append vectors and assign them to their nearest IVF list.
+
+        Args:
+            vectors: float array of shape (n, dim)
+
+        Returns:
+            np.ndarray: Row numbers of the new vectors
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            self._refresh()
+            start = self.count
+            self._ensure_capacity(start + len(vectors), vectors.shape[1])
+            end = start + len(vectors)
+            self.vectors[start:end] = vectors.astype(np.float16)
+            self._write_codes(start, vectors)
+            self.alive[start:end] = 1
+            if self.centroids is not None:
+                self.lists[start:end] = np.argmax(vectors @ self.centroids.T, axis=1)
+            else:
+                self.lists[start:end] = -1
+            self._flush()
+            self.count = end
+            self._save_manifest()
+            return np.arange(start, end, dtype=np.int64)
+
+    def mark_dead(self, rows: Iterable[int]) -> None:
+        """Flag rows as deleted; they are dropped at the next rebuild."""
+        self._set_alive(rows, 0)
+
+    def revive(self, rows: Iterable[int]) -> None:
+        """Undo mark_dead for rows that have not been compacted away yet."""
+        self._set_alive(rows, 1)
+
+    def _set_alive(self, rows: Iterable[int], flag: int) -> None:
+        rows = np.fromiter(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        with self._lock:
+            self._refresh()
+            self.alive[rows[rows < self.count]] = flag
+            self.alive.flush()
+            self._save_manifest()
+
+    def vector(self, row: int) -> np.ndarray:
+        """Return one stored vector as float32."""
+        self._refresh()
+        return np.asarray(self.vectors[row], dtype=np.float32)
+
+    def live_count(self) -> int:
+        self._refresh()
+        return int(np.count_nonzero(self.alive[:self.count])) if self.count else 0
+
+    def needs_rebuild(self) -> bool:
+        """Whether enough rows were appended or replaced since the last rebuild to recluster."""
+        self._refresh()
+        live = self.live_count()
+        if live < IVF_MIN_VECTORS:
+            return False
+        stale = (self.count - self.indexed) + (self.indexed - int(np.count_nonzero(self.alive[:self.indexed])))
+        return self.centroids is None or stale > REBUILD_TAIL_FRACTION * live
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: int = LOCAL_INDEX_NPROBE,
+        rerank: int = LOCAL_INDEX_RERANK
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k rows by inner product with the query.
+
+        Args:
+            query: Query vector of shape (dim,)
+            k: Number of rows to return
+            nprobe: IVF lists to scan (ignored for brute-force indexes)
+            rerank: With quantization, candidates from the compact scan that
+                are re-scored exactly (at least k)
+
+        Returns:
+            Tuple of (rows, scores), best first
+        """
+        self._refresh()
+        if not self.count or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.dim:
+            raise ValueError(f"Query dimension {query.shape[0]} does not match index '{self.name}' ({self.dim})")
+
+        row_blocks: List[np.ndarray] = []
+        score_blocks: List[np.ndarray] = []
+        score_rows = self._score_function(query)
+
+        def score_range(start: int, end: int) -> None:
+            for s in range(start, end, SCAN_CHUNK_ROWS):
+                e = min(end, s + SCAN_CHUNK_ROWS)
+                row_blocks.append(np.arange(s, e, dtype=np.int64))
+                score_blocks.append(score_rows(slice(s, e)))
+
+        if self.centroids is None:
+            score_range(0, self.count)
+        else:
+            nprobe = min(nprobe, len(self.centroids))
+            probe = np.argpartition(self.centroids @ query, -nprobe)[-nprobe:]
+            for list_id in probe:
+                score_range(int(self.offsets[list_id]), int(self.offsets[list_id + 1]))
+            tail_start = self.indexed
+            if tail_start < self.count:
+                tail_lists = np.asarray(self.lists[tail_start:self.count])
+                tail_rows = tail_start + np.flatnonzero(np.isin(tail_lists, probe) | (tail_lists < 0))
+                if len(tail_rows):
+                    row_blocks.append(tail_rows)
+                    score_blocks.append(score_rows(tail_rows))
+
+        if not row_blocks:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        rows = np.concatenate(row_blocks)
+        scores = np.concatenate(score_blocks)
+        live = np.asarray(self.alive[rows], dtype=bool)
+        rows, scores = rows[live], scores[live]
+        if self.quantization != "none":
+            # Second stage: exact float16 scores for the best compact-code candidates
+            candidates = max(k, rerank)
+            if len(rows) > candidates:
+                rows = rows[np.argpartition(scores, -candidates)[-candidates:]]
+            rows = np.sort(rows)
+            scores = np.asarray(self.vectors[rows], dtype=np.float32) @ query
+        if len(rows) > k:
+            top = np.argpartition(scores, -k)[-k:]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores)
+        return rows[order], scores[order]
+
+    def _score_function(self, query: np.ndarray):
+        """Scorer for row ranges or row arrays: exact, or on compact codes when quantized."""
+        if self.quantization == "binary":
+            query_bits = np.packbits(query > 0)
+            return lambda rows: -_POPCOUNT[np.asarray(self.codes[rows]) ^ query_bits].sum(
+                axis=1, dtype=np.int32
+            ).astype(np.float32)
+        if self.quantization == "int8":
+            return lambda rows: (np.asarray(self.codes[rows], dtype=np.float32) @ query) * self.scales[rows]
+        return lambda rows: np.asarray(self.vectors[rows], dtype=np.float32) @ query
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Exact inner product of the query with every row (-inf for dead rows)."""
+        self._refresh()
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        scores = np.full(self.count, -np.inf, dtype=np.float32)
+        for s in range(0, self.count, SCAN_CHUNK_ROWS):
+            e = min(self.count, s + SCAN_CHUNK_ROWS)
+            scores[s:e] = np.asarray(self.vectors[s:e], dtype=np.float32) @ query
+        scores[~np.asarray(self.alive[:self.count], dtype=bool)] = -np.inf
+        return scores
+
+    def top_k_exact(
+        self,
+        queries: np.ndarray,
+        k: int,
+        exclude_rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact top-k rows for a batch of queries by blocked matrix multiply.
+
+        The corpus is streamed in column blocks sized so each block's score
+        matrix stays within KNN_SCORE_BUDGET, and a running top-k per query
+        is merged with each block's scores.
+
+        Args:
+            queries: float32 array of shape (m, dim)
+            k: Neighbours per query
+            exclude_rows: Row to skip for each query (its own row), or -1
+
+        Returns:
+            Tuple of (rows, scores), each (m, k), best first; missing slots are -1 / -inf
+        """
+        self._refresh()
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        m = len(queries)
+        best_rows = np.full((m, k), -1, dtype=np.int64)
+        best_scores = np.full((m, k), -np.inf, dtype=np.float32)
+        if not self.count or k <= 0:
+            return best_rows, best_scores
+        block = max(1024, KNN_SCORE_BUDGET // max(m, 1))
+        query_index = np.arange(m)
+        for s in range(0, self.count, block):
+            e = min(self.count, s + block)
+            scores = queries @ np.asarray(self.vectors[s:e], dtype=np.float32).T
+            scores[:, ~np.asarray(self.alive[s:e], dtype=bool)] = -np.inf
+            if exclude_rows is not None:
+                inside = (exclude_rows >= s) & (exclude_rows < e)
+                scores[query_index[inside], exclude_rows[inside] - s] = -np.inf
+            merged_scores = np.concatenate([best_scores, scores], axis=1)
+            merged_rows = np.concatenate([best_rows, np.broadcast_to(np.arange(s, e), scores.shape)], axis=1)
+            top = np.argpartition(merged_scores, -k, axis=1)[:, -k:]
+            best_scores = np.take_along_axis(merged_scores, top, axis=1)
+            best_rows = np.take_along_axis(merged_rows, top, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        best_rows[~np.isfinite(best_scores)] = -1
+        return best_rows, best_scores
+
+    def rebuild(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0) -> np.ndarray:
+        """
+        Compact live rows and recluster them into contiguous IVF lists.
+
+        Args:
+            nlist: Number of lists (default: IVF_LISTS_PER_SQRT * sqrt of the live row count)
+            iterations: k-means iterations
+            seed: Random seed for the training sample
+
+        Returns:
+            np.ndarray: Mapping from old row to new row (-1 for dropped rows)
+        """
+        with self._lock:
+            self._refresh()
+            live_rows = np.flatnonzero(np.asarray(self.alive[:self.count]))
+            n = len(live_rows)
+            mapping = np.full(self.count, -1, dtype=np.int64)
+
+            centroids = None
+            assignment = np.zeros(n, dtype=np.int32)
+            if n >= IVF_MIN_VECTORS:
+                nlist = int(nlist or min(IVF_MAX_LISTS, max(16, int(IVF_LISTS_PER_SQRT * np.sqrt(n)))))
+                centroids = self._train(live_rows, nlist, iterations, seed)
+                for s in range(0, n, SCAN_CHUNK_ROWS):
+                    chunk = np.asarray(self.vectors[live_rows[s:s + SCAN_CHUNK_ROWS]], dtype=np.float32)
+                    assignment[s:s + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+                order = np.argsort(assignment, kind="stable")
+                offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=nlist))]).astype(np.int64)
+            else:
+                order = np.arange(n)
+                offsets = None
+
+            new_rows = live_rows[order]
+            mapping[new_rows] = np.arange(n)
+            capacity = max(1024, 1 << int(np.ceil(np.log2(max(n, 1)))))
+
+            # Write the compacted, list-ordered copy next to the live files, then swap
+            tmp_vectors = np.memmap(self._path(".f16.tmp"), dtype=np.float16, mode="w+", shape=(capacity, self.dim))
+            for s in range(0, n, SCAN_CHUNK_ROWS):
+                e = min(n, s + SCAN_CHUNK_ROWS)
+                tmp_vectors[s:e] = self.vectors[new_rows[s:e]]
+            tmp_vectors.flush()
+            del tmp_vectors
+            code_suffixes = []
+            for suffix, source in ((".bin" if self.quantization == "binary" else ".i8", self.codes),
+                                   (".scale", self.scales)):
+                if source is None:
+                    continue
+                tmp_codes = np.memmap(self._path(suffix + ".tmp"), dtype=source.dtype, mode="w+",
+                                      shape=(capacity,) + source.shape[1:])
+                for s in range(0, n, SCAN_CHUNK_ROWS):
+                    e = min(n, s + SCAN_CHUNK_ROWS)
+                    tmp_codes[s:e] = source[new_rows[s:e]]
+                tmp_codes.flush()
+                del tmp_codes
+                code_suffixes.append(suffix)
+            alive = np.zeros(capacity, dtype=np.uint8)
+            alive[:n] = 1
+            alive.tofile(self._path(".alive.tmp"))
+            lists = np.full(capacity, -1, dtype=np.int32)
+            lists[:n] = assignment[order] if centroids is not None else -1
+            lists.tofile(self._path(".lists.tmp"))
+
+            self.vectors = self.alive = self.lists = self.codes = self.scales = None
+            for suffix in (".f16", ".alive", ".lists", *code_suffixes):
+                os.replace(self._path(suffix + ".tmp"), self._path(suffix))
+            if centroids is not None:
+                np.savez(self._path(".ivf.tmp.npz"), centroids=centroids, offsets=offsets)
+                os.replace(self._path(".ivf.tmp.npz"), self._path(".ivf.npz"))
+            elif self._path(".ivf.npz").exists():
+                self._path(".ivf.npz").unlink()
+
+            self.count = n
+            self.capacity = capacity
+            self.generation += 1
+            self._map()
+            self._save_manifest()
+            logger.info("Rebuilt local vector index", field=self.name, vectors=n,
+                        lists=len(centroids) if centroids is not None else 0)
+            return mapping
+
+    def _train(self, rows: np.ndarray, nlist: int, iterations: int, seed: int) -> np.ndarray:
+        """Spherical k-means on a sample of rows; returns unit-norm centroids."""
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(rows), max(nlist * 32, 65_536))
+        sample = np.sort(rng.choice(rows, size=sample_size, replace=False))
+        data = np.asarray(self.vectors[sample], dtype=np.float32)
+        data /= np.maximum(np.linalg.norm(data, axis=1, keepdims=True), 1e-12)
+        centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, data)
+            counts = np.bincount(assignment, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty lists from random points so every list stays useful
+            sums[empty] = data[rng.choice(len(data), size=int(empty.sum()), replace=False)]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        return centroids.astype(np.float32)
+
+
+class LocalVectorIndex:
+    """Per-user mirror of clip embeddings and the clip fields needed to show results."""
+
+    def __init__(self, user_id: str, directory: Optional[Path] = None, quantization: Optional[str] = LOCAL_INDEX_QUANTIZATION):
+        """
+        Open the mirror for a user, creating the directory if needed.
+
+        Args:
+            user_id: Owner of the mirrored clips
+            directory: Root directory (default: LOCAL_INDEX_DIR)
+            quantization: Compact codes for candidate retrieval ('none', 'binary',
+                'int8'); None keeps whatever each field was built with
+        """
+        self.user_id = user_id
+        self.directory = Path(directory or LOCAL_INDEX_DIR) / user_id
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.directory / "mirror.db", check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS clips (
+                id TEXT PRIMARY KEY,
+                row TEXT,
+                vectors_version TEXT,
+                synced_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS vector_rows (
+                field TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                clip_id TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                PRIMARY KEY (field, row)
+            );
+            CREATE INDEX IF NOT EXISTS vector_rows_clip ON vector_rows (clip_id);
+            CREATE TABLE IF NOT EXISTS knn (
+                clip_id TEXT PRIMARY KEY,
+                neighbors TEXT NOT NULL,
+                floor REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        # Row owners and list floors of the graph field; see _graph_rows
+        self._graph_state: Optional[Dict[str, Any]] = None
+        self.fields = {name: VectorField(self.directory, name, quantization) for name in VECTOR_COLUMNS}
+
+    @staticmethod
+    def exists(user_id: str, directory: Optional[Path] = None) -> bool:
+        """Whether a mirror was created for this user."""
+        return (Path(directory or LOCAL_INDEX_DIR) / user_id / "mirror.db").exists()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def upsert_clip(
+        self,
+        clip_id: str,
+        vectors: Dict[str, Dict[int, np.ndarray]],
+        clip_row: Optional[Dict[str, Any]] = None,
+        version: Optional[str] = None,
+        patch_graph: bool = True,
+        fields: Optional[Sequence[str]] = None
+    ) -> None:
+        """
+        Replace a clip's mirrored vectors (and optionally its display row).
+
+        Args:
+            clip_id: Clip ID
+            vectors: Field name -> slot -> vector, as from vectors_from_row
+            clip_row: Clip fields to return with search results
+            version: Value of VECTOR_VERSION_COLUMN for the synced vectors row
+            patch_graph: Update the neighbour graph for this clip (bulk loads
+                turn this off and rebuild the graph once at the end)
+            fields: Only replace these fields and keep the clip's other mirrored
+                vectors as they are (default: replace all)
+        """
+        fields = list(self.fields) if fields is None else [f for f in fields if f in self.fields]
+        with self._lock:
+            touched: List[Tuple[str, np.ndarray, int]] = []
+            self._db.execute("BEGIN")
+            try:
+                graph_k = self.graph_k() if patch_graph and KNN_FIELD in fields else None
+                stale = self._graph_unlink(clip_id, graph_k) if graph_k else set()
+                self._drop_vectors([clip_id], fields, touched)
+                for field, slots in vectors.items():
+                    if not slots or field not in fields:
+                        continue
+                    ordered = sorted(slots)
+                    rows = self.fields[field].append(np.stack([slots[slot] for slot in ordered]))
+                    touched.append((field, rows, 0))
+                    self._db.executemany(
+                        "INSERT INTO vector_rows (field, row, clip_id, slot) VALUES (?, ?, ?, ?)",
+                        [(field, int(row), clip_id, slot) for row, slot in zip(rows, ordered)]
+                    )
+                    if field == KNN_FIELD:
+                        self._track_owner(clip_id, int(rows[0]))
+                if clip_row is not None:
+                    self._db.execute(
+                        "INSERT INTO clips (id, row, vectors_version, synced_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(id) DO UPDATE SET row = excluded.row, "
+                        "vectors_version = excluded.vectors_version, synced_at = excluded.synced_at",
+                        (clip_id, json.dumps(clip_row, default=str), version, time.time())
+                    )
+                else:
+                    self._db.execute(
+                        "INSERT INTO clips (id, vectors_version, synced_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(id) DO UPDATE SET vectors_version = excluded.vectors_version, "
+                        "synced_at = excluded.synced_at",
+                        (clip_id, version, time.time())
+                    )
+                if graph_k:
+                    self._graph_link(clip_id, graph_k, stale)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._rollback(touched)
+                raise
+
+    def delete_clips(self, clip_ids: Sequence[str], patch_graph: bool = True) -> None:
+        """Remove clips and their vectors (and neighbour lists) from the mirror."""
+        if not clip_ids:
+            return
+        with self._lock:
+            touched: List[Tuple[str, np.ndarray, int]] = []
+            self._db.execute("BEGIN")
+            try:
+                graph_k = self.graph_k() if patch_graph else None
+                stale: set = set()
+                if graph_k:
+                    for clip_id in clip_ids:
+                        stale |= self._graph_unlink(clip_id, graph_k)
+                self._drop_vectors(clip_ids, touched=touched)
+                self._db.executemany("DELETE FROM clips WHERE id = ?", [(c,) for c in clip_ids])
+                self._db.executemany("DELETE FROM knn WHERE clip_id = ?", [(c,) for c in clip_ids])
+                if stale - set(clip_ids):
+                    self._write_neighbor_lists(self._compute_neighbor_lists(sorted(stale - set(clip_ids)), graph_k))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._rollback(touched)
+                raise
+
+    def _drop_vectors(
+        self,
+        clip_ids: Sequence[str],
+        fields: Optional[Sequence[str]] = None,
+        touched: Optional[List[Tuple[str, np.ndarray, int]]] = None
+    ) -> None:
+        """
+        Mark clips' vector rows dead and delete their row mapping.
+
+        Args:
+            clip_ids: Clips whose vectors are dropped
+            fields: Only drop these fields (default: all)
+            touched: Receives (field, rows, alive flag to restore) for each
+                change, so a rolled-back transaction can undo it
+        """
+        fields = list(self.fields) if fields is None else list(fields)
+        field_marks = ",".join("?" * len(fields))
+        for chunk in _chunks(list(clip_ids), 500):
+            marks = ",".join("?" * len(chunk))
+            existing = self._db.execute(
+                f"SELECT field, row FROM vector_rows WHERE clip_id IN ({marks}) AND field IN ({field_marks})",
+                chunk + fields
+            ).fetchall()
+            for field in fields:
+                rows = np.array([row for f, row in existing if f == field], dtype=np.int64)
+                if touched is not None:
+                    touched.append((field, rows, 1))
+                self.fields[field].mark_dead(rows)
+                if field == KNN_FIELD:
+                    for row in rows.tolist():
+                        self._track_owner(None, row)
+            self._db.execute(f"DELETE FROM vector_rows WHERE clip_id IN ({marks}) AND field IN ({field_marks})",
+                             chunk + fields)
+
+    def _rollback(self, touched: Sequence[Tuple[str, np.ndarray, int]] = ()) -> None:
+        """Roll back the open transaction and undo its changes to the alive flags."""
+        self._db.execute("ROLLBACK")
+        self._graph_state = None
+        for field, rows, flag in reversed(touched):
+            if flag:
+                self.fields[field].revive(rows)
+            else:
+                self.fields[field].mark_dead(rows)
+
+    def versions(self) -> Dict[str, Optional[str]]:
+        """Clip ID -> vectors version for every mirrored clip."""
+        with self._lock:
+            return dict(self._db.execute("SELECT id, vectors_version FROM clips").fetchall())
+
+    def clip_rows(self, clip_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Mirrored display rows for clips (clips without one map to just their id)."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for chunk in _chunks(list(clip_ids), 500):
+                marks = ",".join("?" * len(chunk))
+                for clip_id, row in self._db.execute(f"SELECT id, row FROM clips WHERE id IN ({marks})", chunk):
+                    rows[clip_id] = json.loads(row) if row else {"id": clip_id}
+        return rows
+
+    def clip_vector(self, field: str, clip_id: str, slot: int = 0) -> Optional[np.ndarray]:
+        """A clip's stored vector for one field, or None if it isn't mirrored."""
+        with self._lock:
+            found = self._db.execute(
+                "SELECT row FROM vector_rows WHERE field = ? AND clip_id = ? AND slot = ?", (field, clip_id, slot)
+            ).fetchone()
+        return self.fields[field].vector(found[0]) if found else None
+
+    def search(
+        self,
+        field: str,
+        query: Sequence[float],
+        k: int,
+        nprobe: int = LOCAL_INDEX_NPROBE,
+        exclude: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k clips for a query vector, best first.
+
+        Clips with several vectors in a field (thumbnails) are scored by their
+        best match.
+
+        Args:
+            field: 'summary', 'keyword' or 'thumbnail'
+            query: Query embedding
+            k: Number of clips to return
+            nprobe: IVF lists to scan
+            exclude: Clip IDs to leave out (e.g. the source clip of a similar search)
+
+        Returns:
+            List of (clip_id, score)
+        """
+        if field not in self.fields:
+            raise ValueError(f"Unknown index field: {field}. Must be one of: {', '.join(self.fields)}")
+        excluded = set(exclude or ())
+        slots = len(VECTOR_COLUMNS[field])
+        rows, scores = self.fields[field].search(np.asarray(query, dtype=np.float32), (k + len(excluded)) * slots, nprobe)
+        if not len(rows):
+            return []
+
+        row_list = [int(r) for r in rows]
+        with self._lock:
+            owners: Dict[int, str] = {}
+            for chunk in _chunks(row_list, 500):
+                marks = ",".join("?" * len(chunk))
+                owners.update(self._db.execute(
+                    f"SELECT row, clip_id FROM vector_rows WHERE field = ? AND row IN ({marks})", [field, *chunk]
+                ).fetchall())
+
+        hits: List[Tuple[str, float]] = []
+        seen = set(excluded)
+        for row, score in zip(row_list, scores):
+            clip_id = owners.get(row)
+            if clip_id is None or clip_id in seen:
+                continue
+            seen.add(clip_id)
+            hits.append((clip_id, float(score)))
+            if len(hits) == k:
+                break
+        return hits
+
+    def rebuild(self, fields: Optional[Sequence[str]] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Compact and recluster fields, updating the row mapping.
+
+        Args:
+            fields: Fields to rebuild (default: all)
+            force: Rebuild even if the field doesn't need it yet
+
+        Returns:
+            Dict of field -> live vectors for the fields that were rebuilt
+        """
+        rebuilt = {}
+        with self._lock:
+            for name in fields or list(self.fields):
+                field = self.fields[name]
+                if not field.count or not (force or field.needs_rebuild()):
+                    continue
+                mapping = field.rebuild()
+                remapped = [
+                    (int(mapping[row]), clip_id, slot)
+                    for row, clip_id, slot in self._db.execute(
+                        "SELECT row, clip_id, slot FROM vector_rows WHERE field = ?", (name,)
+                    )
+                    if row < len(mapping) and mapping[row] >= 0
+                ]
+                self._db.execute("BEGIN")
+                try:
+                    self._db.execute("DELETE FROM vector_rows WHERE field = ?", (name,))
+                    self._db.executemany(
+                        "INSERT INTO vector_rows (field, row, clip_id, slot) VALUES (?, ?, ?, ?)",
+                        [(name, row, clip_id, slot) for row, clip_id, slot in remapped]
+                    )
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+                finally:
+                    self._graph_state = None
+                rebuilt[name] = field.count
+        return rebuilt
+
+    def _owners(self, field: str = KNN_FIELD) -> Tuple[np.ndarray, List[str]]:
+        """Rows of a single-vector field and the clip owning each, ordered by row."""
+        found = self._db.execute(
+            "SELECT row, clip_id FROM vector_rows WHERE field = ? ORDER BY row", (field,)
+        ).fetchall()
+        return np.array([row for row, _ in found], dtype=np.int64), [clip_id for _, clip_id in found]
+
+    def _graph_rows(self) -> Dict[str, Any]:
+        """
+        Row-aligned owners and neighbour-list floors of the graph field.
+
+        Loaded from SQLite once and then kept in step with this connection's
+        writes, so patching the graph for one clip doesn't rescan every row.
+        A commit from another connection (PRAGMA data_version) forces a reload.
+
+        Returns:
+            Dict with 'owners' (clip ID per row, None for dead rows), 'rows'
+            (clip ID -> row), and 'floors'/'sizes' of each row's neighbour
+            list (size -1 where the clip has no list)
+        """
+        version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        state = self._graph_state
+        if state is None or state["version"] != version:
+            rows, owners = self._owners()
+            count = int(rows[-1]) + 1 if len(rows) else 0
+            state = {
+                "version": version,
+                "owners": [None] * count,
+                "rows": dict(zip(owners, rows.tolist())),
+                "floors": np.full(count, np.inf),
+                "sizes": np.full(count, -1, dtype=np.int64),
+            }
+            for row, clip_id in zip(rows.tolist(), owners):
+                state["owners"][row] = clip_id
+            for clip_id, floor, size in self._db.execute("SELECT clip_id, floor, size FROM knn"):
+                row = state["rows"].get(clip_id)
+                if row is not None:
+                    state["floors"][row] = floor
+                    state["sizes"][row] = size
+            self._graph_state = state
+        return state
+
+    def _track_owner(self, clip_id: Optional[str], row: int) -> None:
+        """Record a graph-field row gaining (or, with None, losing) its owner in the cached state."""
+        state = self._graph_state
+        if state is None:
+            return
+        if row >= len(state["owners"]):
+            extra = row + 1 - len(state["owners"])
+            state["owners"].extend([None] * extra)
+            state["floors"] = np.concatenate([state["floors"], np.full(extra, np.inf)])
+            state["sizes"] = np.concatenate([state["sizes"], np.full(extra, -1, dtype=np.int64)])
+        previous = state["owners"][row]
+        if previous is not None and state["rows"].get(previous) == row:
+            del state["rows"][previous]
+        state["owners"][row] = clip_id
+        state["sizes"][row] = -1
+        if clip_id is not None:
+            state["rows"][clip_id] = row
+            # A clip re-added without patching the graph keeps its old list until the next build
+            found = self._db.execute("SELECT floor, size FROM knn WHERE clip_id = ?", (clip_id,)).fetchone()
+            if found:
+                state["floors"][row], state["sizes"][row] = found
+
+    def graph_k(self) -> Optional[int]:
+        """Neighbours per clip in the similarity graph, or None if no graph was built."""
+        value = self.get_meta("knn_k")
+        return int(value) if value else None
+
+    def _compute_neighbor_lists(self, clip_ids: Sequence[str], k: int) -> Dict[str, List[Tuple[str, float]]]:
+        """Exact neighbour lists for some clips, computed in blocked batches."""
+        field = self.fields[KNN_FIELD]
+        state = self._graph_rows()
+        owners, rows_by_clip = state["owners"], state["rows"]
+        wanted = [clip_id for clip_id in clip_ids if clip_id in rows_by_clip]
+        lists: Dict[str, List[Tuple[str, float]]] = {}
+        for chunk in _chunks(wanted, KNN_QUERY_BLOCK):
+            query_rows = np.array([rows_by_clip[clip_id] for clip_id in chunk], dtype=np.int64)
+            neighbor_rows, scores = field.top_k_exact(
+                np.asarray(field.vectors[query_rows], dtype=np.float32), k, exclude_rows=query_rows
+            )
+            for clip_id, row_list, score_list in zip(chunk, neighbor_rows.tolist(), scores.tolist()):
+                lists[clip_id] = [(owners[row], score) for row, score in zip(row_list, score_list)
+                                  if 0 <= row < len(owners) and owners[row] is not None]
+        return lists
+
+    def _write_neighbor_lists(self, lists: Dict[str, List[Tuple[str, float]]]) -> None:
+        rows = [(clip_id, json.dumps(neighbors), neighbors[-1][1] if neighbors else -1e30, len(neighbors))
+                for clip_id, neighbors in lists.items()]
+        self._db.executemany("INSERT OR REPLACE INTO knn (clip_id, neighbors, floor, size) VALUES (?, ?, ?, ?)", rows)
+        state = self._graph_state
+        if state is not None:
+            for clip_id, _, floor, size in rows:
+                row = state["rows"].get(clip_id)
+                if row is not None:
+                    state["floors"][row] = floor
+                    state["sizes"][row] = size
+
+    def _graph_candidates(self, vector: np.ndarray, k: int, skip: str) -> List[Tuple[str, float]]:
+        """Clips whose neighbour list a vector may belong in (score at or near their floor)."""
+        scores = self.fields[KNN_FIELD].scores(vector)
+        state = self._graph_rows()
+        n = min(len(scores), len(state["owners"]))
+        scores, floors, sizes = scores[:n], state["floors"][:n], state["sizes"][:n]
+        hits = np.flatnonzero(
+            np.isfinite(scores) & (sizes >= 0) & ((sizes < k) | (scores >= floors - KNN_FLOOR_TOLERANCE))
+        )
+        owners = state["owners"]
+        return [(owners[row], float(scores[row])) for row in hits.tolist()
+                if owners[row] is not None and owners[row] != skip]
+
+    def _graph_unlink(self, clip_id: str, k: int) -> set:
+        """Find the lists that contain a clip about to be replaced or removed."""
+        old = self.clip_vector(KNN_FIELD, clip_id)
+        if old is None:
+            return set()
+        stale = set()
+        for other, _ in self._graph_candidates(old, k, skip=clip_id):
+            found = self._db.execute("SELECT neighbors FROM knn WHERE clip_id = ?", (other,)).fetchone()
+            if found and any(neighbor == clip_id for neighbor, _ in json.loads(found[0])):
+                stale.add(other)
+        return stale
+
+    def _graph_link(self, clip_id: str, k: int, stale: set) -> None:
+        """Write a clip's own list, recompute lists it left, and insert it into lists it now enters."""
+        self._db.execute("DELETE FROM knn WHERE clip_id = ?", (clip_id,))
+        new = self.clip_vector(KNN_FIELD, clip_id)
+        recompute = sorted(stale | ({clip_id} if new is not None else set()))
+        self._write_neighbor_lists(self._compute_neighbor_lists(recompute, k))
+        if new is None:
+            return
+        patched: Dict[str, List[Tuple[str, float]]] = {}
+        for other, score in self._graph_candidates(new, k, skip=clip_id):
+            if other in stale:
+                continue
+            found = self._db.execute("SELECT neighbors FROM knn WHERE clip_id = ?", (other,)).fetchone()
+            neighbors = [tuple(n) for n in json.loads(found[0]) if n[0] != clip_id] if found else []
+            neighbors.append((clip_id, score))
+            neighbors.sort(key=lambda n: n[1], reverse=True)
+            patched[other] = neighbors[:k]
+        self._write_neighbor_lists(patched)
+
+    def build_neighbor_graph(self, k: int = KNN_NEIGHBORS, progress=None) -> int:
+        """
+        Compute every clip's top-k summary neighbours from scratch.
+
+        Args:
+            k: Neighbours per clip
+            progress: Optional callback(done, total)
+
+        Returns:
+            int: Number of clips in the graph
+        """
+        with self._lock:
+            owners = [clip_id for clip_id in self._graph_rows()["owners"] if clip_id is not None]
+            lists: Dict[str, List[Tuple[str, float]]] = {}
+            for start in range(0, len(owners), KNN_QUERY_BLOCK):
+                lists.update(self._compute_neighbor_lists(owners[start:start + KNN_QUERY_BLOCK], k))
+                if progress:
+                    progress(min(start + KNN_QUERY_BLOCK, len(owners)), len(owners))
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM knn")
+                if self._graph_state is not None:
+                    self._graph_state["sizes"][:] = -1
+                self._write_neighbor_lists(lists)
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('knn_k', ?)", (str(k),))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._rollback()
+                raise
+            return len(lists)
+
+    def neighbors(self, clip_id: str, limit: int) -> Optional[List[Tuple[str, float]]]:
+        """
+        A clip's precomputed nearest neighbours, best first.
+
+        Returns:
+            List of (clip_id, score), or None if the graph can't answer
+            (no graph, clip not in it, or limit larger than the graph's k)
+        """
+        k = self.graph_k()
+        if not k or limit > k:
+            return None
+        with self._lock:
+            found = self._db.execute("SELECT neighbors FROM knn WHERE clip_id = ?", (clip_id,)).fetchone()
+        if not found:
+            return None
+        return [(neighbor, score) for neighbor, score in json.loads(found[0])[:limit]]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            found = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return found[0] if found else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def quantize(self, quantization: str) -> None:
+        """
+        Switch every field to a compact code format (or back to 'none').
+
+        Args:
+            quantization: 'none', 'binary' or 'int8'
+        """
+        for field in self.fields.values():
+            field.set_quantization(quantization)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts per field plus sync metadata."""
+        with self._lock:
+            clips = self._db.execute("SELECT COUNT(*) FROM clips").fetchone()[0]
+            graph_clips = self._db.execute("SELECT COUNT(*) FROM knn").fetchone()[0]
+        return {
+            "directory": str(self.directory),
+            "clips": clips,
+            "last_sync": self.get_meta("last_sync"),
+            "knn": {"k": self.graph_k(), "clips": graph_clips},
+            "fields": {
+                name: {
+                    "dim": field.dim,
+                    "rows": field.count,
+                    "live": field.live_count(),
+                    "lists": len(field.centroids) if field.centroids is not None else 0,
+                    "unclustered": field.count - field.indexed,
+                    "quantization": field.quantization,
+                    "bytes": sum(field.memory_bytes().values()),
+                }
+                for name, field in self.fields.items()
+            },
+        }
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+_indexes: Dict[str, LocalVectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_local_index(user_id: str) -> LocalVectorIndex:
+    """Shared LocalVectorIndex per user for this process."""
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is None:
+            index = _indexes[user_id] = LocalVectorIndex(user_id)
+        return index
+
+
+def similar_graph_enabled(user_id: str) -> bool:
+    """Whether find_similar should read the precomputed neighbour graph."""
+    if LOCAL_KNN_SIMILAR in ("0", "false", "off"):
+        return False
+    return LocalVectorIndex.exists(user_id) and bool(get_local_index(user_id).graph_k())
+
+
+def local_index_enabled(user_id: str) -> bool:
+    """Whether store_embeddings should keep this user's mirror current."""
+    if LOCAL_INDEX_AUTO_SYNC in ("0", "false", "off"):
+        return False
+    if LOCAL_INDEX_AUTO_SYNC in ("1", "true", "on"):
+        return True
+    return LocalVectorIndex.exists(user_id)
+
+
+def mirror_clip_vectors(
+    client,
+    user_id: str,
+    clip_id: str,
+    vector_row: Dict[str, Any],
+    logger=None,
+    fields: Optional[Sequence[str]] = None
+) -> bool:
+    """
+    Copy one freshly stored `vectors` row into the user's local mirror.
+
+    Args:
+        client: Authenticated Supabase client (used to fetch the clip's display row)
+        user_id: Owner of the clip
+        clip_id: Clip ID
+        vector_row: The inserted or updated vectors row
+        logger: Optional logger
+        fields: Mirror fields whose vectors changed (default: all)
+
+    Returns:
+        bool: True if the mirror was updated
+    """
+    from .field_profiles import clip_select
+
+    try:
+        clip = client.table('clips').select(clip_select('grid')).eq('id', clip_id).execute()
+        get_local_index(user_id).upsert_clip(
+            clip_id,
+            vectors_from_row(vector_row),
+            clip_row=clip.data[0] if clip.data else None,
+            version=vector_row.get(VECTOR_VERSION_COLUMN),
+            fields=fields
+        )
+        return True
+    except Exception as e:
+        if logger:
+            logger.warning(f"Failed to update local vector index for clip {clip_id}: {str(e)}")
+        return False
+
+
+def sync_local_index(
+    client,
+    user_id: str,
+    full: bool = False,
+    rebuild: bool = False,
+    page_size: int = 1000,
+    batch_size: int = 100,
+    progress=None,
+    knn: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Bring the local mirror in line with the user's `vectors` table.
+
+    Only clips whose vectors row changed (by VECTOR_VERSION_COLUMN) are
+    downloaded; clips that disappeared remotely are removed.
+
+    Args:
+        client: Authenticated Supabase client
+        user_id: User whose vectors to mirror
+        full: Re-download every clip's vectors
+        rebuild: Recluster every field afterwards even if not needed yet
+        page_size: Rows per page when listing remote versions
+        batch_size: Clips per vector download
+        progress: Optional callback(done, total)
+        knn: Build the similarity graph (default: when KNN_NEIGHBORS > 0).
+            It is recomputed once after a sync that changed anything,
+            rather than patched clip by clip.
+
+    Returns:
+        Dict with counts of fetched, removed and rebuilt items
+    """
+    from .field_profiles import clip_select
+
+    index = get_local_index(user_id)
+    started = time.time()
+    if knn is None:
+        knn = KNN_NEIGHBORS > 0
+
+    remote: Dict[str, Optional[str]] = {}
+    last_clip_id = None
+    while True:
+        query = client.table('vectors').select(f"clip_id,{VECTOR_VERSION_COLUMN}") \
+            .eq('user_id', user_id).eq('embedding_type', 'full_clip')
+        if last_clip_id:
+            query = query.gt('clip_id', last_clip_id)
+        page = query.order('clip_id').limit(page_size).execute().data or []
+        for row in page:
+            remote[row['clip_id']] = row.get(VECTOR_VERSION_COLUMN)
+        if len(page) < page_size:
+            break
+        last_clip_id = page[-1]['clip_id']
+
+    local = index.versions()
+    changed = [clip_id for clip_id, version in remote.items()
+               if full or clip_id not in local or local[clip_id] != version]
+    removed = [clip_id for clip_id in local if clip_id not in remote]
+
+    vector_columns = ",".join(column for columns in VECTOR_COLUMNS.values() for column in columns.values())
+    for done, batch in enumerate(_chunks(changed, batch_size)):
+        vector_rows = client.table('vectors').select(f"clip_id,{VECTOR_VERSION_COLUMN},{vector_columns}") \
+            .eq('embedding_type', 'full_clip').in_('clip_id', batch).execute().data or []
+        clip_rows = client.table('clips').select(clip_select('grid')).in_('id', batch).execute().data or []
+        clips_by_id = {row['id']: row for row in clip_rows}
+        for row in vector_rows:
+            index.upsert_clip(row['clip_id'], vectors_from_row(row),
+                              clip_row=clips_by_id.get(row['clip_id']),
+                              version=row.get(VECTOR_VERSION_COLUMN),
+                              patch_graph=False)
+        if progress:
+            progress(min((done + 1) * batch_size, len(changed)), len(changed))
+
+    index.delete_clips(removed, patch_graph=False)
+    rebuilt = index.rebuild(force=rebuild)
+    graph_clips = None
+    if knn and (changed or removed or rebuild or not index.graph_k()):
+        graph_clips = index.build_neighbor_graph(KNN_NEIGHBORS or 20)
+    index.set_meta("last_sync", time.strftime("%Y-%m-%dT%H:%M:%S%z"))
+
+    result = {
+        "remote_clips": len(remote),
+        "fetched": len(changed),
+        "removed": len(removed),
+        "rebuilt": rebuilt,
+        "knn_clips": graph_clips,
+        "seconds": round(time.time() - started, 2),
+    }
+    logger.info("Synced local vector index", **result)
+    return result
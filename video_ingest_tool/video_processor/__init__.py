@@ -7,6 +7,7 @@ Re-exports all video processor components.
 try:
     from .analysis import VideoAnalyzer
     from .compression import VideoCompressor, DEFAULT_COMPRESSION_CONFIG
+    from .segmentation import SegmentedVideoAnalyzer
     from .processor import VideoProcessor
 except ImportError as e:
     # Fail gracefully if dependencies are missing
@@ -15,6 +16,7 @@ except ImportError as e:
 
 __all__ = [
     'VideoAnalyzer',
+    'SegmentedVideoAnalyzer',
     'VideoCompressor',
     'VideoProcessor',
     'DEFAULT_COMPRESSION_CONFIG',
@@ -6,11 +6,16 @@ This module provides the VideoAnalyzer class for handling Gemini AI integration.
 
 import json
 import logging
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Optional
 
 from google import genai
 from google.genai import types
 
+ANALYSIS_MODEL = "gemini-2.5-flash-preview-05-20"
+# Alternate Gemini API endpoint (e.g. a proxy or the benchmark stand-in); unset uses Google's
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE")
+
 
 class VideoAnalyzer:
     """Handles comprehensive video analysis using Gemini Flash 2.5."""
@@ -23,7 +28,8 @@ class VideoAnalyzer:
             api_key: Gemini API key
             fps: Frame rate for video analysis (default: 1)
         """
-        self.client = genai.Client(api_key=api_key)
+        http_options = types.HttpOptions(base_url=GEMINI_API_BASE) if GEMINI_API_BASE else None
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
         self.api_key = api_key
         self.fps = fps
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -490,12 +496,13 @@ MOST IMPORTANT: Your descriptions must be accurate and precise. Focus on exactly
 Please be thorough but concise in your descriptions. Organize the analysis according to the provided schema. Focus on information that would be valuable for video editors to quickly understand and organize footage.
         """
         
-    def analyze_video(self, video_path: str) -> Dict[str, Any]:
+    def analyze_video(self, video_path: str, prompt: Optional[str] = None) -> Dict[str, Any]:
         """
         Perform comprehensive video analysis using Gemini Flash 2.5.
         
         Args:
             video_path: Path to video file to analyze
+            prompt: Prompt to use instead of the default analysis prompt
             
         Returns:
             Dict[str, Any]: Structured analysis results
@@ -523,13 +530,13 @@ Please be thorough but concise in your descriptions. Organize the analysis accor
             schema = self._get_comprehensive_analysis_schema()
             
             # Create analysis prompt
-            prompt = self._create_analysis_prompt()
+            prompt = prompt or self._create_analysis_prompt()
             
             self.logger.info("Sending video to Gemini Flash 2.5 for analysis...")
             
             # Request comprehensive analysis
             response = self.client.models.generate_content(
-                model="gemini-2.5-flash-preview-05-20",
+                model=ANALYSIS_MODEL,
                 contents=[prompt, video_part],
                 config=types.GenerateContentConfig(
                     response_mime_type="application/json",
@@ -2,17 +2,71 @@
 Video compression module for compressing video files using ffmpeg.
 
 This module provides the VideoCompressor class for hardware-accelerated video compression.
+
+Long clips encoded in software are compressed in segments: the source is
+split on its keyframes (GOP boundaries), each segment is encoded by its own
+ffmpeg process with identical settings, the audio is encoded once over the
+whole clip, and the pieces are joined with the concat demuxer without
+re-encoding.
 """
 
 import os
 import sys
+import shutil
+import tempfile
 import subprocess
 import logging
-from typing import Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..config import DEFAULT_COMPRESSION_CONFIG
 
 
+def probe_duration(path: str) -> Optional[float]:
+    """Duration of a media file in seconds, or None if ffprobe can't tell."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "quiet", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+            capture_output=True, text=True, check=True
+        )
+        return float(result.stdout.strip())
+    except Exception:
+        return None
+
+
+def probe_keyframes(path: str) -> List[float]:
+    """Keyframe times of the first video stream, read from packet flags (no decoding)."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "quiet", "-select_streams", "v:0", "-show_entries", "packet=pts_time,flags",
+             "-of", "csv=print_section=0", path],
+            capture_output=True, text=True, check=True
+        )
+    except Exception:
+        return []
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            keyframes.append(float(pts))
+    return sorted(keyframes)
+
+
+def split_on_keyframes(duration: float, keyframes: List[float], segment_seconds: float) -> List[Tuple[float, float]]:
+    """
+    Segment boundaries of roughly segment_seconds that fall on keyframes.
+
+    Returns:
+        List[Tuple[float, float]]: (start, end) of each segment, covering 0..duration
+    """
+    bounds = [0.0]
+    for keyframe in keyframes:
+        if keyframe - bounds[-1] >= segment_seconds and duration - keyframe >= segment_seconds / 2:
+            bounds.append(keyframe)
+    bounds.append(duration)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
 class VideoCompressor:
     """Handles video compression using ffmpeg with hardware acceleration when available."""
     
@@ -140,6 +194,114 @@ class VideoCompressor:
             self.logger.warning(f"Failed to detect video resolution: {str(e)}")
             return (None, None)
 
+    def _plan_encode(self, codec: str, duration: Optional[float]) -> Tuple[str, int]:
+        """
+        Choose the encoder and the number of parallel segment encoders for a clip.
+        
+        Hardware encoders and short clips use one ffmpeg process. Long software
+        encodes are split across processes, and very long ones switch to the
+        faster long_clip_codec.
+        
+        Args:
+            codec: Codec picked by _select_best_codec
+            duration: Clip duration in seconds (None if unknown)
+            
+        Returns:
+            Tuple[str, int]: (codec, parallel segment encoders; 1 = single process)
+        """
+        if 'videotoolbox' in codec or not duration or duration < self.config['parallel_min_duration']:
+            return codec, 1
+        long_clip_codec = self.config.get('long_clip_codec')
+        if long_clip_codec and codec != long_clip_codec and duration >= self.config['long_clip_duration']:
+            self.logger.info(f"Using {long_clip_codec} instead of {codec} for a {duration:.0f}s clip")
+            codec = long_clip_codec
+        workers = self.config['parallel_workers'] or max(1, (os.cpu_count() or 2) // 2)
+        return codec, workers
+    
+    def _video_args(self, video_codec: str, scale_filter: Optional[str]) -> List[str]:
+        """ffmpeg video encoding arguments shared by whole-clip and segment encodes."""
+        args = ["-c:v", video_codec]
+        
+        # Add codec-specific parameters
+        if video_codec == 'libx264' or video_codec == 'libx265':
+            # For software encoding, use CRF (Constant Rate Factor) for quality-based encoding
+            args.extend(["-crf", str(self.config['crf_value'])])  # Use configurable CRF
+        elif 'videotoolbox' in video_codec:
+            # For hardware encoding, use bitrate-based encoding
+            args.extend(["-b:v", self.config['video_bitrate']])
+            
+            # Add specific VideoToolbox parameters for better quality
+            args.extend(["-allow_sw", "1"])  # Allow software encoding as fallback
+            
+            # Add ProRes options for better quality with VideoToolbox
+            if video_codec == 'hevc_videotoolbox':
+                args.extend(["-profile:v", "main"])
+        else:
+            # Default to bitrate for other encoders
+            args.extend(["-b:v", self.config['video_bitrate']])
+        
+        # Set video filters if needed
+        if scale_filter:
+            args.extend(["-vf", scale_filter])
+        
+        # Set frame rate
+        args.extend(["-r", str(self.config['fps'])])
+        return args
+    
+    def _compress_segments(
+        self,
+        input_path: str,
+        output_path: str,
+        segments: List[Tuple[float, float]],
+        video_args: List[str],
+        audio_args: List[str],
+        workers: int
+    ) -> None:
+        """
+        Encode keyframe-aligned segments in parallel ffmpeg processes and join them.
+        
+        Video segments are encoded without audio; the audio track is encoded
+        once over the whole clip so there are no AAC priming gaps at the joins.
+        The concat demuxer then copies everything into the output.
+        """
+        work_dir = tempfile.mkdtemp(prefix="compress-", dir=os.path.dirname(output_path))
+        threads = max(1, (os.cpu_count() or 2) // workers)
+        self.logger.info(f"Encoding {len(segments)} segments with {workers} parallel ffmpeg processes "
+                         f"({threads} threads each)")
+        try:
+            def encode(job: Tuple[int, Tuple[float, float]]) -> str:
+                i, (start, end) = job
+                segment_path = os.path.join(work_dir, f"segment_{i:04d}.mp4")
+                cmd = ["ffmpeg", "-y", "-v", "error", "-ss", f"{start:.6f}", "-i", input_path,
+                       "-t", f"{end - start:.6f}", "-an", "-sn", "-dn", "-threads", str(threads)] \
+                    + video_args + [segment_path]
+                subprocess.run(cmd, check=True, capture_output=True, text=True)
+                return segment_path
+            
+            def encode_audio() -> Optional[str]:
+                audio_path = os.path.join(work_dir, "audio.m4a")
+                cmd = ["ffmpeg", "-y", "-v", "error", "-i", input_path, "-vn", "-sn", "-dn"] + audio_args + [audio_path]
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                return audio_path if result.returncode == 0 and os.path.exists(audio_path) else None
+            
+            with ThreadPoolExecutor(max_workers=workers + 1) as pool:
+                audio = pool.submit(encode_audio)
+                segment_paths = list(pool.map(encode, enumerate(segments)))
+                audio_path = audio.result()
+            
+            list_path = os.path.join(work_dir, "segments.txt")
+            with open(list_path, "w") as f:
+                for segment_path in segment_paths:
+                    f.write(f"file '{segment_path}'\n")
+            cmd = ["ffmpeg", "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+            if audio_path:
+                cmd += ["-i", audio_path, "-map", "0:v", "-map", "1:a"]
+            cmd += ["-c", "copy", "-movflags", "+faststart", output_path]
+            self.logger.info(f"Joining segments: {' '.join(cmd)}")
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
     def compress(self, input_path: str, output_dir: str = None) -> str:
         """
         Compress video using ffmpeg with the best available codec.
@@ -221,53 +383,26 @@ class VideoCompressor:
                 scale_filter = f"scale={max_dimension}:{max_dimension}"
                 self.logger.warning(f"Could not detect resolution, using default scaling to {max_dimension}px")
             
-            # Select the best available codec
-            video_codec = self._select_best_codec()
-            
-            # Base ffmpeg command
-            cmd = [
-                "ffmpeg", "-y", "-i", input_path,
-                "-c:v", video_codec
-            ]
-            
-            # Add codec-specific parameters
-            if video_codec == 'libx264' or video_codec == 'libx265':
-                # For software encoding, use CRF (Constant Rate Factor) for quality-based encoding
-                cmd.extend(["-crf", str(self.config['crf_value'])])  # Use configurable CRF
-            elif 'videotoolbox' in video_codec:
-                # For hardware encoding, use bitrate-based encoding
-                cmd.extend(["-b:v", self.config['video_bitrate']])
-                
-                # Add specific VideoToolbox parameters for better quality
-                cmd.extend(["-allow_sw", "1"])  # Allow software encoding as fallback
-                
-                # Add ProRes options for better quality with VideoToolbox
-                if video_codec == 'hevc_videotoolbox':
-                    cmd.extend(["-profile:v", "main"])
-            else:
-                # Default to bitrate for other encoders
-                cmd.extend(["-b:v", self.config['video_bitrate']])
-            
-            # Set video filters if needed
-            if needs_scaling:
-                cmd.extend(["-vf", scale_filter])
-            
-            # Set frame rate
-            cmd.extend(["-r", str(self.config['fps'])])
-            
-            # Set audio settings
-            cmd.extend([
+            # Pick the encoder and encode mode for this clip's length
+            duration = probe_duration(input_path)
+            video_codec, workers = self._plan_encode(self._select_best_codec(), duration)
+            video_args = self._video_args(video_codec, scale_filter if needs_scaling else None)
+            audio_args = [
                 "-c:a", "aac",
                 "-b:a", self.config['audio_bitrate'],
                 "-ac", str(self.config['audio_channels'])
-            ])
-            
-            # Add output path
-            cmd.append(output_path)
+            ]
             
-            # Execute ffmpeg
-            self.logger.info(f"Running compression command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            segments = split_on_keyframes(duration, probe_keyframes(input_path), self.config['segment_seconds']) \
+                if workers > 1 else []
+            if len(segments) > 1:
+                self._compress_segments(input_path, output_path, segments, video_args, audio_args, workers)
+            else:
+                cmd = ["ffmpeg", "-y", "-i", input_path] + video_args + audio_args + [output_path]
+                
+                # Execute ffmpeg
+                self.logger.info(f"Running compression command: {' '.join(cmd)}")
+                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
             
             # Check if output file was created and has a reasonable size
             if os.path.exists(output_path):
@@ -11,7 +11,7 @@ from typing import Dict, Any
 
 from ..config import Config
 from .compression import VideoCompressor
-from .analysis import VideoAnalyzer
+from .segmentation import SegmentedVideoAnalyzer
 
 
 class VideoProcessor:
@@ -96,7 +96,8 @@ class VideoProcessor:
             # Analyze video
             # Get FPS from compression config, with fallback to default
             fps_for_analysis = self.compression_config.get('fps', 5)
-            analyzer = VideoAnalyzer(api_key=self.api_key, fps=fps_for_analysis)
+            # Long clips are split into segments that are analyzed concurrently
+            analyzer = SegmentedVideoAnalyzer(api_key=self.api_key, fps=fps_for_analysis)
             analysis_results = analyzer.analyze_video(compressed_path)
             
             self.logger.info(f"AI analysis completed successfully")
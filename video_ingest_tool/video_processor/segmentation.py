@@ -0,0 +1,440 @@
+"""
+Segmented AI analysis for long clips.
+
+A single Gemini request over a long proxy is slow, can exceed request size
+limits and fails as a whole. SegmentedVideoAnalyzer splits proxies longer
+than AI_SEGMENT_THRESHOLD_SECONDS into overlapping windows that start on
+keyframes where possible (so they can be cut with a stream copy; the rest
+are re-encoded so they start exactly where planned), analyzes the windows
+concurrently and merges the results into one analysis in the
+ComprehensiveAIAnalysis shape, with every timestamp offset to the full clip.
+
+Each window "owns" the time up to the middle of its overlap with the next
+one; timed items (shots, transcript segments, sound events, ...) are kept
+only from the window that owns their timestamp, so the overlap never
+produces duplicates.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from google.genai import types
+
+from ..utils import parse_timestamp
+from .analysis import ANALYSIS_MODEL, VideoAnalyzer
+from .compression import probe_duration, probe_keyframes
+
+# Proxies longer than this are analyzed in segments
+AI_SEGMENT_THRESHOLD_SECONDS = float(os.getenv("AI_SEGMENT_THRESHOLD_SECONDS", "600"))
+# Target window length and the overlap between consecutive windows
+AI_SEGMENT_SECONDS = float(os.getenv("AI_SEGMENT_SECONDS", "300"))
+AI_SEGMENT_OVERLAP_SECONDS = float(os.getenv("AI_SEGMENT_OVERLAP_SECONDS", "15"))
+# Gemini requests in flight per clip
+AI_SEGMENT_CONCURRENCY = int(os.getenv("AI_SEGMENT_CONCURRENCY", "4"))
+# Extra attempts for a window whose request fails
+AI_SEGMENT_RETRIES = int(os.getenv("AI_SEGMENT_RETRIES", "1"))
+
+# Ratings merged as the value covering most of the clip
+_RATING_FIELDS = {
+    ("visual_analysis", "technical_quality"): ("overall_focus_quality", "stability_assessment", "usability_rating"),
+    ("audio_analysis", "audio_quality"): ("clarity", "background_noise_level", "dialogue_intelligibility"),
+}
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds in the analysis timestamp format ("3725s600ms")."""
+    milliseconds = int(round(max(0.0, seconds) * 1000))
+    return f"{milliseconds // 1000}s{milliseconds % 1000}ms"
+
+
+def check_segment_config(segment_seconds: float, overlap_seconds: float) -> None:
+    """Raise ValueError unless windows of this length and overlap always advance."""
+    if overlap_seconds < 0 or segment_seconds <= overlap_seconds:
+        raise ValueError(f"AI segment length ({segment_seconds}s) must be longer than the "
+                         f"overlap ({overlap_seconds}s), which must not be negative")
+
+
+def plan_segments(
+    duration: float,
+    keyframes: Sequence[float],
+    segment_seconds: float = AI_SEGMENT_SECONDS,
+    overlap_seconds: float = AI_SEGMENT_OVERLAP_SECONDS
+) -> List[Dict[str, float]]:
+    """
+    Split a clip into overlapping windows that start on keyframes.
+
+    Args:
+        duration: Clip duration in seconds
+        keyframes: Keyframe times in seconds (any order)
+        segment_seconds: Target window length
+        overlap_seconds: Minimum overlap between consecutive windows
+
+    Returns:
+        List[Dict[str, float]]: Windows with 'start' and 'end' (what is cut and
+        analyzed), 'own_start'/'own_end' (the part whose items are kept) and
+        'keyframe' (whether 'start' is a keyframe, i.e. the window can be stream-copied)
+
+    Raises:
+        ValueError: If segment_seconds is not longer than overlap_seconds
+    """
+    check_segment_config(segment_seconds, overlap_seconds)
+    keyframes = sorted(k for k in keyframes if 0 <= k < duration)
+    windows = []
+    start, on_keyframe = 0.0, True
+    while True:
+        end = start + segment_seconds
+        # Don't leave a sliver at the end; stretch the last window instead
+        if end + overlap_seconds >= duration - segment_seconds / 4:
+            windows.append({"start": start, "end": duration, "keyframe": on_keyframe})
+            break
+        # Next window starts on the last keyframe that still leaves the overlap
+        candidates = [k for k in keyframes if start < k <= end - overlap_seconds]
+        windows.append({"start": start, "end": end, "keyframe": on_keyframe})
+        # Either way next start > start, since segment_seconds > overlap_seconds
+        start, on_keyframe = (candidates[-1], True) if candidates else (end - overlap_seconds, False)
+
+    for i, window in enumerate(windows):
+        window["own_start"] = windows[i - 1]["own_end"] if i else 0.0
+        window["own_end"] = (windows[i + 1]["start"] + window["end"]) / 2 if i + 1 < len(windows) else duration
+    return windows
+
+
+def _owned(item: Dict[str, Any], window: Dict[str, float], key: str = "timestamp") -> bool:
+    """Offset an item's timestamp in place; True if its window owns it."""
+    seconds = parse_timestamp(item.get(key))
+    if seconds is None:
+        return window["own_start"] == 0.0
+    seconds += window["start"]
+    item[key] = format_timestamp(seconds)
+    return window["own_start"] <= seconds < window["own_end"]
+
+
+def _timed(results: List[Tuple[Dict[str, float], Dict[str, Any]]], *path: str) -> List[Dict[str, Any]]:
+    """Owned, offset copies of a timed list at `path` across all windows."""
+    merged = []
+    for window, analysis in results:
+        node: Any = analysis
+        for key in path:
+            node = (node or {}).get(key)
+        for item in node or []:
+            item = dict(item)
+            if _owned(item, window):
+                merged.append(item)
+    return sorted(merged, key=lambda item: parse_timestamp(item.get("timestamp")) or 0.0)
+
+
+def _section(analysis: Dict[str, Any], *path: str) -> Dict[str, Any]:
+    node: Any = analysis
+    for key in path:
+        node = (node or {}).get(key)
+    return node or {}
+
+
+def _unique(items: List[Dict[str, Any]], key: str) -> List[Dict[str, Any]]:
+    """First item per case-insensitive value of `key`."""
+    seen: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        name = str(item.get(key) or "").strip().lower()
+        if name and name not in seen:
+            seen[name] = item
+    return list(seen.values())
+
+
+def merge_segment_analyses(
+    results: List[Tuple[Dict[str, float], Dict[str, Any]]],
+    summary: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Merge per-window analyses into one analysis of the whole clip.
+
+    Args:
+        results: (window from plan_segments, analysis JSON) pairs in clip order
+        summary: Summary object for the whole clip (default: merged from the windows)
+
+    Returns:
+        Dict[str, Any]: Analysis JSON in the ComprehensiveAIAnalysis shape
+    """
+    weights = [window["own_end"] - window["own_start"] for window, _ in results]
+
+    def weighted_mode(values: List[Optional[str]]) -> Optional[str]:
+        totals: Counter = Counter()
+        for value, weight in zip(values, weights):
+            if value:
+                totals[value] += weight
+        return totals.most_common(1)[0][0] if totals else None
+
+    if summary is None:
+        summaries = [_section(analysis, "summary") for _, analysis in results]
+        summary = {
+            "overall": " ".join(s["overall"] for s in summaries if s.get("overall")),
+            "key_activities": list(dict.fromkeys(a for s in summaries for a in s.get("key_activities") or [])),
+            "content_category": weighted_mode([s.get("content_category") for s in summaries]),
+            "condensed_summary": next((s["condensed_summary"] for s in summaries if s.get("condensed_summary")), None),
+        }
+
+    # Thumbnails: rank-1 frames from windows spread across the clip, then lower ranks
+    by_rank: Dict[str, List[Dict[str, Any]]] = {"1": [], "2": [], "3": []}
+    for window, analysis in results:
+        for thumbnail in _section(analysis, "visual_analysis", "keyframe_analysis").get("recommended_thumbnails") or []:
+            thumbnail = dict(thumbnail)
+            rank = str(thumbnail.get("rank"))
+            if rank in by_rank and _owned(thumbnail, window):
+                by_rank[rank].append(thumbnail)
+    best = by_rank["1"]
+    if len(best) > 3:
+        best = [best[round(i * (len(best) - 1) / 2)] for i in range(3)]
+    thumbnails = (best + by_rank["2"] + by_rank["3"])[:3]
+    for i, thumbnail in enumerate(thumbnails):
+        thumbnail["rank"] = str(i + 1)
+
+    technical = {
+        field: weighted_mode([_section(a, "visual_analysis", "technical_quality").get(field) for _, a in results])
+        for field in _RATING_FIELDS[("visual_analysis", "technical_quality")]
+    }
+    technical["detected_artifacts"] = list({
+        (artifact.get("type"), artifact.get("description")): artifact
+        for _, analysis in results
+        for artifact in _section(analysis, "visual_analysis", "technical_quality").get("detected_artifacts") or []
+    }.values())
+    audio_quality = {
+        field: weighted_mode([_section(a, "audio_analysis", "audio_quality").get(field) for _, a in results])
+        for field in _RATING_FIELDS[("audio_analysis", "audio_quality")]
+    }
+
+    transcript_segments = _timed(results, "audio_analysis", "transcript", "segments")
+    if transcript_segments:
+        full_text = " ".join(segment["text"].strip() for segment in transcript_segments if segment.get("text"))
+    else:
+        full_text = " ".join(
+            text.strip() for _, analysis in results
+            if (text := _section(analysis, "audio_analysis", "transcript").get("full_text"))
+        )
+
+    speakers: Dict[str, Dict[str, Any]] = {}
+    for _, analysis in results:
+        for speaker in _section(analysis, "audio_analysis", "speaker_analysis").get("speakers") or []:
+            merged = speakers.setdefault(speaker.get("speaker_id"), {**speaker, "speaking_time_seconds": 0.0})
+            merged["speaking_time_seconds"] += speaker.get("speaking_time_seconds") or 0.0
+
+    people: Dict[str, Dict[str, Any]] = {}
+    objects: Dict[str, Dict[str, Any]] = {}
+    for window, analysis in results:
+        entities = _section(analysis, "content_analysis", "entities")
+        for person in entities.get("people_details") or []:
+            appearances = [dict(a) for a in person.get("appearances") or []]
+            appearances = [a for a in appearances if _owned(a, window)]
+            key = str(person.get("description") or "").strip().lower()
+            if key in people:
+                people[key].setdefault("appearances", []).extend(appearances)
+            elif key:
+                people[key] = {**person, "appearances": appearances}
+        for item in entities.get("objects_of_interest") or []:
+            timestamps = [
+                format_timestamp(seconds + window["start"])
+                for seconds in map(parse_timestamp, item.get("timestamps") or []) if seconds is not None
+            ]
+            key = str(item.get("object") or "").strip().lower()
+            if key in objects:
+                objects[key]["timestamps"] = objects[key].get("timestamps", []) + timestamps
+            elif key:
+                objects[key] = {**item, "timestamps": timestamps}
+
+    return {
+        "summary": summary,
+        "visual_analysis": {
+            "shot_types": _timed(results, "visual_analysis", "shot_types"),
+            "technical_quality": technical,
+            "text_and_graphics": {
+                "detected_text": _timed(results, "visual_analysis", "text_and_graphics", "detected_text"),
+                "detected_logos_icons": _timed(results, "visual_analysis", "text_and_graphics", "detected_logos_icons"),
+            },
+            "keyframe_analysis": {
+                "recommended_keyframes": _timed(results, "visual_analysis", "keyframe_analysis", "recommended_keyframes"),
+                "recommended_thumbnails": thumbnails,
+            },
+        },
+        "audio_analysis": {
+            "transcript": {"full_text": full_text, "segments": transcript_segments},
+            "speaker_analysis": {
+                "speaker_count": max(
+                    [_section(a, "audio_analysis", "speaker_analysis").get("speaker_count") or 0 for _, a in results],
+                    default=0
+                ),
+                "speakers": list(speakers.values()),
+            },
+            "sound_events": _timed(results, "audio_analysis", "sound_events"),
+            "audio_quality": audio_quality,
+        },
+        "content_analysis": {
+            "entities": {
+                "people_count": max(
+                    [_section(a, "content_analysis", "entities").get("people_count") or 0 for _, a in results],
+                    default=0
+                ),
+                "people_details": list(people.values()),
+                "locations": _unique(
+                    [loc for _, a in results for loc in _section(a, "content_analysis", "entities").get("locations") or []],
+                    "name"
+                ),
+                "objects_of_interest": list(objects.values()),
+            },
+            "activity_summary": _timed(results, "content_analysis", "activity_summary"),
+            "content_warnings": _timed(results, "content_analysis", "content_warnings"),
+        },
+    }
+
+
+class SegmentedVideoAnalyzer(VideoAnalyzer):
+    """VideoAnalyzer that analyzes long clips as concurrent overlapping segments."""
+
+    def __init__(
+        self,
+        api_key: str,
+        fps: int = 1,
+        threshold_seconds: float = AI_SEGMENT_THRESHOLD_SECONDS,
+        segment_seconds: float = AI_SEGMENT_SECONDS,
+        overlap_seconds: float = AI_SEGMENT_OVERLAP_SECONDS,
+        concurrency: int = AI_SEGMENT_CONCURRENCY
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            api_key: Gemini API key
+            fps: Frame rate for video analysis
+            threshold_seconds: Clips longer than this are analyzed in segments
+            segment_seconds: Target segment length
+            overlap_seconds: Minimum overlap between consecutive segments
+            concurrency: Segments analyzed at the same time
+        """
+        check_segment_config(segment_seconds, overlap_seconds)
+        super().__init__(api_key, fps)
+        self.threshold_seconds = threshold_seconds
+        self.segment_seconds = segment_seconds
+        self.overlap_seconds = overlap_seconds
+        self.concurrency = max(1, concurrency)
+
+    def _probe_duration(self, video_path: str) -> Optional[float]:
+        duration = probe_duration(video_path)
+        if duration is None:
+            self.logger.warning(f"Could not probe duration of {video_path}")
+        return duration
+
+    def _probe_keyframes(self, video_path: str) -> List[float]:
+        return probe_keyframes(video_path)
+
+    def _cut_segment(self, video_path: str, window: Dict[str, float], output_path: str) -> str:
+        """
+        Cut one window out of the proxy.
+
+        Windows starting on a keyframe are stream-copied. A stream copy of any
+        other window would start at the keyframe before it, shifting every
+        timestamp in its analysis, so those are re-encoded instead.
+        """
+        if window.get("keyframe", True):
+            codec_args = ["-c", "copy", "-avoid_negative_ts", "make_zero"]
+        else:
+            codec_args = ["-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-c:a", "aac"]
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-ss", f"{window['start']:.3f}", "-i", video_path,
+             "-t", f"{window['end'] - window['start']:.3f}"] + codec_args + [output_path],
+            capture_output=True, text=True, check=True
+        )
+        return output_path
+
+    def _segment_prompt(self, index: int, count: int, window: Dict[str, float]) -> str:
+        return (
+            self._create_analysis_prompt()
+            + f"\nThis video is part {index + 1} of {count} of a longer clip, covering "
+            f"{format_timestamp(window['start'])} to {format_timestamp(window['end'])} of it. "
+            "Describe only this part, and give every timestamp relative to the start of this part."
+        )
+
+    def _analyze_segment(self, segment_path: str, prompt: str) -> Dict[str, Any]:
+        for attempt in range(AI_SEGMENT_RETRIES + 1):
+            try:
+                return self.analyze_video(segment_path, prompt=prompt)
+            except Exception:
+                if attempt == AI_SEGMENT_RETRIES:
+                    raise
+                self.logger.warning(f"Retrying AI analysis of {os.path.basename(segment_path)}")
+
+    def _summarize_segments(self, results: List[Tuple[Dict[str, float], Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """One text-only request that writes the clip summary from the segment summaries."""
+        parts = "\n\n".join(
+            f"Part {i + 1} ({format_timestamp(window['start'])} - {format_timestamp(window['end'])}):\n"
+            + json.dumps(analysis.get("summary") or {})
+            for i, (window, analysis) in enumerate(results)
+        )
+        prompt = (
+            "These are summaries of consecutive parts of one video clip. Write the 'summary' object for the "
+            "whole clip following the same field rules as the parts: 'overall' about 100-256 tokens, "
+            "'key_activities' across the clip, one 'content_category', and a 'condensed_summary' of at most "
+            "64 tokens describing only what is visible.\n\n" + parts
+        )
+        try:
+            response = self.client.models.generate_content(
+                model=ANALYSIS_MODEL,
+                contents=[prompt],
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=self._get_comprehensive_analysis_schema()["properties"]["summary"]
+                )
+            )
+            return json.loads(response.text)
+        except Exception as e:
+            self.logger.warning(f"Clip summary request failed, merging segment summaries instead: {str(e)}")
+            return None
+
+    def analyze_video(self, video_path: str, prompt: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analyze a video, in concurrent segments if it is longer than the threshold.
+
+        Args:
+            video_path: Path to video file to analyze
+            prompt: Prompt to use instead of the default analysis prompt
+
+        Returns:
+            Dict[str, Any]: Structured analysis results for the whole video
+        """
+        if prompt is not None:
+            return super().analyze_video(video_path, prompt=prompt)
+        duration = self._probe_duration(video_path)
+        if not duration or duration <= self.threshold_seconds:
+            return super().analyze_video(video_path)
+
+        windows = plan_segments(duration, self._probe_keyframes(video_path), self.segment_seconds, self.overlap_seconds)
+        self.logger.info(f"Analyzing {os.path.basename(video_path)} ({duration:.0f}s) as {len(windows)} segments, "
+                         f"{self.concurrency} at a time")
+        work_dir = tempfile.mkdtemp(prefix="ai-segments-")
+        try:
+            def run(i: int) -> Dict[str, Any]:
+                segment_path = self._cut_segment(video_path, windows[i], os.path.join(work_dir, f"segment_{i:03d}.mp4"))
+                return self._analyze_segment(segment_path, self._segment_prompt(i, len(windows), windows[i]))
+
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = [pool.submit(run, i) for i in range(len(windows))]
+                results = []
+                for window, future in zip(windows, futures):
+                    try:
+                        results.append((window, future.result()))
+                    except Exception as e:
+                        self.logger.error(f"AI analysis of segment {format_timestamp(window['start'])}-"
+                                          f"{format_timestamp(window['end'])} failed: {str(e)}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        if not results:
+            raise RuntimeError(f"AI analysis failed for every segment of {video_path}")
+        if len(results) < len(windows):
+            self.logger.warning(f"Merging {len(results)} of {len(windows)} segments; failed parts have no analysis")
+        summary = self._summarize_segments(results) if len(results) > 1 else None
+        analysis = merge_segment_analyses(results, summary)
+        self.logger.info(f"Merged {len(results)} segment analyses")
+        return analysis
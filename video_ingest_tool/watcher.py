@@ -0,0 +1,347 @@
+"""
+Watch-folder support for the video ingest tool.
+
+FolderWatcher follows a directory tree and hands over each video file once
+it has finished arriving (e.g. from a card offload), so `ait watch` can
+ingest it while the offload of the next card is still running.
+
+New and changed files are picked up through inotify on Linux (directories
+created later are watched as they appear) and by rescanning the tree every
+WATCH_POLL_INTERVAL seconds elsewhere, or when inotify is unavailable or
+out of watches. With inotify the tree is still rescanned every
+WATCH_RESCAN_INTERVAL seconds in case events were lost.
+
+A file counts as complete once its size and mtime have not changed for
+WATCH_SETTLE_SECONDS and, on Linux, no local process has it open for
+writing. Copies made by other machines onto a network share are only
+visible through size and mtime, so use a longer settle time there. Hidden
+files (dot files such as rsync temporaries and macOS ``._`` resource forks)
+are ignored.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from .utils import is_video_file
+
+WATCH_SETTLE_SECONDS = float(os.getenv("WATCH_SETTLE_SECONDS", "10"))
+WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", "5"))
+WATCH_RESCAN_INTERVAL = float(os.getenv("WATCH_RESCAN_INTERVAL", "300"))
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+# (size, mtime_ns) of a file
+Signature = Tuple[int, int]
+
+
+class InotifyUnavailable(OSError):
+    """inotify cannot be used here (not Linux, or out of watches)."""
+
+
+class Inotify:
+    """Minimal inotify binding (through libc, no extra dependency)."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        try:
+            self._libc = ctypes.CDLL(libc_name, use_errno=True)
+            init = self._libc.inotify_init1
+        except (OSError, AttributeError, TypeError) as e:
+            raise InotifyUnavailable(f"inotify is not available: {e}")
+        self.fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise InotifyUnavailable(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: Dict[int, str] = {}
+
+    def add_watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise InotifyUnavailable(error, "Out of inotify watches (raise fs.inotify.max_user_watches)")
+            if error not in (errno.ENOENT, errno.ENOTDIR):
+                raise OSError(error, os.strerror(error), path)
+            return
+        self._paths[wd] = path
+
+    def read(self, timeout: float) -> Optional[List[Tuple[str, int]]]:
+        """
+        Wait up to `timeout` seconds for events.
+
+        Returns:
+            (path, mask) per event, or None if the kernel queue overflowed
+            and events were lost
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buffer = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            directory = self._paths.get(wd)
+            if directory is not None and name:
+                events.append((os.path.join(directory, os.fsdecode(name)), mask))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def open_for_writing(path: str) -> bool:
+    """
+    Whether a local process has the file open for writing.
+
+    Scans /proc on Linux (processes of other users are only visible to
+    root); returns False where /proc is not available.
+    """
+    if not os.path.isdir("/proc/self/fd"):
+        return False
+    target = os.path.realpath(path)
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                if os.readlink(f"{fd_dir}/{fd}") != target:
+                    continue
+                with open(f"/proc/{pid}/fdinfo/{fd}") as f:
+                    flags = next(int(line.split()[1], 8) for line in f if line.startswith("flags:"))
+            except (OSError, StopIteration, ValueError):
+                continue
+            if flags & os.O_ACCMODE in (os.O_WRONLY, os.O_RDWR):
+                return True
+    return False
+
+
+class FolderWatcher:
+    """
+    Reports video files under a directory once they have finished being written.
+
+    run() blocks until the stop event is set, calling on_ready(path) from
+    the calling thread for every complete file. A file is reported again
+    only if its size or mtime change afterwards.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        on_ready: Callable[[str], None],
+        recursive: bool = True,
+        settle_seconds: float = WATCH_SETTLE_SECONDS,
+        poll_interval: float = WATCH_POLL_INTERVAL,
+        rescan_interval: float = WATCH_RESCAN_INTERVAL,
+        use_inotify: bool = True,
+        include_existing: bool = True,
+        logger=None
+    ):
+        """
+        Args:
+            directory: Directory to watch
+            on_ready: Called with the path of every complete video file
+            recursive: Watch subdirectories
+            settle_seconds: How long size and mtime must stay unchanged
+            poll_interval: Seconds between rescans when polling
+            rescan_interval: Seconds between safety rescans when using inotify
+            use_inotify: Use inotify where available (False always polls)
+            include_existing: Also report files already there when watching starts
+            logger: Optional logger
+        """
+        self.directory = os.path.abspath(directory)
+        self.on_ready = on_ready
+        self.recursive = recursive
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self.include_existing = include_existing
+        self.logger = logger or structlog.get_logger(__name__)
+        self._inotify: Optional[Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = Inotify()
+            except InotifyUnavailable as e:
+                self.logger.warning("inotify unavailable; polling for new files", error=str(e))
+        # path -> [signature, monotonic time it was last seen changing]
+        self._pending: Dict[str, list] = {}
+        # path -> signature it was reported with
+        self._reported: Dict[str, Signature] = {}
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    @property
+    def pending(self) -> int:
+        """Files seen but not complete yet."""
+        return len(self._pending)
+
+    def run(self, stop: threading.Event) -> None:
+        """Watch until `stop` is set."""
+        if self._inotify is not None:
+            try:
+                self._add_watches(self.directory)
+            except OSError as e:
+                self.logger.warning("inotify unavailable; polling for new files", error=str(e))
+                self._close_inotify()
+        for path, signature in self._scan():
+            if self.include_existing:
+                self._pending[path] = [signature, time.monotonic()]
+            else:
+                self._reported[path] = signature
+        self.logger.info("Watching directory", directory=self.directory, mode=self.mode,
+                         recursive=self.recursive, settle_seconds=self.settle_seconds,
+                         existing_files=len(self._pending) if self.include_existing else 0)
+
+        last_scan = time.monotonic()
+        try:
+            while not stop.is_set():
+                scan_every = self.rescan_interval if self._inotify is not None else self.poll_interval
+                timeout = min(self.poll_interval, 1.0 if self._pending else self.poll_interval)
+                rescan = time.monotonic() - last_scan >= scan_every
+                if self._inotify is not None:
+                    events = self._inotify.read(timeout)
+                    if events is None:
+                        self.logger.warning("inotify queue overflowed; rescanning", directory=self.directory)
+                        rescan = True
+                    else:
+                        self._handle_events(events)
+                else:
+                    stop.wait(timeout)
+                if rescan:
+                    for path, signature in self._scan():
+                        self._observe(path, signature)
+                    last_scan = time.monotonic()
+                self._check_pending()
+        finally:
+            self._close_inotify()
+
+    def _close_inotify(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _add_watches(self, directory: str) -> None:
+        self._inotify.add_watch(directory)
+        if self.recursive:
+            for root, dirs, _ in os.walk(directory):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                for d in dirs:
+                    self._inotify.add_watch(os.path.join(root, d))
+
+    def _handle_events(self, events: List[Tuple[str, int]]) -> None:
+        for path, mask in events:
+            name = os.path.basename(path)
+            if name.startswith("."):
+                continue
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    if self._inotify is not None:
+                        try:
+                            self._add_watches(path)
+                        except OSError as e:
+                            # Out of watches or unreadable: keep going by polling, like at startup
+                            self.logger.warning("Cannot watch new directory; polling for new files",
+                                                directory=path, error=str(e))
+                            self._close_inotify()
+                    # Files may have landed before the watch was in place
+                    for file_path, signature in self._scan(path):
+                        self._observe(file_path, signature)
+                continue
+            if is_video_file(path):
+                signature = _signature(path)
+                if signature is not None:
+                    self._observe(path, signature, changed=True)
+
+    def _observe(self, path: str, signature: Signature, changed: bool = False) -> None:
+        """Track a file that is new or differs from what was reported."""
+        if not changed and self._reported.get(path) == signature:
+            return
+        entry = self._pending.get(path)
+        if entry is None:
+            self._pending[path] = [signature, time.monotonic()]
+        elif changed or entry[0] != signature:
+            entry[0], entry[1] = signature, time.monotonic()
+
+    def _check_pending(self) -> None:
+        """Report files whose size and mtime have settled."""
+        now = time.monotonic()
+        for path, entry in list(self._pending.items()):
+            signature = _signature(path)
+            if signature is None:
+                del self._pending[path]
+                continue
+            if signature != entry[0]:
+                entry[0], entry[1] = signature, now
+                continue
+            if now - entry[1] < self.settle_seconds or signature[0] == 0:
+                continue
+            if signature == self._reported.get(path):
+                # Touched (e.g. IN_ATTRIB) without changing
+                del self._pending[path]
+                continue
+            if open_for_writing(path):
+                entry[1] = now
+                continue
+            del self._pending[path]
+            self._reported[path] = signature
+            self.logger.info("File ready", path=path, size_bytes=signature[0])
+            self.on_ready(path)
+
+    def _scan(self, directory: Optional[str] = None) -> Iterator[Tuple[str, Signature]]:
+        """Video files (and their signatures) under a directory."""
+        for root, dirs, files in os.walk(directory or self.directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")] if self.recursive else []
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                if is_video_file(path):
+                    signature = _signature(path)
+                    if signature is not None:
+                        yield path, signature
+
+
+def _signature(path: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns